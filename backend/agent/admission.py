@@ -0,0 +1,234 @@
+"""
+/chat 입장 제어 (Admission Control & Load Shedding)
+
+/chat 한 번은 여러 LLM 스트림과 DB 커넥션(풀 최대 20)을 동시에 쓰기 때문에,
+동시 실행 수를 제한하지 않으면 트래픽이 몰릴 때 풀이 고갈되어 모든 요청이 함께 느려집니다.
+
+- 전체 동시 실행 수(global_limit)와 등급(tier)별 동시 실행 수를 함께 제한합니다.
+- 자리가 없으면 등급별 대기열(max_queue)에서 최대 max_wait초까지 FIFO로 기다립니다.
+- 대기열이 가득 찼거나 기다려도 자리가 나지 않으면 503 + Retry-After로 즉시 거절합니다.
+- 등급: guest(비로그인) / member(BEGINNER) / expert(EXPERT) — 서로의 예산을 침범하지 않습니다.
+
+메트릭: chat_admission_running{tier}, chat_admission_queue_depth{tier},
+        chat_admission_rejected_total{tier,reason}, chat_admission_wait_seconds{tier}
+"""
+
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional, Tuple
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+from .metrics import metrics
+
+
+@dataclass(frozen=True)
+class TierBudget:
+    max_running: int
+    max_queue: int
+
+
+DEFAULT_BUDGETS = "member:8:16,expert:6:12,guest:3:6"
+
+
+def parse_budgets(spec: str) -> Dict[str, TierBudget]:
+    """'tier:동시실행:대기열,...' 형식의 설정을 읽습니다."""
+    budgets: Dict[str, TierBudget] = {}
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        tier, running, queue = item.split(":")
+        budgets[tier.strip()] = TierBudget(max(1, int(running)), max(0, int(queue)))
+    return budgets
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, tier: str, reason: str, retry_after: float) -> None:
+        super().__init__(f"{tier} admission rejected ({reason})")
+        self.tier = tier
+        self.reason = reason
+        self.retry_after = retry_after
+
+    def to_http(self) -> HTTPException:
+        return HTTPException(
+            status_code=503,
+            detail="현재 요청이 많아 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": str(max(1, math.ceil(self.retry_after)))},
+        )
+
+
+class AdmissionTicket:
+    """입장 허가증. release()는 여러 번 불러도 한 번만 반영됩니다."""
+
+    def __init__(self, controller: "AdmissionController", tier: str) -> None:
+        self._controller = controller
+        self.tier = tier
+        self.released = False
+
+    def release(self) -> None:
+        if not self.released:
+            self.released = True
+            self._controller._release(self.tier)
+
+
+class AdmissionController:
+    """
+    Args:
+        budgets: 등급별 예산 (동시 실행 수, 대기열 길이)
+        global_limit: 등급과 무관한 전체 동시 실행 수 (DB 풀 크기보다 작게)
+        max_wait: 대기열에서 기다릴 최대 시간(초)
+        retry_after: 거절 시 Retry-After 기본값(초)
+    """
+
+    def __init__(
+        self,
+        budgets: Dict[str, TierBudget],
+        global_limit: int,
+        max_wait: float = 2.0,
+        retry_after: float = 5.0,
+    ) -> None:
+        self.budgets = budgets
+        self.global_limit = max(1, global_limit)
+        self.max_wait = max_wait
+        self.retry_after = retry_after
+        self._running: Dict[str, int] = {tier: 0 for tier in budgets}
+        self._queued: Dict[str, int] = {tier: 0 for tier in budgets}
+        self._waiters: Deque[Tuple[str, "asyncio.Future[None]"]] = deque()
+
+    @property
+    def running_total(self) -> int:
+        return sum(self._running.values())
+
+    def running(self, tier: str) -> int:
+        return self._running.get(tier, 0)
+
+    def queued(self, tier: str) -> int:
+        return self._queued.get(tier, 0)
+
+    async def acquire(self, tier: str) -> AdmissionTicket:
+        """자리가 나면 AdmissionTicket을, 아니면 AdmissionRejected를 던집니다."""
+        if tier not in self.budgets:
+            raise KeyError(f"unknown admission tier: {tier}")
+        budget = self.budgets[tier]
+        started_at = time.perf_counter()
+
+        if self._can_run(tier) and not self._queued[tier]:
+            self._admit(tier)
+            metrics.observe("chat_admission_wait_seconds", 0.0, tier=tier)
+            return AdmissionTicket(self, tier)
+
+        if self._queued[tier] >= budget.max_queue:
+            raise self._reject(tier, "queue_full")
+
+        future: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        entry = (tier, future)
+        self._waiters.append(entry)
+        self._set_queued(tier, +1)
+        try:
+            await asyncio.wait({future}, timeout=self.max_wait)
+        except asyncio.CancelledError:
+            self._abandon(entry)
+            raise
+        if not future.done():
+            self._abandon(entry)
+            raise self._reject(tier, "timeout")
+
+        metrics.observe("chat_admission_wait_seconds", time.perf_counter() - started_at, tier=tier)
+        return AdmissionTicket(self, tier)
+
+    # ------------------------------------------------------------------
+
+    def _can_run(self, tier: str) -> bool:
+        return (
+            self.running_total < self.global_limit
+            and self._running[tier] < self.budgets[tier].max_running
+        )
+
+    def _admit(self, tier: str) -> None:
+        self._running[tier] += 1
+        metrics.set_gauge("chat_admission_running", self._running[tier], tier=tier)
+
+    def _release(self, tier: str) -> None:
+        self._running[tier] -= 1
+        metrics.set_gauge("chat_admission_running", self._running[tier], tier=tier)
+        self._wake()
+
+    def _wake(self) -> None:
+        """FIFO 순서대로, 지금 자리가 나는 대기자에게 입장을 허가합니다."""
+        for entry in list(self._waiters):
+            if self.running_total >= self.global_limit:
+                break
+            tier, future = entry
+            if future.done() or not self._can_run(tier):
+                continue
+            self._waiters.remove(entry)
+            self._set_queued(tier, -1)
+            self._admit(tier)
+            future.set_result(None)
+
+    def _abandon(self, entry: Tuple[str, "asyncio.Future[None]"]) -> None:
+        tier, future = entry
+        if entry in self._waiters:
+            self._waiters.remove(entry)
+            self._set_queued(tier, -1)
+            future.cancel()
+        elif future.done() and not future.cancelled():
+            # 허가와 취소가 겹침 → 받은 자리를 돌려줌
+            self._release(tier)
+
+    def _set_queued(self, tier: str, delta: int) -> None:
+        self._queued[tier] += delta
+        metrics.set_gauge("chat_admission_queue_depth", self._queued[tier], tier=tier)
+
+    def _reject(self, tier: str, reason: str) -> AdmissionRejected:
+        metrics.inc("chat_admission_rejected_total", tier=tier, reason=reason)
+        return AdmissionRejected(tier, reason, self.retry_after)
+
+
+class AdmittedStreamingResponse(StreamingResponse):
+    """응답(스트림)이 어떤 식으로 끝나든 입장 허가를 반납하는 StreamingResponse"""
+
+    def __init__(self, *args, ticket: Optional[AdmissionTicket] = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.ticket = ticket
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            if self.ticket is not None:
+                self.ticket.release()
+
+
+def admission_tier(user_id: Optional[int], user_mode: str) -> str:
+    """요청자 등급: 비로그인 guest, 회원은 user_mode에 따라 member/expert"""
+    if not user_id:
+        return "guest"
+    return "expert" if (user_mode or "").upper() == "EXPERT" else "member"
+
+
+def is_admission_enabled() -> bool:
+    value = os.getenv("CHAT_ADMISSION_ENABLED", "true").strip().lower()
+    return value not in ("0", "false", "no", "off")
+
+
+_CONTROLLER: Optional[AdmissionController] = None
+
+
+def get_admission_controller() -> AdmissionController:
+    """환경변수 설정으로 만든 프로세스 전역 컨트롤러"""
+    global _CONTROLLER
+    if _CONTROLLER is None:
+        _CONTROLLER = AdmissionController(
+            parse_budgets(os.getenv("CHAT_ADMISSION_BUDGETS", DEFAULT_BUDGETS)),
+            global_limit=int(os.getenv("CHAT_MAX_CONCURRENT_RUNS", "12")),
+            max_wait=float(os.getenv("CHAT_ADMISSION_MAX_WAIT_SECONDS", "2")),
+            retry_after=float(os.getenv("CHAT_RETRY_AFTER_SECONDS", "5")),
+        )
+    return _CONTROLLER
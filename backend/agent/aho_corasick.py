@@ -0,0 +1,113 @@
+"""
+Aho-Corasick 다중 패턴 매처 (순수 Python)
+
+수천 개의 브랜드/향수/노트/동의어를 한 번의 텍스트 스캔으로 찾기 위한 오토마톤입니다.
+입력 길이에 선형이며, 패턴 수가 늘어도 쿼리당 비용이 거의 변하지 않습니다.
+
+사용처:
+- intent_router.Gazetteer (의도 라우팅용 엔티티 탐지)
+- slot_matcher.SlotMatcher (인터뷰 슬롯 사전 추출)
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple
+
+
+@dataclass(frozen=True)
+class Match:
+    start: int
+    end: int
+    value: Any
+
+
+class AhoCorasick:
+    """
+    패턴 추가(add) → build() → find_all()/iter_matches() 순서로 사용합니다.
+
+    대소문자 정규화는 호출자가 담당합니다. (패턴/텍스트 모두 lower() 권장)
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[int, Any]]] = [[]]
+        self._built = False
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, pattern: str, value: Any) -> None:
+        if not pattern:
+            return
+        node = 0
+        for ch in pattern:
+            next_node = self._goto[node].get(ch)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][ch] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = next_node
+        self._output[node].append((len(pattern), value))
+        self._size += 1
+        self._built = False
+
+    def build(self) -> "AhoCorasick":
+        """BFS로 실패 링크를 만들고, 실패 경로의 출력을 합칩니다."""
+        queue = deque()
+        for next_node in self._goto[0].values():
+            self._fail[next_node] = 0
+            queue.append(next_node)
+
+        while queue:
+            node = queue.popleft()
+            for ch, next_node in self._goto[node].items():
+                queue.append(next_node)
+                fallback = self._fail[node]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                candidate = self._goto[fallback].get(ch, 0)
+                self._fail[next_node] = candidate if candidate != next_node else 0
+                self._output[next_node] = (
+                    self._output[next_node] + self._output[self._fail[next_node]]
+                )
+
+        self._built = True
+        return self
+
+    def iter_matches(self, text: str) -> Iterator[Match]:
+        if not self._built:
+            self.build()
+        goto, fail, output = self._goto, self._fail, self._output
+        node = 0
+        for index, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if output[node]:
+                end = index + 1
+                for length, value in output[node]:
+                    yield Match(end - length, end, value)
+
+    def find_all(self, text: str) -> List[Match]:
+        return list(self.iter_matches(text))
+
+
+def select_longest(
+    matches: Sequence[Match],
+    priority: Callable[[Match], int] = lambda m: 0,
+) -> List[Match]:
+    """
+    겹치는 매칭 중 가장 긴 것을 남깁니다. (같은 길이면 priority가 작은 쪽)
+
+    예: "화이트 머스크" 안의 "머스크"는 "화이트 머스크"에 포함되어 제외됩니다.
+    """
+    ordered = sorted(matches, key=lambda m: (-(m.end - m.start), priority(m), m.start))
+    taken: List[Match] = []
+    for match in ordered:
+        if all(match.end <= t.start or match.start >= t.end for t in taken):
+            taken.append(match)
+    return sorted(taken, key=lambda m: m.start)
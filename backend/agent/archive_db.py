@@ -1,17 +1,24 @@
 import json
+import os
 import psycopg2
 import psycopg2.extras
 from typing import List, Dict, Any, Optional
 
 # 기존 DB 연결 함수 사용
 from .database import get_recom_db_connection, get_db_connection, release_recom_db_connection, release_db_connection
+from .profile_cache import invalidate_personalization
 
-def get_my_perfumes(member_id: int) -> List[Dict[str, Any]]:
+def get_my_perfumes(member_id: int, raise_errors: bool = False) -> List[Dict[str, Any]]:
     """
     [복구] 기존 tb_member_my_perfume_t 테이블에서 데이터 조회
+
+    raise_errors=True면 연결 실패/조회 오류를 빈 목록 대신 예외로 올립니다.
+    (개인화 캐시가 "향수 없음"과 "조회 실패"를 구분하도록)
     """
     conn_user = get_recom_db_connection()
     if not conn_user:
+        if raise_errors:
+            raise RuntimeError("recom DB connection unavailable")
         return []
     
     my_perfumes = []
@@ -30,6 +37,8 @@ def get_my_perfumes(member_id: int) -> List[Dict[str, Any]]:
         cur.close()
     except Exception as e:
         print(f"Error fetching my perfumes: {e}")
+        if raise_errors:
+            raise
         return []
     finally:
         release_recom_db_connection(conn_user)
@@ -58,6 +67,8 @@ def get_my_perfumes(member_id: int) -> List[Dict[str, Any]]:
                     details_map[r['perfume_id']] = r
     except Exception as e:
         print(f"Error fetching perfume details: {e}")
+        if raise_errors:
+            raise
     finally:
         release_db_connection(conn_perfume)
 
@@ -102,6 +113,7 @@ def add_my_perfume_logic(member_id: int, perfume_id: int, perfume_name: str, sta
                 alter_dt = NOW()
         """, (member_id, perfume_id, perfume_name, status, preference))
         conn.commit()
+        invalidate_personalization(member_id)
         return {"status": "success"}
     except Exception as e:
         conn.rollback()
@@ -121,6 +133,7 @@ def delete_my_perfume_logic(member_id: int, perfume_id: int):
     try:
         cur.execute("DELETE FROM tb_member_my_perfume_t WHERE member_id = %s AND perfume_id = %s", (member_id, perfume_id))
         conn.commit()
+        invalidate_personalization(member_id)
         return {"status": "success"}
     except Exception as e:
         conn.rollback()
@@ -144,6 +157,7 @@ def update_my_perfume_logic(member_id: int, perfume_id: int, status: str, prefer
             WHERE member_id = %s AND perfume_id = %s
         """, (status, preference, member_id, perfume_id))
         conn.commit()
+        invalidate_personalization(member_id)
         return {"status": "success"}
     except Exception as e:
         conn.rollback()
@@ -152,6 +166,248 @@ def update_my_perfume_logic(member_id: int, perfume_id: int, status: str, prefer
         cur.close()
         release_recom_db_connection(conn)
 
+# ==========================================
+# 일괄 등록/수정/삭제 (한 트랜잭션, 항목별 결과)
+# ==========================================
+ARCHIVE_BULK_MAX_ITEMS = int(os.getenv("ARCHIVE_BULK_MAX_ITEMS", "500"))
+REGISTER_STATUSES = ("HAVE", "HAD", "RECOMMENDED")
+PREFERENCES = ("GOOD", "BAD", "NEUTRAL")
+
+# 배열 4개를 unnest로 펼쳐 한 문장으로 upsert (xmax = 0이면 새로 삽입된 행)
+BULK_UPSERT_SQL = """
+    INSERT INTO tb_member_my_perfume_t
+    (member_id, perfume_id, perfume_name, register_status, preference, register_reason, register_dt)
+    SELECT %(member_id)s, t.perfume_id, t.perfume_name, t.register_status, t.preference, 'USER', NOW()
+    FROM unnest(%(ids)s::int[], %(names)s::text[], %(statuses)s::text[], %(preferences)s::text[])
+        AS t(perfume_id, perfume_name, register_status, preference)
+    ON CONFLICT (member_id, perfume_id)
+    DO UPDATE SET
+        register_status = EXCLUDED.register_status,
+        preference = EXCLUDED.preference,
+        alter_dt = NOW()
+    RETURNING perfume_id, (xmax = 0) AS inserted
+"""
+
+BULK_UPDATE_SQL = """
+    UPDATE tb_member_my_perfume_t p
+    SET register_status = t.register_status,
+        preference = COALESCE(t.preference, p.preference),
+        alter_dt = NOW()
+    FROM unnest(%(ids)s::int[], %(statuses)s::text[], %(preferences)s::text[])
+        AS t(perfume_id, register_status, preference)
+    WHERE p.member_id = %(member_id)s AND p.perfume_id = t.perfume_id
+    RETURNING p.perfume_id
+"""
+
+BULK_DELETE_SQL = """
+    DELETE FROM tb_member_my_perfume_t
+    WHERE member_id = %(member_id)s AND perfume_id = ANY(%(ids)s::int[])
+    RETURNING perfume_id
+"""
+
+
+def _validate_bulk_items(items: List[Dict[str, Any]], require_name: bool):
+    """
+    항목 검증 + 같은 perfume_id 중복 제거 (ON CONFLICT는 한 문장에서 같은 행을 두 번 갱신할 수 없음)
+
+    Returns:
+        (적용할 항목 {perfume_id: item}, 항목별 결과 목록 - 요청 순서, 적용 대상은 None 자리)
+    """
+    results: List[Optional[Dict[str, Any]]] = []
+    valid: Dict[int, Dict[str, Any]] = {}
+    positions: Dict[int, int] = {}
+    for index, item in enumerate(items):
+        perfume_id = item.get("perfume_id")
+        status = (item.get("register_status") or "").upper()
+        preference = item.get("preference")
+        preference = preference.upper() if preference else None
+        error = None
+        if status not in REGISTER_STATUSES:
+            error = f"Invalid register_status: {item.get('register_status')}"
+        elif preference is not None and preference not in PREFERENCES:
+            error = f"Invalid preference: {item.get('preference')}"
+        elif require_name and not item.get("perfume_name"):
+            error = "perfume_name is required"
+        if error:
+            results.append({"perfume_id": perfume_id, "result": "invalid", "message": error})
+            continue
+        if perfume_id in positions:
+            # 뒤에 온 항목이 이김
+            results[positions[perfume_id]] = {"perfume_id": perfume_id, "result": "duplicate"}
+        positions[perfume_id] = index
+        valid[perfume_id] = {**item, "register_status": status, "preference": preference}
+        results.append(None)
+    return valid, results
+
+
+def _run_bulk(member_id: int, sql: str, params: Dict[str, Any]):
+    """한 트랜잭션으로 실행하고 RETURNING 행을 돌려줌 (실패 시 롤백 후 예외)"""
+    conn = get_recom_db_connection()
+    if not conn:
+        raise RuntimeError("DB Connection Failed")
+    cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+    try:
+        cur.execute(sql, {"member_id": member_id, **params})
+        rows = cur.fetchall()
+        conn.commit()
+        return rows
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+        release_recom_db_connection(conn)
+
+
+def _bulk_response(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    summary: Dict[str, int] = {}
+    for r in results:
+        summary[r["result"]] = summary.get(r["result"], 0) + 1
+    return {"status": "success", "results": results, "summary": summary}
+
+
+def _bulk_failed(results, order: List[int], message: str) -> Dict[str, Any]:
+    # 트랜잭션이 롤백되었으므로 적용 대상이던 항목은 모두 error
+    failed = [
+        r if r is not None else {"perfume_id": pid, "result": "error"}
+        for r, pid in zip(results, order)
+    ]
+    return {"status": "error", "message": message, "results": failed}
+
+
+def bulk_add_my_perfumes(member_id: int, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    여러 향수를 한 번에 등록/갱신 (add_my_perfume_logic의 일괄 버전)
+
+    항목별 결과: created | updated | duplicate(같은 요청 안의 뒤 항목이 반영됨) | invalid
+    """
+    valid, results = _validate_bulk_items(items, require_name=True)
+    order = [item.get("perfume_id") for item in items]
+    if valid:
+        ids = list(valid)
+        try:
+            rows = _run_bulk(member_id, BULK_UPSERT_SQL, {
+                "ids": ids,
+                "names": [valid[i]["perfume_name"] for i in ids],
+                "statuses": [valid[i]["register_status"] for i in ids],
+                "preferences": [valid[i]["preference"] or "NEUTRAL" for i in ids],
+            })
+        except Exception as e:
+            return _bulk_failed(results, order, str(e))
+        inserted = {row["perfume_id"]: row["inserted"] for row in rows}
+        invalidate_personalization(member_id)
+        for index, pid in enumerate(order):
+            if results[index] is None:
+                results[index] = {"perfume_id": pid, "result": "created" if inserted.get(pid) else "updated"}
+    return _bulk_response(results)
+
+
+def bulk_update_my_perfumes(member_id: int, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    여러 향수의 상태/선호를 한 번에 변경 (update_my_perfume_logic의 일괄 버전)
+
+    항목별 결과: updated | not_found | duplicate | invalid
+    """
+    valid, results = _validate_bulk_items(items, require_name=False)
+    order = [item.get("perfume_id") for item in items]
+    if valid:
+        ids = list(valid)
+        try:
+            rows = _run_bulk(member_id, BULK_UPDATE_SQL, {
+                "ids": ids,
+                "statuses": [valid[i]["register_status"] for i in ids],
+                "preferences": [valid[i]["preference"] for i in ids],
+            })
+        except Exception as e:
+            return _bulk_failed(results, order, str(e))
+        updated = {row["perfume_id"] for row in rows}
+        if updated:
+            invalidate_personalization(member_id)
+        for index, pid in enumerate(order):
+            if results[index] is None:
+                results[index] = {"perfume_id": pid, "result": "updated" if pid in updated else "not_found"}
+    return _bulk_response(results)
+
+
+def bulk_delete_my_perfumes(member_id: int, perfume_ids: List[int]) -> Dict[str, Any]:
+    """
+    여러 향수를 한 번에 삭제 (delete_my_perfume_logic의 일괄 버전)
+
+    항목별 결과: deleted | not_found | duplicate
+    """
+    ids = list(dict.fromkeys(perfume_ids))
+    if not ids:
+        return _bulk_response([])
+    try:
+        rows = _run_bulk(member_id, BULK_DELETE_SQL, {"ids": ids})
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": str(e),
+            "results": [{"perfume_id": pid, "result": "error"} for pid in perfume_ids],
+        }
+    deleted = {row["perfume_id"] for row in rows}
+    if deleted:
+        invalidate_personalization(member_id)
+    seen = set()
+    results = []
+    for pid in perfume_ids:
+        if pid in seen:
+            results.append({"perfume_id": pid, "result": "duplicate"})
+            continue
+        seen.add(pid)
+        results.append({"perfume_id": pid, "result": "deleted" if pid in deleted else "not_found"})
+    return _bulk_response(results)
+
+
+# 향수별 노트/어코드를 한 번의 왕복으로 묶어 조회 (노트는 TOP/MIDDLE/BASE 중복 제거)
+NOTES_AND_ACCORDS_SQL = """
+    WITH ids AS (
+        SELECT DISTINCT unnest(%(ids)s::int[]) AS perfume_id
+    ),
+    accords AS (
+        SELECT a.perfume_id, array_agg(DISTINCT a.accord) AS accords
+        FROM TB_PERFUME_ACCORD_R a
+        JOIN ids USING (perfume_id)
+        WHERE a.accord IS NOT NULL
+        GROUP BY a.perfume_id
+    ),
+    notes AS (
+        SELECT n.perfume_id, array_agg(DISTINCT n.note) AS notes
+        FROM TB_PERFUME_NOTES_M n
+        JOIN ids USING (perfume_id)
+        WHERE n.note IS NOT NULL
+        GROUP BY n.perfume_id
+    )
+    SELECT ids.perfume_id, accords.accords, notes.notes
+    FROM ids
+    LEFT JOIN accords USING (perfume_id)
+    LEFT JOIN notes USING (perfume_id)
+"""
+
+
+def _ordered_unique(values: Optional[List[str]]) -> List[str]:
+    """순서를 유지하는 중복 제거 (dict 키 = 삽입 순서 집합, O(n))"""
+    return list(dict.fromkeys(v for v in values or () if v))
+
+
+def aggregate_notes_and_accords(perfume_ids: List[int], rows: List[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+    """
+    NOTES_AND_ACCORDS_SQL 결과 행 → {perfume_id: {notes, accords}}
+
+    요청한 ID는 행이 없어도 빈 목록으로 채웁니다.
+    """
+    result = {pid: {"notes": [], "accords": []} for pid in perfume_ids}
+    for row in rows:
+        pid = row['perfume_id']
+        if pid in result:
+            result[pid] = {
+                "notes": _ordered_unique(row.get('notes')),
+                "accords": _ordered_unique(row.get('accords')),
+            }
+    return result
+
+
 def get_perfume_notes_and_accords(perfume_ids: List[int]) -> Dict[int, Dict[str, Any]]:
     """
     Get notes and accords for a list of perfume IDs.
@@ -163,7 +419,7 @@ def get_perfume_notes_and_accords(perfume_ids: List[int]) -> Dict[int, Dict[str,
         Dictionary mapping perfume_id to {notes: List[str], accords: List[str]}
         Example: {
             123: {
-                "notes": ["Rose", "Vanilla", "Sandalwood"],
+                "notes": ["Rose", "Sandalwood", "Vanilla"],
                 "accords": ["Floral", "Woody"]
             }
         }
@@ -175,49 +431,15 @@ def get_perfume_notes_and_accords(perfume_ids: List[int]) -> Dict[int, Dict[str,
     if not conn:
         return {}
     
-    result = {}
-    
     try:
         with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
-            # Fetch accords
-            fmt = ','.join(['%s'] * len(perfume_ids))
-            cur.execute(f"""
-                SELECT perfume_id, accord
-                FROM TB_PERFUME_ACCORD_R
-                WHERE perfume_id IN ({fmt}) AND accord IS NOT NULL
-            """, tuple(perfume_ids))
-            accords_rows = cur.fetchall()
-            
-            # Fetch notes (all types: TOP, MIDDLE, BASE)
-            cur.execute(f"""
-                SELECT perfume_id, note
-                FROM TB_PERFUME_NOTES_M
-                WHERE perfume_id IN ({fmt}) AND note IS NOT NULL
-            """, tuple(perfume_ids))
-            notes_rows = cur.fetchall()
-            
-            # Build result dictionary
-            for pid in perfume_ids:
-                result[pid] = {"notes": [], "accords": []}
-            
-            # Populate accords
-            for row in accords_rows:
-                pid = row['perfume_id']
-                accord = row['accord']
-                if pid in result and accord and accord not in result[pid]["accords"]:
-                    result[pid]["accords"].append(accord)
-            
-            # Populate notes (deduplicated across TOP/MIDDLE/BASE)
-            for row in notes_rows:
-                pid = row['perfume_id']
-                note = row['note']
-                if pid in result and note and note not in result[pid]["notes"]:
-                    result[pid]["notes"].append(note)
-    
+            # 노트(TOP/MIDDLE/BASE)와 어코드를 향수별 배열로 한 번에 조회
+            cur.execute(NOTES_AND_ACCORDS_SQL, {"ids": list(perfume_ids)})
+            rows = cur.fetchall()
     except Exception as e:
         print(f"Error fetching notes/accords: {e}")
         return {}
     finally:
         release_db_connection(conn)
     
-    return result
+    return aggregate_notes_and_accords(perfume_ids, rows)
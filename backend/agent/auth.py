@@ -2,12 +2,18 @@
 # backend/agent/auth.py "BFF -> Backend 요청 검증 + JWT 토큰 발급"
 # ============================================================================
 
+import hashlib
 import os
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from fastapi import Header, HTTPException, Request
-from typing import Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 from jose import jwt, JWTError
 
+from .metrics import metrics
+
 @dataclass
 class RequestIdentity:
     user_id: Optional[int]
@@ -27,7 +33,95 @@ def _decode_jwt(token: str):
     algorithm = os.getenv("ALGORITHM", "HS256")
     if not secret:
         raise HTTPException(status_code=500, detail="SECRET_KEY is missing")
-    return jwt.decode(token, secret, algorithms=[algorithm])
+    if not is_identity_cache_enabled():
+        return jwt.decode(token, secret, algorithms=[algorithm])
+
+    version = _secret_version(secret, algorithm)
+    claims = IDENTITY_CACHE.get(version, token)
+    if claims is not None:
+        return claims
+    # 검증 실패(서명 불일치/만료/형식 오류)는 예외로 빠져나가므로 캐시에 남지 않음
+    claims = jwt.decode(token, secret, algorithms=[algorithm])
+    IDENTITY_CACHE.put(version, token, claims)
+    return dict(claims)
+
+# ==========================================
+# 검증된 JWT 클레임 캐시
+# ==========================================
+# /chat SSE, 아카이브/프로필 호출마다 같은 토큰의 서명을 다시 검증하지 않도록
+# 토큰 해시 -> 검증된 클레임을 토큰의 exp까지 보관합니다 (LRU, 개수 제한).
+# - 키에 비밀키 버전(SECRET_KEY + ALGORITHM 지문)을 포함: 키를 교체하면 이전 항목은 다시 맞지 않고,
+#   버전이 바뀐 것을 처음 본 순간 캐시를 비움
+# - 검증에 성공한 토큰만 저장 (실패는 절대 캐시하지 않음), exp가 없는 토큰은 저장하지 않음
+# 메트릭: auth_identity_cache_total{result=hit|miss|expired}
+
+def _secret_version(secret: str, algorithm: str) -> str:
+    return hashlib.sha256(f"{algorithm}:{secret}".encode()).hexdigest()[:16]
+
+class IdentityCache:
+    """
+    Args:
+        max_entries: LRU로 보관할 최대 토큰 수
+        clock: 테스트용 시계 (exp와 비교하므로 epoch 초)
+    """
+
+    def __init__(self, max_entries: int = 4096, clock: Callable[[], float] = time.time) -> None:
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _token_hash(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, version: str, token: str) -> Optional[Dict[str, Any]]:
+        key = (version, self._token_hash(token))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                metrics.inc("auth_identity_cache_total", result="miss")
+                return None
+            expires_at, claims = entry
+            if self._clock() >= expires_at:
+                del self._entries[key]
+                metrics.inc("auth_identity_cache_total", result="expired")
+                return None
+            self._entries.move_to_end(key)
+        metrics.inc("auth_identity_cache_total", result="hit")
+        return dict(claims)
+
+    def put(self, version: str, token: str, claims: Dict[str, Any]) -> bool:
+        """exp가 없거나 이미 지난 토큰은 저장하지 않고 False"""
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)) or isinstance(exp, bool) or self._clock() >= exp:
+            return False
+        key = (version, self._token_hash(token))
+        with self._lock:
+            if self._version != version:
+                # 키 교체: 이전 버전 항목은 다시 조회될 일이 없으므로 정리
+                self._entries.clear()
+                self._version = version
+            self._entries[key] = (float(exp), dict(claims))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._version = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+def is_identity_cache_enabled() -> bool:
+    value = os.getenv("AUTH_IDENTITY_CACHE_ENABLED", "true").strip().lower()
+    return value not in ("0", "false", "no", "off")
+
+IDENTITY_CACHE = IdentityCache(max_entries=int(os.getenv("AUTH_IDENTITY_CACHE_SIZE", "4096")))
 
 def get_identity(
     request: Request,
@@ -0,0 +1,255 @@
+"""
+OpenAI/임베딩 호출 서킷 브레이커 (Circuit Breaker)
+
+OpenAI API가 느려지거나 장애가 나면 브랜드 매칭, 리랭크 번역/임베딩, 전략 라벨,
+정보 그래프 노드가 각자 타임아웃까지 기다리느라 한 턴이 한없이 길어집니다.
+(모델, 작업) 단위로 브레이커를 두고, 열려 있으면 호출하지 않고 기존 로컬 폴백을 바로 씁니다.
+
+- CLOSED: 정상 호출. 업스트림 오류가 failure_threshold번 연속 나면 OPEN
+- OPEN: 호출하지 않고 CircuitOpenError (open_seconds 동안)
+- HALF_OPEN: open_seconds가 지나면 half_open_max_calls개의 probe 호출만 허용
+             probe 성공 → CLOSED, 실패 → 다시 OPEN
+- 오류 판정은 model_health.is_upstream_error와 같은 기준 (타임아웃/연결/429/5xx)입니다.
+  응답은 왔지만 파싱에 실패한 경우 등은 성공으로 봅니다.
+
+브레이커는 스레드풀에서 도는 동기 경로(match_brand_name, get_embedding 등)에서도 쓰이므로
+상태 전이(실패 카운트, probe 자리)와 레지스트리의 get-or-create는 락 안에서 처리합니다.
+
+상태는 /health 응답의 circuits 항목으로 확인할 수 있습니다.
+메트릭: circuit_breaker_state{breaker}, circuit_breaker_transitions_total{breaker,to},
+        circuit_breaker_rejected_total{breaker}
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from .metrics import metrics
+from .model_health import is_upstream_error
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+_STATE_GAUGE = {CircuitState.CLOSED: 0, CircuitState.OPEN: 1, CircuitState.HALF_OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """브레이커가 열려 있어 호출하지 않았음을 나타냅니다."""
+
+    def __init__(self, name: str) -> None:
+        super().__init__(f"circuit open: {name}")
+        self.name = name
+
+
+@dataclass(frozen=True)
+class BreakerPolicy:
+    failure_threshold: int = 5
+    open_seconds: float = 30.0
+    half_open_max_calls: int = 1
+
+
+class CircuitBreaker:
+    """
+    Args:
+        name: "모델:작업" 형식의 이름 (메트릭 라벨)
+        policy: 열림/복귀 기준
+        clock: 테스트용 시계
+        enabled: False면 항상 호출을 허용하고 기록하지 않음
+    """
+
+    def __init__(
+        self,
+        name: str,
+        policy: BreakerPolicy,
+        clock: Callable[[], float] = time.monotonic,
+        enabled: bool = True,
+    ) -> None:
+        self.name = name
+        self.policy = policy
+        self.enabled = enabled
+        self._clock = clock
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        # state 프로퍼티가 전이를 일으킬 수 있어 같은 스레드에서 다시 잡을 수 있도록 RLock
+        self._lock = threading.RLock()
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            if (
+                self._state is CircuitState.OPEN
+                and self._clock() - self._opened_at >= self.policy.open_seconds
+            ):
+                self._transition(CircuitState.HALF_OPEN)
+            return self._state
+
+    def is_open(self) -> bool:
+        """지금 호출하면 거절되는지 (probe 자리를 차지하지 않고 확인만)"""
+        if not self.enabled:
+            return False
+        with self._lock:
+            state = self.state
+            if state is CircuitState.OPEN:
+                return True
+            return state is CircuitState.HALF_OPEN and self._probes >= self.policy.half_open_max_calls
+
+    def allow(self) -> bool:
+        """호출 허용 여부. HALF_OPEN이면 probe 자리를 하나 차지합니다."""
+        if not self.enabled:
+            return True
+        with self._lock:
+            state = self.state
+            if state is CircuitState.CLOSED:
+                return True
+            if state is CircuitState.HALF_OPEN and self._probes < self.policy.half_open_max_calls:
+                self._probes += 1
+                return True
+        metrics.inc("circuit_breaker_rejected_total", breaker=self.name)
+        return False
+
+    def record_success(self) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._state is CircuitState.HALF_OPEN:
+                self._transition(CircuitState.CLOSED)
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._state is CircuitState.HALF_OPEN:
+                self._transition(CircuitState.OPEN)
+                return
+            if self._state is CircuitState.OPEN:
+                return
+            self._failures += 1
+            if self._failures >= self.policy.failure_threshold:
+                self._transition(CircuitState.OPEN)
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        """
+        with breaker.guard():
+            response = await client.chat.completions.create(...)
+
+        열려 있으면 CircuitOpenError를 던지고, 블록 결과(업스트림 오류 여부)를 기록합니다.
+        동기/비동기 코드 모두에서 쓸 수 있습니다. (진입/종료 시점에 await 없음)
+        """
+        if not self.allow():
+            raise CircuitOpenError(self.name)
+        try:
+            yield
+        except Exception as error:
+            if is_upstream_error(error):
+                self.record_failure()
+            else:
+                self.record_success()
+            raise
+        except BaseException:
+            # 취소 등: 결과를 알 수 없으므로 probe 자리만 돌려줌
+            self._release_probe()
+            raise
+        else:
+            self.record_success()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            state = self.state
+            return {
+                "state": state.value,
+                "consecutive_failures": self._failures,
+                "open_for_seconds": round(self._clock() - self._opened_at, 1)
+                if state is CircuitState.OPEN
+                else 0.0,
+            }
+
+    # ------------------------------------------------------------------
+
+    def _release_probe(self) -> None:
+        with self._lock:
+            if self._state is CircuitState.HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def _transition(self, to: CircuitState) -> None:
+        # 호출자가 self._lock을 잡은 상태
+        self._state = to
+        self._probes = 0
+        if to is CircuitState.OPEN:
+            self._opened_at = self._clock()
+        if to is CircuitState.CLOSED:
+            self._failures = 0
+        metrics.set_gauge("circuit_breaker_state", _STATE_GAUGE[to], breaker=self.name)
+        metrics.inc("circuit_breaker_transitions_total", breaker=self.name, to=to.value)
+        print(f"   🔌 [Circuit] {self.name} → {to.value}", flush=True)
+
+
+class CircuitBreakerRegistry:
+    """(모델, 작업)별 브레이커를 처음 쓸 때 만들어 공유합니다."""
+
+    def __init__(
+        self,
+        policy: Optional[BreakerPolicy] = None,
+        clock: Callable[[], float] = time.monotonic,
+        enabled: bool = True,
+    ) -> None:
+        self.policy = policy or BreakerPolicy()
+        self.enabled = enabled
+        self._clock = clock
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, model: str, operation: str) -> CircuitBreaker:
+        name = f"{model}:{operation}"
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = CircuitBreaker(name, self.policy, clock=self._clock, enabled=self.enabled)
+                self._breakers[name] = breaker
+            return breaker
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            breakers = sorted(self._breakers.items())
+        return {name: breaker.snapshot() for name, breaker in breakers}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._breakers.clear()
+
+
+def model_name_of(llm: Any) -> str:
+    """ChatOpenAI 인스턴스의 모델명 (테스트 더블 등 모델명이 없으면 'default')"""
+    name = getattr(llm, "model_name", None)
+    return name if isinstance(name, str) and name else "default"
+
+
+def build_default_registry() -> CircuitBreakerRegistry:
+    enabled = os.getenv("CIRCUIT_BREAKER_ENABLED", "true").strip().lower() not in (
+        "0",
+        "false",
+        "no",
+        "off",
+    )
+    return CircuitBreakerRegistry(
+        BreakerPolicy(
+            failure_threshold=int(os.getenv("CIRCUIT_BREAKER_FAILURE_THRESHOLD", "5")),
+            open_seconds=float(os.getenv("CIRCUIT_BREAKER_OPEN_SECONDS", "30")),
+            half_open_max_calls=int(os.getenv("CIRCUIT_BREAKER_HALF_OPEN_CALLS", "1")),
+        ),
+        enabled=enabled,
+    )
+
+
+CIRCUIT_BREAKERS = build_default_registry()
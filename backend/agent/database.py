@@ -10,6 +10,15 @@ from psycopg2.extras import RealDictCursor
 from dotenv import load_dotenv
 from openai import OpenAI, AsyncOpenAI  # [최적화] 비동기 클라이언트 추가
 
+from .circuit_breaker import CIRCUIT_BREAKERS, CircuitOpenError
+from .llm_cassette import async_http_client, sync_http_client
+from .profile_cache import invalidate_personalization
+from .deadline import (
+    TRANSLATION_RESERVE_SECONDS,
+    allow_optional_stage,
+    remaining_timeout,
+)
+
 # 오탈자 보정 라이브러리
 try:
     from Levenshtein import distance
@@ -52,8 +61,18 @@ MEMBER_DB_CONFIG = {
 member_db_pool = pool.ThreadedConnectionPool(1, 20, **MEMBER_DB_CONFIG)
 
 # [최적화] 동기/비동기 OpenAI 클라이언트 이원화
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-async_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# (LLM_CASSETTE_MODE가 켜져 있으면 요청/응답을 카세트에 녹화하거나 카세트에서 재생)
+client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=sync_http_client())
+async_client = AsyncOpenAI(
+    api_key=os.getenv("OPENAI_API_KEY"), http_client=async_http_client()
+)
+
+# 서킷 브레이커 키로 쓰는 모델명
+EMBEDDING_MODEL = "text-embedding-3-small"
+HELPER_MODEL = "gpt-4o-mini"
+
+# 리랭크 번역 LLM 기본 타임아웃(초) — 요청 마감 시간이 더 가까우면 그만큼 줄어듦
+RERANK_TRANSLATION_TIMEOUT = float(os.getenv("RERANK_TRANSLATION_TIMEOUT_SECONDS", "10"))
 
 BRAND_CACHE = []
 
@@ -88,10 +107,13 @@ async def get_embedding_async(text: str) -> List[float]:
     try:
         if not text:
             return []
-        response = await async_client.embeddings.create(
-            input=text.replace("\n", " "), model="text-embedding-3-small"
-        )
+        with CIRCUIT_BREAKERS.get(EMBEDDING_MODEL, "embedding").guard():
+            response = await async_client.embeddings.create(
+                input=text.replace("\n", " "), model=EMBEDDING_MODEL
+            )
         return response.data[0].embedding
+    except CircuitOpenError:
+        return []
     except Exception as e:
         print(f"⚠️ Embedding Error: {e}")
         return []
@@ -102,13 +124,13 @@ def get_embedding(text: str) -> List[float]:
     try:
         if not text:
             return []
-        return (
-            client.embeddings.create(
-                input=text.replace("\n", " "), model="text-embedding-3-small"
+        with CIRCUIT_BREAKERS.get(EMBEDDING_MODEL, "embedding").guard():
+            response = client.embeddings.create(
+                input=text.replace("\n", " "), model=EMBEDDING_MODEL
             )
-            .data[0]
-            .embedding
-        )
+        return response.data[0].embedding
+    except CircuitOpenError:
+        return []
     except Exception as e:
         print(f"⚠️ Sync Embedding Error: {e}")
         return []
@@ -141,22 +163,24 @@ def match_brand_name(user_input: str) -> str:
         if b.lower() == user_input.lower():
             return b
 
+    # 브레이커가 열려 있으면 LLM 없이 정확 일치 결과(입력 그대로)만 사용
     try:
         brands_str = ", ".join(all_brands)
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a Brand Matcher. Return ONLY the exact brand name or 'None'.",
-                },
-                {
-                    "role": "user",
-                    "content": f"List: [{brands_str}]\nInput: {user_input}",
-                },
-            ],
-            temperature=0,
-        )
+        with CIRCUIT_BREAKERS.get(HELPER_MODEL, "brand_match").guard():
+            response = client.chat.completions.create(
+                model=HELPER_MODEL,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You are a Brand Matcher. Return ONLY the exact brand name or 'None'.",
+                    },
+                    {
+                        "role": "user",
+                        "content": f"List: [{brands_str}]\nInput: {user_input}",
+                    },
+                ],
+                temperature=0,
+            )
         matched = response.choices[0].message.content.strip()
         if matched and matched != "None" and matched in all_brands:
             return matched
@@ -187,6 +211,36 @@ def fetch_meta_data() -> Dict[str, str]:
     return meta
 
 
+def fetch_gazetteer_terms() -> Dict[str, List[str]]:
+    """
+    로컬 의도 라우터용 이름 사전(브랜드/향수명/한글명/노트)을 조회합니다.
+    """
+    conn = get_db_connection()
+    cur = conn.cursor()
+    try:
+        terms: Dict[str, List[str]] = {"brand": get_all_brands()}
+        cur.execute(
+            """
+            SELECT p.perfume_name, n.name_kr
+            FROM TB_PERFUME_BASIC_M p
+            LEFT JOIN TB_PERFUME_NAME_KR n ON p.perfume_id = n.perfume_id
+            """
+        )
+        perfumes = set()
+        for name, name_kr in cur.fetchall():
+            if name:
+                perfumes.add(name)
+            if name_kr:
+                perfumes.add(name_kr)
+        terms["perfume"] = sorted(perfumes)
+        cur.execute("SELECT DISTINCT note FROM TB_PERFUME_NOTES_M")
+        terms["note"] = [r[0] for r in cur.fetchall() if r[0]]
+        return terms
+    finally:
+        cur.close()
+        release_db_connection(conn)
+
+
 # ==========================================
 # 2. 검색 엔진 (Connection Pool 적용)
 # ==========================================
@@ -298,6 +352,18 @@ def search_perfumes(
 # ==========================================
 # 3. 비동기 리랭킹 엔진
 # ==========================================
+def _fetch_rerank_rows(sql: str, params: List[Any]) -> List[Dict[str, Any]]:
+    """리랭크 점수 조회 1회: 커넥션을 쿼리 동안만 빌리고 바로 반납"""
+    conn = get_db_connection()
+    cur = conn.cursor(cursor_factory=RealDictCursor)
+    try:
+        cur.execute(sql, params)
+        return cur.fetchall()
+    finally:
+        cur.close()
+        release_db_connection(conn)
+
+
 async def rerank_perfumes_async(
     candidates: List[Dict[str, Any]],
     query_text: str,
@@ -307,87 +373,98 @@ async def rerank_perfumes_async(
     if not candidates or not query_text:
         return candidates[:top_k]
 
-    conn = get_db_connection()
-    cur = conn.cursor(cursor_factory=RealDictCursor)
-    try:
-        # [Task D2] Popularity Ranking
-        if rank_mode == "POPULAR":
-            candidate_ids = [p["id"] for p in candidates]
-            if not candidate_ids:
-                return []
-
-            # Query vote counts (SUM of votes from TB_PERFUME_ACCORD_M)
-            # Using placeholders for array of IDs
-            placeholders = ",".join(["%s"] * len(candidate_ids))
-            sql = f"""
-                SELECT perfume_id, SUM(vote) as total_vote
-                FROM TB_PERFUME_ACCORD_M
-                WHERE perfume_id IN ({placeholders})
-                GROUP BY perfume_id
-            """
-            cur.execute(sql, candidate_ids)
-            vote_map = {
-                row["perfume_id"]: row["total_vote"] for row in cur.fetchall()
-            }
+    # 번역/임베딩 LLM 호출을 기다리는 동안 풀 커넥션을 잡고 있지 않도록
+    # 커넥션은 각 쿼리(_fetch_rerank_rows) 안에서만 빌립니다.
 
-            # Assign votes and Sort
-            for p in candidates:
-                p["review_score"] = vote_map.get(
-                    p["id"], 0
-                )  # Use review_score field for compatibility
-                p["best_review"] = (
-                    f"인기도(Vote): {p['review_score']}"  # Optional info
-                )
-
-            candidates.sort(key=lambda x: x.get("review_score", 0), reverse=True)
-            return candidates[:top_k]
-
-        # [Default] Semantic Reranking (비동기 번역 및 스타일링)
-        system_prompt = "You are a Perfume Data Analyst. Transform the Korean logic into a sensory description..."
-        translation = await async_client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": query_text},
-            ],
-            temperature=0,
-        )
-        stylized_query = translation.choices[0].message.content.strip()
-        query_vector = await get_embedding_async(stylized_query)
-        if not query_vector:
-            return candidates[:top_k]
+    # [Circuit] 번역/임베딩 브레이커가 열려 있으면 LLM 호출 없이 인기도 정렬로 대체
+    translation_breaker = CIRCUIT_BREAKERS.get(HELPER_MODEL, "rerank_translation")
+    embedding_breaker = CIRCUIT_BREAKERS.get(EMBEDDING_MODEL, "embedding")
+    if rank_mode != "POPULAR" and (
+        translation_breaker.is_open() or embedding_breaker.is_open()
+    ):
+        print("   🔌 [Rerank] OpenAI circuit open -> POPULAR rerank", flush=True)
+        rank_mode = "POPULAR"
 
+    # [Task D2] Popularity Ranking
+    if rank_mode == "POPULAR":
         candidate_ids = [p["id"] for p in candidates]
+        if not candidate_ids:
+            return []
+
+        # Query vote counts (SUM of votes from TB_PERFUME_ACCORD_M)
+        # Using placeholders for array of IDs
         placeholders = ",".join(["%s"] * len(candidate_ids))
         sql = f"""
-            SELECT m.perfume_id, MAX(1 - (e.embedding <=> %s::vector)) as similarity_score,
-            (ARRAY_AGG(m.content ORDER BY (e.embedding <=> %s::vector) ASC))[1] as best_review
-            FROM TB_PERFUME_REVIEW_M m
-            JOIN TB_REVIEW_EMBEDDING_M e ON m.review_id = e.review_id
-            WHERE m.perfume_id IN ({placeholders})
-            GROUP BY m.perfume_id
-            ORDER BY similarity_score DESC
+            SELECT perfume_id, SUM(vote) as total_vote
+            FROM TB_PERFUME_ACCORD_M
+            WHERE perfume_id IN ({placeholders})
+            GROUP BY perfume_id
         """
-        cur.execute(sql, [query_vector, query_vector] + candidate_ids)
-        scores = {row["perfume_id"]: row for row in cur.fetchall()}
+        vote_map = {
+            row["perfume_id"]: row["total_vote"]
+            for row in _fetch_rerank_rows(sql, candidate_ids)
+        }
 
-        reranked = []
+        # Assign votes and Sort
         for p in candidates:
-            sc = scores.get(
-                p["id"], {"similarity_score": 0, "best_review": "관련 리뷰 없음"}
+            p["review_score"] = vote_map.get(
+                p["id"], 0
+            )  # Use review_score field for compatibility
+            p["best_review"] = (
+                f"인기도(Vote): {p['review_score']}"  # Optional info
             )
-            p.update(
-                {
-                    "review_score": sc["similarity_score"],
-                    "best_review": sc["best_review"],
-                }
+
+        candidates.sort(key=lambda x: x.get("review_score", 0), reverse=True)
+        return candidates[:top_k]
+
+    # [Default] Semantic Reranking (비동기 번역 및 스타일링)
+    # [Deadline] 남은 예산이 부족하면 번역(선택 단계)을 건너뛰고 원문으로 임베딩
+    stylized_query = query_text
+    if allow_optional_stage("rerank_translation", TRANSLATION_RESERVE_SECONDS):
+        system_prompt = "You are a Perfume Data Analyst. Transform the Korean logic into a sensory description..."
+        with translation_breaker.guard():
+            translation = await async_client.chat.completions.create(
+                model=HELPER_MODEL,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": query_text},
+                ],
+                temperature=0,
+                timeout=remaining_timeout(RERANK_TRANSLATION_TIMEOUT),
             )
-            reranked.append(p)
-        reranked.sort(key=lambda x: x.get("review_score", 0), reverse=True)
-        return reranked[:top_k]
-    finally:
-        cur.close()
-        release_db_connection(conn)
+        stylized_query = translation.choices[0].message.content.strip()
+    query_vector = await get_embedding_async(stylized_query)
+    if not query_vector:
+        return candidates[:top_k]
+
+    candidate_ids = [p["id"] for p in candidates]
+    placeholders = ",".join(["%s"] * len(candidate_ids))
+    sql = f"""
+        SELECT m.perfume_id, MAX(1 - (e.embedding <=> %s::vector)) as similarity_score,
+        (ARRAY_AGG(m.content ORDER BY (e.embedding <=> %s::vector) ASC))[1] as best_review
+        FROM TB_PERFUME_REVIEW_M m
+        JOIN TB_REVIEW_EMBEDDING_M e ON m.review_id = e.review_id
+        WHERE m.perfume_id IN ({placeholders})
+        GROUP BY m.perfume_id
+        ORDER BY similarity_score DESC
+    """
+    rows = _fetch_rerank_rows(sql, [query_vector, query_vector] + candidate_ids)
+    scores = {row["perfume_id"]: row for row in rows}
+
+    reranked = []
+    for p in candidates:
+        sc = scores.get(
+            p["id"], {"similarity_score": 0, "best_review": "관련 리뷰 없음"}
+        )
+        p.update(
+            {
+                "review_score": sc["similarity_score"],
+                "best_review": sc["best_review"],
+            }
+        )
+        reranked.append(p)
+    reranked.sort(key=lambda x: x.get("review_score", 0), reverse=True)
+    return reranked[:top_k]
 
 
 # ==========================================
@@ -425,6 +502,7 @@ def add_my_perfume(member_id: int, perfume_id: int, perfume_name: str):
             (member_id, perfume_id, perfume_name),
         )
         conn.commit()
+        invalidate_personalization(member_id)
         return {"status": "success", "message": "향수가 저장되었습니다."}
     finally:
         cur.close()
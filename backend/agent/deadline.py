@@ -0,0 +1,187 @@
+"""
+요청 단위 마감 시간 전파 (Deadline Propagation)
+
+/chat 한 턴에는 전체 시간 예산이 없어서 검색 완화(relaxation), 리랭크 번역, 섹션 작성이
+각자 재시도하면 꼬리 지연이 수 분까지 늘어날 수 있습니다.
+
+- stream_generator가 턴 시작 시 마감 시각(deadline_at, epoch 초)을 정해 AgentState에 싣고
+  ContextVar로도 설정합니다. (그래프 노드 → 도구 → DB 헬퍼까지 같은 컨텍스트로 전달)
+- 노드/도구는 within_deadline()으로 자기 타임아웃을 남은 예산만큼 줄이고,
+  allow_optional_stage()로 시간이 부족하면 선택 단계(추가 완화 단계, 리랭크 번역)를 건너뜁니다.
+- 마감 때문에 끊긴 호출은 DeadlineExceeded로 구분합니다. (업스트림 장애로 집계하지 않음)
+
+메트릭: chat_deadline_exceeded_total{stage}, chat_deadline_skipped_total{stage}
+"""
+
+import asyncio
+import contextvars
+import os
+import time
+from contextlib import asynccontextmanager, contextmanager
+from functools import wraps
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator, Mapping, Optional
+
+from .metrics import metrics
+
+# 턴 전체 예산(초). 0이면 마감 시간 없이 동작 (기존 동작)
+CHAT_DEADLINE_SECONDS = float(os.getenv("CHAT_DEADLINE_SECONDS", "45"))
+# 남은 시간이 이보다 적으면 두 번째 이후 완화 검색을 건너뜀
+RELAXATION_RESERVE_SECONDS = float(os.getenv("DEADLINE_RELAXATION_RESERVE_SECONDS", "12"))
+# 남은 시간이 이보다 적으면 리랭크 번역 LLM을 건너뛰고 원문으로 임베딩
+TRANSLATION_RESERVE_SECONDS = float(os.getenv("DEADLINE_TRANSLATION_RESERVE_SECONDS", "10"))
+# 전략 준비(계획/검색)는 섹션 작성 시간을 이만큼 남기고 끝나야 함
+WRITER_RESERVE_SECONDS = float(os.getenv("DEADLINE_WRITER_RESERVE_SECONDS", "8"))
+
+
+class DeadlineExceeded(Exception):
+    """요청 마감 시간이 지나 단계가 중단되었음을 나타냅니다."""
+
+    def __init__(self, stage: str) -> None:
+        super().__init__(f"deadline exceeded during {stage}")
+        self.stage = stage
+
+
+class Deadline:
+    """
+    Args:
+        at: 마감 시각 (clock 기준, 기본은 epoch 초 — 체크포인트 state에 그대로 저장 가능)
+        clock: 테스트용 시계
+    """
+
+    __slots__ = ("at", "_clock")
+
+    def __init__(self, at: float, clock: Callable[[], float] = time.time) -> None:
+        self.at = at
+        self._clock = clock
+
+    @classmethod
+    def after(cls, seconds: float, clock: Callable[[], float] = time.time) -> "Deadline":
+        return cls(clock() + seconds, clock)
+
+    def remaining(self) -> float:
+        return max(0.0, self.at - self._clock())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+    def has_time_for(self, seconds: float) -> bool:
+        return self.remaining() >= seconds
+
+    def timeout(self, default: Optional[float] = None) -> float:
+        """기본 타임아웃을 남은 예산으로 줄입니다."""
+        remaining = self.remaining()
+        return remaining if default is None else min(default, remaining)
+
+    def reserve(self, seconds: float) -> "Deadline":
+        """뒤 단계 몫으로 seconds를 남겨 둔, 더 이른 마감 시간"""
+        return Deadline(self.at - seconds, self._clock)
+
+    def __repr__(self) -> str:
+        return f"Deadline(remaining={self.remaining():.2f}s)"
+
+
+_CURRENT: contextvars.ContextVar[Optional[Deadline]] = contextvars.ContextVar(
+    "chat_deadline", default=None
+)
+
+
+def new_request_deadline(seconds: Optional[float] = None) -> Optional[Deadline]:
+    """턴 시작 시 호출. 예산이 0 이하면 None (마감 없음)"""
+    budget = CHAT_DEADLINE_SECONDS if seconds is None else seconds
+    if budget <= 0:
+        return None
+    return Deadline.after(budget)
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _CURRENT.get()
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[Deadline]) -> Iterator[Optional[Deadline]]:
+    """이 블록(과 여기서 만든 Task)에서 current_deadline()이 deadline을 돌려주도록 설정"""
+    token = _CURRENT.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _CURRENT.reset(token)
+
+
+def deadline_from_state(state: Mapping[str, Any]) -> Optional[Deadline]:
+    """AgentState의 deadline_at을 우선 사용하고, 없으면 현재 컨텍스트의 마감 시간"""
+    deadline_at = state.get("deadline_at") if state else None
+    if deadline_at:
+        return Deadline(float(deadline_at))
+    return current_deadline()
+
+
+def with_state_deadline(node: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """
+    노드 데코레이터: state의 deadline_at을 노드 실행 동안 ContextVar로 설정합니다.
+    (노드 안에서 부르는 도구/DB 헬퍼가 state 없이도 마감 시간을 볼 수 있도록)
+    """
+
+    @wraps(node)
+    async def wrapper(state, *args, **kwargs):
+        with deadline_scope(deadline_from_state(state)):
+            return await node(state, *args, **kwargs)
+
+    return wrapper
+
+
+def remaining_timeout(default: Optional[float] = None) -> Optional[float]:
+    """현재 마감 시간 기준으로 줄인 타임아웃 (마감 없으면 default 그대로)"""
+    deadline = current_deadline()
+    if deadline is None:
+        return default
+    return deadline.timeout(default)
+
+
+def allow_optional_stage(stage: str, reserve_seconds: float) -> bool:
+    """
+    선택 단계를 실행해도 되는지 판단합니다.
+    남은 시간이 reserve_seconds보다 적으면 건너뛰고 chat_deadline_skipped_total을 올립니다.
+    """
+    deadline = current_deadline()
+    if deadline is None or deadline.has_time_for(reserve_seconds):
+        return True
+    metrics.inc("chat_deadline_skipped_total", stage=stage)
+    print(
+        f"   ⏱️ [Deadline] {stage} 건너뜀 (남은 시간 {deadline.remaining():.1f}s)",
+        flush=True,
+    )
+    return False
+
+
+@asynccontextmanager
+async def within_deadline(
+    stage: str,
+    default_timeout: Optional[float] = None,
+    deadline: Optional[Deadline] = None,
+) -> AsyncIterator[Optional[Deadline]]:
+    """
+    async with within_deadline("writer"):
+        ...
+
+    블록의 타임아웃을 min(default_timeout, 남은 예산)으로 제한합니다.
+    마감 때문에 끊기면 DeadlineExceeded, default_timeout 때문이면 TimeoutError를 던집니다.
+    """
+    deadline = deadline if deadline is not None else current_deadline()
+    if deadline is not None and deadline.expired():
+        metrics.inc("chat_deadline_exceeded_total", stage=stage)
+        raise DeadlineExceeded(stage)
+
+    budget = default_timeout if deadline is None else deadline.timeout(default_timeout)
+    bound_by_deadline = deadline is not None and (
+        default_timeout is None or budget < default_timeout
+    )
+    timeout_cm = asyncio.timeout(budget)
+    try:
+        async with timeout_cm:
+            yield deadline
+    except TimeoutError:
+        # 블록 안에서 난 TimeoutError(업스트림 타임아웃 등)는 그대로 전달
+        if not (bound_by_deadline and timeout_cm.expired()):
+            raise
+        metrics.inc("chat_deadline_exceeded_total", stage=stage)
+        raise DeadlineExceeded(stage) from None
@@ -1,9 +1,10 @@
 # backend/agent/graph.py
 import json
 import asyncio
+import os
 import random
 import uuid
-from typing import List, Dict, Any, Optional, Set
+from typing import List, Dict, Any, Optional, Set, Callable, Awaitable
 
 from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI  # type: ignore[reportMissingImports]
@@ -12,6 +13,7 @@ from langchain_core.messages import (  # type: ignore[reportMissingImports]
     AIMessage,
     HumanMessage,
 )
+from langchain_core.callbacks.manager import adispatch_custom_event  # type: ignore[reportMissingImports]
 from langgraph.graph import StateGraph, START, END  # type: ignore[reportMissingImports]
 from langgraph.checkpoint.memory import MemorySaver  # type: ignore[reportMissingImports]
 
@@ -52,7 +54,25 @@ from .database import save_recommendation_log, fetch_meta_data
 from .denylist import has_forbidden_words, UserFriendlyStrategyLabels
 
 from .followup_classifier import classify_followup
-from .personalization import get_personalization_summary
+from .speculative import is_speculation_enabled, run_speculative
+from .intent_router import route_locally
+from .slot_matcher import prefill_slots
+from .metrics import metrics
+from .strategy_labeler import BatchStrategyLabeler
+from .ordered_stream import OrderedStreamMultiplexer
+from .section_stream import SectionHeaderRewriter
+from .model_health import MODEL_DEGRADATION
+from .llm_cassette import async_http_client, sync_http_client
+from .circuit_breaker import CIRCUIT_BREAKERS, model_name_of
+from .deadline import (
+    WRITER_RESERVE_SECONDS,
+    Deadline,
+    DeadlineExceeded,
+    current_deadline,
+    with_state_deadline,
+    within_deadline,
+)
+from .personalization import aget_personalization_summary
 from .use_case_utils import infer_use_case
 
 # [정보 검색 전용 서브 그래프 임포트]
@@ -80,11 +100,16 @@ from .utils import (
 # ==========================================
 # 1. 모델 설정
 # ==========================================
-FAST_LLM = ChatOpenAI(model="gpt-4.1-mini", temperature=0, streaming=True)
-SMART_LLM = ChatOpenAI(model="gpt-4.1", temperature=0, streaming=True)
-SUPER_SMART_LLM = ChatOpenAI(model="gpt-5.2", temperature=0, streaming=True)
+# LLM_CASSETTE_MODE가 켜져 있으면 http 클라이언트가 요청/응답을 녹화·재생 (llm_cassette.py)
+_HTTP = {"http_client": sync_http_client(), "http_async_client": async_http_client()}
+
+FAST_LLM = ChatOpenAI(model="gpt-4.1-mini", temperature=0, streaming=True, **_HTTP)
+SMART_LLM = ChatOpenAI(model="gpt-4.1", temperature=0, streaming=True, **_HTTP)
+SUPER_SMART_LLM = ChatOpenAI(model="gpt-5.2", temperature=0, streaming=True, **_HTTP)
 # Non-streaming version for parallel_reco to prevent token interleaving
-SUPER_SMART_LLM_NO_STREAM = ChatOpenAI(model="gpt-5.2", temperature=0, streaming=False)
+SUPER_SMART_LLM_NO_STREAM = ChatOpenAI(
+    model="gpt-5.2", temperature=0, streaming=False, **_HTTP
+)
 
 
 # ==========================================
@@ -158,6 +183,7 @@ async def smart_search_with_retry_async(
     )
 
 
+@with_state_deadline
 async def call_info_graph_wrapper(state: AgentState):
     """Sub-Graph Wrapper"""
     current_query = state.get("user_query", "")
@@ -205,18 +231,17 @@ async def call_info_graph_wrapper(state: AgentState):
 # ==========================================
 
 
-def pre_validator_node(state: AgentState):
-    """
-    [Pre-Validator] 요청 실현 가능성 사전 검증.
-    DB에 없는 속성 요청을 조기 차단합니다.
-    """
-    print("\n" + "=" * 60, flush=True)
-    print("🔍 [Pre-Validator] 요청 가능 여부 검증 중...", flush=True)
-
+async def _validate_request(state: AgentState) -> Dict[str, Any]:
+    """PRE_VALIDATOR 판정만 수행합니다. (실패 시 지원 가능으로 처리)"""
     messages = [SystemMessage(content=PRE_VALIDATOR_PROMPT)] + state["messages"]
 
     try:
-        result = SMART_LLM.with_structured_output(ValidationResult).invoke(messages)
+        router_llm, is_primary = MODEL_DEGRADATION.choose("router", SMART_LLM, FAST_LLM)
+        async with within_deadline("pre_validator"):
+            async with MODEL_DEGRADATION.track("router", is_primary):
+                result = await router_llm.with_structured_output(
+                    ValidationResult
+                ).ainvoke(messages)
 
         if result.is_unsupported:
             print(
@@ -237,7 +262,71 @@ def pre_validator_node(state: AgentState):
         return {"validation_result": "supported"}
 
 
-def supervisor_node(state: AgentState):
+def _latest_user_query(state: AgentState) -> str:
+    for message in reversed(state.get("messages") or []):
+        if isinstance(message, HumanMessage):
+            return message.content
+    return state.get("user_query", "")
+
+
+async def _route_request(state: AgentState) -> Dict[str, Any]:
+    """SUPERVISOR 의도 분류만 수행합니다. (실패 시 writer)"""
+    # [Fast-Path] 의도가 명확하면 LLM 없이 로컬 라우터로 결정
+    local = await route_locally(
+        _latest_user_query(state),
+        {"user_preferences": state.get("user_preferences")},
+    )
+    if local.decided:
+        print(
+            f"   ⚡ 로컬 라우팅({local.source}, {local.confidence:.2f}): {local.reason}",
+            flush=True,
+        )
+        return {"next_step": local.next_step}
+
+    messages = [SystemMessage(content=SUPERVISOR_PROMPT)] + state["messages"]
+
+    try:
+        router_llm, is_primary = MODEL_DEGRADATION.choose("router", SMART_LLM, FAST_LLM)
+        async with within_deadline("supervisor"):
+            async with MODEL_DEGRADATION.track("router", is_primary):
+                decision = await router_llm.with_structured_output(
+                    RoutingDecision
+                ).ainvoke(messages)
+        return {"next_step": decision.next_step}
+
+    except Exception as e:
+        print(f"   ⚠️ 분류 실패(Error): {e} -> 기본값 Writer로 이동", flush=True)
+        return {"next_step": "writer"}
+
+
+@with_state_deadline
+async def pre_validator_node(state: AgentState):
+    """
+    [Pre-Validator] 요청 실현 가능성 사전 검증.
+    DB에 없는 속성 요청을 조기 차단합니다.
+
+    [Speculative] 인터뷰 중이 아니면 Supervisor 라우팅을 동시에 시작하고,
+    검증이 통과한 경우에만 그 결과를 speculative_next_step으로 넘깁니다.
+    """
+    print("\n" + "=" * 60, flush=True)
+    print("🔍 [Pre-Validator] 요청 가능 여부 검증 중...", flush=True)
+
+    if not is_speculation_enabled() or state.get("active_mode") == "interviewer":
+        validation = await _validate_request(state)
+        return {**validation, "speculative_next_step": None}
+
+    validation, routing = await run_speculative(
+        _validate_request(state),
+        _route_request(state),
+        accept=lambda result: result.get("validation_result") != "unsupported",
+        stage="supervisor_routing",
+    )
+    next_step = routing.get("next_step") if routing else None
+    return {**validation, "speculative_next_step": next_step}
+
+
+@with_state_deadline
+async def supervisor_node(state: AgentState):
     """[Main Router]"""
     print("\n" + "=" * 60, flush=True)
     print("👀 [Supervisor] 사용자 의도 분류 중...", flush=True)
@@ -246,20 +335,48 @@ def supervisor_node(state: AgentState):
         print("   👉 인터뷰 진행 중 -> Interviewer로 이동", flush=True)
         return {"next_step": "interviewer"}
 
-    messages = [SystemMessage(content=SUPERVISOR_PROMPT)] + state["messages"]
+    # Pre-Validator 단계에서 미리 계산된 라우팅 결과가 있으면 그대로 사용
+    next_step = state.get("speculative_next_step")
+    if next_step:
+        print(f"   👉 분류 결과(speculative): {next_step}", flush=True)
+        return {"next_step": next_step, "speculative_next_step": None}
 
-    try:
-        decision = SMART_LLM.with_structured_output(RoutingDecision).invoke(messages)
-        next_step = decision.next_step
-        print(f"   👉 분류 결과: {next_step}", flush=True)
-        return {"next_step": next_step}
+    decision = await _route_request(state)
+    print(f"   👉 분류 결과: {decision['next_step']}", flush=True)
+    return decision
 
+
+async def _run_interviewer_llm(
+    state: AgentState, current_prefs: Dict[str, Any], prefilled: Dict[str, Any]
+) -> InterviewResult:
+    """InterviewResult 추출 (사전 추출 슬롯은 참고 정보로 컨텍스트에 포함, 남은 마감 시간으로 제한)"""
+    # 현재 정보를 문자열로 변환
+    current_context_str = json.dumps(current_prefs, ensure_ascii=False)
+    if prefilled:
+        current_context_str += (
+            "\n[사전 추출된 단어 정보 (참고용, 대화 맥락이 우선)]: "
+            + json.dumps(prefilled, ensure_ascii=False)
+        )
+
+    # [★수정] 여기서 CURRENT_CONTEXT만 채워주면 됩니다! (SUFFICIENCY_CRITERIA는 이미 들어있음)
+    try:
+        formatted_prompt = INTERVIEWER_PROMPT.format(
+            CURRENT_CONTEXT=current_context_str
+        )
     except Exception as e:
-        print(f"   ⚠️ 분류 실패(Error): {e} -> 기본값 Writer로 이동", flush=True)
-        return {"next_step": "writer"}
+        # 혹시라도 포맷팅 에러가 나면 원본 프롬프트를 사용하여 멈추지 않게 함
+        print(f"⚠️ Prompt Formatting Error: {e}")
+        formatted_prompt = INTERVIEWER_PROMPT.replace(
+            "{{CURRENT_CONTEXT}}", "정보 없음"
+        )
+
+    messages = [SystemMessage(content=formatted_prompt)] + state["messages"]
+    async with within_deadline("interviewer"):
+        return await SMART_LLM.with_structured_output(InterviewResult).ainvoke(messages)
 
 
-def interviewer_node(state: AgentState):
+@with_state_deadline
+async def interviewer_node(state: AgentState):
     """[Interviewer]"""
     current_prefs = state.get("user_preferences") or {}
     if isinstance(current_prefs, UserPreferences):
@@ -306,28 +423,7 @@ def interviewer_node(state: AgentState):
             "recommended_history": state.get("recommended_history", []),
         }
 
-    # 현재 정보를 문자열로 변환
-    current_context_str = json.dumps(current_prefs, ensure_ascii=False)
-
-    # [★수정] 여기서 CURRENT_CONTEXT만 채워주면 됩니다! (SUFFICIENCY_CRITERIA는 이미 들어있음)
     try:
-        formatted_prompt = INTERVIEWER_PROMPT.format(
-            CURRENT_CONTEXT=current_context_str
-        )
-    except Exception as e:
-        # 혹시라도 포맷팅 에러가 나면 원본 프롬프트를 사용하여 멈추지 않게 함
-        print(f"⚠️ Prompt Formatting Error: {e}")
-        formatted_prompt = INTERVIEWER_PROMPT.replace(
-            "{{CURRENT_CONTEXT}}", "정보 없음"
-        )
-
-    messages = [SystemMessage(content=formatted_prompt)] + state["messages"]
-
-    try:
-        interview_result = SMART_LLM.with_structured_output(InterviewResult).invoke(
-            messages
-        )
-
         current_query = state.get("user_query", "")
         recent_messages = state.get("messages", [])[-5:]
         if not current_query and state.get("messages"):
@@ -341,6 +437,31 @@ def interviewer_node(state: AgentState):
             current_constraints=current_prefs,
         )
 
+        # [★추가] 슬롯 사전 추출 (사전 단어만으로 충분성 기준 충족 시 LLM 생략)
+        extraction = prefill_slots(current_query)
+        carried_prefs = {
+            slot: current_prefs[slot]
+            for slot in classification.keep_slots
+            if current_prefs.get(slot) is not None
+        }
+
+        if extraction.can_skip_llm(carried_prefs):
+            metrics.inc("slot_prefill_llm_skipped_total")
+            print(
+                f"      ⚡ [Prefill] 사전 추출로 정보 확보, Interviewer LLM 생략: {json.dumps(extraction.slots, ensure_ascii=False)}",
+                flush=True,
+            )
+            extracted_prefs = dict(extraction.slots)
+            is_sufficient = True
+            response_message = ""
+        else:
+            interview_result = await _run_interviewer_llm(state, current_prefs, extraction.slots)
+            extracted_prefs = interview_result.user_preferences.model_dump(
+                exclude_none=True
+            )
+            is_sufficient = interview_result.is_sufficient
+            response_message = interview_result.response_message
+
         # [★추가] 브랜드 제외 파싱 (세션 레벨 유지)
         session_exclude_brands = state.get("exclude_brands", [])
         current_exclude_brands, has_exclusion = parse_brand_exclusions(current_query)
@@ -396,8 +517,7 @@ def interviewer_node(state: AgentState):
             ):
                 merged_prefs[slot] = current_prefs[slot]
 
-        new_prefs = interview_result.user_preferences
-        for key, value in new_prefs.model_dump(exclude_none=True).items():
+        for key, value in extracted_prefs.items():
             merged_prefs[key] = value
 
         # [★추가] 브랜드 제외 처리
@@ -429,7 +549,7 @@ def interviewer_node(state: AgentState):
         else:
             state["is_count_explicit"] = False
 
-        if interview_result.is_sufficient:
+        if is_sufficient:
             print(
                 f"      ✅ [Handover] 정보 확보 완료! Researcher로 전달: {json.dumps(merged_prefs, ensure_ascii=False)}",
                 flush=True,
@@ -456,7 +576,7 @@ def interviewer_node(state: AgentState):
             }
 
         return {
-            "messages": [AIMessage(content=interview_result.response_message)],
+            "messages": [AIMessage(content=response_message)],
             "user_preferences": merged_prefs,
             "recommended_count": merged_prefs.get(
                 "recommended_count"
@@ -542,6 +662,8 @@ class RecoSearcher:
         batch_selected_ids: Set[int],
         brand_counts: Dict[str, int],
         search_fn: Any,
+        labeler: Optional[BatchStrategyLabeler] = None,
+        deadline: Optional[Deadline] = None,
     ) -> None:
         self.member_id = member_id
         self.user_prefs = user_prefs
@@ -553,6 +675,9 @@ class RecoSearcher:
         self.batch_selected_ids = batch_selected_ids
         self.brand_counts = brand_counts
         self.search_fn = search_fn
+        self.labeler = labeler
+        # 전략 준비(계획/검색/라벨) 마감 — 섹션 작성 몫을 남겨 둔 시각
+        self.deadline = deadline
         self.user_requested_brand = bool(
             user_prefs.get("brand") or user_prefs.get("reference_brand")
         )
@@ -568,6 +693,11 @@ class RecoSearcher:
         Returns:
             User-friendly label string
         """
+        # 브레이커가 열려 있으면 LLM 없이 안전 라벨 사용
+        breaker = CIRCUIT_BREAKERS.get(model_name_of(SMART_LLM), "strategy_label")
+        if breaker.is_open():
+            return random.choice(UserFriendlyStrategyLabels.SAFE_LABELS)
+
         user_prefs_str = json.dumps(self.user_prefs, ensure_ascii=False)
 
         label_messages = [
@@ -589,9 +719,10 @@ class RecoSearcher:
         ]
 
         try:
-            response = await SMART_LLM.ainvoke(
-                label_messages, config={"tags": ["internal_helper"]}
-            )
+            with breaker.guard():
+                response = await SMART_LLM.ainvoke(
+                    label_messages, config={"tags": ["internal_helper"]}
+                )
             user_label = response.content.strip()
 
             if not has_forbidden_words(user_label):
@@ -612,9 +743,10 @@ class RecoSearcher:
                 ),
             ]
 
-            retry_response = await SMART_LLM.ainvoke(
-                retry_messages, config={"tags": ["internal_helper"]}
-            )
+            with breaker.guard():
+                retry_response = await SMART_LLM.ainvoke(
+                    retry_messages, config={"tags": ["internal_helper"]}
+                )
             user_label = retry_response.content.strip()
 
             if not has_forbidden_words(user_label):
@@ -665,23 +797,24 @@ class RecoSearcher:
         query_text: str,
         rank_mode: str,
     ) -> Any:
-        try:
-            return await self.search_fn(
-                h_filters,
-                s_filters,
-                exclude_ids=exclude_ids,
-                query_text=query_text,
-                rank_mode=rank_mode,
-            )
-        except TypeError as e:
-            if "rank_mode" not in str(e):
-                raise
-            return await self.search_fn(
-                h_filters,
-                s_filters,
-                exclude_ids=exclude_ids,
-                query_text=query_text,
-            )
+        async with within_deadline("search", deadline=self.deadline):
+            try:
+                return await self.search_fn(
+                    h_filters,
+                    s_filters,
+                    exclude_ids=exclude_ids,
+                    query_text=query_text,
+                    rank_mode=rank_mode,
+                )
+            except TypeError as e:
+                if "rank_mode" not in str(e):
+                    raise
+                return await self.search_fn(
+                    h_filters,
+                    s_filters,
+                    exclude_ids=exclude_ids,
+                    query_text=query_text,
+                )
 
     async def prepare_strategy(
         self, strategy_name: str, priority: int, rank_mode: str
@@ -699,10 +832,13 @@ class RecoSearcher:
         ]
 
         try:
-            plan = await self.plan_llm.ainvoke(
-                plan_messages, config={"tags": ["internal_helper"]}
-            )
+            async with within_deadline("strategy_plan", deadline=self.deadline):
+                plan = await self.plan_llm.ainvoke(
+                    plan_messages, config={"tags": ["internal_helper"]}
+                )
         except Exception as e:
+            if self.labeler is not None:
+                self.labeler.withdraw(priority)
             return {
                 "error": True,
                 "error_type": "llm_error",
@@ -711,7 +847,12 @@ class RecoSearcher:
                 "priority": priority,
             }
 
-        user_label = await self.generate_user_label(plan.reason)
+        # 배치 라벨러가 있으면 라벨 생성을 검색과 겹쳐서 진행 (턴당 LLM 1회)
+        label_future = None
+        if self.labeler is not None:
+            label_future = self.labeler.request(priority, plan.reason)
+        else:
+            user_label = await self.generate_user_label(plan.reason)
 
         try:
             h_filters = plan.hard_filters.model_dump(exclude_none=True)
@@ -808,6 +949,14 @@ class RecoSearcher:
             reason=plan.reason,
         )
 
+        if label_future is not None:
+            try:
+                async with within_deadline("strategy_label", deadline=self.deadline):
+                    user_label = await label_future
+            except DeadlineExceeded:
+                # 라벨은 표시용이므로 시간이 없으면 안전 라벨로 대체
+                user_label = random.choice(UserFriendlyStrategyLabels.SAFE_LABELS)
+
         perfume_id = int(selected_perfume["id"])
         perfume_name = selected_perfume.get("name") or selected_perfume.get(
             "perfume_name"
@@ -912,7 +1061,17 @@ class RecoWriter:
         *,
         is_first: bool,
         is_last: bool,
+        on_chunk: Optional[Callable[[str], Awaitable[None]]] = None,
+        format_output: bool = True,
     ) -> Optional[str]:
+        """
+        섹션 하나를 작성합니다.
+
+        on_chunk가 주어지면 헤더 번호가 정리된 청크를 즉시 전달합니다.
+        format_output=False면 모델 출력을 그대로 전달합니다. (번호/도입부 정리는
+        OrderedStreamMultiplexer가 섹션이 선두가 될 때 표시 번호로 수행)
+        반환값은 전달한 청크를 모두 이어 붙인 최종 텍스트입니다.
+        """
         if not prepared_data:
             return None
 
@@ -935,6 +1094,8 @@ class RecoWriter:
             f"[마지막 섹션 여부]: {'예' if is_last else '아니오'}",
             (
                 f"[출력 규칙]: 도입부 포함이 '아니오'이면 첫 줄을 반드시 '## {display_priority}.'로 시작하고 도입부 문장을 쓰지 마세요."
+                if not is_first
+                else "[출력 규칙]: 도입부 포함이 '예'이면 섹션 번호와 관계없이 도입부를 먼저 쓰고 '##' 제목으로 이어가세요."
             ),
         ]
 
@@ -958,46 +1119,91 @@ class RecoWriter:
             + [HumanMessage(content="\n".join(content_parts))]
         )
 
+        # 헤더 줄만 버퍼링해 번호를 고치고, 이후 토큰은 바로 흘려보냄
+        rewriter = SectionHeaderRewriter(display_priority) if format_output else None
+        emitted: List[str] = []
+
+        def rewrite(text: str) -> str:
+            return rewriter.feed(text) if rewriter is not None else text
+
+        async def forward(text: str) -> None:
+            if not text:
+                return
+            emitted.append(text)
+            if on_chunk is not None:
+                await on_chunk(text)
+
+        # 업스트림 지연/오류가 임계치를 넘으면 FAST_LLM으로 강등 (첫 토큰 시간 기준)
+        writer_llm, is_primary = MODEL_DEGRADATION.choose("writer", SUPER_SMART_LLM, FAST_LLM)
         try:
-            result_text = ""
-            if hasattr(SUPER_SMART_LLM, "astream"):
-                async for chunk in SUPER_SMART_LLM.astream(messages):
-                    if chunk.content:
-                        result_text += chunk.content
-            else:
-                response = await SUPER_SMART_LLM.ainvoke(messages)
-                result_text = response.content or ""
-
-            if result_text:
-                header_index = result_text.find("##")
-                if display_priority != 1 and header_index > 0:
-                    result_text = result_text[header_index:]
-                if result_text.startswith("##"):
-                    lines = result_text.splitlines()
-                    header_line = lines[0]
-                    after = header_line[2:].lstrip()
-                    idx = 0
-                    while idx < len(after) and after[idx].isdigit():
-                        idx += 1
-                    if idx < len(after) and after[idx] == ".":
-                        idx += 1
-                    if idx < len(after) and after[idx] == " ":
-                        idx += 1
-                    rest = after[idx:]
-                    lines[0] = (
-                        f"## {display_priority}. {rest}"
-                        if rest
-                        else f"## {display_priority}."
-                    )
-                    result_text = "\n".join(lines)
-            if result_text and not result_text.rstrip().endswith("---"):
-                result_text = f"{result_text.rstrip()}\n---"
-            return result_text
+            async with within_deadline("writer"):
+                async with MODEL_DEGRADATION.track("writer", is_primary) as mark_first_token:
+                    if hasattr(writer_llm, "astream"):
+                        async for chunk in writer_llm.astream(messages):
+                            mark_first_token()
+                            if chunk.content:
+                                await forward(rewrite(chunk.content))
+                    else:
+                        response = await writer_llm.ainvoke(messages)
+                        await forward(rewrite(response.content or ""))
+            if rewriter is not None:
+                await forward(rewriter.finish())
+            return "".join(emitted)
+        except DeadlineExceeded:
+            # 이미 화면에 나간 부분까지만 결과로 남김 (최종 메시지와 스트림 일치)
+            logger.warning(f"Writer stopped at deadline (section {display_priority})")
+            return "".join(emitted) or None
         except Exception as e:
             logger.error(f"Writer error: {e}")
             return None
 
 
+# 섹션 작성 동시 실행 수 (1이면 기존 순차 작성과 동일)
+RECO_WRITER_CONCURRENCY = int(os.getenv("RECO_WRITER_CONCURRENCY", "3"))
+RECO_STREAM_EVENT = "reco_stream_chunk"
+
+# 마감 시간이 지나 대안 안내 LLM도 부를 수 없을 때의 고정 문구
+DEADLINE_FALLBACK_MESSAGE = (
+    "조건에 맞는 향수를 찾는 데 시간이 오래 걸리고 있어요. "
+    "조건을 조금 바꾸거나 잠시 후 다시 요청해 주세요. 🙏"
+)
+
+
+def _strategy_deadline(deadline: Optional[Deadline]) -> Optional[Deadline]:
+    """전략 준비 단계 마감: 전체 마감에서 섹션 작성 몫(WRITER_RESERVE_SECONDS)을 뺀 시각"""
+    if deadline is None:
+        return None
+    return deadline.reserve(WRITER_RESERVE_SECONDS)
+
+
+async def _invoke_failure_writer(messages: List[Any]) -> str:
+    """WRITER_FAILURE_PROMPT 안내 생성 (마감 시간이 지나면 고정 문구)"""
+    fallback_llm, _ = MODEL_DEGRADATION.choose("writer", SUPER_SMART_LLM, FAST_LLM)
+    try:
+        async with within_deadline("writer_fallback"):
+            fallback_response = await fallback_llm.ainvoke(messages)
+        return fallback_response.content
+    except DeadlineExceeded:
+        return DEADLINE_FALLBACK_MESSAGE
+
+
+async def _dispatch_reco_chunk(order: int, content: str) -> None:
+    """
+    순서가 정리된 추천 청크를 커스텀 이벤트로 내보냅니다. (main.py SSE에서 수신)
+
+    그래프 실행 컨텍스트 밖(단위 테스트 직접 호출 등)에서는 조용히 무시합니다.
+    """
+    if not content:
+        return
+    try:
+        await adispatch_custom_event(
+            RECO_STREAM_EVENT, {"section": order + 1, "content": content}
+        )
+    except RuntimeError:
+        pass
+
+
+@with_state_deadline
 async def parallel_reco_node(state: AgentState):
     member_id = state.get("member_id", 0)
     user_prefs = state.get("user_preferences", {})
@@ -1007,7 +1213,7 @@ async def parallel_reco_node(state: AgentState):
 
     personalization = {}
     if use_case == "SELF" and member_id > 0:
-        personalization = get_personalization_summary(member_id) or {}
+        personalization = await aget_personalization_summary(member_id) or {}
         if personalization.get("summary_text"):
             print(f"🎯 [Personalization] {personalization['summary_text']}", flush=True)
     else:
@@ -1093,6 +1299,7 @@ async def parallel_reco_node(state: AgentState):
 
     print(f"🔢 [Count] Target recommendations: {target_count}", flush=True)
 
+    labeler = BatchStrategyLabeler(SMART_LLM, user_prefs, expected=target_count)
     searcher = RecoSearcher(
         member_id=member_id,
         user_prefs=user_prefs,
@@ -1103,6 +1310,8 @@ async def parallel_reco_node(state: AgentState):
         batch_selected_ids=batch_selected_ids,
         brand_counts=brand_counts,
         search_fn=smart_search_with_retry_async,
+        labeler=labeler,
+        deadline=_strategy_deadline(current_deadline()),
     )
     writer = RecoWriter(state)
 
@@ -1116,58 +1325,82 @@ async def parallel_reco_node(state: AgentState):
     output_texts: List[str] = []
     prepared_data_list: List[Dict[str, Any]] = []
 
-    for future in asyncio.as_completed(prep_tasks):
-        try:
-            result = await future
-        except Exception as e:
-            errors_encountered.append({"type": "exception", "detail": str(e)})
-            continue
-
-        if not result:
-            errors_encountered.append(
-                {"type": "unknown", "detail": "Strategy returned empty result"}
+    # 섹션 작성은 동시에 진행하되, 화면에는 섹션 순서대로 흘려보냄
+    # 헤더 번호/도입부는 섹션이 선두가 될 때 실제로 나간 앞 섹션 수로 정함 (앞 섹션 실패 대비)
+    multiplexer = OrderedStreamMultiplexer(
+        _dispatch_reco_chunk,
+        max_concurrency=RECO_WRITER_CONCURRENCY,
+        formatter=SectionHeaderRewriter,
+    )
+    section_jobs: List[Dict[str, Any]] = []
+
+    def start_section(prepared: Dict[str, Any], is_last: bool) -> None:
+        section_number = len(section_jobs) + 1
+        section_jobs.append(prepared)
+        # 아직 화면에 나간 섹션이 없으면 이 섹션이 첫 섹션이 될 수 있으므로 도입부도 작성
+        # (첫 섹션이 되지 않으면 SectionHeaderRewriter가 도입부를 잘라냄)
+        is_first = not multiplexer.has_output
+        multiplexer.submit(
+            lambda emit: writer.generate_section(
+                prepared,
+                section_number,
+                is_first=is_first,
+                is_last=is_last,
+                on_chunk=emit,
+                format_output=False,
             )
-            continue
+        )
 
-        if result.get("error"):
-            error_type = result.get("error_type", "unknown")
-            error_detail = result.get("error_detail", "")
-            if error_type not in {"no_results", "no_candidates"}:
-                errors_encountered.append({"type": error_type, "detail": error_detail})
-            continue
+    try:
+        for future in asyncio.as_completed(prep_tasks):
+            try:
+                result = await future
+            except Exception as e:
+                errors_encountered.append({"type": "exception", "detail": str(e)})
+                continue
 
-        if pending_result:
-            section_number = len(output_texts) + 1
-            output_text = await writer.generate_section(
-                pending_result,
-                section_number,
-                is_first=section_number == 1,
-                is_last=False,
-            )
-            if output_text:
-                output_texts.append(output_text)
-                prepared_data_list.append(pending_result)
-            else:
+            if not result:
                 errors_encountered.append(
-                    {
-                        "type": "writer_error",
-                        "detail": "Writer failed to produce output",
-                    }
+                    {"type": "unknown", "detail": "Strategy returned empty result"}
                 )
+                continue
+
+            if result.get("error"):
+                error_type = result.get("error_type", "unknown")
+                error_detail = result.get("error_detail", "")
+                if error_type not in {"no_results", "no_candidates"}:
+                    errors_encountered.append({"type": error_type, "detail": error_detail})
+                continue
+
+            # 다음 결과가 도착해야 현재 섹션이 마지막이 아님을 알 수 있음
+            if pending_result:
+                start_section(pending_result, is_last=False)
 
-        pending_result = result
+            pending_result = result
 
-    if pending_result:
-        section_number = len(output_texts) + 1
-        output_text = await writer.generate_section(
-            pending_result,
-            section_number,
-            is_first=section_number == 1,
-            is_last=True,
+        await labeler.aclose()
+        print(
+            f"🏷️ [Labels] {target_count} strategies labeled with {labeler.llm_calls} LLM call(s)",
+            flush=True,
         )
+
+        if pending_result:
+            start_section(pending_result, is_last=True)
+
+        section_outputs = await multiplexer.drain()
+    except BaseException:
+        # 클라이언트 이탈 등으로 취소되면 진행 중인 전략 준비/라벨/섹션 작성을 모두 정리
+        for task in prep_tasks:
+            task.cancel()
+        await asyncio.gather(*prep_tasks, return_exceptions=True)
+        await labeler.aclose()
+        await multiplexer.aclose()
+        raise
+
+    for prepared, output_text in zip(section_jobs, section_outputs):
         if output_text:
             output_texts.append(output_text)
-            prepared_data_list.append(pending_result)
+            prepared_data_list.append(prepared)
         else:
             errors_encountered.append(
                 {
@@ -1212,8 +1445,8 @@ async def parallel_reco_node(state: AgentState):
             SystemMessage(content=WRITER_FAILURE_PROMPT),
             HumanMessage(content=f"사용자 정보: {current_context}"),
         ]
-        fallback_response = await SUPER_SMART_LLM.ainvoke(fallback_messages)
-        full_text = fallback_response.content
+        full_text = await _invoke_failure_writer(fallback_messages)
+        await _dispatch_reco_chunk(0, full_text)
 
     if len(output_texts) >= 1:
         chat_outcome_status = "OK"
@@ -1310,6 +1543,7 @@ async def parallel_reco_ok_writer(_state: AgentState):
     return {}
 
 
+@with_state_deadline
 async def parallel_reco_no_results(state: AgentState):
     """
     NO_RESULTS 상태일 때 - WRITER_FAILURE_PROMPT 사용하여 대안 제시.
@@ -1324,9 +1558,7 @@ async def parallel_reco_no_results(state: AgentState):
         HumanMessage(content=f"사용자 정보: {current_context}"),
     ]
 
-    fallback_response = await SUPER_SMART_LLM.ainvoke(fallback_messages)
-
-    return {"messages": [AIMessage(content=fallback_response.content)]}
+    return {"messages": [AIMessage(content=await _invoke_failure_writer(fallback_messages))]}
 
 
 async def parallel_reco_error(_state: AgentState):
@@ -31,12 +31,21 @@ from .prompts import (
 
 # [4] Expression Loader for dynamic dictionary injection
 from .expression_loader import ExpressionLoader
+from .circuit_breaker import CIRCUIT_BREAKERS, model_name_of
+from .llm_cassette import async_http_client, sync_http_client
 
 load_dotenv()
 
 # [LLM 이원화]
-INFO_LLM = ChatOpenAI(model="gpt-4.1", temperature=0, streaming=True)
-ROUTER_LLM = ChatOpenAI(model="gpt-4.1", temperature=0, streaming=False)
+# LLM_CASSETTE_MODE가 켜져 있으면 http 클라이언트가 요청/응답을 녹화·재생 (llm_cassette.py)
+_HTTP = {"http_client": sync_http_client(), "http_async_client": async_http_client()}
+INFO_LLM = ChatOpenAI(model="gpt-4.1", temperature=0, streaming=True, **_HTTP)
+ROUTER_LLM = ChatOpenAI(model="gpt-4.1", temperature=0, streaming=False, **_HTTP)
+
+
+def _breaker(llm, operation: str):
+    """OpenAI 장애 시 타임아웃까지 기다리지 않고 노드의 기존 폴백(에러/기본값)으로 바로 가도록"""
+    return CIRCUIT_BREAKERS.get(model_name_of(llm), operation)
 
 
 # ==========================================
@@ -118,9 +127,10 @@ def info_supervisor_node(state: InfoState):
             return {"info_type": "unknown", "target_name": "unknown", "fail_msg": fail_msg}
     
     try:
-        decision = ROUTER_LLM.with_structured_output(InfoRoutingDecision).invoke(
-            messages
-        )
+        with _breaker(ROUTER_LLM, "info_router").guard():
+            decision = ROUTER_LLM.with_structured_output(InfoRoutingDecision).invoke(
+                messages
+            )
 
         # [Phase 1] 기본 지식 질문이면 save_refs 체크 없이 바로 처리
         if decision.info_type in ["note", "accord", "ingredient"]:
@@ -295,7 +305,8 @@ async def perfume_describer_node(state: InfoState):
             SystemMessage(content=selected_prompt),
             HumanMessage(content="\n".join(content_parts)),
         ]
-        response = await INFO_LLM.ainvoke(messages)
+        with _breaker(INFO_LLM, "info_writer").guard():
+            response = await INFO_LLM.ainvoke(messages)
 
         return {"messages": [response], "final_answer": response.content, "info_status": "OK"}
 
@@ -321,9 +332,10 @@ async def ingredient_search_node(state: InfoState):
         """
 
         try:
-            analysis = await ROUTER_LLM.with_structured_output(
-                IngredientAnalysisResult
-            ).ainvoke(analysis_prompt, config={"tags": ["internal_helper"]})
+            with _breaker(ROUTER_LLM, "ingredient_analysis").guard():
+                analysis = await ROUTER_LLM.with_structured_output(
+                    IngredientAnalysisResult
+                ).ainvoke(analysis_prompt, config={"tags": ["internal_helper"]})
             print(
                 f"      - 분석 결과: Notes={analysis.notes}, Accords={analysis.accords}",
                 flush=True,
@@ -461,7 +473,8 @@ async def ingredient_specialist_node(state: InfoState):
             SystemMessage(content=INGREDIENT_SPECIALIST_PROMPT),
             HumanMessage(content=combined_context),
         ]
-        response = await INFO_LLM.ainvoke(messages)
+        with _breaker(INFO_LLM, "info_writer").guard():
+            response = await INFO_LLM.ainvoke(messages)
 
         return {"messages": [response], "final_answer": response.content, "info_status": "OK"}
 
@@ -533,7 +546,8 @@ async def similarity_curator_node(state: InfoState):
                 content=f"원본 향수: {target}\n\n[추천 후보군 데이터]:\n{search_result_json}"
             ),
         ]
-        response = await INFO_LLM.ainvoke(messages)
+        with _breaker(INFO_LLM, "info_writer").guard():
+            response = await INFO_LLM.ainvoke(messages)
 
         return {"messages": [response], "final_answer": response.content, "info_status": "OK"}
 
@@ -1,24 +1,52 @@
 """
 Image processing utilities for profile images.
 Handles validation, conversion, and resizing to 256x256 webp format.
+
+Decoding/resizing/encoding runs in a dedicated worker pool (process pool by default)
+so large uploads do not stall the event loop. One decode produces every size in
+PROFILE_IMAGE_VARIANT_SIZES (e.g. 64/128/256).
 """
 
+import asyncio
 import io
+import math
+import multiprocessing
 import os
 import logging
-from typing import BinaryIO
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import BinaryIO, Dict, Iterable, Optional, Tuple
 
 from PIL import Image, ImageOps
 from fastapi import HTTPException, UploadFile
 
+from .metrics import metrics
+
 logger = logging.getLogger(__name__)
 
+
+def _parse_sizes(value: str) -> Tuple[int, ...]:
+    return tuple(sorted({int(v) for v in value.split(',') if v.strip()}))
+
+
 # Constants (can be overridden by environment variables)
 PROFILE_IMAGE_MAX_MB = int(os.environ.get('PROFILE_IMAGE_MAX_MB', '5'))
 PROFILE_IMAGE_SIZE = int(os.environ.get('PROFILE_IMAGE_SIZE', '256'))
 PROFILE_IMAGE_FORMAT = os.environ.get('PROFILE_IMAGE_FORMAT', 'webp')
 PROFILE_IMAGE_QUALITY = 85  # WebP quality (0-100)
 
+# Decompression-bomb guard: reject by header dimensions before decoding
+PROFILE_IMAGE_MAX_PIXELS = int(os.environ.get('PROFILE_IMAGE_MAX_PIXELS', str(40_000_000)))
+PROFILE_IMAGE_VARIANT_SIZES = _parse_sizes(
+    os.environ.get('PROFILE_IMAGE_VARIANT_SIZES', f'64,128,{PROFILE_IMAGE_SIZE}')
+)
+
+# Worker pool
+IMAGE_POOL_ENABLED = os.environ.get('IMAGE_POOL_ENABLED', 'true').strip().lower() not in ('0', 'false', 'no', 'off')
+IMAGE_POOL_WORKERS = int(os.environ.get('IMAGE_POOL_WORKERS', str(min(4, os.cpu_count() or 1))))
+IMAGE_POOL_MAX_PENDING = int(os.environ.get('IMAGE_POOL_MAX_PENDING', str(IMAGE_POOL_WORKERS * 8)))
+
 # Allowed content types
 ALLOWED_CONTENT_TYPES = {
     'image/png',
@@ -99,28 +127,56 @@ async def validate_and_read_upload(file: UploadFile) -> bytes:
     return b''.join(chunks)
 
 
-def convert_to_profile_webp(image_data: bytes) -> bytes:
+class ImageRejected(Exception):
+    """Raised inside workers; carries the HTTP status/detail back to the handler."""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(status_code, detail)
+        self.status_code = status_code
+        self.detail = detail
+
+    def to_http(self) -> HTTPException:
+        return HTTPException(status_code=self.status_code, detail=self.detail)
+
+
+def _open_checked(image_data: bytes, largest: int) -> Image.Image:
     """
-    Convert image to 256x256 WebP format with center-crop.
+    Open an image, enforce the pixel limit from the header (before decoding),
+    and for JPEGs ask the decoder for a reduced-scale decode via Image.draft.
+    """
+    img = Image.open(io.BytesIO(image_data))
+    width, height = img.size
+    if width * height > PROFILE_IMAGE_MAX_PIXELS:
+        raise ImageRejected(
+            413, f"Image dimensions too large. Maximum: {PROFILE_IMAGE_MAX_PIXELS} pixels"
+        )
+    if img.format == 'JPEG':
+        # DCT scaling (1/2, 1/4, 1/8) while keeping the short side >= largest variant
+        scale = largest / max(1, min(width, height))
+        if scale < 1:
+            img.draft('RGB', (math.ceil(width * scale), math.ceil(height * scale)))
+    return img
+
+
+def render_profile_variants(image_data: bytes, sizes: Iterable[int]) -> Dict[int, bytes]:
+    """
+    Decode once and encode square WebP variants for every requested size.
 
     Processing steps:
-    1. Decode image (validate it's a real image)
+    1. Check pixel limit from the header, reduced-scale JPEG decode (draft)
     2. Apply EXIF orientation correction
-    3. Center-crop and resize to 256x256
-    4. Encode as WebP
-
-    Args:
-        image_data: Raw image bytes (PNG, JPEG, or WebP)
+    3. Center-crop and resize to the largest size, then step down for smaller sizes
+    4. Encode each size as WebP
 
     Returns:
-        WebP image bytes (256x256)
+        {size: WebP bytes}
 
     Raises:
-        HTTPException 400: If image is corrupted or cannot be decoded
+        ImageRejected: 413 if the image exceeds the pixel limit, 400 if it cannot be decoded
     """
+    sizes = sorted(set(sizes), reverse=True)
     try:
-        # Decode image
-        img = Image.open(io.BytesIO(image_data))
+        img = _open_checked(image_data, sizes[0])
 
         # Apply EXIF orientation correction
         img = ImageOps.exif_transpose(img)
@@ -145,37 +201,136 @@ def convert_to_profile_webp(image_data: bytes) -> bytes:
 
         img = img.crop((left, top, right, bottom))
 
-        # Resize to target size
-        target_size = (PROFILE_IMAGE_SIZE, PROFILE_IMAGE_SIZE)
-        img = img.resize(target_size, Image.Resampling.LANCZOS)
+        variants = {}
+        for size in sizes:
+            # Resize from the previous (larger) variant instead of the full image
+            img = img.resize((size, size), Image.Resampling.LANCZOS)
+            output = io.BytesIO()
+            img.save(output, format='WEBP', quality=PROFILE_IMAGE_QUALITY)
+            variants[size] = output.getvalue()
+
+        logger.info(
+            f"Converted image to WebP variants {sizes}: {len(image_data)} -> "
+            f"{sum(len(v) for v in variants.values())} bytes"
+        )
+        return variants
 
-        # Encode as WebP
-        output = io.BytesIO()
-        img.save(output, format='WEBP', quality=PROFILE_IMAGE_QUALITY)
-        output.seek(0)
+    except ImageRejected:
+        raise
+    except Exception as e:
+        logger.error(f"Image conversion failed: {e}")
+        raise ImageRejected(400, "Invalid or corrupted image file")
 
-        webp_bytes = output.getvalue()
-        logger.info(f"Converted image to WebP: {len(image_data)} -> {len(webp_bytes)} bytes")
 
-        return webp_bytes
+def convert_to_profile_webp(image_data: bytes) -> bytes:
+    """
+    Convert image to 256x256 WebP format with center-crop.
 
-    except Exception as e:
-        logger.error(f"Image conversion failed: {e}")
+    Args:
+        image_data: Raw image bytes (PNG, JPEG, or WebP)
+
+    Returns:
+        WebP image bytes (256x256)
+
+    Raises:
+        HTTPException 400: If image is corrupted or cannot be decoded
+        HTTPException 413: If image dimensions exceed PROFILE_IMAGE_MAX_PIXELS
+    """
+    try:
+        return render_profile_variants(image_data, (PROFILE_IMAGE_SIZE,))[PROFILE_IMAGE_SIZE]
+    except ImageRejected as e:
+        raise e.to_http()
+
+
+# =============================================================================
+# Worker pool (decode/resize/encode off the event loop)
+# =============================================================================
+_EXECUTOR: Optional[Executor] = None
+_EXECUTOR_LOCK = threading.Lock()
+_SLOTS = threading.BoundedSemaphore(IMAGE_POOL_MAX_PENDING)
+
+
+def _get_executor() -> Executor:
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            if IMAGE_POOL_ENABLED:
+                # spawn: do not fork a server process that already runs many threads
+                _EXECUTOR = ProcessPoolExecutor(
+                    max_workers=IMAGE_POOL_WORKERS,
+                    mp_context=multiprocessing.get_context('spawn'),
+                )
+            else:
+                _EXECUTOR = ThreadPoolExecutor(
+                    max_workers=IMAGE_POOL_WORKERS, thread_name_prefix='image-pool'
+                )
+        return _EXECUTOR
+
+
+def shutdown_image_pool() -> None:
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        executor, _EXECUTOR = _EXECUTOR, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+async def render_profile_variants_async(
+    image_data: bytes, sizes: Iterable[int] = PROFILE_IMAGE_VARIANT_SIZES
+) -> Dict[int, bytes]:
+    """
+    Run render_profile_variants in the image worker pool.
+
+    Raises:
+        HTTPException 503: If IMAGE_POOL_MAX_PENDING jobs are already queued or running
+        HTTPException 400/413: See render_profile_variants
+    """
+    if not _SLOTS.acquire(blocking=False):
+        metrics.inc("image_pool_rejected_total")
         raise HTTPException(
-            status_code=400,
-            detail="Invalid or corrupted image file"
+            status_code=503,
+            detail="Image processing is busy. Please retry shortly.",
+            headers={"Retry-After": "1"},
         )
+    metrics.add_gauge("image_pool_pending", 1)
+    started = time.perf_counter()
+    try:
+        future = _get_executor().submit(render_profile_variants, image_data, tuple(sizes))
+    except BaseException:
+        _release_slot()
+        raise
+    try:
+        variants = await asyncio.wrap_future(future)
+    except asyncio.CancelledError:
+        # The job keeps running in the worker; hold the slot until it finishes
+        future.add_done_callback(lambda _: _release_slot())
+        raise
+    except ImageRejected as e:
+        _release_slot()
+        raise e.to_http()
+    except BaseException:
+        _release_slot()
+        raise
+    _release_slot()
+    metrics.observe("image_pool_seconds", time.perf_counter() - started)
+    return variants
 
 
-async def process_profile_image_upload(file: UploadFile) -> bytes:
+def _release_slot() -> None:
+    metrics.add_gauge("image_pool_pending", -1)
+    _SLOTS.release()
+
+
+async def process_profile_image_variants(file: UploadFile) -> Dict[int, bytes]:
     """
-    Complete pipeline: validate, read, and convert profile image to WebP.
+    Complete pipeline: validate, read, and convert profile image to WebP variants
+    (PROFILE_IMAGE_VARIANT_SIZES) in the image worker pool.
 
     Args:
         file: FastAPI UploadFile object
 
     Returns:
-        WebP image bytes (256x256)
+        {size: WebP bytes}
 
     Raises:
         HTTPException: Various error codes depending on validation/conversion failures
@@ -183,7 +338,23 @@ async def process_profile_image_upload(file: UploadFile) -> bytes:
     # Validate and read file
     image_data = await validate_and_read_upload(file)
 
-    # Convert to WebP
-    webp_data = convert_to_profile_webp(image_data)
+    # Convert to WebP variants off the event loop
+    return await render_profile_variants_async(image_data, PROFILE_IMAGE_VARIANT_SIZES)
+
 
-    return webp_data
+async def process_profile_image_upload(file: UploadFile) -> bytes:
+    """
+    Complete pipeline: validate, read, and convert profile image to WebP.
+
+    Args:
+        file: FastAPI UploadFile object
+
+    Returns:
+        WebP image bytes (256x256)
+
+    Raises:
+        HTTPException: Various error codes depending on validation/conversion failures
+    """
+    image_data = await validate_and_read_upload(file)
+    variants = await render_profile_variants_async(image_data, (PROFILE_IMAGE_SIZE,))
+    return variants[PROFILE_IMAGE_SIZE]
@@ -0,0 +1,540 @@
+"""
+로컬 Fast-Path 의도 라우터 (Supervisor 앞단)
+
+"상큼한 향수 추천해줘", "베티버가 뭐야?"처럼 의도가 명확한 요청은
+LLM(RoutingDecision) 호출 없이 바로 라우팅하고, 애매한 요청만
+기존 Supervisor LLM으로 넘깁니다(defer).
+
+구성:
+1. 가제티어: DB의 브랜드/향수/노트 이름 + 한글 별칭 사전(data/lexicon_ko.json)
+2. 키워드 규칙: 가제티어 매칭 결과 + 추천/정보/유사 키워드 + follow-up 판별기
+3. 선형 분류기: 문자 n-gram 소프트맥스 회귀 (순수 Python, 오프라인 학습)
+
+사용처:
+- graph._route_request() 에서 LLM 라우팅 전에 호출
+- scripts/train_intent_router.py 로 분류기 재학습
+- benchmarks/eval_intent_router.py 로 정확도/폴백률/지연 측정
+"""
+
+import asyncio
+import json
+import logging
+import math
+import os
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .aho_corasick import AhoCorasick, select_longest
+from .followup_classifier import classify_followup_rule_based
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+LEXICON_PATH = DATA_DIR / "lexicon_ko.json"
+SEED_PATH = DATA_DIR / "intent_seed.jsonl"
+MODEL_PATH = Path(os.getenv("INTENT_ROUTER_MODEL_PATH", DATA_DIR / "intent_model.json"))
+
+# 분류기 단독 결정에 필요한 최소 확률
+CLASSIFIER_THRESHOLD = float(os.getenv("INTENT_ROUTER_THRESHOLD", "0.9"))
+
+# 로컬에서 결정 가능한 라우트 (writer=고정 메시지 종료이므로 LLM에 맡김)
+DECIDABLE_ROUTES = ("interviewer", "info_retrieval")
+
+
+def is_local_router_enabled() -> bool:
+    """LOCAL_INTENT_ROUTER_ENABLED 환경변수 (기본: 활성화)"""
+    value = os.getenv("LOCAL_INTENT_ROUTER_ENABLED", "true").strip().lower()
+    return value not in ("0", "false", "no", "off")
+
+
+# =================================================================
+# 1. 결과 스키마
+# =================================================================
+
+
+@dataclass
+class LocalRoute:
+    """
+    로컬 라우팅 결과
+
+    Fields:
+        next_step: "interviewer" | "info_retrieval" | None(LLM으로 위임)
+        confidence: 결정 신뢰도 (0.0 ~ 1.0)
+        source: "rule" | "classifier" | "defer"
+        reason: 판별 근거 (로깅용)
+    """
+
+    next_step: Optional[str]
+    confidence: float
+    source: str
+    reason: str
+
+    @property
+    def decided(self) -> bool:
+        return self.next_step is not None
+
+
+def _defer(reason: str, confidence: float = 0.0) -> LocalRoute:
+    return LocalRoute(next_step=None, confidence=confidence, source="defer", reason=reason)
+
+
+# =================================================================
+# 2. 가제티어 (브랜드/향수/노트/어코드 사전)
+# =================================================================
+
+# 같은 구간이 겹칠 때 우선순위 (향수명 > 브랜드 > 노트 > 어코드)
+CATEGORY_PRIORITY = {"perfume": 0, "brand": 1, "note": 2, "accord": 3}
+CATEGORY_MASKS = {"perfume": "§p", "brand": "§b", "note": "§n", "accord": "§a"}
+
+_ASCII_TERM = re.compile(r"^[\x00-\x7f]+$")
+
+
+@dataclass(frozen=True)
+class GazetteerHit:
+    category: str
+    surface: str
+    canonical: str
+    start: int
+    end: int
+
+
+class Gazetteer:
+    """표면형(소문자) -> 표준값 사전. 가장 긴 비중첩 매칭을 반환합니다."""
+
+    def __init__(self):
+        self._entries: Dict[str, Dict[str, str]] = {c: {} for c in CATEGORY_PRIORITY}
+        self._automaton: Optional[AhoCorasick] = None
+
+    def add(self, category: str, surface: str, canonical: str) -> None:
+        surface = (surface or "").strip().lower()
+        if category not in self._entries or not surface:
+            return
+        # 너무 짧은 표면형은 오탐이 많아 제외 (한글 2자, 영문 4자 미만)
+        min_len = 4 if _ASCII_TERM.match(surface) else 2
+        if len(surface) < min_len:
+            return
+        if surface not in self._entries[category]:
+            self._entries[category][surface] = canonical
+            self._automaton = None
+
+    def add_many(self, category: str, mapping: Dict[str, str]) -> None:
+        for surface, canonical in mapping.items():
+            self.add(category, surface, canonical)
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self._entries.values())
+
+    def terms(self) -> Iterable[Tuple[str, str, str]]:
+        for category, entries in self._entries.items():
+            for surface, canonical in entries.items():
+                yield category, surface, canonical
+
+    def _get_automaton(self) -> AhoCorasick:
+        if self._automaton is None:
+            automaton = AhoCorasick()
+            for category, surface, canonical in self.terms():
+                automaton.add(surface, (category, surface, canonical))
+            self._automaton = automaton.build()
+        return self._automaton
+
+    def find(self, text: str) -> List[GazetteerHit]:
+        lowered = text.lower()
+        candidates = [
+            match
+            for match in self._get_automaton().iter_matches(lowered)
+            if not _ASCII_TERM.match(match.value[1])
+            or _is_word_boundary(lowered, match.start, match.end)
+        ]
+        selected = select_longest(candidates, lambda m: CATEGORY_PRIORITY[m.value[0]])
+        return [
+            GazetteerHit(m.value[0], m.value[1], m.value[2], m.start, m.end)
+            for m in selected
+        ]
+
+
+def _is_word_boundary(text: str, start: int, end: int) -> bool:
+    """영문 이름은 영문/숫자와 붙어 있으면 매칭하지 않습니다. (예: 'rose' in 'roses')"""
+    before = text[start - 1] if start > 0 else " "
+    after = text[end] if end < len(text) else " "
+    return not (before.isascii() and before.isalnum()) and not (
+        after.isascii() and after.isalnum()
+    )
+
+
+def load_lexicon(path: Path = LEXICON_PATH) -> Dict[str, Dict[str, str]]:
+    with open(path, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+    return {k: v for k, v in raw.items() if not k.startswith("_")}
+
+
+def build_gazetteer(include_db: bool = True) -> Gazetteer:
+    """
+    한글 별칭 사전 + (가능하면) DB 이름 목록으로 가제티어를 만듭니다.
+
+    DB 연결이 불가능한 환경(오프라인 학습/평가)에서는 별칭 사전만 사용합니다.
+    """
+    gazetteer = Gazetteer()
+    lexicon = load_lexicon()
+    gazetteer.add_many("brand", lexicon.get("brands", {}))
+    gazetteer.add_many("perfume", lexicon.get("perfumes", {}))
+    gazetteer.add_many("note", lexicon.get("notes", {}))
+    gazetteer.add_many("accord", lexicon.get("accords", {}))
+
+    if include_db:
+        try:
+            from .database import fetch_gazetteer_terms
+
+            for category, names in fetch_gazetteer_terms().items():
+                for name in names:
+                    gazetteer.add(category, name, name)
+        except Exception as e:
+            logger.warning("Gazetteer DB load failed, using lexicon only: %s", e)
+
+    return gazetteer
+
+
+# =================================================================
+# 3. 선형 분류기 (문자 n-gram 소프트맥스 회귀)
+# =================================================================
+
+_PUNCTUATION = re.compile(r"[?!.,~^…\"'()\[\]]+")
+_SPACES = re.compile(r"\s+")
+
+
+def mask_entities(text: str, hits: Sequence[GazetteerHit]) -> str:
+    """가제티어 매칭 구간을 카테고리 토큰(§p/§b/§n/§a)으로 치환합니다."""
+    lowered = text.lower()
+    parts, cursor = [], 0
+    for hit in hits:
+        parts.append(lowered[cursor:hit.start])
+        parts.append(f" {CATEGORY_MASKS[hit.category]} ")
+        cursor = hit.end
+    parts.append(lowered[cursor:])
+    masked = _PUNCTUATION.sub(" ", "".join(parts))
+    return _SPACES.sub(" ", masked).strip()
+
+
+def extract_features(text: str, hits: Sequence[GazetteerHit]) -> Dict[str, float]:
+    masked = mask_entities(text, hits)
+    counts: Dict[str, float] = {}
+
+    padded = f" {masked} "
+    for n in (2, 3):
+        for i in range(len(padded) - n + 1):
+            key = "c:" + padded[i : i + n]
+            counts[key] = counts.get(key, 0.0) + 1.0
+    for token in masked.split():
+        key = "w:" + token
+        counts[key] = counts.get(key, 0.0) + 1.0
+    for hit in hits:
+        counts["g:" + hit.category] = 1.0
+
+    norm = math.sqrt(sum(v * v for v in counts.values())) or 1.0
+    return {k: v / norm for k, v in counts.items()}
+
+
+def _softmax(scores: List[float]) -> List[float]:
+    peak = max(scores)
+    exps = [math.exp(s - peak) for s in scores]
+    total = sum(exps)
+    return [e / total for e in exps]
+
+
+class LinearIntentClassifier:
+    """희소 가중치 기반 다중 클래스 로지스틱 회귀"""
+
+    def __init__(self, labels: Sequence[str], weights: Dict[str, List[float]], bias: List[float]):
+        self.labels = list(labels)
+        self.weights = weights
+        self.bias = bias
+
+    def predict_proba(self, features: Dict[str, float]) -> Dict[str, float]:
+        scores = list(self.bias)
+        for feature, value in features.items():
+            row = self.weights.get(feature)
+            if row is None:
+                continue
+            for k, w in enumerate(row):
+                scores[k] += w * value
+        return dict(zip(self.labels, _softmax(scores)))
+
+    def to_dict(self) -> Dict:
+        return {
+            "version": 1,
+            "labels": self.labels,
+            "bias": [round(b, 6) for b in self.bias],
+            "weights": {
+                f: [round(w, 5) for w in row]
+                for f, row in sorted(self.weights.items())
+                if any(abs(w) >= 1e-4 for w in row)
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "LinearIntentClassifier":
+        return cls(data["labels"], data["weights"], data["bias"])
+
+    def save(self, path: Path) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path: Path) -> "LinearIntentClassifier":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+def train_linear_classifier(
+    samples: Sequence[Tuple[Dict[str, float], str]],
+    *,
+    epochs: int = 40,
+    learning_rate: float = 0.5,
+    l2: float = 1e-4,
+    seed: int = 13,
+) -> LinearIntentClassifier:
+    """
+    SGD로 소프트맥스 회귀를 학습합니다. (수백 문장 기준 1초 이내)
+
+    Args:
+        samples: (특징 벡터, 라벨) 목록
+    """
+    labels = sorted({label for _, label in samples})
+    index = {label: i for i, label in enumerate(labels)}
+    weights: Dict[str, List[float]] = {}
+    bias = [0.0] * len(labels)
+    rng = random.Random(seed)
+    order = list(range(len(samples)))
+
+    for epoch in range(epochs):
+        rng.shuffle(order)
+        rate = learning_rate / (1 + epoch * 0.1)
+        for i in order:
+            features, label = samples[i]
+            scores = list(bias)
+            for f, v in features.items():
+                row = weights.get(f)
+                if row:
+                    for k in range(len(labels)):
+                        scores[k] += row[k] * v
+            probs = _softmax(scores)
+            probs[index[label]] -= 1.0  # gradient = p - y
+
+            for k in range(len(labels)):
+                bias[k] -= rate * probs[k]
+            for f, v in features.items():
+                row = weights.setdefault(f, [0.0] * len(labels))
+                for k in range(len(labels)):
+                    row[k] -= rate * (probs[k] * v + l2 * row[k])
+
+    return LinearIntentClassifier(labels, weights, bias)
+
+
+def load_seed_examples(path: Path = SEED_PATH) -> List[Tuple[str, str]]:
+    examples = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                row = json.loads(line)
+                examples.append((row["query"], row["label"]))
+    return examples
+
+
+# =================================================================
+# 4. 키워드 규칙
+# =================================================================
+
+RECOMMEND_KEYWORDS = [
+    "추천", "골라", "고르", "찾아줘", "찾아 줘", "찾고", "뭐가 좋", "뭐 사", "뭘 사",
+    "살지", "사려", "사고 싶", "뿌릴", "쓸 만한", "쓸만한", "향수 있", "선물",
+]
+
+# "방금 추천한 향수"처럼 추천 동사가 과거 결과를 가리키는 표현
+PAST_RECOMMEND_PHRASES = ["추천한", "추천해준", "추천해 준", "추천된", "추천받은"]
+
+INFO_KEYWORDS = [
+    "뭐야", "뭐예요", "뭔가요", "뭔지", "무엇", "설명", "알려", "어떤 향", "무슨 향",
+    "어떤 느낌", "어떤 브랜드", "노트", "특징", "정보", "어때", "지속력", "궁금",
+    "차이", "구성",
+]
+
+SIMILARITY_KEYWORDS = [
+    "비슷한", "비슷하", "비슷 ", "같은 느낌", "같은 향", "같은 거", "대체", "느낌의",
+    "느낌 향수", "닮은", "유사",
+]
+
+REFERENCE_KEYWORDS = [
+    "이 향수", "그 향수", "이거", "그거", "저거", "첫 번째", "두 번째", "세 번째",
+    "네 번째", "다섯 번째", "첫번째", "두번째", "세번째", "방금 추천", "앞에 추천",
+    "위에 추천", "추천해준", "추천해 준", "추천한", "추천된",
+]
+
+# "이거 말고 다른 거"처럼 참조어가 거절 의미로 쓰인 경우
+REFERENCE_NEGATIONS = ["이거 말고", "그거 말고", "이것 말고", "그것 말고"]
+
+
+def _contains_any(text: str, keywords: Iterable[str]) -> List[str]:
+    return [k for k in keywords if k in text]
+
+
+def apply_rules(
+    query: str,
+    hits: Sequence[GazetteerHit],
+    previous_context: Optional[dict] = None,
+) -> Optional[LocalRoute]:
+    """
+    고정밀 규칙. 확신할 수 없으면 None을 반환합니다.
+
+    판단 순서:
+    1. 특정 향수 + 유사 표현 → info_retrieval (Item-based 유사 추천)
+    2. 특정 향수 + 정보 표현 (추천 동사 없음) → info_retrieval
+    3. 이전 결과 참조 + 정보/유사 표현 → info_retrieval
+    4. 브랜드/노트/어코드 + 정보 표현 (추천 동사 없음) → info_retrieval
+    5. 추천 동사 (특정 향수/참조/유사 없음) → interviewer
+    6. 이전 추천 조건이 있고 follow-up 판별기가 추천 연속으로 판단 → interviewer
+    """
+    q = _SPACES.sub(" ", query.lower()).strip()
+    categories = {h.category for h in hits}
+    has_item = "perfume" in categories
+    has_entity = bool(categories & {"brand", "note", "accord"})
+
+    q_without_past = q
+    for phrase in PAST_RECOMMEND_PHRASES:
+        q_without_past = q_without_past.replace(phrase, " ")
+    reco = _contains_any(q_without_past, RECOMMEND_KEYWORDS)
+    info = _contains_any(q, INFO_KEYWORDS)
+    similar = _contains_any(q, SIMILARITY_KEYWORDS)
+    if has_item and not similar:
+        last_item_end = max(h.end for h in hits if h.category == "perfume")
+        if "같은" in q[last_item_end:]:
+            similar = ["같은"]
+    reference = [] if _contains_any(q, REFERENCE_NEGATIONS) else _contains_any(
+        q, REFERENCE_KEYWORDS
+    )
+
+    if has_item and similar:
+        return LocalRoute("info_retrieval", 0.95, "rule", f"특정 향수 기준 유사 요청: {similar}")
+
+    if has_item and info and not reco:
+        return LocalRoute("info_retrieval", 0.95, "rule", f"특정 향수 정보 질문: {info}")
+
+    if reference and (info or similar):
+        return LocalRoute("info_retrieval", 0.9, "rule", f"이전 결과 참조 질문: {reference}")
+
+    if has_entity and not has_item and info and not reco:
+        return LocalRoute("info_retrieval", 0.9, "rule", f"브랜드/원료 정보 질문: {info}")
+
+    if reco and not has_item and not similar and not reference:
+        return LocalRoute("interviewer", 0.92, "rule", f"추천 요청 키워드: {reco}")
+
+    if previous_context and previous_context.get("user_preferences") and not has_item and not info:
+        followup = classify_followup_rule_based(query, previous_context)
+        if followup.intent in ("MORE_RECO", "MODIFY_RECO") and followup.confidence >= 0.85:
+            return LocalRoute("interviewer", followup.confidence, "rule", followup.reason)
+        if followup.intent in ("NEW_RECO", "RESET") and followup.confidence >= 0.9:
+            return LocalRoute("interviewer", followup.confidence, "rule", followup.reason)
+
+    return None
+
+
+# =================================================================
+# 5. 라우터
+# =================================================================
+
+
+class IntentRouter:
+    """규칙 → 분류기 순서로 판단하고, 확신이 없으면 LLM으로 위임합니다."""
+
+    def __init__(
+        self,
+        gazetteer: Gazetteer,
+        classifier: Optional[LinearIntentClassifier] = None,
+        threshold: float = CLASSIFIER_THRESHOLD,
+    ):
+        self.gazetteer = gazetteer
+        self.classifier = classifier
+        self.threshold = threshold
+
+    def route(self, query: str, previous_context: Optional[dict] = None) -> LocalRoute:
+        query = (query or "").strip()
+        if not query:
+            return _defer("빈 쿼리")
+
+        hits = self.gazetteer.find(query)
+        rule_decision = apply_rules(query, hits, previous_context)
+
+        probs = None
+        if self.classifier is not None:
+            probs = self.classifier.predict_proba(extract_features(query, hits))
+
+        if rule_decision is not None:
+            # 분류기가 다른 라우트를 강하게 주장하면 LLM에 맡김
+            if probs:
+                best_label = max(probs, key=probs.get)
+                if best_label != rule_decision.next_step and probs[best_label] >= self.threshold:
+                    return _defer(
+                        f"규칙({rule_decision.next_step})/분류기({best_label}) 충돌",
+                        probs[best_label],
+                    )
+            return rule_decision
+
+        if not probs:
+            return _defer("규칙 미적용, 분류기 없음")
+
+        best_label = max(probs, key=probs.get)
+        confidence = probs[best_label]
+        if best_label in DECIDABLE_ROUTES and confidence >= self.threshold:
+            return LocalRoute(best_label, confidence, "classifier", f"분류기 확률 {confidence:.2f}")
+        return _defer(f"분류기 확신 부족 ({best_label} {confidence:.2f})", confidence)
+
+
+_ROUTER: Optional[IntentRouter] = None
+_ROUTER_LOCK = threading.Lock()
+
+
+def load_classifier(path: Path = MODEL_PATH) -> Optional[LinearIntentClassifier]:
+    try:
+        return LinearIntentClassifier.load(path)
+    except FileNotFoundError:
+        logger.warning("Intent classifier model not found: %s", path)
+    except Exception as e:
+        logger.warning("Intent classifier load failed: %s", e)
+    return None
+
+
+def get_intent_router() -> IntentRouter:
+    """프로세스 단위 싱글톤 (최초 호출 시 DB 가제티어/모델 로드)"""
+    global _ROUTER
+    if _ROUTER is None:
+        with _ROUTER_LOCK:
+            if _ROUTER is None:
+                _ROUTER = IntentRouter(build_gazetteer(include_db=True), load_classifier())
+    return _ROUTER
+
+
+async def route_locally(query: str, previous_context: Optional[dict] = None) -> LocalRoute:
+    """
+    그래프에서 사용하는 비동기 진입점.
+
+    최초 로드(DB 조회)는 스레드에서 수행해 이벤트 루프를 막지 않습니다.
+    """
+    if not is_local_router_enabled():
+        return _defer("로컬 라우터 비활성화")
+
+    router = _ROUTER or await asyncio.to_thread(get_intent_router)
+
+    started_at = time.perf_counter()
+    decision = router.route(query, previous_context)
+    metrics.observe("intent_router_latency_seconds", time.perf_counter() - started_at)
+
+    if decision.decided:
+        metrics.inc("intent_router_decided_total", route=decision.next_step, source=decision.source)
+    else:
+        metrics.inc("intent_router_deferred_total")
+    return decision
@@ -0,0 +1,415 @@
+"""
+LLM 카세트 녹화/재생 (Record & Replay)
+
+그래프 성능을 재려면 지금은 매번 OpenAI를 불러야 합니다.
+OpenAI SDK(ChatOpenAI/OpenAI/AsyncOpenAI)가 쓰는 httpx 전송 계층에 끼어들어
+채팅/임베딩 요청과 응답(스트리밍 청크와 도착 시각 포함)을 로컬 카세트 파일에 남기고,
+재생 모드에서는 네트워크 없이 같은 응답을 같은 타이밍(배율 조정 가능)으로 돌려줍니다.
+
+- LLM_CASSETTE_MODE: off(기본) | record | replay
+- LLM_CASSETTE_PATH: 카세트 파일 (record: 이어쓰기 / replay: 파일 또는 *.jsonl 디렉터리)
+- LLM_CASSETTE_LATENCY_SCALE: 재생 지연 배율 (1=녹화 그대로, 0=즉시)
+- LLM_CASSETTE_STRICT: true면 요청 본문이 정확히 같은 응답만 재생
+
+카세트는 JSON Lines입니다.
+    {"type": "turn", ...}  stream_generator에 들어온 사용자 턴 (재생 CLI 입력)
+    {"type": "http", ...}  요청(본문) + 응답(상태/헤더/청크별 도착 시각)
+
+재생 매칭: 요청 본문 해시가 같은 녹화분을 녹화 순서대로 쓰고, 없으면(strict가 아닐 때)
+같은 엔드포인트/모델의 남은 녹화분을 순서대로 씁니다. 끝내 없으면 404 응답(재시도 없음).
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+# 재생 시 돌려주지 않는 헤더 (본문을 디코딩된 그대로 저장하므로)
+_DROPPED_HEADERS = {"content-length", "content-encoding", "transfer-encoding", "set-cookie"}
+
+
+def _request_body(request: httpx.Request) -> Any:
+    raw = request.read()
+    if not raw:
+        return None
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return raw.decode("utf-8", errors="replace")
+
+
+def request_key(method: str, path: str, body: Any) -> str:
+    canonical = json.dumps(body, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(f"{method} {path}\n{canonical}".encode("utf-8")).hexdigest()
+
+
+def request_route(method: str, path: str, body: Any) -> str:
+    model = body.get("model", "") if isinstance(body, dict) else ""
+    return f"{method} {path} {model}".strip()
+
+
+class Cassette:
+    """
+    Args:
+        path: 카세트 파일(또는 재생 시 디렉터리)
+        mode: "record" | "replay"
+        latency_scale: 재생 지연 배율
+        strict: 재생 시 본문이 정확히 같은 요청만 허용
+        upstream_sync/upstream_async: 녹화 시 실제 요청을 보낼 전송 계층 (테스트용)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        mode: str,
+        *,
+        latency_scale: float = 1.0,
+        strict: bool = False,
+        upstream_sync: Optional[httpx.BaseTransport] = None,
+        upstream_async: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        if mode not in ("record", "replay"):
+            raise ValueError(f"unknown cassette mode: {mode}")
+        self.path = Path(path)
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self.strict = strict
+        self.upstream_sync = upstream_sync
+        self.upstream_async = upstream_async
+        self.recorded = 0
+        self.replayed = 0
+        self.misses: List[str] = []
+        self._lock = threading.Lock()
+        self._by_key: Dict[str, Deque[Dict[str, Any]]] = defaultdict(deque)
+        self._by_route: Dict[str, Deque[Dict[str, Any]]] = defaultdict(deque)
+        self.turns: List[Dict[str, Any]] = []
+        if mode == "replay":
+            self._load()
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # httpx 클라이언트 (ChatOpenAI http_client/http_async_client, OpenAI http_client)
+    # ------------------------------------------------------------------
+
+    def sync_client(self) -> httpx.Client:
+        return httpx.Client(transport=_CassetteTransport(self), timeout=None)
+
+    def async_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=_CassetteTransport(self), timeout=None)
+
+    # ------------------------------------------------------------------
+    # 녹화
+    # ------------------------------------------------------------------
+
+    def record_turn(self, **turn: Any) -> None:
+        if self.mode == "record":
+            self._append({"type": "turn", "recorded_at": time.time(), **turn})
+
+    def _record_http(self, entry: Dict[str, Any]) -> None:
+        self._append(entry)
+        self.recorded += 1
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        line = json.dumps(entry, ensure_ascii=False)
+        with self._lock:
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    # ------------------------------------------------------------------
+    # 재생
+    # ------------------------------------------------------------------
+
+    def _load(self) -> None:
+        files = sorted(self.path.glob("*.jsonl")) if self.path.is_dir() else [self.path]
+        for file in files:
+            with file.open(encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    if entry.get("type") == "turn":
+                        self.turns.append({**entry, "cassette": file.name})
+                    elif entry.get("type") == "http":
+                        entry["used"] = False
+                        self._by_key[entry["key"]].append(entry)
+                        self._by_route[entry["route"]].append(entry)
+
+    def take(self, key: str, route: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._pop_unused(self._by_key.get(key))
+            if entry is None and not self.strict:
+                entry = self._pop_unused(self._by_route.get(route))
+            if entry is None:
+                self.misses.append(route)
+                return None
+            entry["used"] = True
+            self.replayed += 1
+            return entry
+
+    @staticmethod
+    def _pop_unused(queue: Optional[Deque[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        while queue:
+            entry = queue.popleft()
+            if not entry["used"]:
+                return entry
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "recorded": self.recorded,
+            "replayed": self.replayed,
+            "misses": len(self.misses),
+        }
+
+
+class _CassetteTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """녹화 모드에서는 실제 전송 계층을 감싸고, 재생 모드에서는 카세트에서 응답을 만듭니다."""
+
+    def __init__(self, cassette: Cassette) -> None:
+        self.cassette = cassette
+        self._sync: Optional[httpx.BaseTransport] = None
+        self._async: Optional[httpx.AsyncBaseTransport] = None
+
+    def _describe(self, request: httpx.Request) -> Tuple[Any, str, str]:
+        body = _request_body(request)
+        method, path = request.method, request.url.path
+        return body, request_key(method, path, body), request_route(method, path, body)
+
+    # -------------------------- 비동기 --------------------------
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body, key, route = self._describe(request)
+        if self.cassette.mode == "replay":
+            entry = self.cassette.take(key, route)
+            if entry is None:
+                return _miss_response(route)
+            await asyncio.sleep(entry["response"]["headers_at"] * self.cassette.latency_scale)
+            return _replay_response(entry, _ReplayAsyncStream(entry, self.cassette.latency_scale))
+
+        if self._async is None:
+            self._async = self.cassette.upstream_async or httpx.AsyncHTTPTransport()
+        request.headers["accept-encoding"] = "identity"
+        started = time.perf_counter()
+        response = await self._async.handle_async_request(request)
+        recorder = _Recorder(self.cassette, request, body, key, route, response, started)
+        return _recorded_response(response, _RecordingAsyncStream(response.stream, recorder))
+
+    async def aclose(self) -> None:
+        if self._async is not None and self._async is not self.cassette.upstream_async:
+            await self._async.aclose()
+
+    # -------------------------- 동기 --------------------------
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        body, key, route = self._describe(request)
+        if self.cassette.mode == "replay":
+            entry = self.cassette.take(key, route)
+            if entry is None:
+                return _miss_response(route)
+            time.sleep(entry["response"]["headers_at"] * self.cassette.latency_scale)
+            return _replay_response(entry, _ReplaySyncStream(entry, self.cassette.latency_scale))
+
+        if self._sync is None:
+            self._sync = self.cassette.upstream_sync or httpx.HTTPTransport()
+        request.headers["accept-encoding"] = "identity"
+        started = time.perf_counter()
+        response = self._sync.handle_request(request)
+        recorder = _Recorder(self.cassette, request, body, key, route, response, started)
+        return _recorded_response(response, _RecordingSyncStream(response.stream, recorder))
+
+    def close(self) -> None:
+        if self._sync is not None and self._sync is not self.cassette.upstream_sync:
+            self._sync.close()
+
+
+# ======================================================================
+# 녹화 스트림
+# ======================================================================
+
+
+class _Recorder:
+    def __init__(self, cassette, request, body, key, route, response, started) -> None:
+        self.cassette = cassette
+        self.entry = {
+            "type": "http",
+            "key": key,
+            "route": route,
+            "request": {"method": request.method, "url": str(request.url), "body": body},
+            "response": {
+                "status": response.status_code,
+                "headers": [
+                    [name, value]
+                    for name, value in response.headers.items()
+                    if name.lower() not in _DROPPED_HEADERS
+                ],
+                "headers_at": round(time.perf_counter() - started, 6),
+                "chunks": [],
+            },
+        }
+        self.started = started
+        self.closed = False
+
+    def chunk(self, data: bytes) -> None:
+        if data:
+            offset = round(time.perf_counter() - self.started, 6)
+            self.entry["response"]["chunks"].append(
+                [offset, base64.b64encode(data).decode("ascii")]
+            )
+
+    def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self.cassette._record_http(self.entry)
+
+
+class _RecordingAsyncStream(httpx.AsyncByteStream):
+    def __init__(self, inner: httpx.AsyncByteStream, recorder: _Recorder) -> None:
+        self.inner = inner
+        self.recorder = recorder
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for data in self.inner:
+            self.recorder.chunk(data)
+            yield data
+
+    async def aclose(self) -> None:
+        try:
+            await self.inner.aclose()
+        finally:
+            self.recorder.close()
+
+
+class _RecordingSyncStream(httpx.SyncByteStream):
+    def __init__(self, inner: httpx.SyncByteStream, recorder: _Recorder) -> None:
+        self.inner = inner
+        self.recorder = recorder
+
+    def __iter__(self) -> Iterator[bytes]:
+        for data in self.inner:
+            self.recorder.chunk(data)
+            yield data
+
+    def close(self) -> None:
+        try:
+            self.inner.close()
+        finally:
+            self.recorder.close()
+
+
+def _recorded_response(response: httpx.Response, stream) -> httpx.Response:
+    return httpx.Response(
+        status_code=response.status_code,
+        headers=response.headers,
+        stream=stream,
+        extensions=response.extensions,
+    )
+
+
+# ======================================================================
+# 재생 스트림
+# ======================================================================
+
+
+def _decoded_chunks(entry: Dict[str, Any]) -> List[Tuple[float, bytes]]:
+    return [(offset, base64.b64decode(data)) for offset, data in entry["response"]["chunks"]]
+
+
+class _ReplayAsyncStream(httpx.AsyncByteStream):
+    def __init__(self, entry: Dict[str, Any], scale: float) -> None:
+        self.chunks = _decoded_chunks(entry)
+        self.previous = entry["response"]["headers_at"]
+        self.scale = scale
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for offset, data in self.chunks:
+            delay = (offset - self.previous) * self.scale
+            self.previous = offset
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield data
+
+
+class _ReplaySyncStream(httpx.SyncByteStream):
+    def __init__(self, entry: Dict[str, Any], scale: float) -> None:
+        self.chunks = _decoded_chunks(entry)
+        self.previous = entry["response"]["headers_at"]
+        self.scale = scale
+
+    def __iter__(self) -> Iterator[bytes]:
+        for offset, data in self.chunks:
+            delay = (offset - self.previous) * self.scale
+            self.previous = offset
+            if delay > 0:
+                time.sleep(delay)
+            yield data
+
+
+def _replay_response(entry: Dict[str, Any], stream) -> httpx.Response:
+    return httpx.Response(
+        status_code=entry["response"]["status"],
+        headers=[tuple(header) for header in entry["response"]["headers"]],
+        stream=stream,
+    )
+
+
+def _miss_response(route: str) -> httpx.Response:
+    # 4xx는 OpenAI SDK가 재시도하지 않으므로 바로 NotFoundError로 드러남
+    return httpx.Response(
+        status_code=404,
+        json={"error": {"message": f"cassette miss: {route}", "type": "cassette_miss"}},
+    )
+
+
+# ======================================================================
+# 프로세스 전역 설정
+# ======================================================================
+
+_CASSETTE: Optional[Cassette] = None
+
+
+def cassette_from_env() -> Optional[Cassette]:
+    mode = os.getenv("LLM_CASSETTE_MODE", "off").strip().lower()
+    if mode in ("", "off", "0", "false", "no"):
+        return None
+    return Cassette(
+        os.getenv("LLM_CASSETTE_PATH", "cassettes/session.jsonl"),
+        mode,
+        latency_scale=float(os.getenv("LLM_CASSETTE_LATENCY_SCALE", "1")),
+        strict=os.getenv("LLM_CASSETTE_STRICT", "false").strip().lower() in ("1", "true", "yes", "on"),
+    )
+
+
+def get_cassette() -> Optional[Cassette]:
+    """환경변수로 켠 전역 카세트 (꺼져 있으면 None)"""
+    global _CASSETTE
+    if _CASSETTE is None:
+        _CASSETTE = cassette_from_env()
+    return _CASSETTE
+
+
+def sync_http_client() -> Optional[httpx.Client]:
+    """카세트가 켜져 있으면 녹화/재생용 동기 httpx 클라이언트, 아니면 None (SDK 기본값)"""
+    cassette = get_cassette()
+    return cassette.sync_client() if cassette else None
+
+
+def async_http_client() -> Optional[httpx.AsyncClient]:
+    cassette = get_cassette()
+    return cassette.async_client() if cassette else None
+
+
+def record_turn(**turn: Any) -> None:
+    """녹화 중이면 사용자 턴을 카세트에 남깁니다. (재생 CLI가 같은 순서로 다시 보냄)"""
+    cassette = get_cassette()
+    if cassette is not None:
+        cassette.record_turn(**turn)
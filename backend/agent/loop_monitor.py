@@ -0,0 +1,221 @@
+"""
+이벤트 루프 블로킹 감지 (Event-Loop Lag Monitor)
+
+stream_generator와 그래프 노드에는 save_chat_message, get_personalization_summary,
+save_recommendation_log 같은 동기 DB/LLM 호출이 섞여 있어, 이벤트 루프를 막아도 드러나지 않습니다.
+루프가 막히면 그 동안 모든 /chat 스트림의 토큰 전송이 함께 멈춥니다.
+
+- 지연 샘플러: 루프 위에서 interval마다 깨어나는 태스크가 예정보다 늦게 깨어난 시간(lag)을 기록합니다.
+- 블로킹 훅(선택): 별도 감시 스레드가 샘플러가 block_threshold 이상 깨어나지 못하는 것을 보면
+  그 순간 루프 스레드의 스택을 잡아, 막고 있는 앱 코드 프레임(파일:함수)을 남깁니다.
+  (asyncio debug 모드의 slow_callback_duration은 콜백 repr만 남기고 스택은 없음)
+
+최근 블로킹 보고는 GET /debug/event-loop (관리자)에서 확인합니다.
+메트릭: event_loop_lag_seconds, event_loop_blocked_seconds,
+        event_loop_blocked_total{frame}
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+
+from .metrics import metrics
+
+APP_ROOT = Path(__file__).resolve().parents[1]
+
+# 블로킹 보고에 남기는 스택 깊이
+STACK_LIMIT = 25
+
+
+def _is_app_file(filename: str, app_root: Path) -> bool:
+    if "site-packages" in filename or "dist-packages" in filename:
+        return False
+    try:
+        Path(filename).resolve().relative_to(app_root)
+    except ValueError:
+        return False
+    return True
+
+
+def _frame_info(frame_summary: traceback.FrameSummary, app_root: Path) -> Dict[str, Any]:
+    try:
+        file = str(Path(frame_summary.filename).resolve().relative_to(app_root))
+    except ValueError:
+        file = frame_summary.filename
+    return {
+        "file": file,
+        "line": frame_summary.lineno,
+        "function": frame_summary.name,
+        "code": frame_summary.line,
+    }
+
+
+def offending_frame(stack: List[traceback.FrameSummary], app_root: Path) -> Optional[traceback.FrameSummary]:
+    """가장 안쪽의 앱 코드 프레임 (없으면 가장 안쪽 프레임)"""
+    for frame_summary in reversed(stack):
+        if _is_app_file(frame_summary.filename, app_root):
+            return frame_summary
+    return stack[-1] if stack else None
+
+
+class LoopMonitor:
+    """
+    Args:
+        interval: 지연 샘플 간격(초)
+        block_threshold: 이 시간 이상 루프가 막히면 스택을 캡처 (0이면 샘플러만)
+        max_reports: 보관할 최근 블로킹 보고 수
+        app_root: 이 경로 아래 파일을 '앱 코드'로 보고 원인 프레임으로 고름
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.1,
+        block_threshold: float = 0.2,
+        max_reports: int = 20,
+        app_root: Path = APP_ROOT,
+    ) -> None:
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self.app_root = app_root
+        self.max_lag = 0.0
+        self.blocked_total = 0
+        self._reports: Deque[Dict[str, Any]] = deque(maxlen=max_reports)
+        self._lock = threading.Lock()
+        self._last_tick = time.perf_counter()
+        self._open_report: Optional[Dict[str, Any]] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """실행 중인 이벤트 루프에서 호출합니다."""
+        if self.running:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_tick = time.perf_counter()
+        self._stopping.clear()
+        self._task = asyncio.get_running_loop().create_task(self._sample())
+        if self.block_threshold > 0:
+            self._watchdog = threading.Thread(
+                target=self._watch, name="loop-monitor-watchdog", daemon=True
+            )
+            self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1)
+            self._watchdog = None
+
+    # ------------------------------------------------------------------
+    # 루프 위: 지연 샘플러
+    # ------------------------------------------------------------------
+    async def _sample(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            self._last_tick = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            self.max_lag = max(self.max_lag, lag)
+            metrics.observe("event_loop_lag_seconds", lag)
+            self._close_report(lag)
+
+    def _close_report(self, lag: float) -> None:
+        with self._lock:
+            report, self._open_report = self._open_report, None
+        if report is None:
+            return
+        report["blocked_seconds"] = round(lag, 4)
+        metrics.observe("event_loop_blocked_seconds", lag)
+        frame = report["frame"]
+        print(
+            f"   🐢 [LoopMonitor] 이벤트 루프 {lag * 1000:.0f}ms 블로킹: "
+            f"{frame['file']}:{frame['line']} {frame['function']}",
+            flush=True,
+        )
+
+    # ------------------------------------------------------------------
+    # 감시 스레드: 블로킹 중인 스택 캡처
+    # ------------------------------------------------------------------
+    def _watch(self) -> None:
+        poll = max(0.005, min(self.interval, self.block_threshold) / 2)
+        while not self._stopping.wait(poll):
+            overdue = time.perf_counter() - self._last_tick - self.interval
+            if overdue < self.block_threshold or self._open_report is not None:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            self._record(traceback.extract_stack(frame, limit=STACK_LIMIT))
+
+    def _record(self, stack: List[traceback.FrameSummary]) -> None:
+        culprit = offending_frame(stack, self.app_root)
+        if culprit is None:
+            return
+        frame = _frame_info(culprit, self.app_root)
+        report = {
+            "detected_at": time.time(),
+            "blocked_seconds": None,  # 루프가 풀리면 샘플러가 채움
+            "frame": frame,
+            "stack": [_frame_info(f, self.app_root) for f in stack],
+        }
+        with self._lock:
+            self._open_report = report
+            self._reports.append(report)
+            self.blocked_total += 1
+        metrics.inc("event_loop_blocked_total", frame=f"{frame['file']}:{frame['function']}")
+
+    # ------------------------------------------------------------------
+    def reports(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._reports)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "interval_seconds": self.interval,
+            "block_threshold_seconds": self.block_threshold,
+            "lag": metrics.histogram("event_loop_lag_seconds"),
+            "max_lag_seconds": round(self.max_lag, 4),
+            "blocked_total": self.blocked_total,
+            "recent_blocks": list(reversed(self.reports())),
+        }
+
+
+def is_loop_monitor_enabled() -> bool:
+    value = os.getenv("LOOP_MONITOR_ENABLED", "true").strip().lower()
+    return value not in ("0", "false", "no", "off")
+
+
+_MONITOR: Optional[LoopMonitor] = None
+
+
+def get_loop_monitor() -> LoopMonitor:
+    """환경변수 설정으로 만든 프로세스 전역 모니터"""
+    global _MONITOR
+    if _MONITOR is None:
+        _MONITOR = LoopMonitor(
+            interval=float(os.getenv("LOOP_LAG_INTERVAL_MS", "100")) / 1000,
+            block_threshold=float(os.getenv("LOOP_BLOCK_THRESHOLD_MS", "200")) / 1000,
+            max_reports=int(os.getenv("LOOP_BLOCK_REPORTS", "20")),
+        )
+    return _MONITOR
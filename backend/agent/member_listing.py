@@ -0,0 +1,205 @@
+"""
+관리자 회원 목록 페이지네이션 (Keyset Pagination + 저렴한 전체 건수)
+
+회원 전체를 한 번에 돌려주던 /users/admin/members를 페이지 단위로 나눕니다.
+
+- 키셋 페이지네이션: member_id DESC 순서로 "마지막으로 본 member_id보다 작은 것"을 LIMIT만큼
+  (OFFSET처럼 앞 페이지를 다시 읽지 않으므로 몇 번째 페이지든 비용이 같음)
+- 서버 측 필터: 상태(member_status), 권한(role_type), 가입일 범위(join_dt)
+- 전체 건수는 기본적으로 추정치
+  - 필터 없음: pg_class.reltuples (ANALYZE/autovacuum이 갱신하는 통계, 카탈로그 한 행 조회)
+  - 필터 있음: EXPLAIN의 예상 행 수
+  - count=exact일 때만 COUNT(*)
+- 커서는 불투명 문자열 (base64 "m:<member_id>")
+
+인덱스: agent/migrations/member/0002_member_listing_indexes.sql
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+MEMBER_STATUSES = ("NORMAL", "LOCK", "DORMANT", "WITHDRAW_REQ", "WITHDRAW")
+MEMBER_ROLES = ("USER", "ADMIN")
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+_LIST_FROM = """
+    FROM tb_member_basic_m b
+    LEFT JOIN tb_member_profile_t p ON b.member_id = p.member_id
+    LEFT JOIN tb_member_status_t s ON b.member_id = s.member_id
+"""
+
+_LIST_COLUMNS = """
+    SELECT
+        b.member_id,
+        p.email,
+        p.nickname,
+        b.join_dt,
+        s.member_status,
+        b.join_channel
+"""
+
+ESTIMATE_TABLE_SQL = "SELECT reltuples::bigint AS estimate FROM pg_class WHERE oid = 'tb_member_basic_m'::regclass"
+
+
+@dataclass(frozen=True)
+class MemberFilters:
+    status: Optional[str] = None
+    role: Optional[str] = None
+    joined_from: Optional[date] = None
+    joined_to: Optional[date] = None  # 포함 (해당 날짜 끝까지)
+
+    @property
+    def empty(self) -> bool:
+        return not (self.status or self.role or self.joined_from or self.joined_to)
+
+
+# ==========================================
+# 커서
+# ==========================================
+def encode_cursor(member_id: int) -> str:
+    return base64.urlsafe_b64encode(f"m:{member_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> int:
+    """잘못된 커서는 ValueError"""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+    except (binascii.Error, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+    prefix, _, value = raw.partition(":")
+    if prefix != "m" or not value.isdigit():
+        raise ValueError("Invalid cursor")
+    return int(value)
+
+
+# ==========================================
+# 쿼리
+# ==========================================
+def _where(filters: MemberFilters, after_id: Optional[int] = None) -> Tuple[str, Dict[str, Any]]:
+    conditions: List[str] = []
+    params: Dict[str, Any] = {}
+    if filters.status:
+        # 상태 행이 없는 회원은 NORMAL (드문 상태는 status 인덱스로 바로 찾도록 OR로 분리)
+        if filters.status == "NORMAL":
+            conditions.append("(s.member_status = 'NORMAL' OR s.member_status IS NULL)")
+        else:
+            conditions.append("s.member_status = %(status)s")
+            params["status"] = filters.status
+    if filters.role:
+        if filters.role == "USER":
+            conditions.append("(b.role_type = 'USER' OR b.role_type IS NULL)")
+        else:
+            conditions.append("b.role_type = %(role)s")
+            params["role"] = filters.role
+    if filters.joined_from:
+        conditions.append("b.join_dt >= %(joined_from)s")
+        params["joined_from"] = filters.joined_from
+    if filters.joined_to:
+        conditions.append("b.join_dt < %(joined_before)s")
+        params["joined_before"] = filters.joined_to + timedelta(days=1)
+    if after_id is not None:
+        conditions.append("b.member_id < %(after_id)s")
+        params["after_id"] = after_id
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return where, params
+
+
+def build_page_query(filters: MemberFilters, after_id: Optional[int], limit: int) -> Tuple[str, Dict[str, Any]]:
+    """limit + 1건을 읽어 다음 페이지 존재 여부를 판단"""
+    where, params = _where(filters, after_id)
+    params["limit"] = limit + 1
+    sql = f"{_LIST_COLUMNS} {_LIST_FROM} {where} ORDER BY b.member_id DESC LIMIT %(limit)s"
+    return sql, params
+
+
+def _row_value(row, key: str, index: int = 0):
+    return row[key] if isinstance(row, dict) else row[index]
+
+
+def estimate_total(cur, filters: MemberFilters) -> Optional[int]:
+    """통계 기반 추정치 (통계가 아직 없으면 None)"""
+    if filters.empty:
+        cur.execute(ESTIMATE_TABLE_SQL)
+        row = cur.fetchone()
+        estimate = int(_row_value(row, "estimate")) if row else -1
+        # 한 번도 ANALYZE되지 않은 테이블은 -1 (PG14+) 또는 0
+        return estimate if estimate > 0 else None
+
+    where, params = _where(filters)
+    cur.execute(f"EXPLAIN (FORMAT JSON) SELECT 1 {_LIST_FROM} {where}", params)
+    plan = _row_value(cur.fetchone(), "QUERY PLAN")
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def exact_total(cur, filters: MemberFilters) -> int:
+    where, params = _where(filters)
+    cur.execute(f"SELECT COUNT(*) AS total {_LIST_FROM} {where}", params)
+    return int(_row_value(cur.fetchone(), "total"))
+
+
+def count_members(cur, filters: MemberFilters, mode: str) -> Optional[Dict[str, Any]]:
+    """mode: estimate | exact | none"""
+    if mode == "none":
+        return None
+    if mode == "estimate":
+        estimate = estimate_total(cur, filters)
+        if estimate is not None:
+            return {"count": estimate, "exact": False}
+    return {"count": exact_total(cur, filters), "exact": True}
+
+
+def fetch_page(cur, filters: MemberFilters, after_id: Optional[int], limit: int) -> Tuple[List[dict], Optional[str]]:
+    """
+    Returns:
+        (회원 행 목록, 다음 페이지 커서 또는 None)
+    """
+    sql, params = build_page_query(filters, after_id, limit)
+    cur.execute(sql, params)
+    rows = cur.fetchall()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(_row_value(rows[-1], "member_id"))
+    return rows, next_cursor
+
+
+# ==========================================
+# 스트리밍 JSON
+# ==========================================
+def stream_page_json(
+    rows: List[dict],
+    next_cursor: Optional[str],
+    total: Optional[Dict[str, Any]],
+    limit: int,
+    encode=None,
+) -> Iterator[bytes]:
+    """
+    {"members": [...], "next_cursor": ..., "has_more": ..., "limit": ..., "total": ...}
+    회원 행을 하나씩 직렬화해 내보내므로 응답 전체 문자열을 메모리에 만들지 않습니다.
+    """
+    if encode is None:
+        from fastapi.encoders import jsonable_encoder
+
+        encode = jsonable_encoder
+
+    def dumps(value) -> str:
+        return json.dumps(encode(value), ensure_ascii=False, separators=(",", ":"))
+
+    yield b'{"members":['
+    for index, row in enumerate(rows):
+        yield (("," if index else "") + dumps(dict(row))).encode()
+    tail = {
+        "next_cursor": next_cursor,
+        "has_more": next_cursor is not None,
+        "limit": limit,
+        "total": total,
+    }
+    yield ("]," + dumps(tail)[1:]).encode()
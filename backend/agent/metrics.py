@@ -0,0 +1,123 @@
+"""
+경량 인프로세스 메트릭 레지스트리
+
+외부 모니터링 의존성 없이 카운터/게이지/히스토그램을 기록하고,
+`/metrics` 엔드포인트나 벤치마크 스크립트에서 스냅샷으로 조회합니다.
+
+사용 예:
+    from agent.metrics import metrics
+    metrics.inc("speculative_wasted_total", stage="supervisor_routing")
+    metrics.observe("ttft_seconds", 0.42)
+"""
+
+import threading
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict
+
+# 히스토그램당 보관하는 최근 샘플 수 (분위수 계산용)
+HISTOGRAM_WINDOW = 1024
+
+
+def _metric_key(name: str, labels: Dict[str, Any]) -> str:
+    """메트릭 이름과 라벨을 `name{k=v,...}` 형태의 키로 변환합니다."""
+    if not labels:
+        return name
+    label_text = ",".join(f"{k}={labels[k]}" for k in sorted(labels))
+    return f"{name}{{{label_text}}}"
+
+
+def _percentile(sorted_values: list, ratio: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(ratio * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class _Histogram:
+    __slots__ = ("count", "total", "maximum", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self.samples: Deque[float] = deque(maxlen=HISTOGRAM_WINDOW)
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.maximum = max(self.maximum, value)
+        self.samples.append(value)
+
+    def summary(self) -> Dict[str, float]:
+        ordered = sorted(self.samples)
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "p50": round(_percentile(ordered, 0.50), 6),
+            "p95": round(_percentile(ordered, 0.95), 6),
+            "max": round(self.maximum, 6),
+        }
+
+
+class MetricsRegistry:
+    """스레드 안전한 카운터/게이지/히스토그램 저장소"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = defaultdict(float)
+        self._gauges: Dict[str, float] = {}
+        self._histograms: Dict[str, _Histogram] = {}
+
+    def inc(self, name: str, value: float = 1, **labels: Any) -> None:
+        key = _metric_key(name, labels)
+        with self._lock:
+            self._counters[key] += value
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        key = _metric_key(name, labels)
+        with self._lock:
+            self._gauges[key] = value
+
+    def add_gauge(self, name: str, delta: float, **labels: Any) -> None:
+        key = _metric_key(name, labels)
+        with self._lock:
+            self._gauges[key] = self._gauges.get(key, 0) + delta
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        key = _metric_key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram()
+            histogram.observe(value)
+
+    def counter(self, name: str, **labels: Any) -> float:
+        with self._lock:
+            return self._counters.get(_metric_key(name, labels), 0)
+
+    def gauge(self, name: str, **labels: Any) -> float:
+        with self._lock:
+            return self._gauges.get(_metric_key(name, labels), 0)
+
+    def histogram(self, name: str, **labels: Any) -> Dict[str, float]:
+        with self._lock:
+            histogram = self._histograms.get(_metric_key(name, labels))
+            return histogram.summary() if histogram else _Histogram().summary()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "histograms": {k: h.summary() for k, h in self._histograms.items()},
+            }
+
+    def reset(self) -> None:
+        """테스트/벤치마크 전용: 모든 값을 초기화합니다."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+
+metrics = MetricsRegistry()
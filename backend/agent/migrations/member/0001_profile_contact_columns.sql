@@ -0,0 +1,4 @@
+-- 프로필 보조 이메일 / 프로필 이미지 URL
+-- (기존 routers/users.py::_ensure_profile_columns가 요청마다 실행하던 DDL)
+ALTER TABLE tb_member_profile_t ADD COLUMN IF NOT EXISTS sub_email VARCHAR(100);
+ALTER TABLE tb_member_profile_t ADD COLUMN IF NOT EXISTS profile_image_url VARCHAR(255);
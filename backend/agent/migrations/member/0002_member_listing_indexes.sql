@@ -0,0 +1,7 @@
+-- 관리자 회원 목록 (agent/member_listing.py) 필터용 인덱스
+-- 정렬/키셋 조건(member_id DESC)은 기본키로 처리하고, 드문 값 필터는 아래 인덱스로 바로 찾음
+-- 러너가 한 트랜잭션으로 적용하므로 CONCURRENTLY는 쓰지 않음
+-- (운영 중 대형 테이블이면 이 버전을 기록하기 전에 CREATE INDEX CONCURRENTLY로 미리 생성)
+CREATE INDEX IF NOT EXISTS ix_member_basic_role_member ON tb_member_basic_m (role_type, member_id DESC);
+CREATE INDEX IF NOT EXISTS ix_member_basic_join_dt_member ON tb_member_basic_m (join_dt, member_id DESC);
+CREATE INDEX IF NOT EXISTS ix_member_status_status_member ON tb_member_status_t (member_status, member_id DESC);
@@ -0,0 +1,258 @@
+"""
+모델 지연/오류 기반 자동 강등 (Adaptive Model Degradation)
+
+writer(SUPER_SMART_LLM)와 router(SMART_LLM) 호출의 최근 지연(p95)과 업스트림 오류율을
+역할(role)별로 추적하다가, 임계치를 넘으면 일정 시간 FAST_LLM으로 우회합니다.
+
+- 강등: 최근 window_seconds 동안 표본이 min_samples 이상이고
+        p95 > p95_threshold 또는 오류율 > error_threshold
+- 강등 중에는 probe_ratio 비율의 호출만 원래 모델로 보내 회복 여부를 측정합니다.
+- 복귀(히스테리시스): 강등 후 min_hold_seconds가 지났고, 강등 이후의 probe 표본이
+        min_probe_samples 이상이며 p95 < p95_threshold × recover_ratio,
+        오류율 < error_threshold × recover_ratio 일 때
+- writer는 첫 토큰 시간(TTFT), router는 전체 응답 시간을 지연으로 기록합니다.
+- 오류율에는 업스트림 장애(타임아웃/연결/429/5xx)만 포함합니다. (파싱 오류 등 제외)
+
+상태는 /health 응답의 models 항목으로 확인할 수 있습니다.
+"""
+
+import asyncio
+import os
+import random
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Optional, Tuple
+
+from .metrics import metrics
+
+try:
+    import openai
+
+    UPSTREAM_ERRORS: Tuple[type, ...] = (
+        asyncio.TimeoutError,
+        openai.APIConnectionError,  # APITimeoutError 포함
+        openai.RateLimitError,
+        openai.InternalServerError,
+    )
+except ImportError:  # pragma: no cover
+    UPSTREAM_ERRORS = (asyncio.TimeoutError,)
+
+
+def is_upstream_error(error: BaseException) -> bool:
+    return isinstance(error, UPSTREAM_ERRORS)
+
+
+@dataclass(frozen=True)
+class DegradationPolicy:
+    p95_threshold: float
+    error_threshold: float = 0.25
+    recover_ratio: float = 0.7
+    window_seconds: float = 60.0
+    min_samples: int = 10
+    min_probe_samples: int = 5
+    min_hold_seconds: float = 30.0
+    probe_ratio: float = 0.1
+
+
+@dataclass
+class _RoleState:
+    policy: DegradationPolicy
+    samples: Deque[Tuple[float, float, bool]] = field(default_factory=deque)
+    degraded: bool = False
+    degraded_since: float = 0.0
+    transitions: int = 0
+
+
+def _p95(values) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(0.95 * (len(ordered) - 1) + 0.5))]
+
+
+class DegradationController:
+    """
+    Args:
+        policies: 역할별 강등 정책 {"writer": ..., "router": ...}
+        clock: 시뮬레이션 테스트용 시계
+        rng: probe 선택용 난수 생성기
+    """
+
+    def __init__(
+        self,
+        policies: Dict[str, DegradationPolicy],
+        clock: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None,
+        enabled: bool = True,
+    ) -> None:
+        self._roles = {role: _RoleState(policy) for role, policy in policies.items()}
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self.enabled = enabled
+
+    # ------------------------------------------------------------------
+    # 선택 / 기록
+    # ------------------------------------------------------------------
+
+    def choose(self, role: str, primary: Any, fallback: Any) -> Tuple[Any, bool]:
+        """
+        이번 호출에 쓸 모델을 고릅니다.
+
+        Returns:
+            (model, is_primary) — is_primary일 때만 record()로 결과를 남기면 됩니다.
+        """
+        state = self._roles.get(role)
+        if not self.enabled or state is None or not state.degraded:
+            return primary, True
+        if self._rng.random() < state.policy.probe_ratio:
+            metrics.inc("model_degradation_probe_total", role=role)
+            return primary, True
+        return fallback, False
+
+    def record(self, role: str, latency: float, ok: bool = True) -> None:
+        """원래 모델(primary) 호출 결과를 기록하고 강등/복귀를 판단합니다."""
+        state = self._roles.get(role)
+        if state is None:
+            return
+        now = self._clock()
+        state.samples.append((now, latency, ok))
+        self._expire(state, now)
+        self._evaluate(role, state, now)
+
+    @asynccontextmanager
+    async def track(self, role: str, is_primary: bool = True) -> AsyncIterator[Callable[[], None]]:
+        """
+        async with controller.track("router", is_primary) as mark_first_token:
+            ...
+
+        블록이 끝나면(또는 mark_first_token() 시점에) 지연을 기록합니다.
+        업스트림 오류로 끝나면 실패로 기록합니다.
+        """
+        started_at = self._clock()
+        first_token_at: Optional[float] = None
+
+        def mark_first_token() -> None:
+            nonlocal first_token_at
+            if first_token_at is None:
+                first_token_at = self._clock()
+
+        try:
+            yield mark_first_token
+        except BaseException as error:
+            if is_primary and is_upstream_error(error):
+                self.record(role, self._clock() - started_at, ok=False)
+            raise
+        else:
+            if is_primary:
+                ended_at = first_token_at if first_token_at is not None else self._clock()
+                self.record(role, ended_at - started_at, ok=True)
+
+    # ------------------------------------------------------------------
+    # 판단
+    # ------------------------------------------------------------------
+
+    def _expire(self, state: _RoleState, now: float) -> None:
+        horizon = now - state.policy.window_seconds
+        while state.samples and state.samples[0][0] < horizon:
+            state.samples.popleft()
+
+    def _stats(self, state: _RoleState) -> Tuple[int, float, float]:
+        samples = state.samples
+        if not samples:
+            return 0, 0.0, 0.0
+        latencies = [latency for _, latency, ok in samples if ok]
+        errors = sum(1 for _, _, ok in samples if not ok)
+        return len(samples), _p95(latencies), errors / len(samples)
+
+    def _evaluate(self, role: str, state: _RoleState, now: float) -> None:
+        policy = state.policy
+        count, p95, error_rate = self._stats(state)
+        if not state.degraded:
+            if count >= policy.min_samples and (
+                p95 > policy.p95_threshold or error_rate > policy.error_threshold
+            ):
+                self._transition(role, state, now, degraded=True, p95=p95, error_rate=error_rate)
+            return
+
+        if now - state.degraded_since < policy.min_hold_seconds:
+            return
+        if (
+            count >= policy.min_probe_samples
+            and p95 < policy.p95_threshold * policy.recover_ratio
+            and error_rate < policy.error_threshold * policy.recover_ratio
+        ):
+            self._transition(role, state, now, degraded=False, p95=p95, error_rate=error_rate)
+
+    def _transition(
+        self, role: str, state: _RoleState, now: float, *, degraded: bool, p95: float, error_rate: float
+    ) -> None:
+        state.degraded = degraded
+        state.degraded_since = now if degraded else 0.0
+        state.transitions += 1
+        # 강등 이후에는 probe 표본만으로 회복을 판단
+        state.samples.clear()
+        metrics.set_gauge("model_degraded", 1 if degraded else 0, role=role)
+        metrics.inc("model_degradation_transitions_total", role=role, to="fast" if degraded else "primary")
+        arrow = "⬇️ degraded to FAST_LLM" if degraded else "⬆️ recovered"
+        print(
+            f"   🩺 [ModelHealth] {role} {arrow} (p95={p95:.2f}s, errors={error_rate:.0%})",
+            flush=True,
+        )
+
+    # ------------------------------------------------------------------
+    # 상태
+    # ------------------------------------------------------------------
+
+    def is_degraded(self, role: str) -> bool:
+        state = self._roles.get(role)
+        return bool(state and state.degraded)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        now = self._clock()
+        result: Dict[str, Dict[str, Any]] = {}
+        for role, state in self._roles.items():
+            self._expire(state, now)
+            count, p95, error_rate = self._stats(state)
+            result[role] = {
+                "state": "degraded" if state.degraded else "normal",
+                "p95_seconds": round(p95, 3),
+                "error_rate": round(error_rate, 3),
+                "samples": count,
+                "degraded_for_seconds": round(now - state.degraded_since, 1) if state.degraded else 0.0,
+                "transitions": state.transitions,
+            }
+        return result
+
+
+def _policy_from_env(role: str, p95_default: float) -> DegradationPolicy:
+    prefix = f"MODEL_DEGRADE_{role.upper()}"
+    return DegradationPolicy(
+        p95_threshold=float(os.getenv(f"{prefix}_P95_SECONDS", str(p95_default))),
+        error_threshold=float(os.getenv(f"{prefix}_ERROR_RATE", "0.25")),
+        window_seconds=float(os.getenv("MODEL_DEGRADE_WINDOW_SECONDS", "60")),
+        min_samples=int(os.getenv("MODEL_DEGRADE_MIN_SAMPLES", "10")),
+        min_hold_seconds=float(os.getenv("MODEL_DEGRADE_HOLD_SECONDS", "30")),
+        probe_ratio=float(os.getenv("MODEL_DEGRADE_PROBE_RATIO", "0.1")),
+    )
+
+
+def build_default_controller() -> DegradationController:
+    enabled = os.getenv("MODEL_DEGRADATION_ENABLED", "true").strip().lower() not in (
+        "0",
+        "false",
+        "no",
+        "off",
+    )
+    return DegradationController(
+        {
+            # writer: 첫 토큰 시간 기준 / router: 구조화 응답 전체 시간 기준
+            "writer": _policy_from_env("writer", 6.0),
+            "router": _policy_from_env("router", 4.0),
+        },
+        enabled=enabled,
+    )
+
+
+MODEL_DEGRADATION = build_default_controller()
@@ -0,0 +1,178 @@
+"""
+순서 보장 스트림 멀티플렉서 (Ordered Fan-in)
+
+추천 섹션 작성(RecoWriter.generate_section)을 동시에 K개까지 실행하면서도
+사용자에게는 1 → 2 → 3 순서 그대로 토큰이 흘러가도록 합니다.
+
+- 선두(head) 섹션의 토큰은 즉시 sink로 내보냅니다.
+- 뒤 섹션의 토큰은 버퍼에 쌓아 두었다가, 앞 섹션이 끝나는 순간 한 번에 내보내고
+  그 섹션을 새 선두로 삼습니다. (이미 끝난 섹션이면 연달아 다음 섹션으로 진행)
+- 섹션은 submit() 순서가 곧 출력 순서입니다.
+- formatter를 주면 섹션이 선두가 되는 순간(앞 섹션이 모두 끝난 뒤) 실제로 화면에 나간
+  앞 섹션 수로 표시 번호를 정해 formatter(번호)를 만들고, 그 섹션의 청크를 이것으로 정리해
+  내보냅니다. 앞 섹션 작성이 실패해도 스트림 번호가 1..N으로 이어집니다.
+
+전체 지연: 순차 실행 시 Σ(섹션 작성 시간) → 동시 실행 시 ≈ max(섹션 작성 시간) + 출력 시간
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, List, Optional, Protocol
+
+Emit = Callable[[str], Awaitable[None]]
+Producer = Callable[[Emit], Awaitable[Any]]
+
+
+class ChunkFormatter(Protocol):
+    """섹션 하나의 청크 정리기 (SectionHeaderRewriter와 같은 인터페이스)"""
+
+    def feed(self, chunk: str) -> str: ...
+
+    def finish(self) -> str: ...
+
+
+@dataclass
+class _Slot:
+    buffer: List[str] = field(default_factory=list)
+    done: bool = False
+    task: Optional["asyncio.Task[Any]"] = None
+    emitted: bool = False
+    formatter: Optional[ChunkFormatter] = None
+    output: List[str] = field(default_factory=list)
+
+
+class OrderedStreamMultiplexer:
+    """
+    Args:
+        sink: 순서가 보장된 청크를 받는 코루틴 함수 (order, chunk)
+        max_concurrency: 동시에 실행할 producer 수 (K)
+        formatter: 표시 번호(1부터)를 받아 ChunkFormatter를 만드는 함수 (선택)
+    """
+
+    def __init__(
+        self,
+        sink: Callable[[int, str], Awaitable[None]],
+        max_concurrency: int = 3,
+        formatter: Optional[Callable[[int], ChunkFormatter]] = None,
+    ) -> None:
+        self._sink = sink
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self._formatter = formatter
+        self._slots: List[_Slot] = []
+        self._head = 0
+        self._shown = 0  # 선두 앞에서 실제로 청크를 내보낸 섹션 수
+        self._lock = asyncio.Lock()
+
+    @property
+    def has_output(self) -> bool:
+        """지금까지 sink로 나간 청크가 있는지 (이후 섹션은 첫 섹션이 될 수 없음)"""
+        return any(slot.output for slot in self._slots)
+
+    def submit(self, producer: Producer) -> "asyncio.Task[Any]":
+        """producer(emit)를 예약합니다. 반환값(Task 결과)은 producer의 반환값입니다."""
+        order = len(self._slots)
+        slot = _Slot()
+        self._slots.append(slot)
+        if order == self._head:
+            self._activate(order)
+        slot.task = asyncio.create_task(self._run(order, producer))
+        return slot.task
+
+    async def drain(self) -> List[Any]:
+        """
+        모든 producer를 기다린 뒤 submit 순서대로 결과를 반환합니다. (예외는 None)
+
+        formatter가 있으면 producer 반환값 대신 각 섹션이 실제로 내보낸 텍스트를
+        반환합니다. (아무것도 내보내지 않은 섹션은 None) 최종 메시지가 스트림과 같아집니다.
+        """
+        results: List[Any] = []
+        for slot in list(self._slots):
+            try:
+                results.append(await slot.task)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                results.append(None)
+        if self._formatter is not None:
+            return ["".join(slot.output) or None for slot in self._slots]
+        return results
+
+    async def aclose(self) -> None:
+        """진행 중인 producer를 취소합니다. (클라이언트 이탈 등)"""
+        for slot in self._slots:
+            if slot.task is not None and not slot.task.done():
+                slot.task.cancel()
+        current = asyncio.current_task()
+        cancelling = current.cancelling() if current is not None else 0
+        for slot in self._slots:
+            if slot.task is None:
+                continue
+            try:
+                await slot.task
+            except asyncio.CancelledError:
+                # producer 쪽 취소만 삼키고, 정리 중 현재 태스크에 새로 온 취소는 그대로 전달
+                if current is not None and current.cancelling() > cancelling:
+                    raise
+            except Exception:
+                pass
+
+    async def _run(self, order: int, producer: Producer) -> Any:
+        async def emit(chunk: str) -> None:
+            if not chunk:
+                return
+            async with self._lock:
+                self._slots[order].emitted = True
+                if order == self._head:
+                    await self._send(order, chunk)
+                else:
+                    self._slots[order].buffer.append(chunk)
+
+        try:
+            async with self._semaphore:
+                result = await producer(emit)
+            # 스트리밍하지 않는 producer는 반환한 문자열을 한 번에 내보냄
+            if self._formatter is not None and isinstance(result, str) and not self._slots[order].emitted:
+                await emit(result)
+            return result
+        finally:
+            await self._complete(order)
+
+    async def _complete(self, order: int) -> None:
+        async with self._lock:
+            self._slots[order].done = True
+            # 선두가 끝났으면 다음 섹션 버퍼를 비우고 선두를 넘김
+            while self._head < len(self._slots) and self._slots[self._head].done:
+                await self._finish(self._head)
+                self._head += 1
+                if self._head < len(self._slots):
+                    await self._flush(self._head)
+
+    def _activate(self, order: int) -> None:
+        """선두가 된 섹션의 표시 번호를 정하고 formatter를 만듭니다."""
+        if self._formatter is not None:
+            self._slots[order].formatter = self._formatter(self._shown + 1)
+
+    async def _send(self, order: int, chunk: str) -> None:
+        slot = self._slots[order]
+        if slot.formatter is not None:
+            chunk = slot.formatter.feed(chunk)
+        if chunk:
+            slot.output.append(chunk)
+            await self._sink(order, chunk)
+
+    async def _finish(self, order: int) -> None:
+        slot = self._slots[order]
+        if slot.formatter is not None:
+            tail = slot.formatter.finish()
+            if tail:
+                slot.output.append(tail)
+                await self._sink(order, tail)
+        if slot.output:
+            self._shown += 1
+
+    async def _flush(self, order: int) -> None:
+        self._activate(order)
+        slot = self._slots[order]
+        buffered, slot.buffer = slot.buffer, []
+        for chunk in buffered:
+            await self._send(order, chunk)
@@ -0,0 +1,227 @@
+"""
+비밀번호 해시 전용 실행기 (Bounded Password-Hashing Executor)
+
+pbkdf2_sha256 hash/verify는 호출당 수십 ms의 CPU를 씁니다. 동기 엔드포인트 스레드에서 바로 돌리면
+로그인이 몰릴 때 모든 sync 라우트가 함께 쓰는 스레드풀과 GIL을 독차지해 무관한 API까지 느려집니다.
+
+- 전용 프로세스 풀에서 실행 (GIL 밖, PASSWORD_HASH_WORKERS개)
+- 대기+실행 중 작업 수가 PASSWORD_HASH_MAX_PENDING을 넘으면 기다리지 않고 PasswordHasherBusy → 429
+- PASSWORD_HASH_TIMEOUT_SECONDS 안에 결과가 없으면(풀 포화) PasswordHasherTimeout → 503
+- 검증 시 작업 계수(PASSWORD_HASH_ROUNDS)가 바뀌었으면 새 해시를 함께 돌려줘 호출자가 저장 (투명한 재해시)
+
+메트릭: password_hash_seconds{op}, password_hash_pending, password_hash_rejected_total{op},
+        password_hash_timeouts_total{op}, password_rehash_total
+"""
+
+import math
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException
+from passlib.context import CryptContext
+
+from .metrics import metrics
+
+SCHEMES = ["pbkdf2_sha256"]
+
+
+class PasswordHasherBusy(Exception):
+    status_code = 429
+    reason = "queue is full"
+
+    def __init__(self, op: str, retry_after: float) -> None:
+        super().__init__(f"password {op} {self.reason}")
+        self.op = op
+        self.retry_after = retry_after
+
+    def to_http(self) -> HTTPException:
+        return HTTPException(
+            status_code=self.status_code,
+            detail="로그인 요청이 많아 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": str(max(1, math.ceil(self.retry_after)))},
+        )
+
+
+class PasswordHasherTimeout(PasswordHasherBusy):
+    """슬롯은 얻었지만 timeout 안에 결과가 나오지 않음 (워커 포화) → 503"""
+
+    status_code = 503
+    reason = "timed out"
+
+
+# ==========================================
+# 워커 (프로세스 풀에서 실행되므로 모듈 최상위 함수)
+# ==========================================
+_CONTEXTS: Dict[Optional[int], CryptContext] = {}
+
+
+def build_context(rounds: Optional[int] = None) -> CryptContext:
+    """rounds를 지정하면 그보다 적은 라운드의 해시는 needs_update로 표시됩니다."""
+    if not rounds:
+        return CryptContext(schemes=SCHEMES, deprecated="auto")
+    return CryptContext(
+        schemes=SCHEMES,
+        deprecated="auto",
+        pbkdf2_sha256__default_rounds=rounds,
+        pbkdf2_sha256__min_rounds=rounds,
+    )
+
+
+def _context(rounds: Optional[int]) -> CryptContext:
+    context = _CONTEXTS.get(rounds)
+    if context is None:
+        context = _CONTEXTS[rounds] = build_context(rounds)
+    return context
+
+
+def _hash(password: str, rounds: Optional[int]) -> str:
+    return _context(rounds).hash(password)
+
+
+def _verify_and_update(password: str, pwd_hash: str, rounds: Optional[int]) -> Tuple[bool, Optional[str]]:
+    return _context(rounds).verify_and_update(password, pwd_hash)
+
+
+# ==========================================
+# 실행기
+# ==========================================
+class PasswordHasher:
+    """
+    Args:
+        workers: 해시 워커 수
+        max_pending: 대기+실행 중 허용 작업 수 (넘으면 PasswordHasherBusy)
+        rounds: pbkdf2 라운드 (None이면 passlib 기본값)
+        timeout: 작업 1개 최대 대기 시간(초)
+        use_processes: False면 스레드 풀 (GIL은 공유하지만 동시 실행 수 제한은 동일)
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_pending: int = 8,
+        rounds: Optional[int] = None,
+        timeout: float = 10.0,
+        use_processes: bool = True,
+    ) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self.rounds = rounds
+        self.timeout = timeout
+        self.use_processes = use_processes
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._avg_seconds = 0.05
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.use_processes:
+                    # 스레드가 많은 서버 프로세스를 fork하지 않도록 spawn
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers, thread_name_prefix="password-hash"
+                    )
+            return self._executor
+
+    def _run(self, op: str, fn: Callable, *args):
+        if not self._slots.acquire(blocking=False):
+            metrics.inc("password_hash_rejected_total", op=op)
+            # 앞선 작업들이 빠지는 데 걸릴 대략적인 시간
+            raise PasswordHasherBusy(op, self._avg_seconds * self.max_pending / self.workers)
+
+        metrics.add_gauge("password_hash_pending", 1)
+        started = time.perf_counter()
+
+        def release(_future=None) -> None:
+            metrics.add_gauge("password_hash_pending", -1)
+            self._slots.release()
+
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            release()
+            raise
+        try:
+            result = future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            # 타임아웃으로 먼저 반환해도 작업이 끝날 때까지 슬롯을 잡아 둠
+            future.add_done_callback(release)
+            metrics.inc("password_hash_timeouts_total", op=op)
+            raise PasswordHasherTimeout(op, self._avg_seconds * self.max_pending / self.workers)
+        except BaseException:
+            release()
+            raise
+        release()
+        elapsed = time.perf_counter() - started
+        self._avg_seconds = 0.8 * self._avg_seconds + 0.2 * elapsed
+        metrics.observe("password_hash_seconds", elapsed, op=op)
+        return result
+
+    def hash(self, password: str) -> str:
+        return self._run("hash", _hash, password, self.rounds)
+
+    def verify(self, password: str, pwd_hash: str) -> Tuple[bool, Optional[str]]:
+        """
+        Returns:
+            (일치 여부, 새 해시) - 작업 계수가 바뀐 해시면 새 해시, 아니면 None
+        """
+        ok, new_hash = self._run("verify", _verify_and_update, password, pwd_hash, self.rounds)
+        if ok and new_hash:
+            metrics.inc("password_rehash_total")
+        return ok, new_hash
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+_HASHER: Optional[PasswordHasher] = None
+_HASHER_LOCK = threading.Lock()
+
+
+def get_password_hasher() -> PasswordHasher:
+    """환경변수 설정으로 만든 프로세스 전역 해시 실행기"""
+    global _HASHER
+    with _HASHER_LOCK:
+        if _HASHER is None:
+            workers = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(2, os.cpu_count() or 1))))
+            rounds = int(os.getenv("PASSWORD_HASH_ROUNDS", "0")) or None
+            use_processes = os.getenv("PASSWORD_HASH_POOL_ENABLED", "true").strip().lower() not in (
+                "0", "false", "no", "off",
+            )
+            _HASHER = PasswordHasher(
+                workers=workers,
+                max_pending=int(os.getenv("PASSWORD_HASH_MAX_PENDING", str(workers * 4))),
+                rounds=rounds,
+                timeout=float(os.getenv("PASSWORD_HASH_TIMEOUT_SECONDS", "10")),
+                use_processes=use_processes,
+            )
+        return _HASHER
+
+
+def hash_password(password: str) -> str:
+    """라우터용: 대기열이 가득 차면 429, 시간 안에 처리하지 못하면 503"""
+    try:
+        return get_password_hasher().hash(password)
+    except PasswordHasherBusy as e:
+        raise e.to_http()
+
+
+def verify_password(password: str, pwd_hash: str) -> Tuple[bool, Optional[str]]:
+    """라우터용: (일치 여부, 저장할 새 해시 또는 None), 대기열이 가득 차면 429, 시간 초과면 503"""
+    try:
+        return get_password_hasher().verify(password, pwd_hash)
+    except PasswordHasherBusy as e:
+        raise e.to_http()
@@ -5,9 +5,17 @@ tb_member_my_perfume_t 기반 사용자 취향을 분석하여
 추천 시스템에 주입할 수 있는 형태로 요약합니다.
 """
 
+import asyncio
+import copy
 from typing import List, Dict, Any, Optional
 from collections import defaultdict
 from .archive_db import get_my_perfumes, get_perfume_notes_and_accords
+from .profile_cache import (
+    PERFUME_FEATURE_CACHE,
+    PROFILE_CACHE,
+    PersonalizationProfile,
+    is_profile_cache_enabled,
+)
 
 # =================================================================
 # 개인화 신호 가중치 설정
@@ -109,22 +117,72 @@ def get_personalization_summary(member_id: int) -> Dict[str, Any]:
     if not member_id or member_id == 0:
         return _empty_summary()
 
-    # DB에서 개인화 데이터 조회
+    if not is_profile_cache_enabled():
+        return build_personalization_profile(member_id).summary
+
+    # 캐시 (아카이브 변경 시 profile_cache.invalidate_personalization으로 무효화)
+    cached = PROFILE_CACHE.get(member_id)
+    if cached is not None:
+        return copy.deepcopy(cached.summary)
+    return _build_and_cache(member_id)
+
+
+async def aget_personalization_summary(member_id: int) -> Dict[str, Any]:
+    """
+    그래프용 비동기 접근자
+
+    캐시 적중이면 루프에서 바로 반환하고, 미스일 때만 DB 조회를 스레드로 넘겨
+    이벤트 루프를 막지 않습니다.
+    """
+    if not member_id:
+        return _empty_summary()
+    if not is_profile_cache_enabled():
+        return await asyncio.to_thread(get_personalization_summary, member_id)
+    cached = PROFILE_CACHE.get(member_id)
+    if cached is not None:
+        return copy.deepcopy(cached.summary)
+    return await asyncio.to_thread(_build_and_cache, member_id)
+
+
+def _build_and_cache(member_id: int) -> Dict[str, Any]:
+    # 계산 도중 아카이브가 바뀌면(세대 변경) 결과를 저장하지 않음
+    generation = PROFILE_CACHE.generation(member_id)
+    profile = build_personalization_profile(member_id)
+    PROFILE_CACHE.put(member_id, profile, generation)
+    return copy.deepcopy(profile.summary)
+
+
+def build_personalization_profile(member_id: int) -> PersonalizationProfile:
+    """
+    DB에서 개인화 프로필 계산 (점수 벡터 + 요약)
+
+    Returns:
+        PersonalizationProfile, 조회 오류가 있었으면 degraded=True (캐시하지 않음)
+    """
+    # DB에서 개인화 데이터 조회 (오류는 빈 아카이브와 구분해 예외로 받음)
     try:
-        my_perfumes = get_my_perfumes(member_id)
+        my_perfumes = get_my_perfumes(member_id, raise_errors=True)
     except Exception as e:
         print(f"⚠️ [Personalization] Error fetching my_perfumes: {e}")
-        return _empty_summary()
+        return PersonalizationProfile(summary=_empty_summary(), degraded=True)
 
     if not my_perfumes:
-        return _empty_summary()
+        return PersonalizationProfile(summary=_empty_summary())
 
     # 최근 N개만 사용 (성능)
     my_perfumes = my_perfumes[:QUERY_LIMIT]
 
-    # [★추가] Notes/Accords 조회
+    # [★추가] Notes/Accords 조회 (향수별 캐시에 없는 ID만 DB 조회)
     perfume_ids = [p['perfume_id'] for p in my_perfumes]
-    notes_accords_map = get_perfume_notes_and_accords(perfume_ids)
+    if is_profile_cache_enabled():
+        notes_accords_map, unresolved_ids = PERFUME_FEATURE_CACHE.get_many(perfume_ids, get_perfume_notes_and_accords)
+    else:
+        notes_accords_map = get_perfume_notes_and_accords(perfume_ids)
+        unresolved_ids = [pid for pid in perfume_ids if pid not in notes_accords_map]
+    # 요청한 ID는 행이 없어도 빈 목록으로 채워지므로, 빠진 ID는 조회 실패(오류를 삼키고 {} 반환)
+    degraded = bool(unresolved_ids)
+    if degraded:
+        print(f"⚠️ [Personalization] notes/accords unavailable for {len(unresolved_ids)} perfume(s) of member {member_id}, not caching profile")
 
     # 점수 계산
     scored_perfumes = []
@@ -191,7 +249,7 @@ def get_personalization_summary(member_id: int) -> Dict[str, Any]:
         disliked_accords=disliked_accords,
     )
 
-    return {
+    summary = {
         "liked_perfumes": liked,
         "disliked_perfumes": disliked,
         "liked_brands": liked_brands,
@@ -203,6 +261,13 @@ def get_personalization_summary(member_id: int) -> Dict[str, Any]:
         "total_count": len(my_perfumes),
         "summary_text": summary_text,
     }
+    return PersonalizationProfile(
+        summary=summary,
+        brand_scores=dict(brand_scores),
+        note_scores=dict(note_scores),
+        accord_scores=dict(accord_scores),
+        degraded=degraded,
+    )
 
 
 def _empty_summary() -> Dict[str, Any]:
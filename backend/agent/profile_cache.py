@@ -0,0 +1,165 @@
+"""
+개인화 프로필 캐시 (Per-member Personalization Profile Cache)
+
+parallel_reco_node는 추천 턴마다 get_personalization_summary를 부르고, 매번
+get_my_perfumes(recom_db + perfume_db 왕복 2회)와 get_perfume_notes_and_accords를 다시 돌립니다.
+아카이브(tb_member_my_perfume_t)가 바뀌지 않았다면 결과는 같으므로 회원별로 계산 결과를 보관합니다.
+
+- ProfileCache: 회원별 브랜드/노트/어코드 점수 벡터 + 요약. 아카이브 변경 시 해당 회원만 무효화
+  (add_my_perfume, archive_db의 add/delete/update가 커밋 후 invalidate 호출)
+  계산 도중 무효화가 끼어들면 세대(generation) 비교로 오래된 결과를 저장하지 않습니다.
+  TTL은 다른 경로(직접 SQL, 다른 프로세스)로 바뀐 경우를 위한 안전망입니다.
+  아카이브 조회가 실패했거나 일부 향수의 노트/어코드가 빠진 채로 계산된 프로필(degraded)은
+  저장하지 않습니다. (조회 오류를 삼키고 빈 결과를 돌려줘도 TTL 동안 틀린 취향이 굳지 않도록)
+- PerfumeFeatureCache: 향수별 노트/어코드 (카탈로그 데이터라 회원 간 공유)
+  무효화 후 재계산 시 새로 추가된 향수의 노트/어코드만 조회하고, 조회되지 않은 ID를 함께 돌려줍니다.
+
+메트릭: personalization_cache_total{result=hit|miss|stale}, personalization_cache_invalidations_total,
+        personalization_cache_skipped_total{reason=degraded}
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .metrics import metrics
+
+
+@dataclass
+class PersonalizationProfile:
+    """회원 1명의 계산된 개인화 프로필"""
+
+    summary: Dict[str, Any]
+    brand_scores: Dict[str, float] = field(default_factory=dict)
+    note_scores: Dict[str, float] = field(default_factory=dict)
+    accord_scores: Dict[str, float] = field(default_factory=dict)
+    built_at: float = field(default_factory=time.monotonic)
+    degraded: bool = False  # 일부 데이터 조회 실패 (캐시하지 않음)
+
+
+class ProfileCache:
+    """
+    Args:
+        ttl_seconds: 안전망 TTL (0 이하면 만료 없음)
+        max_members: LRU로 보관할 최대 회원 수
+        clock: 테스트용 시계
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 600.0,
+        max_members: int = 2000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_members = max_members
+        self._clock = clock
+        self._entries: "OrderedDict[int, PersonalizationProfile]" = OrderedDict()
+        self._generations: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, member_id: int) -> Optional[PersonalizationProfile]:
+        with self._lock:
+            profile = self._entries.get(member_id)
+            if profile is None:
+                metrics.inc("personalization_cache_total", result="miss")
+                return None
+            if self.ttl_seconds > 0 and self._clock() - profile.built_at > self.ttl_seconds:
+                del self._entries[member_id]
+                metrics.inc("personalization_cache_total", result="stale")
+                return None
+            self._entries.move_to_end(member_id)
+            metrics.inc("personalization_cache_total", result="hit")
+            return profile
+
+    def generation(self, member_id: int) -> int:
+        """계산 시작 전에 읽어 두고 put에 넘깁니다."""
+        with self._lock:
+            return self._generations.get(member_id, 0)
+
+    def put(self, member_id: int, profile: PersonalizationProfile, generation: int) -> bool:
+        """계산 도중 무효화가 있었거나 degraded 프로필이면 저장하지 않고 False"""
+        if profile.degraded:
+            metrics.inc("personalization_cache_skipped_total", reason="degraded")
+            return False
+        with self._lock:
+            if self._generations.get(member_id, 0) != generation:
+                return False
+            profile.built_at = self._clock()
+            self._entries[member_id] = profile
+            self._entries.move_to_end(member_id)
+            while len(self._entries) > self.max_members:
+                self._entries.popitem(last=False)
+            return True
+
+    def invalidate(self, member_id: int) -> None:
+        with self._lock:
+            self._entries.pop(member_id, None)
+            self._generations[member_id] = self._generations.get(member_id, 0) + 1
+        metrics.inc("personalization_cache_invalidations_total")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class PerfumeFeatureCache:
+    """향수별 노트/어코드 캐시 (없는 ID만 loader로 조회)"""
+
+    def __init__(self, max_perfumes: int = 20000) -> None:
+        self.max_perfumes = max_perfumes
+        self._features: "OrderedDict[int, Dict[str, List[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(
+        self,
+        perfume_ids: Iterable[int],
+        loader: Callable[[List[int]], Dict[int, Dict[str, Any]]],
+    ) -> Tuple[Dict[int, Dict[str, Any]], List[int]]:
+        """
+        Returns:
+            (향수별 특징, 요청했지만 loader가 돌려주지 않은 ID 목록)
+        """
+        perfume_ids = list(perfume_ids)
+        with self._lock:
+            found = {pid: self._features[pid] for pid in perfume_ids if pid in self._features}
+        missing = [pid for pid in perfume_ids if pid not in found]
+        if missing:
+            loaded = loader(missing) or {}
+            with self._lock:
+                for pid, features in loaded.items():
+                    self._features[pid] = features
+                    self._features.move_to_end(pid)
+                while len(self._features) > self.max_perfumes:
+                    self._features.popitem(last=False)
+            found.update(loaded)
+        return found, [pid for pid in perfume_ids if pid not in found]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._features.clear()
+
+
+def is_profile_cache_enabled() -> bool:
+    value = os.getenv("PERSONALIZATION_CACHE_ENABLED", "true").strip().lower()
+    return value not in ("0", "false", "no", "off")
+
+
+PROFILE_CACHE = ProfileCache(
+    ttl_seconds=float(os.getenv("PERSONALIZATION_CACHE_TTL_SECONDS", "600")),
+    max_members=int(os.getenv("PERSONALIZATION_CACHE_MAX_MEMBERS", "2000")),
+)
+PERFUME_FEATURE_CACHE = PerfumeFeatureCache()
+
+
+def invalidate_personalization(member_id: int) -> None:
+    """아카이브 변경 후 호출: 해당 회원의 프로필만 버립니다."""
+    if member_id:
+        PROFILE_CACHE.invalidate(member_id)
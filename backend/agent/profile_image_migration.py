@@ -0,0 +1,379 @@
+"""
+프로필 이미지 일괄 이전 엔진 (로컬 /uploads → 오브젝트 스토리지)
+
+scripts/migrate_profile_images_to_s3.py가 사용합니다. 한 장씩 순차 처리하던 방식 대신:
+
+- 워커 풀에서 읽기/변환(64/128/256 WebP)/업로드를 동시에 처리
+- 토큰 버킷으로 초당 업로드 수 제한 (스토리지 쓰로틀링 회피)
+- DB URL 갱신은 batch_size건씩 한 번에 (기존 URL이 그대로인 행만 갱신)
+- 갱신이 커밋된 member_id는 체크포인트 파일에 추가 → 중단 후 재실행 시 건너뜀
+- 주기적으로 처리량/ETA 출력
+- dry_run이면 읽기/변환까지만 하고 업로드/DB/체크포인트는 건드리지 않음
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+SELECT_LOCAL_IMAGES_SQL = """
+    SELECT member_id, profile_image_url
+    FROM tb_member_profile_t
+    WHERE profile_image_url LIKE '/uploads/%'
+    ORDER BY member_id
+"""
+
+# 이전 중 사용자가 새 이미지를 올렸으면(URL이 바뀌었으면) 덮어쓰지 않음
+UPDATE_URLS_SQL = """
+    UPDATE tb_member_profile_t AS p
+    SET profile_image_url = v.cdn_url
+    FROM (VALUES %s) AS v(member_id, old_url, cdn_url)
+    WHERE p.member_id = v.member_id AND p.profile_image_url = v.old_url
+    RETURNING p.member_id
+"""
+
+
+@dataclass(frozen=True)
+class MigrationRow:
+    member_id: int
+    old_url: str
+
+
+@dataclass(frozen=True)
+class MigratedImage:
+    member_id: int
+    old_url: str
+    key: str
+    cdn_url: str
+
+
+class MigrationError(Exception):
+    """행 하나의 실패 (stats 카테고리와 함께)"""
+
+    def __init__(self, category: str, message: str) -> None:
+        super().__init__(message)
+        self.category = category
+
+
+# ==========================================
+# 속도 제한 / 체크포인트 / 진행률
+# ==========================================
+class RateLimiter:
+    """초당 rate건 토큰 버킷 (여러 워커 스레드에서 공유). rate <= 0이면 제한 없음"""
+
+    def __init__(self, rate: float, burst: Optional[float] = None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """토큰 1개를 받을 때까지 대기하고, 기다린 시간(초)을 돌려줍니다."""
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                # 부동소수점 오차로 1에 약간 못 미치는 경우까지 허용
+                if self._tokens >= 1 - 1e-9:
+                    self._tokens = max(0.0, self._tokens - 1)
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            self._sleep(delay)
+            waited += delay
+
+
+class Checkpoint:
+    """DB 갱신이 커밋된 member_id를 한 줄에 하나씩 기록하는 추가 전용 파일"""
+
+    def __init__(self, path) -> None:
+        self.path = Path(path)
+        self.completed: Set[int] = set()
+        if self.path.exists():
+            data = self.path.read_bytes()
+            complete = data[: data.rfind(b"\n") + 1]
+            if len(complete) != len(data):
+                # 줄바꿈으로 끝나지 않은 마지막 줄은 쓰다 만 기록 ("37"이 "3"으로 잘렸을 수 있음)
+                # → 잘라내고 해당 행은 다시 처리 (기존 URL 조건으로 중복 갱신은 걸러짐)
+                with open(self.path, "r+b") as f:
+                    f.truncate(len(complete))
+            for line in complete.decode("utf-8").splitlines():
+                if line.strip().isdigit():
+                    self.completed.add(int(line))
+
+    def __contains__(self, member_id: int) -> bool:
+        return member_id in self.completed
+
+    def add_many(self, member_ids: Iterable[int]) -> None:
+        member_ids = [m for m in member_ids if m not in self.completed]
+        if not member_ids:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(f"{m}\n" for m in member_ids))
+            f.flush()
+            os.fsync(f.fileno())
+        self.completed.update(member_ids)
+
+
+class ProgressReporter:
+    """interval초마다 처리 건수, 처리량, ETA 출력"""
+
+    def __init__(self, total: int, interval: float = 5.0, clock=time.monotonic, emit=print) -> None:
+        self.total = total
+        self.interval = interval
+        self._clock = clock
+        self._emit = emit
+        self.started = clock()
+        self._last = self.started
+
+    def line(self, processed: int, stats: Dict[str, int]) -> str:
+        elapsed = max(1e-9, self._clock() - self.started)
+        rate = processed / elapsed
+        remaining = self.total - processed
+        eta = remaining / rate if rate > 0 else float("inf")
+        eta_text = f"{eta:,.0f}s" if eta != float("inf") else "?"
+        return (
+            f"📦 [Migration] {processed}/{self.total} ({processed / max(1, self.total):.0%}) "
+            f"{rate:,.1f} img/s, ETA {eta_text} | ok={stats['success']} failed={processed - stats['success']}"
+        )
+
+    def maybe_report(self, processed: int, stats: Dict[str, int], force: bool = False) -> Optional[str]:
+        now = self._clock()
+        if not force and now - self._last < self.interval:
+            return None
+        self._last = now
+        text = self.line(processed, stats)
+        self._emit(text)
+        return text
+
+
+# ==========================================
+# 엔진
+# ==========================================
+def _default_convert(image_data: bytes) -> Dict[int, bytes]:
+    from .image_utils import PROFILE_IMAGE_VARIANT_SIZES, render_profile_variants
+
+    return render_profile_variants(image_data, PROFILE_IMAGE_VARIANT_SIZES)
+
+
+def _default_upload(variants: Dict[int, bytes]) -> Tuple[str, str]:
+    from .image_utils import PROFILE_IMAGE_SIZE
+    from .storage_s3 import upload_profile_variants
+
+    return upload_profile_variants(variants, PROFILE_IMAGE_SIZE)
+
+
+def _default_delete(key: str) -> None:
+    from .image_utils import PROFILE_IMAGE_SIZE, PROFILE_IMAGE_VARIANT_SIZES
+    from .storage_s3 import delete_profile_image
+
+    delete_profile_image(key, [s for s in PROFILE_IMAGE_VARIANT_SIZES if s != PROFILE_IMAGE_SIZE])
+
+
+def update_profile_urls(conn, images: Sequence[MigratedImage]) -> Set[int]:
+    """
+    배치 URL 갱신 (한 트랜잭션)
+
+    Returns:
+        실제로 갱신된 member_id 집합 (이전 중 URL이 바뀐 행은 제외)
+    """
+    from psycopg2.extras import execute_values
+
+    cur = conn.cursor()
+    try:
+        rows = execute_values(
+            cur,
+            UPDATE_URLS_SQL,
+            [(img.member_id, img.old_url, img.cdn_url) for img in images],
+            fetch=True,
+        )
+        conn.commit()
+        return {row[0] for row in rows}
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+
+
+class ProfileImageMigrator:
+    """
+    Args:
+        uploads_dir: 로컬 이미지 디렉터리 (URL의 파일명으로 찾음)
+        update_urls: MigratedImage 목록을 한 번에 반영하고 갱신된 member_id 집합을 돌려주는 함수
+        checkpoint: 완료 기록 (None이면 재개 불가)
+        workers: 동시 처리 수
+        rate: 초당 업로드 상한 (0 = 제한 없음)
+        batch_size: DB 갱신 배치 크기
+        dry_run: 읽기/변환만 수행
+    """
+
+    def __init__(
+        self,
+        uploads_dir,
+        update_urls: Callable[[Sequence[MigratedImage]], Set[int]],
+        checkpoint: Optional[Checkpoint] = None,
+        workers: int = 8,
+        rate: float = 0.0,
+        batch_size: int = 100,
+        dry_run: bool = False,
+        report_interval: float = 5.0,
+        convert: Callable[[bytes], Dict[int, bytes]] = _default_convert,
+        upload: Callable[[Dict[int, bytes]], Tuple[str, str]] = _default_upload,
+        delete: Callable[[str], None] = _default_delete,
+        emit: Callable[[str], None] = print,
+    ) -> None:
+        self.uploads_dir = Path(uploads_dir)
+        self.update_urls = update_urls
+        self.checkpoint = checkpoint
+        self.workers = workers
+        self.limiter = RateLimiter(rate)
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.report_interval = report_interval
+        self.convert = convert
+        self.upload = upload
+        self.delete = delete
+        self.emit = emit
+        self.stats = {
+            'total': 0,
+            'skipped_checkpoint': 0,
+            'file_not_found': 0,
+            'read_failed': 0,
+            'conversion_failed': 0,
+            's3_failed': 0,
+            'db_failed': 0,
+            'url_changed': 0,
+            'success': 0,
+        }
+
+    def _process(self, row: MigrationRow) -> Optional[MigratedImage]:
+        local_path = self.uploads_dir / os.path.basename(row.old_url)
+        try:
+            image_data = local_path.read_bytes()
+        except FileNotFoundError:
+            raise MigrationError('file_not_found', f"File not found: {local_path}")
+        except OSError as e:
+            # 권한/디렉터리/IO 오류도 행 하나의 실패로 처리 (전체 이전은 계속)
+            raise MigrationError('read_failed', f"Read failed: {local_path}: {e}")
+
+        try:
+            variants = self.convert(image_data)
+        except Exception as e:
+            raise MigrationError('conversion_failed', f"Conversion failed: {e}")
+
+        if self.dry_run:
+            return None
+
+        self.limiter.acquire()
+        try:
+            key, cdn_url = self.upload(variants)
+        except Exception as e:
+            raise MigrationError('s3_failed', f"Upload failed: {e}")
+        return MigratedImage(row.member_id, row.old_url, key, cdn_url)
+
+    def _discard(self, images: Iterable[MigratedImage]) -> None:
+        """올렸지만 DB에 반영하지 못한 객체 삭제 (하나가 실패해도 나머지는 계속)"""
+        for img in images:
+            try:
+                self.delete(img.key)
+            except Exception as e:
+                self.emit(f"⚠️ [Migration] failed to delete {img.key}: {e}")
+
+    def _flush(self, batch: List[MigratedImage]) -> None:
+        if not batch:
+            return
+        try:
+            updated = self.update_urls(batch)
+        except Exception as e:
+            self.emit(f"❌ [Migration] DB batch of {len(batch)} failed: {e}")
+            self.stats['db_failed'] += len(batch)
+            for img in batch:
+                self.delete(img.key)
+            batch.clear()
+            return
+
+        for img in batch:
+            if img.member_id in updated:
+                self.stats['success'] += 1
+            else:
+                # 이전 중 사용자가 이미지를 바꿈 → 올린 객체는 고아가 되므로 삭제
+                self.stats['url_changed'] += 1
+                self.delete(img.key)
+        if self.checkpoint is not None:
+            self.checkpoint.add_many(img.member_id for img in batch)
+        batch.clear()
+
+    def run(self, rows: Iterable[MigrationRow]) -> Dict[str, int]:
+        rows = list(rows)
+        self.stats['total'] = len(rows)
+        todo = deque()
+        for row in rows:
+            if self.checkpoint is not None and row.member_id in self.checkpoint:
+                self.stats['skipped_checkpoint'] += 1
+            else:
+                todo.append(row)
+
+        reporter = ProgressReporter(len(todo), self.report_interval, emit=self.emit)
+        processed = 0
+        batch: List[MigratedImage] = []
+        # 메모리 사용을 제한하기 위해 동시에 떠 있는 작업 수를 workers*2로 유지
+        max_in_flight = self.workers * 2
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="image-migrate") as pool:
+            in_flight = {}
+            try:
+                while todo or in_flight:
+                    while todo and len(in_flight) < max_in_flight:
+                        row = todo.popleft()
+                        in_flight[pool.submit(self._process, row)] = row
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        row = in_flight.pop(future)
+                        processed += 1
+                        try:
+                            image = future.result()
+                        except MigrationError as e:
+                            self.stats[e.category] += 1
+                            self.emit(f"⚠️ [Migration] member {row.member_id}: {e}")
+                            continue
+                        if image is None:  # dry-run
+                            self.stats['success'] += 1
+                            continue
+                        batch.append(image)
+                        if len(batch) >= self.batch_size:
+                            self._flush(batch)
+                    reporter.maybe_report(processed, self.stats)
+                self._flush(batch)
+            except BaseException:
+                # 중단 시 남은 작업은 취소. 커밋 전 배치는 체크포인트에 없으므로 재실행 때 다시 처리됨
+                # → 이미 올린 객체(커밋 전 배치 + 실행 중이던 작업)는 고아가 되므로 지움
+                todo.clear()
+                for future in in_flight:
+                    future.cancel()
+                uncommitted = list(batch)
+                for future in in_flight:
+                    if future.cancelled():
+                        continue
+                    try:
+                        image = future.result()
+                    except BaseException:
+                        continue
+                    if image is not None:
+                        uncommitted.append(image)
+                self._discard(uncommitted)
+                raise
+
+        reporter.maybe_report(processed, self.stats, force=True)
+        return self.stats
@@ -0,0 +1,131 @@
+"""
+버전 관리 스키마 마이그레이션 (Schema Migration Runner)
+
+요청 처리 중 ALTER TABLE ... ADD COLUMN IF NOT EXISTS를 실행하면 컬럼이 이미 있어도
+ACCESS EXCLUSIVE 락을 잡아, 같은 테이블을 읽는 모든 요청이 그 트랜잭션 뒤로 줄을 섭니다.
+DDL은 여기로 모으고 서버 시작 시 한 번(또는 scripts/migrate_schema.py로) 적용합니다.
+
+- 마이그레이션 스크립트: agent/migrations/<db>/NNNN_<name>.sql (번호 순서대로 적용)
+- 적용 이력: 각 DB의 schema_migrations(version, name, applied_at) 테이블
+- 여러 워커가 동시에 시작해도 pg_advisory_xact_lock으로 한 프로세스만 적용합니다.
+- 미적용 스크립트는 한 트랜잭션으로 적용하므로 실패 시 전부 롤백됩니다.
+"""
+
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent / "migrations"
+
+# pg_advisory_xact_lock 키 (임의의 고정 상수)
+MIGRATION_LOCK_ID = 7_340_119
+
+_FILENAME_RE = re.compile(r"^(\d+)_([A-Za-z0-9_]+)\.sql$")
+
+CREATE_VERSION_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INTEGER PRIMARY KEY,
+        name VARCHAR(200) NOT NULL,
+        applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    sql: str
+
+
+def discover_migrations(directory: Path) -> List[Migration]:
+    """NNNN_name.sql 파일을 버전 순으로 읽습니다 (번호 중복은 오류)."""
+    migrations = {}
+    for path in sorted(directory.glob("*.sql")):
+        match = _FILENAME_RE.match(path.name)
+        if not match:
+            raise ValueError(f"Invalid migration filename: {path.name}")
+        version = int(match.group(1))
+        if version in migrations:
+            raise ValueError(f"Duplicate migration version {version}: {path.name}")
+        migrations[version] = Migration(version, match.group(2), path.read_text(encoding="utf-8"))
+    return [migrations[v] for v in sorted(migrations)]
+
+
+def pending_migrations(cur, migrations: List[Migration]) -> List[Migration]:
+    cur.execute("SELECT version FROM schema_migrations")
+    applied = {row[0] if isinstance(row, (tuple, list)) else row["version"] for row in cur.fetchall()}
+    return [m for m in migrations if m.version not in applied]
+
+
+def run_migrations(conn, directory: Path, dry_run: bool = False) -> List[Migration]:
+    """
+    미적용 마이그레이션을 순서대로 적용합니다.
+
+    Returns:
+        적용한(dry_run이면 적용할) 마이그레이션 목록
+    """
+    migrations = discover_migrations(directory)
+    cur = conn.cursor()
+    try:
+        cur.execute("SELECT pg_advisory_xact_lock(%s)", (MIGRATION_LOCK_ID,))
+        cur.execute(CREATE_VERSION_TABLE_SQL)
+        pending = pending_migrations(cur, migrations)
+        if dry_run:
+            conn.rollback()
+            return pending
+        for migration in pending:
+            cur.execute(migration.sql)
+            cur.execute(
+                "INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+                (migration.version, migration.name),
+            )
+        conn.commit()
+        return pending
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+
+
+def _member_db() -> Tuple[Callable, Callable]:
+    from .database import get_member_db_connection, release_member_db_connection
+
+    return get_member_db_connection, release_member_db_connection
+
+
+# DB 이름 → (마이그레이션 디렉터리, 커넥션 함수 로더)
+DATABASES = {
+    "member": (MIGRATIONS_DIR / "member", _member_db),
+}
+
+
+def migrate(databases: Optional[List[str]] = None, dry_run: bool = False) -> dict:
+    """
+    등록된 DB에 마이그레이션 적용
+
+    Returns:
+        {db 이름: [적용한 버전, ...]}
+    """
+    applied = {}
+    for name in databases or list(DATABASES):
+        directory, connection_functions = DATABASES[name]
+        get_connection, release_connection = connection_functions()
+        conn = get_connection()
+        try:
+            migrations = run_migrations(conn, directory, dry_run=dry_run)
+        finally:
+            release_connection(conn)
+        applied[name] = [m.version for m in migrations]
+        for migration in migrations:
+            action = "대기" if dry_run else "적용"
+            print(f"🗄️ [Migration] {name} {migration.version:04d}_{migration.name} {action}", flush=True)
+    return applied
+
+
+def is_migrate_on_startup_enabled() -> bool:
+    value = os.getenv("SCHEMA_MIGRATE_ON_STARTUP", "true").strip().lower()
+    return value not in ("0", "false", "no", "off")
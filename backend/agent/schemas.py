@@ -73,6 +73,12 @@ class AgentState(Dict):
     unsupported_category: Optional[str] = None  # "제형", "성능", "가격" 등
     unsupported_reason: Optional[str] = None
 
+    # [★추가] Pre-Validator와 동시에 계산된 Supervisor 라우팅 결과 (턴마다 갱신)
+    speculative_next_step: Optional[str] = None
+
+    # [★추가] 턴 전체 마감 시각 (epoch 초, agent/deadline.py) — 노드/도구가 남은 예산을 계산
+    deadline_at: Optional[float] = None
+
 
 # =================================================================
 # 2. 인터뷰 및 라우팅 (Interviewer & Router)
@@ -187,6 +193,15 @@ class ResearchActionPlan(BaseModel):
     plans: List[SearchStrategyPlan] = Field(description="3가지 검색 전략")
 
 
+class StrategyLabel(BaseModel):
+    priority: int = Field(description="전략 우선순위 (요청에 주어진 번호 그대로)")
+    label: str = Field(description="사용자에게 보여줄 한 문장 전략명")
+
+
+class StrategyLabelBatch(BaseModel):
+    labels: List[StrategyLabel] = Field(description="전략별 사용자 친화 전략명 목록")
+
+
 # =================================================================
 # 4. 리서처 결과 및 라이터 전달 (Researcher Output) - [변경 없음]
 # =================================================================
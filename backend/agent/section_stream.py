@@ -0,0 +1,203 @@
+"""
+추천 섹션 스트림 헤더 정리기 (Incremental Header Rewriter)
+
+RecoWriter.generate_section은 예전에는 모델 출력 전체를 모은 뒤에
+1) (2번째 이후 섹션) 첫 '##' 앞의 도입부를 잘라내고
+2) 첫 '##' 헤더 줄 번호를 '## {display_priority}.'로 다시 매기고 (1번 섹션은 도입부 뒤 헤더)
+3) 끝이 '---'가 아니면 구분선을 붙였습니다. (format_section_text)
+
+SectionHeaderRewriter는 같은 결과를 스트리밍으로 만듭니다.
+- 첫 헤더 줄이 완성될 때까지만 버퍼링하고, 헤더를 고쳐 쓴 뒤에는 토큰을 바로 내보냅니다.
+- 끝의 공백/줄바꿈만 잠시 붙잡아 두었다가 스트림이 끝나면 구분선 처리와 함께 내보냅니다.
+
+feed()/finish()가 내보낸 문자열을 모두 이어 붙이면 format_section_text(전체 텍스트)와
+글자 단위로 같습니다. (청크를 어떻게 나누어 넣어도 동일)
+"""
+
+import re
+from typing import List
+
+SECTION_SEPARATOR = "---"
+
+# str.splitlines()가 줄 경계로 보는 문자들 ("\r\n"은 하나의 경계)
+_LINE_BREAK = re.compile(r"\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+
+
+def renumber_header_line(header_line: str, display_priority: int) -> str:
+    """'## 3. 제목' 한 줄의 번호를 display_priority로 바꿉니다."""
+    after = header_line[2:].lstrip()
+    idx = 0
+    while idx < len(after) and after[idx].isdigit():
+        idx += 1
+    if idx < len(after) and after[idx] == ".":
+        idx += 1
+    if idx < len(after) and after[idx] == " ":
+        idx += 1
+    rest = after[idx:]
+    return f"## {display_priority}. {rest}" if rest else f"## {display_priority}."
+
+
+def renumber_section_header(text: str, display_priority: int) -> str:
+    """'##'로 시작하는 섹션 텍스트의 첫 줄 번호를 display_priority로 맞춥니다."""
+    if not text.startswith("##"):
+        return text
+    lines = text.splitlines()
+    lines[0] = renumber_header_line(lines[0], display_priority)
+    return "\n".join(lines)
+
+
+def format_section_text(text: str, display_priority: int) -> str:
+    """섹션 전체 텍스트 후처리 (도입부 제거 → 헤더 번호 정리 → 구분선). 비스트리밍 기준 구현."""
+    if text:
+        header_index = text.find("##")
+        if header_index >= 0:
+            preamble = text[:header_index] if display_priority == 1 else ""
+            text = preamble + renumber_section_header(text[header_index:], display_priority)
+    if text and not text.rstrip().endswith(SECTION_SEPARATOR):
+        text = f"{text.rstrip()}\n{SECTION_SEPARATOR}"
+    return text
+
+
+def _split_trailing_space(text: str):
+    end = len(text)
+    while end > 0 and text[end - 1].isspace():
+        end -= 1
+    return text[:end], text[end:]
+
+
+class SectionHeaderRewriter:
+    """
+    format_section_text의 스트리밍 버전.
+
+    상태:
+        PREAMBLE  첫 '##' 위치(또는 헤더가 없다는 사실)를 알 때까지 버퍼링
+        HEADER    헤더 첫 줄이 끝날 때까지 버퍼링
+        BODY      바로 전달 (끝의 공백만 보류)
+
+    Usage:
+        rewriter = SectionHeaderRewriter(display_priority=2)
+        for chunk in stream:
+            out = rewriter.feed(chunk)
+        out = rewriter.finish()
+    """
+
+    _PREAMBLE, _HEADER, _BODY = "preamble", "header", "body"
+
+    def __init__(self, display_priority: int) -> None:
+        self.display_priority = display_priority
+        self._state = self._PREAMBLE
+        self._buffer = ""
+        self._seen_input = False
+        # 헤더를 고쳐 쓴 경우에만 원본과 같이 줄바꿈을 '\n'으로 정규화 (splitlines/join 동작)
+        self._normalize = False
+        self._pending_space = ""
+        self._tail = ""  # 지금까지 내보낸 텍스트의 마지막 몇 글자 ('---' 판정용)
+        self._finished = False
+
+    def feed(self, chunk: str) -> str:
+        """청크를 넣고 지금 바로 내보낼 수 있는 텍스트를 반환합니다."""
+        if self._finished:
+            raise RuntimeError("SectionHeaderRewriter already finished")
+        if not chunk:
+            return ""
+        self._seen_input = True
+        out: List[str] = []
+        if self._state == self._BODY:
+            out.append(self._emit(chunk))
+        else:
+            self._buffer += chunk
+            self._advance(out)
+        return "".join(out)
+
+    def finish(self) -> str:
+        """스트림 종료 시 남은 텍스트와 (필요하면) 구분선을 반환합니다."""
+        if self._finished:
+            return ""
+        self._finished = True
+        if not self._seen_input:
+            return ""
+
+        out: List[str] = []
+        if self._state == self._PREAMBLE:
+            # 헤더가 없음 → 원문 그대로
+            buffered, self._buffer = self._buffer, ""
+            self._state = self._BODY
+            out.append(self._emit(buffered))
+        if self._state == self._HEADER:
+            header_line, self._buffer = self._buffer, ""
+            self._state = self._BODY
+            out.append(self._emit(renumber_header_line(header_line, self.display_priority)))
+
+        pending, self._pending_space = self._pending_space, ""
+        if self._tail.endswith(SECTION_SEPARATOR):
+            if self._normalize:
+                pending = _LINE_BREAK.sub("\n", pending)
+                # splitlines()는 마지막 줄바꿈을 남기지 않음
+                if pending.endswith("\n"):
+                    pending = pending[:-1]
+            out.append(pending)
+        else:
+            out.append(f"\n{SECTION_SEPARATOR}")
+        return "".join(out)
+
+    # ------------------------------------------------------------------
+
+    def _advance(self, out: List[str]) -> None:
+        if self._state == self._PREAMBLE:
+            if self.display_priority == 1:
+                # 1번 섹션은 도입부를 바로 흘려보내고, 뒤따르는 첫 '##' 헤더 번호만 고침
+                header_index = self._buffer.find("##")
+                if header_index < 0:
+                    # '#' 하나로 끝나면 다음 청크와 합쳐 '##'인지 확인할 때까지 보류
+                    keep = 1 if self._buffer.endswith("#") else 0
+                    cut = len(self._buffer) - keep
+                    buffered, self._buffer = self._buffer[:cut], self._buffer[cut:]
+                    out.append(self._emit(buffered))
+                    return
+                preamble, buffered = self._buffer[:header_index], self._buffer[header_index:]
+                self._buffer = ""
+                out.append(self._emit_preamble(preamble))
+                self._start_header(buffered, out)
+            else:
+                header_index = self._buffer.find("##")
+                if header_index < 0:
+                    return
+                buffered, self._buffer = self._buffer[header_index:], ""
+                self._start_header(buffered, out)
+        elif self._state == self._HEADER:
+            buffered, self._buffer = self._buffer, ""
+            self._start_header(buffered, out)
+
+    def _start_header(self, text: str, out: List[str]) -> None:
+        """'##'로 시작하는 text에서 헤더 줄이 끝났으면 고쳐 쓰고 나머지를 본문으로 넘깁니다."""
+        self._normalize = True
+        match = _LINE_BREAK.search(text)
+        if match is None:
+            self._state = self._HEADER
+            self._buffer = text
+            return
+        self._state = self._BODY
+        header_line, rest = text[: match.start()], text[match.start():]
+        out.append(self._emit(renumber_header_line(header_line, self.display_priority)))
+        out.append(self._emit(rest))
+
+    def _emit_preamble(self, text: str) -> str:
+        """도입부는 줄바꿈 정규화 없이 보류 중인 공백까지 그대로 내보냅니다."""
+        content = self._emit(text)
+        pending, self._pending_space = self._pending_space, ""
+        self._tail = (self._tail + pending)[-len(SECTION_SEPARATOR):]
+        return content + pending
+
+    def _emit(self, text: str) -> str:
+        """끝의 공백은 보류하고 나머지를 내보냅니다."""
+        if not text:
+            return ""
+        content, space = _split_trailing_space(self._pending_space + text)
+        if not content:
+            self._pending_space = space
+            return ""
+        self._pending_space = space
+        if self._normalize:
+            content = _LINE_BREAK.sub("\n", content)
+        self._tail = (self._tail + content)[-len(SECTION_SEPARATOR):]
+        return content
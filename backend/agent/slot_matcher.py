@@ -0,0 +1,299 @@
+"""
+인터뷰 슬롯 사전 추출기 (Interviewer 앞단)
+
+"여름에 쓸 여자 향수 추천해줘", "남친 선물로 우디한 거"처럼 필수 슬롯
+(대상/성별 + 컨셉 1개 이상)이 사전 단어만으로 확정되는 턴은
+InterviewResult LLM 호출 없이 바로 Researcher로 넘깁니다.
+
+구성:
+1. Aho-Corasick 오토마톤: 가제티어(브랜드/향수/노트/어코드) + DB 메타(계절/상황/어코드)
+   + 한글/영문 동의어 사전(data/lexicon_ko.json의 seasons 이하 섹션)
+2. 슬롯 조립: 성별/관계/나이에서 target 합성, 중복 값 충돌 검출, 부정 표현 범위 처리
+3. 스킵 판정: 충돌/부정/특정 향수 언급/긴 문장이 하나라도 있으면 LLM 사용
+
+LLM을 건너뛰지 못하는 턴에서는 추출 결과를 참고 정보로만 프롬프트 컨텍스트에 넣고
+(대화 맥락이 우선), 최종 슬롯은 LLM 결과를 그대로 사용합니다.
+
+사용처:
+- graph.interviewer_node()
+- benchmarks/bench_slot_matcher.py 로 처리량/스킵 비율 측정
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .aho_corasick import AhoCorasick, Match, select_longest
+from .intent_router import (
+    SIMILARITY_KEYWORDS,
+    Gazetteer,
+    _ASCII_TERM,
+    _is_word_boundary,
+    build_gazetteer,
+    load_lexicon,
+)
+from .metrics import metrics
+from .utils import parse_recommended_count
+
+logger = logging.getLogger(__name__)
+
+# 사전 추출만으로 LLM을 건너뛸 수 있는 최대 쿼리 길이 (긴 문장은 뉘앙스가 많음)
+MAX_SKIP_QUERY_LENGTH = int(os.getenv("SLOT_PREFILL_MAX_QUERY_LENGTH", "60"))
+
+# 부정 표현이 앞 단어에 영향을 주는 최대 거리 (문자 수)
+NEGATION_WINDOW = 6
+
+# 단일 값만 허용되는 슬롯 (서로 다른 값이 나오면 충돌)
+SINGLE_VALUE_SLOTS = {"gender", "season", "situation", "brand", "perfume", "target"}
+
+# 충분성 기준 B (컨셉) - prompts.SUFFICIENCY_CRITERIA 와 동일
+CONCEPT_SLOTS = (
+    "season", "style", "note", "accord", "situation", "brand", "reference_brand", "like",
+    "perfume",
+)
+
+# 매칭 구간이 겹칠 때 우선순위 (작을수록 우선)
+CATEGORY_PRIORITY = {
+    "perfume": 0, "brand": 1, "relation": 2, "gender": 3, "season": 4, "situation": 5,
+    "style": 6, "note": 7, "accord": 8, "self": 9, "gift": 10, "negation": 11,
+}
+
+_AGE_PATTERN = re.compile(r"([1-6]0)\s*대")
+
+GENDER_TARGET_LABELS = {"Women": "여성", "Men": "남성"}
+
+
+def is_slot_prefill_enabled() -> bool:
+    return os.getenv("SLOT_PREFILL_ENABLED", "true").lower() in ("1", "true", "yes")
+
+
+@dataclass
+class SlotExtraction:
+    """한 턴에서 사전 추출한 슬롯과 스킵 판정에 필요한 신호"""
+
+    slots: Dict[str, Any] = field(default_factory=dict)
+    conflicts: Set[str] = field(default_factory=set)
+    has_negation: bool = False
+    mentions_perfume: bool = False
+    query_length: int = 0
+
+    def can_skip_llm(self, carried_prefs: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        이번 턴 + 유지 슬롯만으로 충분성 기준(A: 대상/성별, B: 컨셉 1개)을
+        모호함 없이 충족하는지 판단합니다.
+        """
+        if not self.slots or self.conflicts or self.has_negation or self.mentions_perfume:
+            return False
+        if self.query_length > MAX_SKIP_QUERY_LENGTH:
+            return False
+
+        combined = {k: v for k, v in (carried_prefs or {}).items() if v is not None}
+        combined.update(self.slots)
+        if not combined.get("gender") or not combined.get("target"):
+            return False
+        return any(combined.get(slot) for slot in CONCEPT_SLOTS)
+
+
+class SlotMatcher:
+    """표면형(소문자) -> (슬롯 카테고리, 표준값) 오토마톤"""
+
+    def __init__(self):
+        self._automaton = AhoCorasick()
+
+    def __len__(self) -> int:
+        return len(self._automaton)
+
+    def add(self, category: str, surface: str, canonical: Any) -> None:
+        surface = (surface or "").strip().lower()
+        if surface:
+            self._automaton.add(surface, (category, surface, canonical))
+
+    def add_many(self, category: str, mapping: Dict[str, Any]) -> None:
+        for surface, canonical in mapping.items():
+            self.add(category, surface, canonical)
+
+    def build(self) -> "SlotMatcher":
+        self._automaton.build()
+        return self
+
+    def find(self, text: str) -> List[Match]:
+        lowered = text.lower()
+        candidates = [
+            match
+            for match in self._automaton.iter_matches(lowered)
+            if not _ASCII_TERM.match(match.value[1])
+            or _is_word_boundary(lowered, match.start, match.end)
+        ]
+        return select_longest(candidates, lambda m: CATEGORY_PRIORITY[m.value[0]])
+
+    def extract(self, query: str) -> SlotExtraction:
+        query = (query or "").strip()
+        extraction = SlotExtraction(query_length=len(query))
+        if not query:
+            return extraction
+
+        matches = self.find(query)
+        negation_starts = [m.start for m in matches if m.value[0] == "negation"]
+        extraction.has_negation = bool(negation_starts)
+
+        values: Dict[str, List[Any]] = {}
+        relation_surface = None
+        is_self = is_gift = False
+
+        for match in matches:
+            category, surface, canonical = match.value
+            if category == "negation":
+                continue
+            # "장미 말고", "우디한 건 싫어" → 부정된 단어는 슬롯에 넣지 않음
+            if any(0 <= start - match.end <= NEGATION_WINDOW for start in negation_starts):
+                continue
+
+            if category == "perfume":
+                extraction.mentions_perfume = True
+                _append(values, "perfume", canonical)
+            elif category == "relation":
+                relation_surface = surface
+                is_gift = True
+                if canonical:
+                    _append(values, "gender", canonical)
+            elif category == "self":
+                is_self = True
+            elif category == "gift":
+                is_gift = True
+            else:
+                _append(values, category, canonical)
+
+        slots: Dict[str, Any] = {}
+        for slot, found in values.items():
+            if slot in SINGLE_VALUE_SLOTS and len(found) > 1:
+                extraction.conflicts.add(slot)
+                continue
+            slots[slot] = ", ".join(found)
+
+        if slots.get("brand") and any(k in query for k in SIMILARITY_KEYWORDS):
+            slots["reference_brand"] = slots.pop("brand")
+
+        target = _build_target(query, relation_surface, slots.get("gender"))
+        if target:
+            slots["target"] = target
+        if is_self and is_gift:
+            extraction.conflicts.add("use_case")
+        elif is_gift:
+            slots["use_case"] = "GIFT"
+        elif is_self:
+            slots["use_case"] = "SELF"
+
+        count = parse_recommended_count(query)
+        if count:
+            slots["recommended_count"] = count
+
+        extraction.slots = slots
+        return extraction
+
+
+def _append(values: Dict[str, List[Any]], slot: str, value: Any) -> None:
+    bucket = values.setdefault(slot, [])
+    if value not in bucket:
+        bucket.append(value)
+
+
+def _build_target(query: str, relation: Optional[str], gender: Optional[str]) -> Optional[str]:
+    """관계어(여친/엄마) > 나이+성별(20대 여성) > 성별 순으로 target 문구를 만듭니다."""
+    age = _AGE_PATTERN.search(query)
+    age_prefix = f"{age.group(1)}대 " if age else ""
+
+    if relation:
+        return f"{age_prefix}{relation}".strip()
+    if gender in GENDER_TARGET_LABELS:
+        return f"{age_prefix}{GENDER_TARGET_LABELS[gender]}"
+    if gender == "Unisex":
+        # "중성적인 향수" → 대상은 본인 (SUFFICIENCY_CRITERIA 예시와 동일)
+        return f"{age_prefix}본인"
+    return None
+
+
+def build_slot_matcher(
+    gazetteer: Optional[Gazetteer] = None, include_db: bool = True
+) -> SlotMatcher:
+    """
+    가제티어 이름 목록 + 슬롯 동의어 사전 + (가능하면) DB 메타 값으로 매처를 만듭니다.
+    """
+    matcher = SlotMatcher()
+    if gazetteer is None:
+        gazetteer = build_gazetteer(include_db=include_db)
+    for category, surface, canonical in gazetteer.terms():
+        matcher.add(category, surface, canonical)
+
+    lexicon = load_lexicon()
+    matcher.add_many("season", lexicon.get("seasons", {}))
+    matcher.add_many("situation", lexicon.get("occasions", {}))
+    matcher.add_many("gender", lexicon.get("genders", {}))
+    matcher.add_many("relation", lexicon.get("relations", {}))
+    matcher.add_many("style", lexicon.get("styles", {}))
+    for category, key in (
+        ("self", "self_markers"),
+        ("gift", "gift_markers"),
+        ("negation", "negations"),
+    ):
+        for surface in lexicon.get(key, []):
+            matcher.add(category, surface, surface)
+
+    if include_db:
+        for category, values in _load_db_meta_terms():
+            for value in values:
+                matcher.add(category, value, value)
+
+    return matcher.build()
+
+
+def _load_db_meta_terms() -> Iterable[Tuple[str, List[str]]]:
+    """TB_PERFUME_SEASON_R / OCA_R / ACCORD_R 의 표준값 (영문 입력 대응)"""
+    try:
+        from .database import fetch_meta_data
+
+        meta = fetch_meta_data()
+        return [
+            (category, [v.strip() for v in meta.get(key, "").split(",") if v.strip()])
+            for category, key in (
+                ("season", "seasons"),
+                ("situation", "occasions"),
+                ("accord", "accords"),
+            )
+        ]
+    except Exception as e:
+        logger.warning("Slot matcher DB meta load failed, using lexicon only: %s", e)
+        return []
+
+
+_MATCHER: Optional[SlotMatcher] = None
+_MATCHER_LOCK = threading.Lock()
+
+
+def get_slot_matcher() -> SlotMatcher:
+    """프로세스 단위 싱글톤 (의도 라우터의 가제티어를 재사용)"""
+    global _MATCHER
+    if _MATCHER is None:
+        with _MATCHER_LOCK:
+            if _MATCHER is None:
+                from .intent_router import get_intent_router
+
+                _MATCHER = build_slot_matcher(get_intent_router().gazetteer)
+    return _MATCHER
+
+
+def prefill_slots(query: str) -> SlotExtraction:
+    """그래프에서 사용하는 진입점. 비활성화 시 빈 결과를 반환합니다."""
+    if not is_slot_prefill_enabled():
+        return SlotExtraction(query_length=len(query or ""))
+
+    started_at = time.perf_counter()
+    extraction = get_slot_matcher().extract(query)
+    metrics.observe("slot_prefill_latency_seconds", time.perf_counter() - started_at)
+    metrics.inc("slot_prefill_turns_total")
+    for slot in extraction.slots:
+        metrics.inc("slot_prefill_slots_total", slot=slot)
+    return extraction
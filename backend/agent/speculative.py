@@ -0,0 +1,110 @@
+"""
+추측 실행(Speculative Execution) 헬퍼
+
+검증(Pre-Validator)과 라우팅(Supervisor)처럼 "앞 단계가 통과하면 거의 항상
+뒤 단계가 실행되는" 두 LLM 호출을 동시에 시작해 지연을 겹칩니다.
+
+- 앞 단계(primary)가 통과하면 뒤 단계(speculative) 결과를 그대로 사용합니다.
+- 앞 단계가 거부하면 아직 진행 중인 추측 호출은 즉시 취소하고,
+  이미 끝난 호출은 '낭비(wasted)'로 집계합니다.
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+from .metrics import metrics
+
+
+def is_speculation_enabled() -> bool:
+    """SPECULATIVE_ROUTING_ENABLED 환경변수 (기본: 활성화)"""
+    value = os.getenv("SPECULATIVE_ROUTING_ENABLED", "true").strip().lower()
+    return value not in ("0", "false", "no", "off")
+
+
+async def _discard_speculation(
+    task: "asyncio.Task[Any]", speculative: Awaitable[Any], stage: str
+) -> None:
+    """
+    거부된 추측 작업을 정리합니다.
+
+    진행 중이면 취소(cancelled)하고, 이미 완료됐다면 낭비(wasted)로 기록합니다.
+    """
+    try:
+        await _cancel_or_count(task, stage)
+    finally:
+        # 시작 전에 취소된 코루틴의 'never awaited' 경고 방지
+        if asyncio.iscoroutine(speculative):
+            speculative.close()
+
+
+async def _cancel_or_count(task: "asyncio.Task[Any]", stage: str) -> None:
+    if task.done():
+        metrics.inc("speculative_wasted_total", stage=stage)
+        if not task.cancelled():
+            task.exception()  # 미확인 예외 경고 방지
+        return
+
+    task.cancel()
+    metrics.inc("speculative_cancelled_total", stage=stage)
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    except Exception:
+        pass
+
+
+async def _timed(awaitable: Awaitable[Any]) -> Tuple[Any, float]:
+    started_at = time.perf_counter()
+    result = await awaitable
+    return result, time.perf_counter() - started_at
+
+
+async def run_speculative(
+    primary: Awaitable[Any],
+    speculative: Awaitable[Any],
+    *,
+    accept: Callable[[Any], bool],
+    stage: str,
+) -> Tuple[Any, Optional[Any]]:
+    """
+    primary와 speculative를 동시에 실행합니다.
+
+    Args:
+        primary: 먼저 판정이 필요한 작업 (예: 요청 검증)
+        speculative: primary가 통과하면 사용할 작업 (예: 라우팅)
+        accept: primary 결과를 받아 speculative 결과를 사용할지 판단하는 함수
+        stage: 메트릭 라벨
+
+    Returns:
+        (primary 결과, speculative 결과 또는 None)
+        primary가 거부되면 speculative 결과는 None입니다.
+    """
+    started_at = time.perf_counter()
+    spec_task = asyncio.ensure_future(_timed(speculative))
+    metrics.inc("speculative_started_total", stage=stage)
+
+    try:
+        primary_result = await primary
+    except BaseException:
+        await _discard_speculation(spec_task, speculative, stage)
+        raise
+
+    primary_elapsed = time.perf_counter() - started_at
+
+    if not accept(primary_result):
+        await _discard_speculation(spec_task, speculative, stage)
+        return primary_result, None
+
+    speculative_result, speculative_elapsed = await spec_task
+
+    metrics.inc("speculative_used_total", stage=stage)
+    # 순차 실행 대비 절약된 시간 = 두 작업이 겹친 구간
+    metrics.observe(
+        "speculative_saved_seconds",
+        min(primary_elapsed, speculative_elapsed),
+        stage=stage,
+    )
+    return primary_result, speculative_result
@@ -0,0 +1,191 @@
+"""
+SSE 프레임 인코딩/병합 (Frame Coalescing)
+
+stream_generator는 모델 청크(토큰)마다 "data: {json}\\n\\n" 프레임을 하나씩 보냈기 때문에
+동시 접속이 많으면 프레임마다의 json.dumps + ASGI send 비용이 커집니다.
+
+SSECoalescer는 같은 노드에서 연속으로 나온 answer 청크를 한 프레임으로 합칩니다.
+- 바이트 임계치(max_bytes)를 넘거나
+- 첫 청크가 버퍼에 들어온 뒤 window(기본 30ms)가 지나거나
+- 다른 종류의 이벤트(log/error, 다른 노드의 answer)가 오면
+버퍼를 비웁니다. 클라이언트는 answer content를 이어 붙이므로 화면 결과는 같습니다.
+
+coalesce_sse()는 이벤트 소스를 별도 Task에서 읽어, 새 이벤트가 없어도 window가 지나면
+버퍼를 내보냅니다. (토큰 사이가 길어져도 글자가 묶여 있지 않도록)
+"""
+
+import asyncio
+import json
+import os
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, NamedTuple, Optional
+
+from .metrics import metrics
+from .stream_cancel import cancel_and_wait
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson이 없으면 표준 json 사용
+    orjson = None
+
+
+def _env_flag(name: str, default: str = "true") -> bool:
+    return os.getenv(name, default).strip().lower() not in ("0", "false", "no", "off")
+
+
+SSE_COALESCE_ENABLED = _env_flag("SSE_COALESCE_ENABLED")
+SSE_COALESCE_WINDOW_MS = float(os.getenv("SSE_COALESCE_WINDOW_MS", "30"))
+SSE_COALESCE_MAX_BYTES = int(os.getenv("SSE_COALESCE_MAX_BYTES", "1024"))
+
+COALESCED_TYPES = frozenset({"answer"})
+
+_DONE = object()
+
+
+class SSEEvent(NamedTuple):
+    """stream_generator가 내보내는 이벤트 (payload + 병합 기준 키: 노드 이름)"""
+
+    payload: Dict[str, Any]
+    key: str = ""
+
+
+def dumps_json(payload: Dict[str, Any]) -> str:
+    """payload를 JSON 문자열로 (orjson 우선, 한글은 이스케이프하지 않음)"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(payload, ensure_ascii=False)
+
+
+def encode_sse(payload: Dict[str, Any]) -> str:
+    return f"data: {dumps_json(payload)}\n\n"
+
+
+class SSECoalescer:
+    """
+    연속된 answer 청크를 한 SSE 프레임으로 합칩니다.
+
+    Args:
+        window: 버퍼에 머무를 수 있는 최대 시간(초)
+        max_bytes: 버퍼 content가 이 크기(UTF-8 바이트)를 넘으면 즉시 내보냄
+    """
+
+    def __init__(
+        self,
+        window: float = SSE_COALESCE_WINDOW_MS / 1000,
+        max_bytes: int = SSE_COALESCE_MAX_BYTES,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.window = window
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._parts: List[str] = []
+        self._bytes = 0
+        self._key: Optional[str] = None
+        self._type: Optional[str] = None
+        self._started_at = 0.0
+        self.events_in = 0
+        self.frames_out = 0
+
+    def push(self, event: SSEEvent) -> List[str]:
+        """이벤트를 넣고 지금 보내야 할 프레임 목록을 반환합니다."""
+        self.events_in += 1
+        payload, key = event
+        event_type = payload.get("type")
+        content = payload.get("content")
+        mergeable = event_type in COALESCED_TYPES and isinstance(content, str) and len(payload) == 2
+
+        frames: List[str] = []
+        if not mergeable:
+            frames.extend(self.flush())
+            frames.append(self._frame(payload))
+            return frames
+
+        if self._parts and (key != self._key or event_type != self._type):
+            frames.extend(self.flush())
+        if not self._parts:
+            self._key, self._type = key, event_type
+            self._started_at = self._clock()
+        self._parts.append(content)
+        self._bytes += len(content.encode("utf-8"))
+
+        if self._bytes >= self.max_bytes or self.timeout() == 0:
+            frames.extend(self.flush())
+        return frames
+
+    def flush(self) -> List[str]:
+        """버퍼에 남은 청크를 한 프레임으로 내보냅니다."""
+        if not self._parts:
+            return []
+        payload = {"type": self._type, "content": "".join(self._parts)}
+        self._parts, self._bytes = [], 0
+        self._key = self._type = None
+        return [self._frame(payload)]
+
+    def timeout(self) -> Optional[float]:
+        """버퍼를 비워야 할 때까지 남은 시간(초). 버퍼가 비었으면 None."""
+        if not self._parts:
+            return None
+        return max(0.0, self.window - (self._clock() - self._started_at))
+
+    def _frame(self, payload: Dict[str, Any]) -> str:
+        self.frames_out += 1
+        return encode_sse(payload)
+
+
+async def coalesce_sse(
+    source: AsyncIterator[SSEEvent],
+    coalescer: Optional[SSECoalescer] = None,
+    *,
+    enabled: Optional[bool] = None,
+) -> AsyncIterator[str]:
+    """
+    SSEEvent 소스를 SSE 프레임 문자열 스트림으로 바꿉니다.
+
+    병합이 꺼져 있으면(SSE_COALESCE_ENABLED=false) 이벤트마다 프레임 하나를 그대로 보냅니다.
+    """
+    if not (SSE_COALESCE_ENABLED if enabled is None else enabled):
+        async for payload, _key in source:
+            yield encode_sse(payload)
+        return
+
+    coalescer = coalescer or SSECoalescer()
+    queue: "asyncio.Queue" = asyncio.Queue()
+
+    async def pump() -> None:
+        try:
+            async for event in source:
+                queue.put_nowait(event)
+        finally:
+            queue.put_nowait(_DONE)
+
+    pump_task = asyncio.create_task(pump())
+    try:
+        while True:
+            if not queue.empty():
+                event = queue.get_nowait()
+            elif coalescer.timeout() is None:
+                event = await queue.get()
+            else:
+                try:
+                    async with asyncio.timeout(coalescer.timeout()):
+                        event = await queue.get()
+                except TimeoutError:
+                    for frame in coalescer.flush():
+                        yield frame
+                    continue
+            if event is _DONE:
+                break
+            for frame in coalescer.push(event):
+                yield frame
+        for frame in coalescer.flush():
+            yield frame
+        await pump_task
+    finally:
+        if not pump_task.done():
+            await cancel_and_wait(pump_task)
+        if coalescer.events_in:
+            metrics.inc("sse_events_total", coalescer.events_in)
+            metrics.inc("sse_frames_total", coalescer.frames_out)
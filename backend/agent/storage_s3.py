@@ -1,25 +1,51 @@
 """
 S3 Storage Adapter for profile images and other assets.
 Handles S3 upload, deletion, and CDN URL generation.
+
+Object I/O goes through a StorageBackend:
+- S3Backend: one cached boto3 client per process (boto3 clients are thread-safe),
+  with a connection pool sized for the storage executor
+- LocalFSBackend: writes under a local directory (tests, local development)
+
+Request handlers use the async facade (aupload_bytes, adelete_key, ...), which runs
+backend calls on a bounded thread pool instead of blocking the event loop.
 """
 
+import asyncio
 import os
+import threading
+import time
 import uuid
 import logging
-from typing import Optional, Tuple
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Tuple
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
+from .metrics import metrics
+
 logger = logging.getLogger(__name__)
 
+# Storage settings (can be overridden by environment variables)
+STORAGE_BACKEND = os.environ.get('STORAGE_BACKEND', 's3').strip().lower()
+STORAGE_LOCAL_ROOT = os.environ.get('STORAGE_LOCAL_ROOT', 'local_storage')
+S3_MAX_POOL_CONNECTIONS = int(os.environ.get('S3_MAX_POOL_CONNECTIONS', '16'))
+S3_CONNECT_TIMEOUT = float(os.environ.get('S3_CONNECT_TIMEOUT_SECONDS', '3'))
+S3_READ_TIMEOUT = float(os.environ.get('S3_READ_TIMEOUT_SECONDS', '10'))
+STORAGE_IO_WORKERS = int(os.environ.get('STORAGE_IO_WORKERS', str(S3_MAX_POOL_CONNECTIONS)))
 
-def _get_s3_client():
+
+def _get_s3_client(config: Optional[Config] = None):
     """Create and return a boto3 S3 client using environment variables."""
     region = os.environ.get('AWS_REGION', 'ap-northeast-2')
     aws_access_key_id = os.environ.get('AWS_ACCESS_KEY_ID')
     aws_secret_access_key = os.environ.get('AWS_SECRET_ACCESS_KEY')
     aws_session_token = os.environ.get('AWS_SESSION_TOKEN')
+    endpoint_url = os.environ.get('AWS_S3_ENDPOINT_URL')
 
     kwargs = {
         'region_name': region,
@@ -32,9 +58,27 @@ def _get_s3_client():
     if aws_session_token:
         kwargs['aws_session_token'] = aws_session_token
 
+    if endpoint_url:
+        # S3-compatible storage (MinIO, LocalStack, ...)
+        kwargs['endpoint_url'] = endpoint_url
+
+    if config is not None:
+        kwargs['config'] = config
+
     return boto3.client('s3', **kwargs)
 
 
+def _s3_client_config() -> Config:
+    """Connection pool sized for the storage executor; bounded timeouts and retries."""
+    return Config(
+        max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+        connect_timeout=S3_CONNECT_TIMEOUT,
+        read_timeout=S3_READ_TIMEOUT,
+        retries={'max_attempts': 3, 'mode': 'standard'},
+        tcp_keepalive=True,
+    )
+
+
 def _get_bucket_name() -> str:
     """Get S3 bucket name from environment."""
     bucket = os.environ.get('AWS_BUCKET_NAME')
@@ -94,9 +138,120 @@ def parse_key_from_cdn_url(url: str) -> Optional[str]:
     return key
 
 
+
+# =============================================================================
+# Storage backends
+# =============================================================================
+class StorageBackend(ABC):
+    """Minimal object storage interface used by this module."""
+
+    name = 'base'
+
+    @abstractmethod
+    def put(self, key: str, data: bytes, content_type: str) -> None:
+        """Store data under key, replacing any existing object."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove key; deleting a missing key is not an error."""
+
+
+class S3Backend(StorageBackend):
+    """
+    S3 backend with a lazily created, cached client.
+
+    Credential resolution and endpoint setup happen once instead of on every call;
+    the client's urllib3 pool keeps connections alive between uploads.
+    """
+
+    name = 's3'
+
+    def __init__(self, bucket: Optional[str] = None, client_factory: Optional[Callable] = None):
+        self.bucket = bucket or _get_bucket_name()
+        self._client_factory = client_factory or (lambda: _get_s3_client(_s3_client_config()))
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._client_factory()
+        return self._client
+
+    def put(self, key: str, data: bytes, content_type: str) -> None:
+        self.client.put_object(Bucket=self.bucket, Key=key, Body=data, ContentType=content_type)
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def __repr__(self) -> str:
+        return f"s3://{self.bucket}"
+
+
+class LocalFSBackend(StorageBackend):
+    """Stores objects as files under a root directory (tests, local development)."""
+
+    name = 'local'
+
+    def __init__(self, root):
+        self.root = Path(root).resolve()
+
+    def path_for(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if self.root not in path.parents:
+            raise ValueError(f"Key escapes storage root: {key}")
+        return path
+
+    def put(self, key: str, data: bytes, content_type: str) -> None:
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so readers never see a partial object
+        tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    def delete(self, key: str) -> None:
+        self.path_for(key).unlink(missing_ok=True)
+
+    def __repr__(self) -> str:
+        return f"file://{self.root}"
+
+
+_BACKEND: Optional[StorageBackend] = None
+_BACKEND_LOCK = threading.Lock()
+
+
+def get_storage_backend() -> StorageBackend:
+    """Process-wide storage backend selected by STORAGE_BACKEND (s3 | local)."""
+    global _BACKEND
+    if _BACKEND is None:
+        with _BACKEND_LOCK:
+            if _BACKEND is None:
+                if STORAGE_BACKEND == 'local':
+                    _BACKEND = LocalFSBackend(STORAGE_LOCAL_ROOT)
+                elif STORAGE_BACKEND == 's3':
+                    _BACKEND = S3Backend()
+                else:
+                    raise ValueError(f"Unknown STORAGE_BACKEND: {STORAGE_BACKEND}")
+    return _BACKEND
+
+
+def set_storage_backend(backend: Optional[StorageBackend]) -> None:
+    """Replace the process-wide backend (None = rebuild from environment on next use)."""
+    global _BACKEND
+    with _BACKEND_LOCK:
+        _BACKEND = backend
+
+
+def _observe(op: str, backend: StorageBackend, started: float) -> None:
+    metrics.observe('storage_op_seconds', time.perf_counter() - started, op=op, backend=backend.name)
+
+
 def upload_bytes(*, key: str, data: bytes, content_type: str) -> None:
     """
-    Upload bytes to S3 with the given key.
+    Upload bytes to storage with the given key.
 
     Args:
         key: S3 object key
@@ -105,26 +260,25 @@ def upload_bytes(*, key: str, data: bytes, content_type: str) -> None:
 
     Raises:
         ClientError: If S3 upload fails
+        OSError: If local storage write fails
     """
-    s3 = _get_s3_client()
-    bucket = _get_bucket_name()
+    backend = get_storage_backend()
+    started = time.perf_counter()
 
     try:
-        s3.put_object(
-            Bucket=bucket,
-            Key=key,
-            Body=data,
-            ContentType=content_type,
-        )
-        logger.info(f"Uploaded {len(data)} bytes to s3://{bucket}/{key}")
-    except ClientError as e:
-        logger.error(f"Failed to upload to S3: {e}")
+        backend.put(key, data, content_type)
+        logger.info(f"Uploaded {len(data)} bytes to {backend!r}/{key}")
+    except (ClientError, OSError) as e:
+        metrics.inc('storage_errors_total', op='put', backend=backend.name)
+        logger.error(f"Failed to upload to storage: {e}")
         raise
+    finally:
+        _observe('put', backend, started)
 
 
 def delete_key(key: str) -> None:
     """
-    Delete an S3 object by key (best-effort).
+    Delete an object by key (best-effort).
 
     Args:
         key: S3 object key to delete
@@ -132,14 +286,17 @@ def delete_key(key: str) -> None:
     Note:
         Does not raise exception on failure, only logs.
     """
-    s3 = _get_s3_client()
-    bucket = _get_bucket_name()
+    backend = get_storage_backend()
+    started = time.perf_counter()
 
     try:
-        s3.delete_object(Bucket=bucket, Key=key)
-        logger.info(f"Deleted s3://{bucket}/{key}")
-    except ClientError as e:
-        logger.warning(f"Failed to delete S3 object {key}: {e}")
+        backend.delete(key)
+        logger.info(f"Deleted {backend!r}/{key}")
+    except (ClientError, OSError) as e:
+        metrics.inc('storage_errors_total', op='delete', backend=backend.name)
+        logger.warning(f"Failed to delete storage object {key}: {e}")
+    finally:
+        _observe('delete', backend, started)
 
 
 def upload_profile_webp(data: bytes) -> Tuple[str, str]:
@@ -165,3 +322,111 @@ def upload_profile_webp(data: bytes) -> Tuple[str, str]:
 
     cdn_url = build_cdn_url(key)
     return key, cdn_url
+
+
+def profile_variant_key(key: str, size: int) -> str:
+    """
+    Key of a smaller profile image variant stored next to the primary image.
+
+    Example: ("profile_images/abc-123.webp", 64) -> "profile_images/abc-123_64.webp"
+    """
+    base, dot, ext = key.rpartition('.')
+    return f"{base}_{size}.{ext}" if dot else f"{key}_{size}"
+
+
+def upload_profile_variants(variants: Dict[int, bytes], primary_size: int) -> Tuple[str, str]:
+    """
+    Upload all profile image variants under one random UUID.
+
+    The primary size is stored at "{prefix}/{uuid}.webp" (the URL saved in the DB),
+    other sizes at "{prefix}/{uuid}_{size}.webp".
+
+    Args:
+        variants: {size: WebP bytes}
+        primary_size: Size whose key/URL is returned
+
+    Returns:
+        Tuple of (s3_key, cdn_url) of the primary variant
+
+    Raises:
+        Exception: Whatever the failing upload raised (already uploaded variants are deleted first)
+    """
+    profile_prefix = _get_profile_prefix()
+    random_uuid = str(uuid.uuid4())
+    key = f"{profile_prefix}/{random_uuid}.webp"
+
+    uploaded = []
+    try:
+        for size, data in sorted(variants.items(), key=lambda item: item[0] == primary_size):
+            variant_key = key if size == primary_size else profile_variant_key(key, size)
+            upload_bytes(key=variant_key, data=data, content_type='image/webp')
+            uploaded.append(variant_key)
+    except Exception:
+        for variant_key in uploaded:
+            delete_key(variant_key)
+        raise
+
+    cdn_url = build_cdn_url(key)
+    return key, cdn_url
+
+
+def delete_profile_image(key: str, sizes: Iterable[int] = ()) -> None:
+    """
+    Delete a profile image and its smaller variants (best-effort).
+
+    Args:
+        key: Primary S3 object key
+        sizes: Variant sizes stored next to it (missing objects are ignored by S3)
+    """
+    delete_key(key)
+    for size in sizes:
+        delete_key(profile_variant_key(key, size))
+
+
+# =============================================================================
+# Async facade (bounded executor, keeps blocking I/O off the event loop)
+# =============================================================================
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            # Same size as the S3 connection pool so workers never wait for a connection
+            _EXECUTOR = ThreadPoolExecutor(max_workers=STORAGE_IO_WORKERS, thread_name_prefix='storage-io')
+        return _EXECUTOR
+
+
+def shutdown_storage_executor() -> None:
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        executor, _EXECUTOR = _EXECUTOR, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+async def _run_in_executor(fn: Callable, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), lambda: fn(*args, **kwargs))
+
+
+async def aupload_bytes(*, key: str, data: bytes, content_type: str) -> None:
+    """Async upload_bytes."""
+    await _run_in_executor(upload_bytes, key=key, data=data, content_type=content_type)
+
+
+async def adelete_key(key: str) -> None:
+    """Async delete_key (best-effort)."""
+    await _run_in_executor(delete_key, key)
+
+
+async def aupload_profile_variants(variants: Dict[int, bytes], primary_size: int) -> Tuple[str, str]:
+    """Async upload_profile_variants."""
+    return await _run_in_executor(upload_profile_variants, variants, primary_size)
+
+
+async def adelete_profile_image(key: str, sizes: Iterable[int] = ()) -> None:
+    """Async delete_profile_image (best-effort)."""
+    await _run_in_executor(delete_profile_image, key, tuple(sizes))
@@ -0,0 +1,202 @@
+"""
+전략명(사용자 친화 라벨) 배치 생성기
+
+병렬 추천의 N개 전략이 각자 라벨 LLM 호출(+금지어 재시도)을 하던 것을
+한 턴에 구조화 출력 1회로 묶습니다.
+
+- 각 전략은 계획(plan)이 나오는 즉시 request()로 의도를 등록하고 검색을 계속합니다.
+- 모든 전략이 등록/철회(withdraw)되면(또는 max_wait 경과 시) 한 번에 라벨을 요청합니다.
+- 응답 라벨은 DenylistPolicy로 로컬 검증하고, 위반/누락된 전략만 다시 요청합니다.
+- 재요청 후에도 실패한 전략은 SAFE_LABELS로 대체합니다.
+"""
+
+import asyncio
+import json
+import random
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from .circuit_breaker import CIRCUIT_BREAKERS, model_name_of
+from .denylist import DenylistPolicy, UserFriendlyStrategyLabels, has_forbidden_words
+from .metrics import metrics
+from .schemas import StrategyLabelBatch
+
+LABEL_SYSTEM_PROMPT = "당신은 향수 추천 전략을 사용자 친화적인 한 문장으로 표현하는 전문가입니다."
+
+# 일부 전략 계획이 늦어질 때 먼저 도착한 전략들의 라벨을 기다리게 하는 최대 시간 (초)
+DEFAULT_MAX_WAIT = 3.0
+
+
+class BatchStrategyLabeler:
+    """
+    한 턴(parallel_reco_node 1회) 단위로 생성합니다.
+
+    llm_calls: 이번 턴에 라벨 생성으로 발생한 LLM 호출 수
+    """
+
+    def __init__(
+        self,
+        llm: Any,
+        user_prefs: Dict[str, Any],
+        expected: int,
+        *,
+        max_retries: int = 1,
+        max_wait: float = DEFAULT_MAX_WAIT,
+    ) -> None:
+        self.llm = llm
+        self.user_prefs_str = json.dumps(user_prefs, ensure_ascii=False)
+        self.expected = expected
+        self.max_retries = max_retries
+        self.max_wait = max_wait
+        self.llm_calls = 0
+
+        self._accounted = 0
+        self._pending: Dict[int, Tuple[str, "asyncio.Future[str]"]] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: List["asyncio.Task[None]"] = []
+
+    def request(self, priority: int, reason: str) -> "asyncio.Future[str]":
+        """전략 의도를 등록하고, 라벨이 채워질 Future를 반환합니다. (대기하지 않음)"""
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[str]" = loop.create_future()
+        self._pending[priority] = (reason, future)
+        self._accounted += 1
+        if self._timer is None and self._accounted < self.expected:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        self._maybe_flush()
+        return future
+
+    def withdraw(self, priority: int) -> None:
+        """계획 단계에서 실패해 라벨이 필요 없는 전략"""
+        self._accounted += 1
+        self._maybe_flush()
+
+    async def aclose(self) -> None:
+        """아무도 기다리지 않는 배치 호출을 정리합니다."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        for task in self._tasks:
+            if not task.done():
+                task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        metrics.observe("strategy_label_llm_calls_per_turn", self.llm_calls)
+
+    def _maybe_flush(self) -> None:
+        if self._accounted >= self.expected:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        items = {priority: reason for priority, (reason, _) in self._pending.items()}
+        futures = {priority: future for priority, (_, future) in self._pending.items()}
+        self._pending = {}
+        self._tasks.append(asyncio.create_task(self._resolve(items, futures)))
+
+    async def _resolve(
+        self, items: Dict[int, str], futures: Dict[int, "asyncio.Future[str]"]
+    ) -> None:
+        labels = await self.generate_labels(items)
+        for priority, future in futures.items():
+            if not future.done():
+                future.set_result(labels[priority])
+
+    async def generate_labels(self, items: Dict[int, str]) -> Dict[int, str]:
+        """
+        {priority: 전략 의도} -> {priority: 라벨}
+
+        첫 요청은 전체를 한 번에, 재요청은 금지어 위반/누락된 전략만 보냅니다.
+        """
+        labels: Dict[int, str] = {}
+        remaining = dict(items)
+        retry = False
+
+        for _ in range(1 + self.max_retries):
+            if not remaining:
+                break
+            for priority, label in (await self._invoke(remaining, retry)).items():
+                if priority in remaining and label and not has_forbidden_words(label):
+                    labels[priority] = label
+                    del remaining[priority]
+            retry = True
+
+        if remaining:
+            fallback = list(UserFriendlyStrategyLabels.SAFE_LABELS)
+            random.shuffle(fallback)
+            for index, priority in enumerate(sorted(remaining)):
+                labels[priority] = fallback[index % len(fallback)]
+            metrics.inc("strategy_label_fallback_total", len(remaining))
+
+        return labels
+
+    async def _invoke(self, items: Dict[int, str], retry: bool) -> Dict[int, str]:
+        # 브레이커가 열려 있으면 호출하지 않음 → 누락 처리되어 SAFE_LABELS로 대체
+        breaker = CIRCUIT_BREAKERS.get(model_name_of(self.llm), "strategy_label")
+        if breaker.is_open():
+            return {}
+        self.llm_calls += 1
+        metrics.inc("strategy_label_llm_calls_total")
+        try:
+            with breaker.guard():
+                response = await self.llm.with_structured_output(
+                    StrategyLabelBatch
+                ).ainvoke(
+                    self._build_messages(items, retry),
+                    config={"tags": ["internal_helper"]},
+                )
+            return {
+                int(item.priority): str(item.label).strip()
+                for item in response.labels
+            }
+        except Exception as e:
+            print(f"[WARNING] Batch user label generation failed: {e}", flush=True)
+            return {}
+
+    def _build_messages(self, items: Dict[int, str], retry: bool) -> List[Any]:
+        forbidden = ", ".join(_forbidden_examples())
+        strategies = "\n".join(
+            f"- priority {priority}: {reason}" for priority, reason in sorted(items.items())
+        )
+        header = (
+            "이전 응답에 금지어가 포함되었거나 누락된 전략이 있습니다. 아래 전략만 다시 작성하세요.\n\n"
+            if retry
+            else ""
+        )
+        return [
+            SystemMessage(content=LABEL_SYSTEM_PROMPT),
+            HumanMessage(
+                content=(
+                    f"{header}"
+                    f"사용자 정보: {self.user_prefs_str}\n"
+                    f"전략 의도 목록:\n{strategies}\n\n"
+                    "각 전략마다 사용자에게 보여줄 전략명을 작성하세요.\n\n"
+                    "요구사항:\n"
+                    "- priority 번호는 위 목록 그대로 사용\n"
+                    '- 각각 한 문장으로 작성 (예: "강인하고 자신감 있는 첫인상", "우아하고 세련된 분위기")\n'
+                    "- 첫인상/무드 중심 표현 사용, 전략끼리 겹치지 않게 작성\n"
+                    f"- 다음 단어는 절대 사용 금지: {forbidden}"
+                )
+            ),
+        ]
+
+
+def _forbidden_examples() -> List[str]:
+    """DenylistPolicy 패턴을 프롬프트용 예시 단어로 풀어 씁니다."""
+    examples: List[str] = []
+    for pattern in DenylistPolicy.get_forbidden_patterns():
+        if "(" in pattern:
+            prefix = pattern.split("\\s*")[0]
+            options = pattern[pattern.index("(") + 1 : pattern.index(")")].split("|")
+            examples.extend(f"{prefix} {option}" for option in options)
+        else:
+            examples.append(pattern)
+    return examples
@@ -0,0 +1,115 @@
+"""
+클라이언트 이탈 시 스트림 작업 취소 (Client-Disconnect Cancellation)
+
+/chat SSE 응답을 만드는 그래프 실행(astream_events)을 별도 Task(pump)에서 돌리고,
+응답 쪽은 큐에서 청크를 꺼내 전달하면서 주기적으로 연결 상태를 확인합니다.
+
+- 브라우저가 연결을 끊으면(is_disconnected) pump Task를 취소합니다.
+  취소는 astream_events → LangGraph 노드 Task → 노드 내부 하위 Task(전략 준비, 섹션 작성,
+  라벨 배치 호출 등)로 전파되어 LLM 호출이 더 이상 진행되지 않습니다.
+- 응답 제너레이터가 서버 쪽에서 닫혀도(전송 실패, 서버 종료) 같은 정리 경로를 탑니다.
+- 정리는 제한 시간(cancel_timeout) 안에서 하위 Task가 모두 풀릴 때까지 기다리며,
+  결과(outcome)는 completed / cancelled / error 로 집계합니다.
+"""
+
+import asyncio
+import os
+import time
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+from .metrics import metrics
+
+DISCONNECT_POLL_SECONDS = float(os.getenv("STREAM_DISCONNECT_POLL_SECONDS", "0.5"))
+CANCEL_GRACE_SECONDS = float(os.getenv("STREAM_CANCEL_GRACE_SECONDS", "5"))
+
+_DONE = object()
+
+
+class StreamOutcome:
+    """스트림 종료 결과 (메트릭 라벨 겸용)"""
+
+    COMPLETED = "completed"
+    CANCELLED = "cancelled"
+    ERROR = "error"
+
+
+async def cancel_and_wait(task: "asyncio.Task", timeout: float = CANCEL_GRACE_SECONDS) -> bool:
+    """
+    task를 취소하고 timeout 안에 정리가 끝날 때까지 기다립니다.
+
+    Returns:
+        제한 시간 안에 정리됐으면 True
+    """
+    if task.done():
+        return True
+    task.cancel()
+    done, _ = await asyncio.wait({task}, timeout=timeout)
+    if task in done and not task.cancelled():
+        task.exception()  # 미확인 예외 경고 방지
+    return task in done
+
+
+async def stream_until_disconnect(
+    source: AsyncIterator[str],
+    is_disconnected: Callable[[], Awaitable[bool]],
+    *,
+    poll_interval: float = DISCONNECT_POLL_SECONDS,
+    cancel_timeout: float = CANCEL_GRACE_SECONDS,
+    on_finish: Optional[Callable[[str], None]] = None,
+) -> AsyncIterator[str]:
+    """
+    source의 청크를 그대로 전달하되, 클라이언트가 떠나면 source 실행을 취소합니다.
+
+    Args:
+        source: SSE 청크를 만드는 비동기 이터레이터 (그래프 실행)
+        is_disconnected: 연결 종료 여부 확인 함수 (FastAPI Request.is_disconnected)
+        on_finish: 종료 결과(StreamOutcome)를 받는 콜백
+    """
+    queue: "asyncio.Queue" = asyncio.Queue()
+
+    async def pump() -> None:
+        try:
+            async for chunk in source:
+                queue.put_nowait(chunk)
+        finally:
+            aclose = getattr(source, "aclose", None)
+            if aclose is not None:
+                await aclose()
+            queue.put_nowait(_DONE)
+
+    pump_task = asyncio.create_task(pump())
+    outcome = StreamOutcome.CANCELLED
+    last_checked = time.perf_counter()
+    try:
+        while True:
+            try:
+                chunk = await asyncio.wait_for(queue.get(), timeout=poll_interval)
+            except asyncio.TimeoutError:
+                chunk = None
+            # 청크가 계속 흘러도 poll_interval마다 한 번은 연결 상태를 확인
+            if chunk is None or time.perf_counter() - last_checked >= poll_interval:
+                last_checked = time.perf_counter()
+                if await is_disconnected():
+                    print("   🔌 [Stream] Client disconnected, cancelling graph run", flush=True)
+                    return
+            if chunk is None:
+                continue
+            if chunk is _DONE:
+                break
+            yield chunk
+        # source에서 난 예외는 호출 측으로 그대로 전달
+        await pump_task
+        outcome = StreamOutcome.COMPLETED
+    except Exception:
+        outcome = StreamOutcome.ERROR
+        raise
+    finally:
+        if not pump_task.done():
+            started_at = time.perf_counter()
+            cleaned = await cancel_and_wait(pump_task, cancel_timeout)
+            metrics.observe("chat_stream_cancel_seconds", time.perf_counter() - started_at)
+            if not cleaned:
+                metrics.inc("chat_stream_cancel_timeout_total")
+        metrics.inc("chat_stream_outcome_total", outcome=outcome)
+        if on_finish is not None:
+            on_finish(outcome)
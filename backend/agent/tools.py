@@ -17,7 +17,10 @@ from .database import (
     rerank_perfumes_async,
     get_perfumes_by_note,
 )
+from .circuit_breaker import CIRCUIT_BREAKERS, CircuitOpenError, model_name_of
+from .deadline import RELAXATION_RESERVE_SECONDS, allow_optional_stage, current_deadline
 from .expression_loader import ExpressionLoader
+from .llm_cassette import async_http_client, sync_http_client
 from .schemas import (
     LookupNoteInput,
     AdvancedSearchInput,
@@ -29,7 +32,11 @@ from .utils import enrich_accord_description, sanitize_filters, remove_special_c
 
 
 NORMALIZER_LLM = ChatOpenAI(
-    model="gpt-4o-mini", temperature=0, tags=["internal_helper"]
+    model="gpt-4o-mini",
+    temperature=0,
+    tags=["internal_helper"],
+    http_client=sync_http_client(),
+    http_async_client=async_http_client(),
 )
 
 _expression_loader = ExpressionLoader()
@@ -134,8 +141,18 @@ async def smart_perfume_search(
     if results:
         return results, "Perfect Match"
 
+    # [Deadline] 첫 완화 검색까지만 보장하고, 이후 단계는 남은 예산이 충분할 때만 시도
+    relaxed_attempts = 0
+    deadline = current_deadline()
     for r in range(len(active_keys) - 1, 0, -1):
         for combo_keys in itertools.combinations(active_keys, r):
+            if deadline is not None and deadline.expired():
+                return [], "No Results"
+            if relaxed_attempts and not allow_optional_stage(
+                "relaxation", RELAXATION_RESERVE_SECONDS
+            ):
+                return [], "No Results"
+            relaxed_attempts += 1
             temp_filters = {k: sanitized_strategy[k] for k in combo_keys}
             results = await tool_runner.ainvoke(
                 {
@@ -171,11 +188,17 @@ def lookup_perfume_info_tool(user_input: str) -> Dict[str, Any] | List:
     Output strictly JSON.
     """
     try:
-        norm_result = NORMALIZER_LLM.invoke(normalization_prompt).content
+        breaker = CIRCUIT_BREAKERS.get(model_name_of(NORMALIZER_LLM), "perfume_normalize")
+        with breaker.guard():
+            norm_result = NORMALIZER_LLM.invoke(normalization_prompt).content
         cleaned_json = norm_result.replace("```json", "").replace("```", "").strip()
         parsed = json.loads(cleaned_json)
         target_brand = " ".join(parsed.get("brand", "").split()).strip()
         target_name = " ".join(parsed.get("name", "").split()).strip()
+    except CircuitOpenError:
+        # 정규화 LLM 장애 중: 입력 그대로 영문명/한글명/별칭에서 찾음 (브랜드 조건 없음)
+        target_brand = ""
+        target_name = " ".join(user_input.split()).strip()
     except Exception as e:
         raise Exception(f"검색어 분석 실패: {e}")
 
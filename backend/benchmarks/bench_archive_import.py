@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+내 향수 일괄 가져오기 벤치마크 (기본 500건)
+
+실제 라우터(routers.archive)를 TestClient로 띄우고 agent.database를 인메모리 테이블로 바꿔
+DB 왕복마다 --rtt-ms만큼, 행마다 --row-us만큼 스레드를 막는 지연을 넣습니다.
+인증은 BFF 헤더(INTERNAL_REQUEST_SECRET) 경로를 그대로 거칩니다.
+
+- per-item: 기존처럼 POST /users/{id}/perfumes를 항목마다 (요청 N번, INSERT N번, 커밋 N번)
+- bulk:     POST /users/{id}/perfumes/bulk 한 번 (unnest upsert 1번, 커밋 1번)
+
+두 번째 실행은 같은 항목을 다시 보내 upsert(updated) 경로를 잽니다.
+
+Usage:
+    python benchmarks/bench_archive_import.py
+    python benchmarks/bench_archive_import.py --items 500 --rtt-ms 1.0 --row-us 20 --repeat 3
+"""
+
+import argparse
+import importlib
+import os
+import statistics
+import sys
+import time
+import types
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+MEMBER_ID = 42
+SECRET = "bench-secret"
+
+
+class LatencyArchiveDB:
+    """tb_member_my_perfume_t 인메모리 흉내 + 왕복/행 단위 지연"""
+
+    def __init__(self, rtt: float, per_row: float):
+        self.rtt = rtt
+        self.per_row = per_row
+        self.rows = {}
+        self.round_trips = 0
+
+    def _wait(self, rows: int = 0):
+        self.round_trips += 1
+        time.sleep(self.rtt + rows * self.per_row)
+
+    def cursor(self, cursor_factory=None):
+        return LatencyArchiveCursor(self)
+
+    def commit(self):
+        self._wait()
+
+    def rollback(self):
+        self._wait()
+
+
+class LatencyArchiveCursor:
+    def __init__(self, db):
+        self.db = db
+        self.result = []
+
+    def execute(self, sql, params):
+        db = self.db
+        if isinstance(params, dict):
+            # BULK_UPSERT_SQL
+            member_id = params["member_id"]
+            self.result = []
+            for pid, name, status, pref in zip(params["ids"], params["names"], params["statuses"], params["preferences"]):
+                inserted = (member_id, pid) not in db.rows
+                db.rows[(member_id, pid)] = (name, status, pref)
+                self.result.append({"perfume_id": pid, "inserted": inserted})
+            db._wait(len(self.result))
+        else:
+            # 단건 INSERT ... ON CONFLICT
+            member_id, pid, name, status, pref = params
+            db.rows[(member_id, pid)] = (name, status, pref)
+            db._wait(1)
+
+    def fetchall(self):
+        return self.result
+
+    def close(self):
+        pass
+
+
+def load_router(db):
+    fake_db = types.ModuleType("agent.database")
+    fake_db.get_recom_db_connection = lambda: db
+    fake_db.release_recom_db_connection = lambda conn: None
+    fake_db.get_db_connection = lambda: db
+    fake_db.release_db_connection = lambda conn: None
+    sys.modules["agent.database"] = fake_db
+    for name in ("agent.archive_db", "routers.archive"):
+        sys.modules.pop(name, None)
+    archive_db = importlib.import_module("agent.archive_db")
+    archive_db.invalidate_personalization = lambda member_id: None
+    return importlib.import_module("routers.archive")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import N perfumes: per-item requests vs one bulk request")
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--rtt-ms", type=float, default=1.0, help="DB 왕복 1번 지연")
+    parser.add_argument("--row-us", type=float, default=20.0, help="행 1개 처리 지연")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    os.environ["INTERNAL_REQUEST_SECRET"] = SECRET
+    os.environ["ARCHIVE_BULK_MAX_ITEMS"] = str(max(args.items, 500))
+
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    db = LatencyArchiveDB(args.rtt_ms / 1000, args.row_us / 1_000_000)
+    archive = load_router(db)
+    app = FastAPI()
+    app.include_router(archive.router)
+    client = TestClient(app)
+    headers = {"X-Scentence-User-Id": str(MEMBER_ID), "X-Scentence-Internal-Secret": SECRET}
+
+    items = [
+        {
+            "perfume_id": 10_000 + i,
+            "perfume_name": f"Perfume {i}",
+            "register_status": ("HAVE", "HAD", "RECOMMENDED")[i % 3],
+            "preference": ("GOOD", "NEUTRAL", "BAD")[i % 3],
+        }
+        for i in range(args.items)
+    ]
+
+    def per_item():
+        for item in items:
+            response = client.post(f"/users/{MEMBER_ID}/perfumes", json=item, headers=headers)
+            assert response.status_code == 200, response.text
+
+    def bulk():
+        response = client.post(f"/users/{MEMBER_ID}/perfumes/bulk", json={"items": items}, headers=headers)
+        assert response.status_code == 200, response.text
+        return response.json()["summary"]
+
+    print(f"🧪 Importing {args.items} perfumes (rtt {args.rtt_ms}ms, {args.row_us}µs/row)\n")
+    print(f"{'mode':<22} {'median':>10} {'per item':>10} {'round trips':>12}  summary")
+    print("-" * 78)
+    for name, fn in (("per-item (fresh)", per_item), ("bulk (fresh)", bulk), ("bulk (re-import)", bulk)):
+        samples, summary = [], None
+        for _ in range(args.repeat):
+            if "fresh" in name:
+                db.rows.clear()
+            db.round_trips = 0
+            started = time.perf_counter()
+            summary = fn()
+            samples.append(time.perf_counter() - started)
+        seconds = statistics.median(samples)
+        assert len(db.rows) == args.items
+        print(
+            f"{name:<22} {seconds * 1000:>8.1f}ms {seconds / args.items * 1e6:>8.0f}µs "
+            f"{db.round_trips:>12}  {summary or ''}"
+        )
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
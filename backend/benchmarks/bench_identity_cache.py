@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+get_identity 의존성 오버헤드 마이크로 벤치마크 (JWT 서명 검증 매번 vs 검증된 클레임 캐시)
+
+- dependency: get_identity를 직접 호출 (Authorization 헤더만 전달)
+- request:    FastAPI 라우트 하나를 TestClient로 호출 (헤더 파싱/의존성 주입 포함 왕복)
+
+토큰 풀(--tokens)을 돌아가며 사용하므로 동시 접속 사용자 수만큼의 토큰이 캐시에 올라갑니다.
+
+Usage:
+    python benchmarks/bench_identity_cache.py
+    python benchmarks/bench_identity_cache.py --calls 20000 --tokens 200 --algorithm HS512
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="get_identity overhead with and without the claims cache")
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--tokens", type=int, default=100, help="서로 다른 토큰 수")
+    parser.add_argument("--algorithm", default="HS256")
+    args = parser.parse_args()
+
+    os.environ["SECRET_KEY"] = "bench-secret-key"
+    os.environ["ALGORITHM"] = args.algorithm
+
+    from fastapi import Depends, FastAPI
+    from fastapi.testclient import TestClient
+    from jose import jwt
+
+    from agent import auth
+    from agent.auth import IDENTITY_CACHE, get_identity
+
+    exp = int(time.time()) + 3600
+    tokens = [
+        jwt.encode(
+            {"sub": str(i), "role": "USER", "user_mode": "BEGINNER", "exp": exp},
+            os.environ["SECRET_KEY"],
+            algorithm=args.algorithm,
+        )
+        for i in range(1, args.tokens + 1)
+    ]
+    headers = [f"Bearer {t}" for t in tokens]
+
+    app = FastAPI()
+
+    @app.get("/whoami")
+    def whoami(identity=Depends(get_identity)):
+        return {"user_id": identity.user_id}
+
+    client = TestClient(app)
+
+    def dependency():
+        for i in range(args.calls):
+            get_identity(None, None, None, None, None, headers[i % len(headers)])
+        return args.calls
+
+    def request():
+        for i in range(args.requests):
+            client.get("/whoami", headers={"Authorization": headers[i % len(headers)]})
+        return args.requests
+
+    print(f"🧪 get_identity with {args.tokens} distinct {args.algorithm} tokens\n")
+    print(f"{'case':<28} {'per call':>10}")
+    print("-" * 40)
+    for name, fn in (("dependency", dependency), ("request", request)):
+        for enabled in ("false", "true"):
+            os.environ["AUTH_IDENTITY_CACHE_ENABLED"] = enabled
+            IDENTITY_CACHE.clear()
+            fn()  # 워밍업 (캐시 채움)
+            started = time.perf_counter()
+            calls = fn()
+            elapsed = time.perf_counter() - started
+            label = f"{name} ({'cached' if enabled == 'true' else 'verify'})"
+            print(f"{label:<28} {elapsed / calls * 1e6:>8.1f}µs")
+    print(f"\ncache entries: {len(IDENTITY_CACHE)} (max {auth.IDENTITY_CACHE.max_entries})")
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
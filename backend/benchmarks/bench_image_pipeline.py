@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+프로필 이미지 업로드 동시 처리 벤치마크
+
+큰 JPEG(기본 약 8MB) N장을 동시에 업로드하는 상황에서 변환 처리량과 이벤트 루프 지연을 잽니다.
+프로브 코루틴이 10ms마다 깨어나 예정보다 늦은 만큼을 루프 지연으로 기록합니다.
+
+- legacy: 기존 convert_to_profile_webp (원본 크기 디코드, 256 한 장)를 async 핸들러 안에서 실행
+- inline: 새 변환(Image.draft 축소 디코드 + 64/128/256 한 번에)을 async 핸들러 안에서 실행
+- pool:   새 변환을 agent.image_utils 워커 풀에서 실행
+
+Usage:
+    python benchmarks/bench_image_pipeline.py
+    python benchmarks/bench_image_pipeline.py --uploads 20 --megabytes 8 --workers 2
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from PIL import Image, ImageOps
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+PROBE_INTERVAL = 0.01
+
+
+def make_jpeg(megabytes: float) -> bytes:
+    """노이즈 이미지라 압축이 잘 안 되므로 원하는 크기의 JPEG를 쉽게 만들 수 있음"""
+    side = 1024
+    while True:
+        img = Image.effect_noise((side, side), 64).convert("RGB")
+        buf = io.BytesIO()
+        img.save(buf, format="JPEG", quality=95)
+        if buf.tell() >= megabytes * 1024 * 1024:
+            return buf.getvalue()
+        side = int(side * 1.25)
+
+
+def legacy_convert(data: bytes) -> bytes:
+    """변경 전 convert_to_profile_webp와 같은 처리"""
+    img = ImageOps.exif_transpose(Image.open(io.BytesIO(data)))
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+    width, height = img.size
+    side = min(width, height)
+    left, top = (width - side) // 2, (height - side) // 2
+    img = img.crop((left, top, left + side, top + side))
+    img = img.resize((256, 256), Image.Resampling.LANCZOS)
+    out = io.BytesIO()
+    img.save(out, format="WEBP", quality=85)
+    return out.getvalue()
+
+
+def percentile(values, ratio):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(ratio * len(ordered)))]
+
+
+async def run_burst(mode: str, data: bytes, uploads: int):
+    from agent.image_utils import (
+        PROFILE_IMAGE_VARIANT_SIZES,
+        render_profile_variants,
+        render_profile_variants_async,
+    )
+
+    async def upload():
+        if mode == "legacy":
+            return legacy_convert(data)
+        if mode == "inline":
+            return render_profile_variants(data, PROFILE_IMAGE_VARIANT_SIZES)
+        return await render_profile_variants_async(data, PROFILE_IMAGE_VARIANT_SIZES)
+
+    # 워밍업 (워커 프로세스 기동)
+    await upload()
+
+    done = asyncio.Event()
+    lags = []
+
+    async def probe():
+        loop = asyncio.get_running_loop()
+        while not done.is_set():
+            expected = loop.time() + PROBE_INTERVAL
+            await asyncio.sleep(PROBE_INTERVAL)
+            lags.append(max(0.0, loop.time() - expected))
+
+    prober = asyncio.create_task(probe())
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    await asyncio.gather(*(upload() for _ in range(uploads)))
+    wall = time.perf_counter() - started
+    done.set()
+    await prober
+
+    return {
+        "mode": mode,
+        "wall": wall,
+        "throughput": uploads / wall,
+        "lag_p50": statistics.median(lags),
+        "lag_p95": percentile(lags, 0.95),
+        "lag_max": max(lags),
+        "probes": len(lags),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile image upload throughput and event-loop lag")
+    parser.add_argument("--uploads", type=int, default=20)
+    parser.add_argument("--megabytes", type=float, default=8.0, help="업로드 JPEG 크기")
+    parser.add_argument("--workers", type=int, default=None, help="이미지 워커 프로세스 수")
+    parser.add_argument("--modes", nargs="+", default=["legacy", "inline", "pool"], choices=["legacy", "inline", "pool"])
+    args = parser.parse_args()
+
+    # 모듈 상수라 임포트 전에 설정
+    os.environ.setdefault("PROFILE_IMAGE_MAX_MB", str(int(args.megabytes) + 2))
+    os.environ.setdefault("IMAGE_POOL_MAX_PENDING", str(args.uploads + 1))
+    if args.workers:
+        os.environ["IMAGE_POOL_WORKERS"] = str(args.workers)
+
+    from agent.image_utils import IMAGE_POOL_WORKERS, shutdown_image_pool
+
+    data = make_jpeg(args.megabytes)
+    with Image.open(io.BytesIO(data)) as img:
+        dims = img.size
+
+    print("=" * 78)
+    print(
+        f"{args.uploads} concurrent uploads of {len(data) / 1024 / 1024:.1f}MB JPEG {dims[0]}x{dims[1]} "
+        f"(workers={IMAGE_POOL_WORKERS}, cpus={os.cpu_count()})"
+    )
+    print("=" * 78)
+    print(f"{'mode':<8} {'burst':>9} {'img/s':>7} {'lag p50':>10} {'lag p95':>10} {'lag max':>10} {'probes':>7}")
+    try:
+        for mode in args.modes:
+            r = asyncio.run(run_burst(mode, data, args.uploads))
+            print(
+                f"{r['mode']:<8} {r['wall']:>8.2f}s {r['throughput']:>7.2f} "
+                f"{r['lag_p50'] * 1000:>8.1f}ms {r['lag_p95'] * 1000:>8.1f}ms "
+                f"{r['lag_max'] * 1000:>8.1f}ms {r['probes']:>7}"
+            )
+    finally:
+        shutdown_image_pool()
+
+
+if __name__ == "__main__":
+    main()
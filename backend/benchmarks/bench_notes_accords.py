@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+get_perfume_notes_and_accords 집계 마이크로 벤치마크
+
+아카이브 향수 20/200/2000개 회원을 가정하고 DB 결과 행을 합성해 Python 쪽 집계만 비교합니다.
+- legacy: 노트/어코드 쿼리 2회의 (perfume_id, 값) 행을 리스트 `not in`으로 중복 제거 (향수당 O(n²))
+- set-based: array_agg(DISTINCT ...) 1회의 향수별 배열을 dict.fromkeys로 정리 (O(n))
+  (archive_db.aggregate_notes_and_accords를 그대로 호출)
+
+노트는 TOP/MIDDLE/BASE 레이어에 걸쳐 중복되도록 만들어 실제 TB_PERFUME_NOTES_M 모양을 흉내 냅니다.
+DB 왕복 수는 2회 → 1회로 줄어들며, 이 벤치마크는 네트워크 비용을 포함하지 않습니다.
+
+Usage:
+    python benchmarks/bench_notes_accords.py
+    python benchmarks/bench_notes_accords.py --sizes 20 200 2000 --notes-per-perfume 60 --repeat 20
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+# archive_db는 임포트 시 DB 풀을 만드는 agent.database에 의존하므로 부하 생성기의 가짜 DB로 교체
+from benchmarks.chat_load import fake_database  # noqa: E402
+
+sys.modules.setdefault("agent.database", fake_database)
+
+from agent.archive_db import aggregate_notes_and_accords  # noqa: E402
+
+LAYERS = ("TOP", "MIDDLE", "BASE")
+
+
+def synthetic_rows(perfume_count: int, notes_per_perfume: int, accords_per_perfume: int, rng: random.Random):
+    """(perfume_ids, legacy 노트 행, legacy 어코드 행, array_agg 행)"""
+    vocabulary = [f"note_{i}" for i in range(400)]
+    accord_vocabulary = [f"accord_{i}" for i in range(60)]
+    perfume_ids = list(range(1, perfume_count + 1))
+    note_rows, accord_rows, grouped_rows = [], [], []
+    for pid in perfume_ids:
+        notes = rng.sample(vocabulary, notes_per_perfume)
+        accords = rng.sample(accord_vocabulary, accords_per_perfume)
+        for note in notes:
+            # 같은 노트가 여러 레이어에 등장
+            for _ in rng.sample(LAYERS, rng.randint(1, len(LAYERS))):
+                note_rows.append({"perfume_id": pid, "note": note})
+        accord_rows.extend({"perfume_id": pid, "accord": accord} for accord in accords)
+        grouped_rows.append({"perfume_id": pid, "notes": sorted(notes), "accords": sorted(accords)})
+    rng.shuffle(note_rows)
+    return perfume_ids, note_rows, accord_rows, grouped_rows
+
+
+def legacy_aggregate(perfume_ids, accords_rows, notes_rows):
+    """변경 전 archive_db 집계 로직"""
+    result = {}
+    for pid in perfume_ids:
+        result[pid] = {"notes": [], "accords": []}
+    for row in accords_rows:
+        pid = row['perfume_id']
+        accord = row['accord']
+        if pid in result and accord and accord not in result[pid]["accords"]:
+            result[pid]["accords"].append(accord)
+    for row in notes_rows:
+        pid = row['perfume_id']
+        note = row['note']
+        if pid in result and note and note not in result[pid]["notes"]:
+            result[pid]["notes"].append(note)
+    return result
+
+
+def timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark notes/accords aggregation")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 200, 2000], help="회원당 아카이브 향수 수")
+    parser.add_argument("--notes-per-perfume", type=int, default=30)
+    parser.add_argument("--accords-per-perfume", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    print("=" * 72)
+    print(
+        f"notes/accords aggregation (notes/perfume={args.notes_per_perfume}, "
+        f"accords/perfume={args.accords_per_perfume}, best of {args.repeat})"
+    )
+    print("=" * 72)
+    print(f"{'perfumes':>9} {'rows':>8} {'legacy':>11} {'set-based':>11} {'speedup':>8} {'queries':>9}")
+    for size in args.sizes:
+        perfume_ids, note_rows, accord_rows, grouped_rows = synthetic_rows(
+            size, args.notes_per_perfume, args.accords_per_perfume, rng
+        )
+        legacy = legacy_aggregate(perfume_ids, accord_rows, note_rows)
+        current = aggregate_notes_and_accords(perfume_ids, grouped_rows)
+        for pid in perfume_ids:
+            assert sorted(legacy[pid]["notes"]) == current[pid]["notes"]
+            assert sorted(legacy[pid]["accords"]) == current[pid]["accords"]
+
+        legacy_s = timed(lambda: legacy_aggregate(perfume_ids, accord_rows, note_rows), args.repeat)
+        current_s = timed(lambda: aggregate_notes_and_accords(perfume_ids, grouped_rows), args.repeat)
+        print(
+            f"{size:>9} {len(note_rows) + len(accord_rows):>8} {legacy_s * 1000:>9.2f}ms "
+            f"{current_s * 1000:>9.2f}ms {legacy_s / current_s:>7.1f}x {'2 → 1':>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
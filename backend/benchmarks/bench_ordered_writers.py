@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+추천 섹션 동시 작성 벤치마크 (가짜 스트리밍 모델)
+
+parallel_reco_node의 작성 단계를 흉내 냅니다.
+- 전략 준비(계획+검색)가 시차를 두고 완료되고 (as_completed 순서),
+- 다음 전략이 도착해야 앞 섹션의 is_last=False가 확정되며,
+- 각 섹션은 가짜 모델이 "첫 토큰 지연 + 토큰 간 지연"으로 스트리밍합니다.
+
+순차 작성(K=1, 기존 동작)과 OrderedStreamMultiplexer 동시 작성(K=N)의
+첫 토큰 시간(TTFT)과 전체 완료 시간을 3/5 섹션에 대해 비교합니다.
+
+Usage:
+    python benchmarks/bench_ordered_writers.py
+    python benchmarks/bench_ordered_writers.py --sections 3 5 --tokens 120 --token-ms 10 --runs 5
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.ordered_stream import OrderedStreamMultiplexer
+
+
+class FakeStreamingModel:
+    """첫 토큰 지연(ttft_ms ± jitter) 후 token_ms 간격으로 토큰을 내보내는 가짜 모델"""
+
+    def __init__(self, ttft_ms: float, token_ms: float, tokens: int, rng: random.Random):
+        self.ttft_ms = ttft_ms
+        self.token_ms = token_ms
+        self.tokens = tokens
+        self.rng = rng
+
+    async def astream(self, section: int):
+        await asyncio.sleep(max(0.0, self.rng.gauss(self.ttft_ms, self.ttft_ms * 0.2)) / 1000)
+        yield f"## {section}. "
+        for _ in range(self.tokens):
+            await asyncio.sleep(self.token_ms / 1000)
+            yield "토큰 "
+
+
+async def run_turn(sections: int, concurrency: int, model: FakeStreamingModel, prep_ms: float, rng):
+    started = time.perf_counter()
+    first_token_at = None
+    received = []
+
+    async def sink(_order, chunk):
+        nonlocal first_token_at
+        if first_token_at is None:
+            first_token_at = time.perf_counter() - started
+        received.append(chunk)
+
+    async def prepare(index: int):
+        await asyncio.sleep(rng.uniform(0.5, 1.5) * prep_ms / 1000)
+        return index
+
+    def writer(section: int):
+        async def produce(emit):
+            text = ""
+            async for chunk in model.astream(section):
+                text += chunk
+                await emit(chunk)
+            return text
+
+        return produce
+
+    multiplexer = OrderedStreamMultiplexer(sink, max_concurrency=concurrency)
+    pending = None
+    written = 0
+    for future in asyncio.as_completed([prepare(i) for i in range(sections)]):
+        await future
+        if pending is not None:
+            written += 1
+            multiplexer.submit(writer(written))
+            if concurrency == 1:
+                # 기존 동작: 다음 전략 처리 전에 앞 섹션 작성을 끝까지 기다림
+                await multiplexer.drain()
+        pending = True
+    if pending is not None:
+        written += 1
+        multiplexer.submit(writer(written))
+    await multiplexer.drain()
+
+    return first_token_at, time.perf_counter() - started, "".join(received)
+
+
+async def bench(args):
+    print(
+        f"{'sections':>8} {'mode':<12} {'TTFT p50':>10} {'total p50':>10} {'total p95':>10}"
+    )
+    for sections in args.sections:
+        baseline_total = None
+        for label, concurrency in (("sequential", 1), ("concurrent", sections)):
+            rng = random.Random(args.seed)
+            model = FakeStreamingModel(args.ttft_ms, args.token_ms, args.tokens, rng)
+            ttfts, totals = [], []
+            for _ in range(args.runs):
+                ttft, total, text = await run_turn(sections, concurrency, model, args.prep_ms, rng)
+                assert [line for line in text.split("## ") if line][0].startswith("1.")
+                ttfts.append(ttft)
+                totals.append(total)
+            totals_sorted = sorted(totals)
+            p95 = totals_sorted[min(len(totals) - 1, int(0.95 * (len(totals) - 1)))]
+            total_p50 = statistics.median(totals)
+            print(
+                f"{sections:>8} {label:<12} {statistics.median(ttfts) * 1000:>8.0f}ms "
+                f"{total_p50 * 1000:>8.0f}ms {p95 * 1000:>8.0f}ms"
+            )
+            if baseline_total is None:
+                baseline_total = total_p50
+            else:
+                print(f"{'':>8} {'':<12} end-to-end {1 - total_p50 / baseline_total:.0%} faster")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent ordered section writing")
+    parser.add_argument("--sections", type=int, nargs="+", default=[3, 5])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--prep-ms", type=float, default=300, help="전략 준비 평균 지연")
+    parser.add_argument("--ttft-ms", type=float, default=400, help="섹션 작성 모델 첫 토큰 지연")
+    parser.add_argument("--token-ms", type=float, default=5, help="토큰 간 지연")
+    parser.add_argument("--tokens", type=int, default=200, help="섹션당 토큰 수")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    asyncio.run(bench(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+로그인 폭주 중 무관한 엔드포인트 지연 벤치마크
+
+앱과 같은 구조(동기 엔드포인트 = anyio 공용 스레드풀)의 작은 FastAPI 앱을 프로세스 안에 띄우고
+로그인 N건을 한꺼번에 보내는 동안 다른 동기 엔드포인트(/ping)의 지연을 잽니다.
+
+- inline: 기존처럼 엔드포인트 스레드에서 pbkdf2_sha256 verify
+- pool:   agent.password_hasher (전용 프로세스 풀 + 대기열 제한, 넘치면 429)
+
+Usage:
+    python benchmarks/bench_password_burst.py
+    python benchmarks/bench_password_burst.py --logins 100 --workers 2 --max-pending 8 --rounds 29000
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import httpx
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.password_hasher import PasswordHasher, PasswordHasherBusy, build_context  # noqa: E402
+
+PASSWORD = "Secret!23"
+PING_INTERVAL = 0.01
+
+
+class LoginRequest(BaseModel):
+    password: str
+
+
+def build_app(mode: str, hasher: PasswordHasher, pwd_hash: str) -> FastAPI:
+    app = FastAPI()
+    context = build_context(hasher.rounds)
+
+    @app.post("/login")
+    def login(req: LoginRequest):
+        if mode == "inline":
+            ok = context.verify(req.password, pwd_hash)
+        else:
+            try:
+                ok, _ = hasher.verify(req.password, pwd_hash)
+            except PasswordHasherBusy as e:
+                raise e.to_http()
+        if not ok:
+            raise HTTPException(status_code=401, detail="Invalid credentials")
+        return {"ok": True}
+
+    @app.get("/ping")
+    def ping():
+        # 짧은 DB 조회 흉내
+        time.sleep(0.001)
+        return {"ok": True}
+
+    return app
+
+
+def percentile(values, ratio):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(ratio * len(ordered)))]
+
+
+async def run_burst(mode: str, hasher: PasswordHasher, pwd_hash: str, logins: int):
+    app = build_app(mode, hasher, pwd_hash)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        # 워밍업 (스레드풀/워커 프로세스 기동)
+        await client.get("/ping")
+        await client.post("/login", json={"password": PASSWORD})
+
+        done = asyncio.Event()
+        ping_latencies = []
+
+        async def probe():
+            while not done.is_set():
+                started = time.perf_counter()
+                await client.get("/ping")
+                ping_latencies.append(time.perf_counter() - started)
+                await asyncio.sleep(PING_INTERVAL)
+
+        async def login():
+            response = await client.post("/login", json={"password": PASSWORD})
+            return response.status_code
+
+        prober = asyncio.create_task(probe())
+        started = time.perf_counter()
+        statuses = await asyncio.gather(*(login() for _ in range(logins)))
+        wall = time.perf_counter() - started
+        done.set()
+        await prober
+
+    return {
+        "mode": mode,
+        "ok": statuses.count(200),
+        "rejected": statuses.count(429),
+        "wall": wall,
+        "ping_p50": statistics.median(ping_latencies),
+        "ping_p95": percentile(ping_latencies, 0.95),
+        "ping_max": max(ping_latencies),
+        "pings": len(ping_latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Unrelated endpoint latency during a login burst")
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=2, help="해시 워커 프로세스 수")
+    parser.add_argument("--max-pending", type=int, default=8, help="대기열 제한 (넘치면 429)")
+    parser.add_argument("--rounds", type=int, default=29000, help="pbkdf2 라운드 (passlib 기본값 29000)")
+    parser.add_argument("--modes", nargs="+", default=["inline", "pool"], choices=["inline", "pool"])
+    args = parser.parse_args()
+
+    hasher = PasswordHasher(workers=args.workers, max_pending=args.max_pending, rounds=args.rounds)
+    pwd_hash = build_context(args.rounds).hash(PASSWORD)
+
+    print("=" * 78)
+    print(
+        f"{args.logins}-login burst (rounds={args.rounds}, workers={args.workers}, "
+        f"max_pending={args.max_pending})"
+    )
+    print("=" * 78)
+    print(f"{'mode':<8} {'ok':>5} {'429':>5} {'burst':>9} {'ping p50':>10} {'ping p95':>10} {'ping max':>10} {'pings':>6}")
+    try:
+        for mode in args.modes:
+            r = asyncio.run(run_burst(mode, hasher, pwd_hash, args.logins))
+            print(
+                f"{r['mode']:<8} {r['ok']:>5} {r['rejected']:>5} {r['wall']:>8.2f}s "
+                f"{r['ping_p50'] * 1000:>8.1f}ms {r['ping_p95'] * 1000:>8.1f}ms "
+                f"{r['ping_max'] * 1000:>8.1f}ms {r['pings']:>6}"
+            )
+    finally:
+        hasher.shutdown()
+
+
+if __name__ == "__main__":
+    main()
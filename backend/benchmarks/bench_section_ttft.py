@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+섹션 첫 토큰 시간(TTFT) 벤치마크: 전체 버퍼링 후처리 vs 헤더 스트리밍 정리기
+
+가짜 모델이 "도입부 → ## N. 헤더 → 본문 토큰" 순서로 스트리밍할 때,
+- buffered: 전체 출력을 모은 뒤 format_section_text로 정리 (기존 generate_section)
+- streaming: SectionHeaderRewriter로 헤더 줄만 버퍼링하고 바로 전달
+두 방식에서 첫 섹션 토큰이 소비자에게 도달하는 시간과 전체 완료 시간을 비교합니다.
+두 방식의 최종 텍스트가 같은지도 매 실행 확인합니다.
+
+Usage:
+    python benchmarks/bench_section_ttft.py
+    python benchmarks/bench_section_ttft.py --tokens 300 --token-ms 8 --preamble-tokens 5 --runs 5
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.section_stream import SectionHeaderRewriter, format_section_text
+
+
+class FakeSectionModel:
+    """첫 토큰 지연 후 token_ms 간격으로 도입부/헤더/본문 토큰을 내보내는 가짜 모델"""
+
+    def __init__(self, ttft_ms: float, token_ms: float, tokens: int, preamble_tokens: int):
+        self.ttft_ms = ttft_ms
+        self.token_ms = token_ms
+        self.tokens = tokens
+        self.preamble_tokens = preamble_tokens
+
+    async def astream(self):
+        await asyncio.sleep(self.ttft_ms / 1000)
+        pieces = ["도입 "] * self.preamble_tokens + ["\n## ", "4", ". ", "시트러스 ", "향수", "\n"]
+        pieces += ["본문 "] * self.tokens
+        for piece in pieces:
+            yield piece
+            await asyncio.sleep(self.token_ms / 1000)
+
+
+async def run_buffered(model: FakeSectionModel, display_priority: int):
+    started = time.perf_counter()
+    text = ""
+    async for chunk in model.astream():
+        text += chunk
+    output = format_section_text(text, display_priority)
+    first_token_at = time.perf_counter() - started
+    return first_token_at, time.perf_counter() - started, output
+
+
+async def run_streaming(model: FakeSectionModel, display_priority: int):
+    started = time.perf_counter()
+    first_token_at = None
+    rewriter = SectionHeaderRewriter(display_priority)
+    received = []
+    async for chunk in model.astream():
+        out = rewriter.feed(chunk)
+        if out:
+            if first_token_at is None:
+                first_token_at = time.perf_counter() - started
+            received.append(out)
+    received.append(rewriter.finish())
+    if first_token_at is None:
+        first_token_at = time.perf_counter() - started
+    return first_token_at, time.perf_counter() - started, "".join(received)
+
+
+async def bench(args):
+    model = FakeSectionModel(args.ttft_ms, args.token_ms, args.tokens, args.preamble_tokens)
+    print(f"{'mode':<10} {'TTFT p50':>10} {'total p50':>10}")
+    results = {}
+    outputs = {}
+    for label, runner in (("buffered", run_buffered), ("streaming", run_streaming)):
+        ttfts, totals = [], []
+        for _ in range(args.runs):
+            ttft, total, output = await runner(model, args.display_priority)
+            ttfts.append(ttft)
+            totals.append(total)
+            outputs[label] = output
+        results[label] = statistics.median(ttfts)
+        print(
+            f"{label:<10} {results[label] * 1000:>8.0f}ms "
+            f"{statistics.median(totals) * 1000:>8.0f}ms"
+        )
+    assert outputs["buffered"] == outputs["streaming"], "post-processing parity broken"
+    print(f"time-to-first-section-token {1 - results['streaming'] / results['buffered']:.0%} lower")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark section time-to-first-token")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--ttft-ms", type=float, default=400, help="모델 첫 토큰 지연")
+    parser.add_argument("--token-ms", type=float, default=5, help="토큰 간 지연")
+    parser.add_argument("--tokens", type=int, default=200, help="본문 토큰 수")
+    parser.add_argument("--preamble-tokens", type=int, default=3, help="헤더 앞 도입부 토큰 수")
+    parser.add_argument("--display-priority", type=int, default=2)
+    args = parser.parse_args()
+    asyncio.run(bench(args))
+
+
+if __name__ == "__main__":
+    main()
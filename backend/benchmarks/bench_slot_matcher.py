@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+인터뷰 슬롯 사전 추출 벤치마크
+
+1. 처리량: Aho-Corasick 오토마톤 vs 단순 부분 문자열 스캔 (어휘 크기별)
+   - 실서비스 DB 어휘(브랜드/향수/노트 수천 개)를 흉내 내기 위해 합성 어휘를 추가합니다.
+2. 스킵 비율: 픽스처 턴(benchmarks/fixtures/interview_turns.jsonl) 중
+   InterviewResult LLM 호출 없이 Researcher로 넘길 수 있는 비율과 기대값 일치율
+
+Usage:
+    python benchmarks/bench_slot_matcher.py
+    python benchmarks/bench_slot_matcher.py --vocab-sizes 0 1000 10000 --repeat 20 --verbose
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.intent_router import build_gazetteer
+from agent.slot_matcher import build_slot_matcher
+
+FIXTURE_PATH = Path(__file__).resolve().parent / "fixtures" / "interview_turns.jsonl"
+
+_SYLLABLES = "가나다라마바사아자차카타파하거너더러머버서어저처커터퍼허고노도로모보소오조"
+
+
+def load_fixture(path: Path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def synthetic_terms(count: int, rng: random.Random):
+    """DB 향수명을 흉내 낸 3~6음절 임의 이름"""
+    return {
+        "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(3, 6)))
+        for _ in range(count)
+    }
+
+
+def naive_scan(terms, text: str):
+    lowered = text.lower()
+    return [term for term in terms if term in lowered]
+
+
+def bench_throughput(queries, vocab_sizes, repeat: int):
+    rng = random.Random(7)
+    print(f"{'vocab':>8} {'patterns':>9} {'aho q/s':>12} {'naive q/s':>12} {'speedup':>8}")
+    for size in vocab_sizes:
+        gazetteer = build_gazetteer(include_db=False)
+        for term in synthetic_terms(size, rng):
+            gazetteer.add("perfume", term, term)
+        matcher = build_slot_matcher(gazetteer, include_db=False)
+        surfaces = [surface for _, surface, _ in gazetteer.terms()]
+
+        started = time.perf_counter()
+        for _ in range(repeat):
+            for query in queries:
+                matcher.extract(query)
+        aho_qps = repeat * len(queries) / (time.perf_counter() - started)
+
+        started = time.perf_counter()
+        for _ in range(repeat):
+            for query in queries:
+                naive_scan(surfaces, query)
+        naive_qps = repeat * len(queries) / (time.perf_counter() - started)
+
+        print(
+            f"{size:>8} {len(matcher):>9} {aho_qps:>12,.0f} {naive_qps:>12,.0f} "
+            f"{aho_qps / naive_qps:>7.1f}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark interview slot pre-extraction")
+    parser.add_argument("--fixture", type=Path, default=FIXTURE_PATH)
+    parser.add_argument("--vocab-sizes", type=int, nargs="+", default=[0, 1000, 5000, 20000])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    rows = load_fixture(args.fixture)
+    queries = [row["query"] for row in rows]
+
+    print("=" * 60)
+    print("Slot matcher throughput (extract() incl. slot assembly)")
+    print("=" * 60)
+    bench_throughput(queries, args.vocab_sizes, args.repeat)
+
+    matcher = build_slot_matcher(include_db=False)
+    skipped = agreed = 0
+    mismatches = []
+    for row in rows:
+        extraction = matcher.extract(row["query"])
+        can_skip = extraction.can_skip_llm(row.get("user_preferences"))
+        skipped += can_skip
+        if can_skip == row.get("expect_skip", can_skip):
+            agreed += 1
+        else:
+            mismatches.append((row, extraction))
+        if args.verbose:
+            mark = "SKIP" if can_skip else "LLM "
+            print(f"  [{mark}] {row['query']} -> {json.dumps(extraction.slots, ensure_ascii=False)}")
+
+    total = len(rows)
+    print("=" * 60)
+    print("Interviewer LLM skip rate")
+    print("=" * 60)
+    print(f"Turns:                {total}")
+    print(f"LLM skipped:          {skipped} ({skipped / total:.1%})")
+    print(f"Matches expectation:  {agreed} ({agreed / total:.1%})")
+    if mismatches:
+        print("-" * 60)
+        print("Mismatched:")
+        for row, extraction in mismatches:
+            print(
+                f"  {row['query']!r}: expect_skip={row['expect_skip']} "
+                f"slots={extraction.slots} conflicts={sorted(extraction.conflicts)} "
+                f"negation={extraction.has_negation}"
+            )
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Pre-Validator / Supervisor 추측 병렬 실행 벤치마크 (가짜 모델)
+
+실제 LLM 대신 지연 분포를 흉내 낸 가짜 모델로 한 턴의
+"첫 토큰까지의 시간(TTFT)"을 순차 실행과 추측 실행으로 비교합니다.
+
+TTFT = 검증 + 라우팅 + 다음 노드의 첫 토큰 지연
+(거부된 턴은 검증 직후 고정 메시지가 나가므로 검증 지연만 포함)
+
+Usage:
+    python benchmarks/bench_speculative_routing.py --turns 200 --reject-rate 0.1
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.metrics import metrics
+from agent.speculative import run_speculative
+
+
+class FakeModel:
+    """정규분포 지연을 갖는 가짜 구조화 출력 모델"""
+
+    def __init__(self, mean_ms: float, jitter_ms: float, rng: random.Random):
+        self.mean_ms = mean_ms
+        self.jitter_ms = jitter_ms
+        self.rng = rng
+        self.calls = 0
+
+    async def ainvoke(self, result):
+        self.calls += 1
+        delay_ms = max(1.0, self.rng.gauss(self.mean_ms, self.jitter_ms))
+        await asyncio.sleep(delay_ms / 1000)
+        return result
+
+
+async def run_turn(mode, validator, router, downstream_ms, rejected):
+    started = time.perf_counter()
+    validation = {"validation_result": "unsupported" if rejected else "supported"}
+
+    if mode == "sequential":
+        result = await validator.ainvoke(validation)
+        if result["validation_result"] == "supported":
+            await router.ainvoke("interviewer")
+    else:
+        result, _ = await run_speculative(
+            validator.ainvoke(validation),
+            router.ainvoke("interviewer"),
+            accept=lambda r: r["validation_result"] != "unsupported",
+            stage="bench",
+        )
+
+    if result["validation_result"] == "supported":
+        await asyncio.sleep(downstream_ms / 1000)
+    return time.perf_counter() - started
+
+
+async def run_mode(mode, args):
+    rng = random.Random(args.seed)
+    validator = FakeModel(args.validator_ms, args.jitter_ms, rng)
+    router = FakeModel(args.router_ms, args.jitter_ms, rng)
+    decisions = random.Random(args.seed + 1)
+
+    async def one_turn():
+        rejected = decisions.random() < args.reject_rate
+        return await run_turn(mode, validator, router, args.downstream_ms, rejected)
+
+    samples = []
+    for start in range(0, args.turns, args.concurrency):
+        batch = min(args.concurrency, args.turns - start)
+        samples.extend(await asyncio.gather(*(one_turn() for _ in range(batch))))
+    return samples, router.calls
+
+
+def _summary(samples):
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(0.95 * (len(ordered) - 1)))]
+    return statistics.mean(samples) * 1000, statistics.median(samples) * 1000, p95 * 1000
+
+
+async def main_async(args):
+    sequential, seq_router_calls = await run_mode("sequential", args)
+    metrics.reset()
+    speculative, spec_router_calls = await run_mode("speculative", args)
+
+    print("=" * 64)
+    print(
+        f"turns={args.turns} reject_rate={args.reject_rate:.2f} "
+        f"validator={args.validator_ms}ms router={args.router_ms}ms "
+        f"downstream={args.downstream_ms}ms"
+    )
+    print("=" * 64)
+    print(f"{'mode':<12}{'mean(ms)':>12}{'p50(ms)':>12}{'p95(ms)':>12}{'router calls':>16}")
+    for label, samples, calls in (
+        ("sequential", sequential, seq_router_calls),
+        ("speculative", speculative, spec_router_calls),
+    ):
+        mean, p50, p95 = _summary(samples)
+        print(f"{label:<12}{mean:>12.1f}{p50:>12.1f}{p95:>12.1f}{calls:>16}")
+
+    seq_mean = statistics.mean(sequential)
+    spec_mean = statistics.mean(speculative)
+    snapshot = metrics.snapshot()["counters"]
+    wasted = snapshot.get("speculative_wasted_total{stage=bench}", 0)
+    cancelled = snapshot.get("speculative_cancelled_total{stage=bench}", 0)
+    print("-" * 64)
+    print(f"TTFT reduction (mean): {(1 - spec_mean / seq_mean) * 100:.1f}%")
+    print(f"speculative cancelled: {int(cancelled)}  wasted: {int(wasted)}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--reject-rate", type=float, default=0.1)
+    parser.add_argument("--validator-ms", type=float, default=700)
+    parser.add_argument("--router-ms", type=float, default=600)
+    parser.add_argument("--downstream-ms", type=float, default=400)
+    parser.add_argument("--jitter-ms", type=float, default=120)
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(main_async(parse_args()))
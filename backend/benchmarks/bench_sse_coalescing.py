@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+SSE 프레임 병합 벤치마크 (가짜 1k 토큰 생성)
+
+stream_generator 출력 단계만 떼어 내어 비교합니다.
+- per-token: 토큰마다 json.dumps + "data: ...\\n\\n" 프레임 1개 (기존 동작)
+- coalesced: coalesce_sse (시간창/바이트 임계치 병합 + orjson)
+
+동시 스트림 N개를 한 이벤트 루프에서 돌리고, 각 프레임을 루프백 소켓으로 실제 전송합니다.
+(ASGI send → transport.write와 같은 프레임당 비용 포함)
+스트림당 프레임 수 / 전송 바이트 / CPU 시간(process_time)과 전체 frames/sec를 출력하고,
+화면에 보이는 최종 텍스트가 같은지도 확인합니다.
+
+Usage:
+    python benchmarks/bench_sse_coalescing.py
+    python benchmarks/bench_sse_coalescing.py --streams 50 --tokens 1000 --token-ms 2 --window-ms 30
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.sse import SSECoalescer, SSEEvent, coalesce_sse
+
+TOKENS = ["향", "수는 ", "시트러스", " 노트", "가 ", "산뜻하게 ", "퍼지고", ", ", "잔향은 ", "우디", "합니다. ", "\n"]
+
+
+async def fake_generation(tokens: int, token_ms: float):
+    """토큰 간격 token_ms로 answer 이벤트를 내보내는 가짜 writer 노드"""
+    yield SSEEvent({"type": "log", "content": "추천 작성 중..."})
+    for index in range(tokens):
+        if token_ms and index % 4 == 0:
+            # 모델 청크는 보통 몇 토큰씩 몰려서 도착함
+            await asyncio.sleep(token_ms * 4 / 1000)
+        yield SSEEvent({"type": "answer", "content": TOKENS[index % len(TOKENS)]}, "writer")
+
+
+async def per_token_frames(source):
+    async for payload, _key in source:
+        data = json.dumps(payload, ensure_ascii=False)
+        yield f"data: {data}\n\n"
+
+
+async def _discard(reader, writer):
+    while await reader.read(65536):
+        pass
+    writer.close()
+
+
+async def consume(frames, port: int):
+    _reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    count = size = 0
+    text = []
+    async for frame in frames:
+        data = frame.encode("utf-8")
+        writer.write(data)
+        await writer.drain()
+        count += 1
+        size += len(data)
+        payload = json.loads(frame[len("data: "):])
+        if payload["type"] == "answer":
+            text.append(payload["content"])
+    writer.close()
+    await writer.wait_closed()
+    return count, size, "".join(text)
+
+
+async def run_mode(mode: str, args):
+    def build(index):
+        source = fake_generation(args.tokens, args.token_ms)
+        if mode == "per-token":
+            return per_token_frames(source)
+        coalescer = SSECoalescer(window=args.window_ms / 1000, max_bytes=args.max_bytes)
+        return coalesce_sse(source, coalescer, enabled=True)
+
+    server = await asyncio.start_server(_discard, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    cpu_started = time.process_time()
+    wall_started = time.perf_counter()
+    results = await asyncio.gather(*(consume(build(i), port) for i in range(args.streams)))
+    wall = time.perf_counter() - wall_started
+    cpu = time.process_time() - cpu_started
+    server.close()
+    await server.wait_closed()
+    frames = sum(r[0] for r in results)
+    size = sum(r[1] for r in results)
+    return {
+        "frames_per_stream": frames / args.streams,
+        "bytes_per_stream": size / args.streams,
+        "cpu_ms_per_stream": cpu * 1000 / args.streams,
+        "frames_per_sec": frames / wall,
+        "wall": wall,
+        "text": results[0][2],
+    }
+
+
+async def bench(args):
+    print(
+        f"{'mode':<10} {'frames/stream':>14} {'bytes/stream':>13} "
+        f"{'CPU/stream':>11} {'frames/sec':>11} {'wall':>8}"
+    )
+    results = {}
+    for mode in ("per-token", "coalesced"):
+        result = await run_mode(mode, args)
+        results[mode] = result
+        print(
+            f"{mode:<10} {result['frames_per_stream']:>14.0f} {result['bytes_per_stream']:>13.0f} "
+            f"{result['cpu_ms_per_stream']:>9.2f}ms {result['frames_per_sec']:>11.0f} "
+            f"{result['wall']:>7.2f}s"
+        )
+    assert results["per-token"]["text"] == results["coalesced"]["text"], "rendered text differs"
+    base, new = results["per-token"], results["coalesced"]
+    print(
+        f"frames -{1 - new['frames_per_stream'] / base['frames_per_stream']:.0%}, "
+        f"bytes -{1 - new['bytes_per_stream'] / base['bytes_per_stream']:.0%}, "
+        f"CPU -{1 - new['cpu_ms_per_stream'] / base['cpu_ms_per_stream']:.0%} per stream"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SSE frame coalescing")
+    parser.add_argument("--streams", type=int, default=50, help="동시 스트림 수")
+    parser.add_argument("--tokens", type=int, default=1000, help="스트림당 토큰 수")
+    parser.add_argument("--token-ms", type=float, default=2, help="토큰 간 평균 지연")
+    parser.add_argument("--window-ms", type=float, default=30, help="병합 시간창")
+    parser.add_argument("--max-bytes", type=int, default=1024, help="병합 바이트 임계치")
+    args = parser.parse_args()
+    asyncio.run(bench(args))
+
+
+if __name__ == "__main__":
+    main()
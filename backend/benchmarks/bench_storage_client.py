@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+오브젝트 업로드 1건당 오버헤드 벤치마크 (호출마다 새 boto3 클라이언트 vs 캐시된 클라이언트)
+
+프로세스 안에 S3 PUT만 흉내 내는 작은 HTTP 서버(keep-alive)를 띄우고 AWS_S3_ENDPOINT_URL로 연결해
+네트워크 왕복 대신 클라이언트 생성/자격증명 해석/커넥션 수립 비용만 비교합니다.
+
+- per-call: 기존처럼 upload마다 _get_s3_client() 생성
+- cached:   agent.storage_s3.S3Backend (클라이언트 1개 + 커넥션 풀 재사용)
+
+Usage:
+    python benchmarks/bench_storage_client.py
+    python benchmarks/bench_storage_client.py --uploads 200 --concurrency 8 --kilobytes 20
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+
+class FakeS3Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = set()
+
+    def do_PUT(self):
+        FakeS3Handler.connections.add(self.client_address)
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("ETag", '"bench"')
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeS3Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(mode: str, uploads: int, concurrency: int, payload: bytes):
+    from agent.storage_s3 import S3Backend, _get_s3_client
+
+    backend = S3Backend(bucket="bench")
+    backend.put("warmup", payload, "image/webp")
+    FakeS3Handler.connections.clear()
+
+    def upload(i):
+        started = time.perf_counter()
+        key = f"profile_images/{i}.webp"
+        if mode == "per-call":
+            _get_s3_client().put_object(Bucket="bench", Key=key, Body=payload, ContentType="image/webp")
+        else:
+            backend.put(key, payload, "image/webp")
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(upload, range(uploads)))
+    wall = time.perf_counter() - started
+    return {
+        "mode": mode,
+        "p50": statistics.median(latencies),
+        "p95": sorted(latencies)[int(0.95 * (len(latencies) - 1))],
+        "throughput": uploads / wall,
+        "connections": len(FakeS3Handler.connections),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-upload overhead: per-call vs cached S3 client")
+    parser.add_argument("--uploads", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--kilobytes", type=int, default=20, help="업로드 크기 (프로필 WebP 수준)")
+    args = parser.parse_args()
+
+    server = start_server()
+    os.environ["AWS_S3_ENDPOINT_URL"] = f"http://127.0.0.1:{server.server_port}"
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "bench")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "bench")
+    payload = os.urandom(args.kilobytes * 1024)
+
+    print("=" * 72)
+    print(f"{args.uploads} uploads x {args.kilobytes}KB, concurrency={args.concurrency}")
+    print("=" * 72)
+    print(f"{'mode':<9} {'p50':>10} {'p95':>10} {'uploads/s':>10} {'connections':>12}")
+    try:
+        for mode in ("per-call", "cached"):
+            r = run(mode, args.uploads, args.concurrency, payload)
+            print(
+                f"{r['mode']:<9} {r['p50'] * 1000:>8.2f}ms {r['p95'] * 1000:>8.2f}ms "
+                f"{r['throughput']:>10.1f} {r['connections']:>12}"
+            )
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+"""
+/chat 엔드투엔드 부하 생성기 (네트워크/DB 없이 노트북에서 실행)
+
+FastAPI 앱을 프로세스 안에서 띄우고 다음을 가짜로 바꿔 끼웁니다.
+- agent.database → fake_database (인메모리 카탈로그/채팅 기록, 쿼리당 동기 지연)
+- ChatOpenAI / OpenAI SDK 전송 계층 → fake_openai (스트리밍/구조화 출력/임베딩, 지연 모델)
+
+시나리오(추천, 정보, 후속 질문)를 가중치대로 섞어 동시성 N으로 /chat SSE를 호출하고
+TTFT, 프레임 간격, 완료 시간 p50/p95/p99와 이벤트 루프 지연을 JSON으로 남깁니다.
+
+Usage (backend/에서):
+    python -m benchmarks.chat_load --concurrency 16 --sessions 200 --json results/load.json
+    python -m benchmarks.chat_load --mix reco=0.6,info=0.3,followup=0.1 --latency-scale 0.2
+"""
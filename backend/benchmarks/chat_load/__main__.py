@@ -0,0 +1,77 @@
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from benchmarks.chat_load.runner import run  # noqa: E402
+
+
+def _ms(value):
+    return f"{value * 1000:8.0f}ms" if value is not None else "        -"
+
+
+def report(result) -> None:
+    config = result["meta"]["config"]
+    git = result["meta"]["git"]
+    print(
+        f"commit {git['commit']}{' (dirty)' if git['dirty'] else ''}  "
+        f"concurrency {config['concurrency']}  sessions {config['sessions']}  "
+        f"latency x{config['latency_scale']}  wall {result['wall_seconds']:.1f}s"
+    )
+    header = f"{'scenario':<10} {'turns':>5} {'err':>4} {'metric':<16} {'p50':>10} {'p95':>10} {'p99':>10} {'max':>10}"
+    print("\n" + header)
+    print("-" * len(header))
+    rows = [("overall", result["overall"])] + list(result["scenarios"].items())
+    for name, summary in rows:
+        for index, metric in enumerate(("ttft", "inter_token_gap", "completion")):
+            dist = summary[metric]
+            prefix = (
+                f"{name:<10} {summary['turns']:>5} {summary['error_turns']:>4}"
+                if index == 0
+                else " " * 21
+            )
+            print(
+                f"{prefix} {metric:<16} {_ms(dist['p50'])} {_ms(dist['p95'])} {_ms(dist['p99'])} {_ms(dist['max'])}"
+            )
+    lag = result["loop_lag"]
+    print(
+        f"\nevent loop lag   p50 {_ms(lag['p50'])}  p95 {_ms(lag['p95'])}  "
+        f"p99 {_ms(lag['p99'])}  max {_ms(lag['max'])}  ({lag['count']} samples)"
+    )
+    print(f"fake openai calls {result['fake_openai']['calls']}")
+    for error in result["errors"]:
+        print(f"⚠️  {error}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="/chat SSE load generator with fake LLM/DB")
+    parser.add_argument("--concurrency", type=int, default=8, help="동시 세션 수")
+    parser.add_argument("--sessions", type=int, default=48, help="측정할 세션 수")
+    parser.add_argument("--mix", default="reco=0.5,info=0.3,followup=0.2", help="시나리오 가중치")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="가짜 LLM 지연 배율 (0=지연 없음)")
+    parser.add_argument("--db-latency-ms", type=float, default=2.0, help="가짜 DB 쿼리당 동기 지연")
+    parser.add_argument("--perfumes", type=int, default=400, help="가짜 카탈로그 크기")
+    parser.add_argument("--recommended-count", type=int, default=3)
+    parser.add_argument("--lag-interval-ms", type=float, default=10.0, help="루프 지연 샘플 간격")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--no-warmup", dest="warmup", action="store_false", help="시나리오별 워밍업 세션 생략")
+    parser.add_argument("--app-logs", action="store_true", help="앱 print 로그를 그대로 출력")
+    parser.add_argument("--json", help="결과 JSON 저장 경로 (커밋 간 비교용)")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    report(result)
+    if args.json:
+        path = Path(args.json)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\n💾 {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,573 @@
+"""
+agent/database.py의 인메모리 대체 모듈 (부하 테스트 전용)
+
+runner가 main을 임포트하기 전에 sys.modules["agent.database"]로 등록합니다.
+database.py의 공개 함수/상수를 같은 시그니처로 제공하고, 향수 카탈로그는
+lexicon_ko.json의 브랜드/노트/어코드로 시드 고정 생성합니다.
+
+- 동기 DB 함수는 실제 psycopg2처럼 스레드를 막는 time.sleep(DB_LATENCY)을 가집니다.
+  (이벤트 루프 안에서 동기 DB를 부르는 경로가 루프 지연으로 드러나도록)
+- 리랭크 번역/임베딩은 가짜 OpenAI 전송 계층(fake_openai)을 거쳐 실제 SDK로 호출합니다.
+- 도구(tools.py)가 직접 실행하는 SQL은 FakeCursor가 패턴별로 흉내 냅니다.
+"""
+
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+from openai import AsyncOpenAI, OpenAI
+
+from agent.circuit_breaker import CIRCUIT_BREAKERS, CircuitOpenError
+from agent.deadline import TRANSLATION_RESERVE_SECONDS, allow_optional_stage, remaining_timeout
+from agent.profile_cache import invalidate_personalization
+
+LEXICON_PATH = Path(__file__).resolve().parents[2] / "agent" / "data" / "lexicon_ko.json"
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+HELPER_MODEL = "gpt-4o-mini"
+RERANK_TRANSLATION_TIMEOUT = 10.0
+
+SEASONS = ["Spring", "Summer", "Fall", "Winter"]
+OCCASIONS = ["Daily", "Office", "Date", "Party"]
+GENDERS = ["Feminine", "Masculine", "Unisex"]
+
+DB_LATENCY = 0.002
+BRAND_CACHE: List[str] = []
+
+client: Optional[OpenAI] = None
+async_client: Optional[AsyncOpenAI] = None
+
+
+def configure(db_latency: float = DB_LATENCY, perfumes: int = 400, seed: int = 7) -> None:
+    """쿼리당 지연과 카탈로그 크기를 설정합니다."""
+    global DB_LATENCY, CATALOG
+    DB_LATENCY = db_latency
+    CATALOG = Catalog.generate(perfumes, seed)
+    BRAND_CACHE.clear()
+
+
+def attach_openai(transport) -> None:
+    """리랭크 번역/임베딩용 SDK 클라이언트를 가짜 OpenAI 전송 계층에 연결합니다."""
+    global client, async_client
+    client = OpenAI(api_key="sk-bench", max_retries=0, http_client=httpx.Client(transport=transport))
+    async_client = AsyncOpenAI(
+        api_key="sk-bench", max_retries=0, http_client=httpx.AsyncClient(transport=transport)
+    )
+
+
+# ==========================================
+# 카탈로그
+# ==========================================
+class Catalog:
+    def __init__(self, perfumes: List[Dict[str, Any]], notes: List[str], accords: List[str]):
+        self.perfumes = perfumes
+        self.by_id = {p["id"]: p for p in perfumes}
+        self.notes = notes
+        self.accords = accords
+
+    @classmethod
+    def generate(cls, size: int, seed: int) -> "Catalog":
+        lexicon = json.loads(LEXICON_PATH.read_text(encoding="utf-8"))
+        brands = sorted(set(lexicon["brands"].values()))
+        names = sorted(set(lexicon["perfumes"].values()))
+        notes = sorted(set(lexicon["notes"].values()))
+        accords = sorted(set(lexicon["accords"].values()))
+        name_kr = {en: kr for kr, en in lexicon["perfumes"].items() if not kr.isascii()}
+
+        rng = random.Random(seed)
+        perfumes = []
+        for index in range(size):
+            perfume_id = 1000 + index
+            base = names[index] if index < len(names) else f"{rng.choice(notes)} {rng.choice(['Eau', 'Intense', 'Absolu', 'Cologne', 'Extrait'])} {index}"
+            top, middle, base_notes = (rng.sample(notes, 2) for _ in range(3))
+            perfumes.append(
+                {
+                    "id": perfume_id,
+                    "brand": rng.choice(brands),
+                    "name": base,
+                    "name_kr": name_kr.get(base),
+                    "concentration": rng.choice(["EDT", "EDP", "Parfum"]),
+                    "image_url": f"https://cdn.example.com/perfumes/{perfume_id}.jpg",
+                    "gender": rng.choice(GENDERS),
+                    "accords": rng.sample(accords, 3),
+                    "top": top,
+                    "middle": middle,
+                    "base": base_notes,
+                    "seasons": rng.sample(SEASONS, 2),
+                    "occasions": rng.sample(OCCASIONS, 2),
+                    "votes": rng.randint(10, 5000),
+                }
+            )
+        return cls(perfumes, notes, accords)
+
+    def notes_of(self, perfume: Dict[str, Any]) -> List[str]:
+        return perfume["top"] + perfume["middle"] + perfume["base"]
+
+    def search_row(self, perfume: Dict[str, Any]) -> Dict[str, Any]:
+        """search_perfumes SELECT 컬럼 형태"""
+        return {
+            "id": perfume["id"],
+            "brand": perfume["brand"],
+            "name": perfume["name"],
+            "concentration": perfume["concentration"],
+            "image_url": perfume["image_url"],
+            "accords": ", ".join(perfume["accords"]),
+            "gender": perfume["gender"],
+            "top_notes": ", ".join(perfume["top"]),
+            "middle_notes": ", ".join(perfume["middle"]),
+            "base_notes": ", ".join(perfume["base"]),
+            "seasons": ", ".join(perfume["seasons"]),
+            "occasions": ", ".join(perfume["occasions"]),
+        }
+
+    def detail_row(self, perfume: Dict[str, Any]) -> Dict[str, Any]:
+        """lookup_perfume_*_tool SELECT 컬럼 형태"""
+        return {
+            "perfume_id": perfume["id"],
+            "perfume_brand": perfume["brand"],
+            "perfume_name": perfume["name"],
+            "img_link": perfume["image_url"],
+            "gender": perfume["gender"],
+            "top_notes": ", ".join(perfume["top"]),
+            "middle_notes": ", ".join(perfume["middle"]),
+            "base_notes": ", ".join(perfume["base"]),
+            "accords": ", ".join(perfume["accords"]),
+            "seasons": ", ".join(perfume["seasons"]),
+            "occasions": ", ".join(perfume["occasions"]),
+        }
+
+    def find_by_name(self, pattern: str, brand_pattern: str = "%%") -> Optional[Dict[str, Any]]:
+        needle = _unlike(pattern)
+        brand = _unlike(brand_pattern)
+        matches = [
+            p
+            for p in self.perfumes
+            if brand in _compact(p["brand"])
+            and (
+                needle in _compact(p["name"])
+                or (p["name_kr"] and needle in _compact(p["name_kr"]))
+            )
+        ]
+        return min(matches, key=lambda p: len(p["name"])) if matches else None
+
+    def with_note(self, pattern: str) -> List[Dict[str, Any]]:
+        needle = _unlike(pattern)
+        return [p for p in self.perfumes if any(needle in _compact(n) for n in self.notes_of(p))]
+
+    def with_accord(self, pattern: str) -> List[Dict[str, Any]]:
+        needle = _unlike(pattern)
+        return [p for p in self.perfumes if any(needle in _compact(a) for a in p["accords"])]
+
+    def similar_to(self, target: Dict[str, Any], limit: int = 3) -> List[Dict[str, Any]]:
+        target_notes = set(self.notes_of(target))
+        scored = []
+        for p in self.perfumes:
+            if p["id"] == target["id"]:
+                continue
+            score = len(set(p["accords"]) & set(target["accords"])) * 3 + len(
+                set(self.notes_of(p)) & target_notes
+            )
+            if score > 0:
+                scored.append((score, p))
+        scored.sort(key=lambda item: -item[0])
+        return [
+            {
+                "perfume_id": p["id"],
+                "perfume_brand": p["brand"],
+                "perfume_name": p["name"],
+                "img_link": p["image_url"],
+                "score": score,
+                "target_brand": target["brand"],
+                "target_name": target["name"],
+            }
+            for score, p in scored[:limit]
+        ]
+
+
+CATALOG = Catalog.generate(400, 7)
+
+
+def _unlike(pattern: str) -> str:
+    return _compact(str(pattern).strip("%"))
+
+
+def _compact(text: str) -> str:
+    return "".join(ch for ch in text.lower() if ch.isalnum())
+
+
+def _db_wait() -> None:
+    if DB_LATENCY > 0:
+        time.sleep(DB_LATENCY)
+
+
+# ==========================================
+# 커넥션/커서 (tools.py, archive_db.py, routers가 직접 실행하는 SQL)
+# ==========================================
+class FakeCursor:
+    def __init__(self, dict_rows: bool) -> None:
+        self._dict_rows = dict_rows
+        self._rows: List[Dict[str, Any]] = []
+
+    def execute(self, sql: str, params=None) -> None:
+        _db_wait()
+        self._rows = _answer(" ".join(sql.split()), tuple(params or ()))
+
+    def fetchone(self):
+        rows = self.fetchall()
+        return rows[0] if rows else None
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows if self._dict_rows else [tuple(row.values()) for row in rows]
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "FakeCursor":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class FakeConnection:
+    def cursor(self, cursor_factory=None) -> FakeCursor:
+        return FakeCursor(dict_rows=cursor_factory is not None)
+
+    def commit(self) -> None:
+        pass
+
+    def rollback(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def _answer(sql: str, params: tuple) -> List[Dict[str, Any]]:
+    """도구 SQL을 문장 패턴으로 구분해 카탈로그에서 같은 모양의 행을 돌려줍니다."""
+    if "WITH TARGET_PERFUME" in sql:
+        brand = params[0] if len(params) == 4 else "%%"
+        target = CATALOG.find_by_name(params[-1], brand)
+        return CATALOG.similar_to(target) if target else []
+    if "FROM TB_PERFUME_BASIC_M p" in sql and "WHERE p.perfume_id = %s" in sql:
+        perfume = CATALOG.by_id.get(int(params[0]))
+        return [CATALOG.detail_row(perfume)] if perfume else []
+    if "FROM TB_PERFUME_BASIC_M p" in sql and "p.perfume_brand ILIKE" in sql:
+        perfume = CATALOG.find_by_name(params[1], params[0])
+        return [CATALOG.detail_row(perfume)] if perfume else []
+    if "FROM TB_PERFUME_NOTES_M n JOIN TB_PERFUME_BASIC_M m" in sql:
+        ranked = sorted(CATALOG.with_note(params[0]), key=lambda p: -p["votes"])[:3]
+        return [{"perfume_brand": p["brand"], "perfume_name": p["name"]} for p in ranked]
+    if "FROM TB_PERFUME_ACCORD_M a JOIN TB_PERFUME_BASIC_M m" in sql:
+        ranked = sorted(CATALOG.with_accord(params[0]), key=lambda p: -p["votes"])[:3]
+        return [{"perfume_brand": p["brand"], "perfume_name": p["name"]} for p in ranked]
+    if "SELECT description FROM TB_NOTE_EMBEDDING_M" in sql:
+        return [{"description": f"{params[0]} 특유의 선명한 잔향이 특징인 원료입니다."}]
+    return []
+
+
+_CONNECTION = FakeConnection()
+
+
+def get_db_connection():
+    return _CONNECTION
+
+
+def release_db_connection(conn):
+    pass
+
+
+def get_recom_db_connection():
+    return _CONNECTION
+
+
+def release_recom_db_connection(conn):
+    pass
+
+
+def get_member_db_connection():
+    return _CONNECTION
+
+
+def release_member_db_connection(conn):
+    pass
+
+
+# ==========================================
+# 임베딩 / 메타
+# ==========================================
+async def get_embedding_async(text: str) -> List[float]:
+    try:
+        with CIRCUIT_BREAKERS.get(EMBEDDING_MODEL, "embedding").guard():
+            response = await async_client.embeddings.create(
+                input=text.replace("\n", " "), model=EMBEDDING_MODEL
+            )
+        return response.data[0].embedding
+    except CircuitOpenError:
+        return []
+
+
+def get_embedding(text: str) -> List[float]:
+    try:
+        with CIRCUIT_BREAKERS.get(EMBEDDING_MODEL, "embedding").guard():
+            response = client.embeddings.create(
+                input=text.replace("\n", " "), model=EMBEDDING_MODEL
+            )
+        return response.data[0].embedding
+    except CircuitOpenError:
+        return []
+
+
+def get_all_brands() -> List[str]:
+    if not BRAND_CACHE:
+        _db_wait()
+        BRAND_CACHE.extend(sorted({p["brand"] for p in CATALOG.perfumes}))
+    return BRAND_CACHE
+
+
+def match_brand_name(user_input: str) -> str:
+    if not user_input:
+        return user_input
+    for brand in get_all_brands():
+        if brand.lower() == user_input.lower():
+            return brand
+    return user_input
+
+
+def fetch_meta_data() -> Dict[str, str]:
+    _db_wait()
+    return {
+        "seasons": ", ".join(SEASONS),
+        "occasions": ", ".join(OCCASIONS),
+        "accords": ", ".join(CATALOG.accords),
+        "genders": "Women, Men, Unisex",
+    }
+
+
+def fetch_gazetteer_terms() -> Dict[str, List[str]]:
+    _db_wait()
+    perfumes = set()
+    for p in CATALOG.perfumes:
+        perfumes.add(p["name"])
+        if p["name_kr"]:
+            perfumes.add(p["name_kr"])
+    return {"brand": get_all_brands(), "perfume": sorted(perfumes), "note": CATALOG.notes}
+
+
+# ==========================================
+# 검색 / 리랭크
+# ==========================================
+def _matches_gender(perfume: Dict[str, Any], gender: str) -> bool:
+    g = gender.lower()
+    if g in ("women", "female"):
+        return perfume["gender"] in ("Feminine", "Unisex")
+    if g in ("men", "male"):
+        return perfume["gender"] in ("Masculine", "Unisex")
+    return perfume["gender"] == "Unisex"
+
+
+def _field_values(perfume: Dict[str, Any], key: str) -> List[str]:
+    if key == "note":
+        return CATALOG.notes_of(perfume)
+    return perfume.get({"accord": "accords", "season": "seasons", "occasion": "occasions"}[key], [])
+
+
+def _ilike(values: List[str], pattern: str) -> bool:
+    needle = str(pattern).strip("%").lower()
+    return any(v.lower() == needle for v in values)
+
+
+def search_perfumes(
+    hard_filters: Dict[str, Any],
+    strategy_filters: Dict[str, List[str]],
+    exclude_ids: List[int] = None,
+    exclude_brands: List[str] = None,
+    limit: int = 20,
+) -> List[Dict[str, Any]]:
+    _db_wait()
+    excluded_ids = set(exclude_ids or [])
+    excluded_brands = set(exclude_brands or [])
+    results = []
+    for perfume in CATALOG.perfumes:
+        if perfume["id"] in excluded_ids or perfume["brand"] in excluded_brands:
+            continue
+        if hard_filters.get("gender") and not _matches_gender(perfume, hard_filters["gender"]):
+            continue
+        if hard_filters.get("brand") and match_brand_name(hard_filters["brand"]).lower() != perfume["brand"].lower():
+            continue
+        if any(
+            hard_filters.get(key) and not _ilike(_field_values(perfume, key), hard_filters[key])
+            for key in ("season", "occasion", "accord", "note")
+        ):
+            continue
+        if any(
+            vals
+            and key.lower() in ("accord", "season", "occasion", "note")
+            and not any(_ilike(_field_values(perfume, key.lower()), v) for v in vals)
+            for key, vals in strategy_filters.items()
+        ):
+            continue
+        results.append(CATALOG.search_row(perfume))
+        if len(results) >= limit:
+            break
+    return results
+
+
+def _similarity(vector: List[float], perfume_id: int) -> float:
+    digest = hashlib.blake2b(
+        f"{perfume_id}:{sum(vector):.4f}".encode(), digest_size=4
+    ).digest()
+    return int.from_bytes(digest, "big") / 2**32
+
+
+async def rerank_perfumes_async(
+    candidates: List[Dict[str, Any]],
+    query_text: str,
+    top_k: int = 5,
+    rank_mode: str = "DEFAULT",
+) -> List[Dict[str, Any]]:
+    if not candidates or not query_text:
+        return candidates[:top_k]
+
+    translation_breaker = CIRCUIT_BREAKERS.get(HELPER_MODEL, "rerank_translation")
+    embedding_breaker = CIRCUIT_BREAKERS.get(EMBEDDING_MODEL, "embedding")
+    if rank_mode != "POPULAR" and (translation_breaker.is_open() or embedding_breaker.is_open()):
+        rank_mode = "POPULAR"
+
+    if rank_mode == "POPULAR":
+        _db_wait()
+        for p in candidates:
+            p["review_score"] = CATALOG.by_id[p["id"]]["votes"]
+            p["best_review"] = f"인기도(Vote): {p['review_score']}"
+        candidates.sort(key=lambda x: x.get("review_score", 0), reverse=True)
+        return candidates[:top_k]
+
+    stylized_query = query_text
+    if allow_optional_stage("rerank_translation", TRANSLATION_RESERVE_SECONDS):
+        with translation_breaker.guard():
+            translation = await async_client.chat.completions.create(
+                model=HELPER_MODEL,
+                messages=[
+                    {"role": "system", "content": "You are a Perfume Data Analyst. Transform the Korean logic into a sensory description..."},
+                    {"role": "user", "content": query_text},
+                ],
+                temperature=0,
+                timeout=remaining_timeout(RERANK_TRANSLATION_TIMEOUT),
+            )
+        stylized_query = translation.choices[0].message.content.strip()
+    query_vector = await get_embedding_async(stylized_query)
+    if not query_vector:
+        return candidates[:top_k]
+
+    _db_wait()
+    for p in candidates:
+        p["review_score"] = _similarity(query_vector, p["id"])
+        p["best_review"] = "향이 오래가고 은은하게 퍼져서 데일리로 좋아요."
+    candidates.sort(key=lambda x: x.get("review_score", 0), reverse=True)
+    return candidates[:top_k]
+
+
+# ==========================================
+# 추천 로그 / 채팅 / 히스토리
+# ==========================================
+_LOCK = threading.Lock()
+_CHAT: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+_THREAD_OWNER: Dict[str, int] = {}
+_RECOMMENDED: Dict[str, List[int]] = defaultdict(list)
+_MY_PERFUMES: Dict[int, Dict[int, str]] = defaultdict(dict)
+
+
+def save_recommendation_log(member_id: int, perfumes: List[Dict[str, Any]], reason: str):
+    if not member_id or not perfumes:
+        return
+    _db_wait()
+
+
+def add_my_perfume(member_id: int, perfume_id: int, perfume_name: str):
+    _db_wait()
+    with _LOCK:
+        if perfume_id in _MY_PERFUMES[member_id]:
+            return {"status": "already_exists", "message": "이미 저장된 향수입니다."}
+        _MY_PERFUMES[member_id][perfume_id] = perfume_name
+    invalidate_personalization(member_id)
+    return {"status": "success", "message": "향수가 저장되었습니다."}
+
+
+def save_chat_message(thread_id: str, member_id: int, role: str, message: str, meta: dict = None):
+    _db_wait()
+    with _LOCK:
+        if member_id > 0 or thread_id not in _THREAD_OWNER:
+            _THREAD_OWNER[thread_id] = member_id
+        _CHAT[thread_id].append({"role": role, "text": message, "metadata": meta})
+
+
+def get_chat_history(thread_id: str) -> List[Dict[str, Any]]:
+    _db_wait()
+    with _LOCK:
+        return [dict(row) for row in _CHAT.get(thread_id, [])]
+
+
+def get_user_chat_list(member_id: int) -> List[Dict[str, Any]]:
+    if not member_id:
+        return []
+    _db_wait()
+    with _LOCK:
+        return [
+            {"thread_id": thread_id, "title": _CHAT[thread_id][0]["text"][:30], "last_chat_dt": None}
+            for thread_id, owner in _THREAD_OWNER.items()
+            if owner == member_id and _CHAT.get(thread_id)
+        ][:30]
+
+
+def lookup_note_by_string(keyword: str) -> List[str]:
+    _db_wait()
+    keyword_clean = keyword.strip().lower()
+    return [n for n in CATALOG.notes if n.lower() == keyword_clean]
+
+
+def lookup_note_by_vector(keyword: str) -> List[str]:
+    vector = get_embedding(keyword)
+    if not vector:
+        return []
+    _db_wait()
+    return sorted(CATALOG.notes, key=lambda n: _similarity(vector, hash(n)))[:10]
+
+
+def update_recommended_history(thread_id: str, perfume_ids: List[int], max_size: int = 100):
+    if not thread_id or not perfume_ids:
+        return
+    _db_wait()
+    with _LOCK:
+        merged = sorted(set(_RECOMMENDED[thread_id]) | set(perfume_ids), reverse=True)
+        _RECOMMENDED[thread_id] = merged[:max_size]
+
+
+def get_recommended_history(thread_id: str) -> List[int]:
+    if not thread_id:
+        return []
+    _db_wait()
+    with _LOCK:
+        return list(_RECOMMENDED.get(thread_id, []))
+
+
+def clear_recommended_history(thread_id: str):
+    if not thread_id:
+        return
+    _db_wait()
+    with _LOCK:
+        _RECOMMENDED.pop(thread_id, None)
+
+
+def get_perfumes_by_note(note_name: str, limit: int = 5) -> List[Dict]:
+    _db_wait()
+    return [
+        {"perfume_id": p["id"], "name": p["name"], "brand": p["brand"]}
+        for p in CATALOG.with_note(note_name)[:limit]
+    ]
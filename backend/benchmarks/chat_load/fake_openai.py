@@ -0,0 +1,363 @@
+"""
+가짜 OpenAI 서버 (httpx 전송 계층, 네트워크 없음)
+
+ChatOpenAI / openai SDK가 보내는 실제 HTTP 요청을 받아 결정적인 응답을 만듭니다.
+SDK 파싱, 스트리밍 청크 처리, with_structured_output 검증까지 운영과 같은 경로를 탑니다.
+
+- 구조화 출력(response_format=json_schema): JSON 스키마로 기본 인스턴스를 만든 뒤
+  스키마 이름별로 시나리오에 맞는 값(라우팅, 인터뷰 슬롯, 검색 전략, 라벨 등)을 덮어씁니다.
+- 일반 텍스트: 프롬프트로 헬퍼(정규화/번역)와 writer를 구분하고, writer는 토큰 단위로 스트리밍합니다.
+- 지연: 호출 종류별 첫 토큰 시간(TTFT)과 토큰 간격을 LatencyModel로 흉내 냅니다. (지터 포함, 시드 고정)
+"""
+
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+INFO_MARKERS = ("어떤 향", "어떤향", "정보", "알려줘", "노트 구성", "무슨 향")
+
+
+@dataclass(frozen=True)
+class CallProfile:
+    ttft: float
+    token_gap: float = 0.0
+    tokens: int = 1
+
+
+@dataclass(frozen=True)
+class LatencyModel:
+    """호출 종류별 지연 (초). scale=0이면 지연 없이 CPU 경로만 측정"""
+
+    router: CallProfile = CallProfile(ttft=0.35)
+    helper: CallProfile = CallProfile(ttft=0.25)
+    writer: CallProfile = CallProfile(ttft=0.6, token_gap=0.025, tokens=120)
+    embedding: CallProfile = CallProfile(ttft=0.12)
+    jitter: float = 0.2
+    scale: float = 1.0
+
+    def scaled(self, scale: float) -> "LatencyModel":
+        return replace(self, scale=scale)
+
+
+@dataclass
+class FakeOpenAIStats:
+    calls: Dict[str, int] = field(default_factory=dict)
+    schemas: Dict[str, int] = field(default_factory=dict)
+
+    def count(self, kind: str, schema: Optional[str]) -> None:
+        self.calls[kind] = self.calls.get(kind, 0) + 1
+        if schema:
+            self.schemas[schema] = self.schemas.get(schema, 0) + 1
+
+
+# ==========================================
+# 응답 내용
+# ==========================================
+def example_from_schema(schema: Dict[str, Any], defs: Optional[Dict[str, Any]] = None) -> Any:
+    """JSON 스키마를 만족하는 최소 인스턴스"""
+    defs = defs if defs is not None else schema.get("$defs", {})
+    if "$ref" in schema:
+        return example_from_schema(defs[schema["$ref"].split("/")[-1]], defs)
+    if "anyOf" in schema:
+        options = [s for s in schema["anyOf"] if s.get("type") != "null"]
+        return example_from_schema(options[0], defs) if options else None
+    if "enum" in schema:
+        return schema["enum"][0]
+    kind = schema.get("type")
+    if kind == "object":
+        return {
+            name: example_from_schema(prop, defs)
+            for name, prop in schema.get("properties", {}).items()
+        }
+    if kind == "array":
+        return [example_from_schema(schema.get("items", {}), defs)]
+    return {"string": "샘플", "integer": 1, "number": 0.5, "boolean": False}.get(kind)
+
+
+def _merge(base: Any, overlay: Any) -> Any:
+    if isinstance(base, dict) and isinstance(overlay, dict):
+        return {**base, **{k: _merge(base.get(k), v) for k, v in overlay.items()}}
+    return overlay
+
+
+def _text_of(message: Dict[str, Any]) -> str:
+    content = message.get("content") or ""
+    if isinstance(content, list):
+        return " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return content
+
+
+class Responder:
+    """요청 본문 → (호출 종류, 응답 텍스트)"""
+
+    LABELS = ["산뜻하게 시작하는 데일리 무드", "포근하게 감싸는 잔향", "깨끗하고 차분한 분위기", "은은하게 남는 우아함"]
+
+    def __init__(self, catalog, seed: int = 7) -> None:
+        self.catalog = catalog
+        self._rng = random.Random(seed)
+
+    def respond(self, body: Dict[str, Any]) -> Tuple[str, Optional[str], str]:
+        messages = body.get("messages") or []
+        user_text = next(
+            (_text_of(m) for m in reversed(messages) if m.get("role") == "user"), ""
+        )
+        all_text = "\n".join(_text_of(m) for m in messages)
+
+        response_format = body.get("response_format") or {}
+        if response_format.get("type") == "json_schema":
+            spec = response_format["json_schema"]
+            name = spec.get("name", "")
+            payload = _merge(example_from_schema(spec["schema"]), self._overlay(name, user_text, all_text))
+            return "router", name, json.dumps(payload, ensure_ascii=False)
+
+        helper = self._helper(all_text, user_text)
+        if helper is not None:
+            return "helper", None, helper
+        return "writer", None, self._writer_text(user_text)
+
+    # -- 구조화 출력 ----------------------------------------------------
+    def _overlay(self, name: str, user_text: str, all_text: str) -> Dict[str, Any]:
+        if name == "ValidationResult":
+            return {"is_unsupported": False, "unsupported_category": None, "reason": "지원 가능한 요청"}
+        if name == "RoutingDecision":
+            is_info = any(marker in user_text for marker in INFO_MARKERS)
+            return {"next_step": "info_retrieval" if is_info else "interviewer"}
+        if name == "InterviewResult":
+            return {
+                "user_preferences": {
+                    "target": "20대 여성",
+                    "gender": "Women",
+                    "situation": "Daily",
+                    "season": "Spring",
+                    "accord": "Citrus",
+                },
+                "is_sufficient": True,
+                "response_message": "",
+                "is_off_topic": False,
+            }
+        if name == "SearchStrategyPlan":
+            priority = int(m.group(1)) if (m := re.search(r"우선순위: (\d+)", user_text)) else 1
+            accords = self._rng.sample(self.catalog.accords, 2)
+            return {
+                "priority": priority,
+                "strategy_name": f"전략 {priority}",
+                "reason": f"{accords[0]} 계열로 가볍게 즐기는 향을 찾습니다.",
+                "hard_filters": {"gender": "Women", "brand": None, "season": None, "occasion": None, "accord": None, "note": None},
+                "strategy_filters": {"accord": accords, "occasion": None, "note": None},
+                "strategy_keyword": accords,
+            }
+        if name == "StrategyLabelBatch":
+            priorities = sorted({int(p) for p in re.findall(r"priority (\d+):", all_text)}) or [1]
+            return {
+                "labels": [
+                    {"priority": p, "label": self.LABELS[(p - 1) % len(self.LABELS)]}
+                    for p in priorities
+                ]
+            }
+        if name == "InfoRoutingDecision":
+            perfume = self._mentioned_perfume(user_text)
+            return {
+                "info_type": "perfume",
+                "target_brand": perfume["brand"],
+                "target_name": perfume["name"],
+                "target_name_kr": perfume["name_kr"],
+                "intent": "향수 상세 정보",
+            }
+        if name == "IngredientAnalysisResult":
+            return {"notes": self._rng.sample(self.catalog.notes, 2), "accords": [], "is_ambiguous": False}
+        return {}
+
+    def _mentioned_perfume(self, text: str) -> Dict[str, Any]:
+        compact = "".join(text.lower().split())
+        for perfume in self.catalog.perfumes:
+            names = [perfume["name"], perfume["name_kr"] or ""]
+            if any(n and "".join(n.lower().split()) in compact for n in names):
+                return perfume
+        return self.catalog.perfumes[0]
+
+    # -- 일반 텍스트 ------------------------------------------------------
+    def _helper(self, all_text: str, user_text: str) -> Optional[str]:
+        if "Perfume Database Expert" in all_text or "Extract the Target Perfume" in all_text:
+            quoted = re.search(r'User Input: "(.*?)"', all_text)
+            perfume = self._mentioned_perfume(quoted.group(1) if quoted else user_text)
+            return json.dumps({"brand": perfume["brand"], "name": perfume["name"]})
+        if "Fragrance Ingredient Expert" in all_text:
+            return json.dumps(self._rng.sample(self.catalog.notes, 1))
+        if "Fragrance Accord Expert" in all_text:
+            return json.dumps(self._rng.sample(self.catalog.accords, 1))
+        if "Brand Matcher" in all_text:
+            return "None"
+        if "Perfume Data Analyst" in all_text:
+            return "A bright, airy citrus opening that settles into soft musk."
+        return None
+
+    def _writer_text(self, user_text: str) -> str:
+        perfume = self._rng.choice(self.catalog.perfumes)
+        return (
+            f"## {perfume['brand']} {perfume['name']}\n\n"
+            f"첫 향은 {', '.join(perfume['top'])}로 산뜻하게 열리고, "
+            f"{', '.join(perfume['middle'])}가 부드럽게 이어지며 "
+            f"{', '.join(perfume['base'])}의 잔향이 오래 남습니다. "
+            f"{', '.join(perfume['accords'])} 어코드가 중심이라 "
+            f"{'/'.join(perfume['seasons'])} 시즌의 {'/'.join(perfume['occasions'])} 상황에 잘 어울려요.\n\n"
+        )
+
+
+# ==========================================
+# 전송 계층
+# ==========================================
+def _chunk(model: str, delta: Dict[str, Any], finish: Optional[str] = None) -> bytes:
+    payload = {
+        "id": "chatcmpl-bench",
+        "object": "chat.completion.chunk",
+        "created": 0,
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+    }
+    return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n".encode()
+
+
+def _split_tokens(text: str, count: int) -> List[str]:
+    """텍스트를 대략 count개의 스트리밍 청크로 나눔 (이어 붙이면 원문)"""
+    if count <= 1 or len(text) <= 1:
+        return [text]
+    size = max(1, -(-len(text) // count))
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+class _TimedStream(httpx.AsyncByteStream, httpx.SyncByteStream):
+    def __init__(self, frames: List[Tuple[float, bytes]]) -> None:
+        self._frames = frames
+
+    async def __aiter__(self):
+        for delay, frame in self._frames:
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield frame
+
+    def __iter__(self):
+        for delay, frame in self._frames:
+            if delay > 0:
+                time.sleep(delay)
+            yield frame
+
+
+class FakeOpenAITransport(httpx.AsyncBaseTransport, httpx.BaseTransport):
+    """/chat/completions (stream/non-stream)와 /embeddings를 처리하는 가짜 OpenAI"""
+
+    def __init__(self, responder: Responder, latency: LatencyModel = LatencyModel(), seed: int = 7) -> None:
+        self.responder = responder
+        self.latency = latency
+        self.stats = FakeOpenAIStats()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _delay(self, seconds: float) -> float:
+        with self._lock:
+            jitter = 1 + self._rng.uniform(-self.latency.jitter, self.latency.jitter)
+        return max(0.0, seconds * jitter * self.latency.scale)
+
+    def _build(self, request: httpx.Request) -> Tuple[int, Dict[str, str], List[Tuple[float, bytes]]]:
+        body = json.loads(request.read() or b"{}")
+        path = request.url.path
+
+        if path.endswith("/embeddings"):
+            self.stats.count("embedding", None)
+            text = body.get("input") if isinstance(body.get("input"), str) else json.dumps(body.get("input"))
+            rng = random.Random(text)
+            payload = {
+                "object": "list",
+                "data": [{"object": "embedding", "index": 0, "embedding": [rng.uniform(-1, 1) for _ in range(32)]}],
+                "model": body.get("model"),
+                "usage": {"prompt_tokens": 1, "total_tokens": 1},
+            }
+            return 200, {"content-type": "application/json"}, [
+                (self._delay(self.latency.embedding.ttft), json.dumps(payload).encode())
+            ]
+
+        if not path.endswith("/chat/completions"):
+            return 404, {"content-type": "application/json"}, [
+                (0.0, json.dumps({"error": {"message": f"fake openai: {path}", "type": "not_found"}}).encode())
+            ]
+
+        kind, schema, text = self.responder.respond(body)
+        self.stats.count(kind, schema)
+        profile: CallProfile = getattr(self.latency, kind)
+        model = body.get("model", "gpt-fake")
+
+        if not body.get("stream"):
+            payload = {
+                "id": "chatcmpl-bench",
+                "object": "chat.completion",
+                "created": 0,
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+            }
+            total = profile.ttft + profile.token_gap * max(0, profile.tokens - 1)
+            return 200, {"content-type": "application/json"}, [
+                (self._delay(total), json.dumps(payload, ensure_ascii=False).encode())
+            ]
+
+        # 구조화 출력/헬퍼는 한 번에, writer는 토큰 간격을 두고 스트리밍
+        pieces = _split_tokens(text, profile.tokens if kind == "writer" else 1)
+        frames = [(self._delay(profile.ttft), _chunk(model, {"role": "assistant", "content": pieces[0]}))]
+        frames += [(self._delay(profile.token_gap), _chunk(model, {"content": piece})) for piece in pieces[1:]]
+        frames.append((0.0, _chunk(model, {}, "stop")))
+        frames.append((0.0, b"data: [DONE]\n\n"))
+        return 200, {"content-type": "text/event-stream"}, frames
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        status, headers, frames = self._build(request)
+        return httpx.Response(status, headers=headers, stream=_TimedStream(frames))
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        status, headers, frames = self._build(request)
+        return httpx.Response(status, headers=headers, stream=_TimedStream(frames))
+
+
+# ==========================================
+# 그래프 모델 교체
+# ==========================================
+# (모듈, 전역 이름) — 임포트 시점에 만들어지는 ChatOpenAI 인스턴스들
+LLM_GLOBALS = {
+    "agent.graph": ("FAST_LLM", "SMART_LLM", "SUPER_SMART_LLM", "SUPER_SMART_LLM_NO_STREAM"),
+    "agent.graph_info": ("INFO_LLM", "ROUTER_LLM"),
+    "agent.tools": ("NORMALIZER_LLM",),
+}
+
+
+def install_fake_llms(transport: FakeOpenAITransport) -> int:
+    """그래프/도구의 ChatOpenAI 전역을 같은 설정(모델명, 스트리밍, 태그)의 가짜 전송 계층 버전으로 교체"""
+    import importlib
+
+    from langchain_openai import ChatOpenAI
+
+    replaced = 0
+    for module_name, names in LLM_GLOBALS.items():
+        module = importlib.import_module(module_name)
+        for name in names:
+            llm = getattr(module, name)
+            setattr(
+                module,
+                name,
+                ChatOpenAI(
+                    model=llm.model_name,
+                    temperature=llm.temperature,
+                    streaming=llm.streaming,
+                    tags=llm.tags,
+                    api_key="sk-bench",
+                    max_retries=0,
+                    http_client=httpx.Client(transport=transport),
+                    http_async_client=httpx.AsyncClient(transport=transport),
+                ),
+            )
+            replaced += 1
+    return replaced
@@ -0,0 +1,347 @@
+"""
+/chat 부하 실행기
+
+FastAPI 앱을 프로세스 안에서 띄우고(소켓 없이 ASGI 직접 호출) SSE 응답 프레임이
+도착하는 시각을 기록합니다. 응답 바디는 StreamingResponse가 send를 부르는 즉시 받으므로
+uvicorn 뒤에서 클라이언트가 보는 프레임 순서/간격과 같습니다.
+
+- TTFT: 요청 시작 → 첫 answer 프레임
+- inter-token gap: 연속한 answer 프레임 사이 간격 (SSE 병합 후 프레임 기준)
+- completion: 요청 시작 → 마지막 바디 청크
+- loop lag: 같은 이벤트 루프에서 sleep(interval)이 늦게 깨어난 정도 (동기 DB/CPU 작업으로 막힌 시간)
+"""
+
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import uuid
+import warnings
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+
+@dataclass
+class TurnResult:
+    scenario: str
+    session: int
+    turn: int
+    status: int = 0
+    ttft: Optional[float] = None
+    completion: float = 0.0
+    gaps: List[float] = field(default_factory=list)
+    answer_frames: int = 0
+    answer_chars: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+# ==========================================
+# 앱 기동 (가짜 DB/LLM 주입)
+# ==========================================
+def boot_app(args) -> Tuple[Any, Any]:
+    """agent.database를 인메모리 대체 모듈로 바꾼 뒤 main을 임포트하고, LLM 전역을 가짜 전송 계층으로 교체"""
+    os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+    os.environ["LLM_CASSETTE_MODE"] = "off"
+
+    from benchmarks.chat_load import fake_database
+    from benchmarks.chat_load.fake_openai import (
+        FakeOpenAITransport,
+        LatencyModel,
+        Responder,
+        install_fake_llms,
+    )
+
+    latency = LatencyModel().scaled(args.latency_scale)
+    fake_database.configure(db_latency=args.db_latency_ms / 1000, perfumes=args.perfumes, seed=args.seed)
+    transport = FakeOpenAITransport(Responder(fake_database.CATALOG, args.seed), latency, args.seed)
+    fake_database.attach_openai(transport)
+    sys.modules["agent.database"] = fake_database
+
+    import main
+
+    install_fake_llms(transport)
+    return main.app, transport
+
+
+# ==========================================
+# ASGI SSE 클라이언트
+# ==========================================
+class SSEProbe:
+    """ASGI send로 들어오는 바디 청크를 SSE 프레임으로 나눠 answer 도착 시각을 기록"""
+
+    def __init__(self, result: TurnResult, started: float) -> None:
+        self.result = result
+        self.started = started
+        self._buffer = b""
+        self._last_answer: Optional[float] = None
+
+    def feed(self, body: bytes, now: float) -> None:
+        self._buffer += body
+        while b"\n\n" in self._buffer:
+            frame, self._buffer = self._buffer.split(b"\n\n", 1)
+            for line in frame.split(b"\n"):
+                if line.startswith(b"data:"):
+                    self._on_payload(line[5:].strip(), now)
+
+    def _on_payload(self, data: bytes, now: float) -> None:
+        try:
+            payload = json.loads(data)
+        except ValueError:
+            return
+        if payload.get("type") == "error":
+            self.result.errors.append(str(payload.get("content", ""))[:200])
+        if payload.get("type") != "answer":
+            return
+        if self._last_answer is None:
+            self.result.ttft = now - self.started
+        else:
+            self.result.gaps.append(now - self._last_answer)
+        self._last_answer = now
+        self.result.answer_frames += 1
+        self.result.answer_chars += len(payload.get("content", ""))
+
+
+async def post_chat(app, body: Dict[str, Any], result: TurnResult) -> TurnResult:
+    """POST /chat을 ASGI로 직접 호출하고 스트림이 끝날 때까지 프레임을 기록"""
+    raw = json.dumps(body, ensure_ascii=False).encode()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.3"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/chat",
+        "raw_path": b"/chat",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"host", b"bench"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(raw)).encode()),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    request_sent = False
+    finished = asyncio.Event()
+    started = time.perf_counter()
+    probe = SSEProbe(result, started)
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": raw, "more_body": False}
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        now = time.perf_counter()
+        if message["type"] == "http.response.start":
+            result.status = message["status"]
+        elif message["type"] == "http.response.body":
+            probe.feed(message.get("body", b""), now)
+            if not message.get("more_body", False):
+                result.completion = now - started
+                finished.set()
+
+    try:
+        await app(scope, receive, send)
+    except Exception as e:
+        result.errors.append(f"{type(e).__name__}: {e}"[:200])
+    finally:
+        finished.set()
+    if not result.completion:
+        result.completion = time.perf_counter() - started
+    return result
+
+
+# ==========================================
+# 이벤트 루프 지연 측정
+# ==========================================
+class LoopLagSampler:
+    def __init__(self, interval: float = 0.01) -> None:
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - expected))
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+
+
+# ==========================================
+# 집계
+# ==========================================
+def percentile(values: List[float], q: float) -> Optional[float]:
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(q * (len(ordered) - 1) + 0.5))]
+
+
+def distribution(values: List[float]) -> Dict[str, Optional[float]]:
+    return {
+        "count": len(values),
+        "p50": percentile(values, 0.50),
+        "p95": percentile(values, 0.95),
+        "p99": percentile(values, 0.99),
+        "max": max(values) if values else None,
+    }
+
+
+def summarize(results: List[TurnResult], wall: float) -> Dict[str, Any]:
+    statuses: Dict[str, int] = defaultdict(int)
+    for r in results:
+        statuses[str(r.status)] += 1
+    return {
+        "turns": len(results),
+        "turns_per_second": len(results) / wall if wall else None,
+        "status": dict(statuses),
+        "error_turns": sum(1 for r in results if r.errors or r.status != 200),
+        "no_answer_turns": sum(1 for r in results if r.status == 200 and r.ttft is None),
+        "ttft": distribution([r.ttft for r in results if r.ttft is not None]),
+        "inter_token_gap": distribution([g for r in results for g in r.gaps]),
+        "completion": distribution([r.completion for r in results if r.status == 200]),
+        "answer_frames_mean": (
+            sum(r.answer_frames for r in results) / len(results) if results else None
+        ),
+    }
+
+
+def git_revision() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR, capture_output=True, text=True, timeout=10,
+        ).stdout.strip()
+        dirty = bool(
+            subprocess.run(
+                ["git", "status", "--porcelain", "--", "."],
+                cwd=BACKEND_DIR, capture_output=True, text=True, timeout=30,
+            ).stdout.strip()
+        )
+        return {"commit": commit or None, "dirty": dirty}
+    except (OSError, subprocess.SubprocessError):
+        return {"commit": None, "dirty": None}
+
+
+# ==========================================
+# 실행
+# ==========================================
+async def run_sessions(app, plan, args, measured: List[TurnResult]) -> None:
+    queue: "asyncio.Queue" = asyncio.Queue()
+    for index, (name, turns) in enumerate(plan):
+        queue.put_nowait((index, name, turns))
+
+    async def worker() -> None:
+        while True:
+            try:
+                index, name, turns = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            thread_id = f"bench-{uuid.uuid4().hex[:12]}"
+            for number, turn in enumerate(turns, start=1):
+                result = await post_chat(
+                    app,
+                    {
+                        "user_query": turn.query,
+                        "thread_id": thread_id,
+                        "recommended_count": args.recommended_count,
+                    },
+                    TurnResult(scenario=name, session=index, turn=number),
+                )
+                if turn.measured:
+                    measured.append(result)
+                if result.status != 200:
+                    break
+
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+
+
+async def run(args) -> Dict[str, Any]:
+    from benchmarks.chat_load.scenarios import SCENARIOS, parse_mix, schedule
+
+    mix = parse_mix(args.mix)
+    # with_structured_output의 parsed 필드 직렬화 경고 (매 호출마다 출력되어 결과를 가림)
+    warnings.filterwarnings("ignore", message="Pydantic serializer warnings")
+    log_sink = open(os.devnull, "w") if not args.app_logs else None
+    with contextlib.redirect_stdout(log_sink) if log_sink else contextlib.nullcontext():
+        app, transport = boot_app(args)
+
+        # 지연 로딩(의도 라우터 사전, 슬롯 매처 등)이 측정에 섞이지 않도록 시나리오별 1세션 선실행
+        warmup: List[TurnResult] = []
+        if args.warmup:
+            warmup_plan = [(name, SCENARIOS[name].variants[0]) for name in mix]
+            await run_sessions(app, warmup_plan, _Serial(args), warmup)
+
+        plan = schedule(mix, args.sessions, args.seed)
+        sampler = LoopLagSampler(args.lag_interval_ms / 1000)
+        measured: List[TurnResult] = []
+        sampler.start()
+        started = time.perf_counter()
+        await run_sessions(app, plan, args, measured)
+        wall = time.perf_counter() - started
+        await sampler.stop()
+    if log_sink:
+        log_sink.close()
+
+    by_scenario: Dict[str, List[TurnResult]] = defaultdict(list)
+    for r in measured:
+        by_scenario[r.scenario].append(r)
+
+    return {
+        "meta": {
+            "git": git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": {
+                "concurrency": args.concurrency,
+                "sessions": args.sessions,
+                "mix": mix,
+                "latency_scale": args.latency_scale,
+                "db_latency_ms": args.db_latency_ms,
+                "perfumes": args.perfumes,
+                "recommended_count": args.recommended_count,
+                "seed": args.seed,
+            },
+        },
+        "wall_seconds": wall,
+        "overall": summarize(measured, wall),
+        "scenarios": {name: summarize(rs, wall) for name, rs in sorted(by_scenario.items())},
+        "loop_lag": distribution(sampler.samples),
+        "fake_openai": asdict(transport.stats),
+        "warmup_errors": [e for r in warmup for e in r.errors],
+        "errors": sorted({e for r in measured for e in r.errors})[:20],
+    }
+
+
+class _Serial:
+    """워밍업은 동시성 1로"""
+
+    def __init__(self, args) -> None:
+        self.concurrency = 1
+        self.recommended_count = args.recommended_count
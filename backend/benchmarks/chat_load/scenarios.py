@@ -0,0 +1,87 @@
+"""
+부하 시나리오 (세션 단위)
+
+세션 하나는 같은 thread_id로 보내는 턴 목록입니다.
+measured가 아닌 턴(후속 질문 시나리오의 첫 추천 등)은 대화 상태를 만드는 용도라 집계에서 뺍니다.
+"""
+
+import random
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+
+@dataclass(frozen=True)
+class Turn:
+    query: str
+    measured: bool = True
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    variants: Tuple[Tuple[Turn, ...], ...]
+
+    def pick(self, rng: random.Random) -> Tuple[Turn, ...]:
+        return rng.choice(self.variants)
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    # 슬롯이 충분한 추천 요청 → interviewer(사전 추출) → parallel_reco
+    "reco": Scenario(
+        "reco",
+        (
+            (Turn("20대 여성 데일리로 쓸 시트러스 향수 추천해줘"),),
+            (Turn("30대 남자 회사 출근용 우디 향수 3개 추천해줘"),),
+            (Turn("여자친구 선물로 봄에 어울리는 플로럴 향수 추천해줘"),),
+            (Turn("요즘 인기 있는 여름용 유니섹스 향수 추천해줘"),),
+        ),
+    ),
+    # 향수/노트 정보 질문 → info 서브그래프
+    "info": Scenario(
+        "info",
+        (
+            (Turn("샤넬 넘버5 어떤 향이야?"),),
+            (Turn("조말론 우드세이지 정보 알려줘"),),
+            (Turn("디올 소바쥬 노트 구성 알려줘"),),
+        ),
+    ),
+    # 추천 후 같은 스레드에서 조건을 바꾼 후속 요청 (두 번째 턴만 집계)
+    "followup": Scenario(
+        "followup",
+        (
+            (
+                Turn("20대 여성 데일리로 쓸 시트러스 향수 추천해줘", measured=False),
+                Turn("이번엔 좀 더 무거운 우디 계열로 다시 추천해줘"),
+            ),
+            (
+                Turn("30대 남자 회사 출근용 우디 향수 추천해줘", measured=False),
+                Turn("비슷한데 여름에 쓸 수 있게 더 가벼운 걸로 추천해줘"),
+            ),
+        ),
+    ),
+}
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """"reco=0.5,info=0.3,followup=0.2" → 정규화된 가중치"""
+    weights: Dict[str, float] = {}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"unknown scenario: {name} (choose from {', '.join(SCENARIOS)})")
+        weights[name] = float(weight) if weight else 1.0
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError(f"empty scenario mix: {spec!r}")
+    return {name: weight / total for name, weight in weights.items()}
+
+
+def schedule(mix: Dict[str, float], sessions: int, seed: int) -> List[Tuple[str, Tuple[Turn, ...]]]:
+    """가중치대로 세션 목록을 시드 고정으로 뽑습니다. (커밋 간 비교 시 같은 입력)"""
+    rng = random.Random(seed)
+    names = list(mix)
+    chosen = rng.choices(names, weights=[mix[n] for n in names], k=sessions)
+    return [(name, SCENARIOS[name].pick(rng)) for name in chosen]
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+로컬 의도 라우터 평가 스크립트
+
+라벨링된 쿼리 픽스처(benchmarks/fixtures/intent_eval.jsonl)로
+- 정확도: 로컬에서 결정한 쿼리 중 정답 비율 (오라우팅은 LLM 비용 절감보다 치명적)
+- 폴백률: LLM Supervisor로 위임한 비율
+- 지연: 쿼리당 로컬 라우팅 시간 (p50/p95)
+을 출력합니다.
+
+Usage:
+    python benchmarks/eval_intent_router.py
+    python benchmarks/eval_intent_router.py --with-db --verbose
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.intent_router import IntentRouter, build_gazetteer, load_classifier
+
+FIXTURE_PATH = Path(__file__).resolve().parent / "fixtures" / "intent_eval.jsonl"
+
+
+def load_fixture(path: Path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate the local intent router")
+    parser.add_argument("--fixture", type=Path, default=FIXTURE_PATH)
+    parser.add_argument("--with-db", action="store_true", help="DB 이름 목록도 가제티어에 포함")
+    parser.add_argument("--threshold", type=float, default=None)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    router = IntentRouter(build_gazetteer(include_db=args.with_db), load_classifier())
+    if args.threshold is not None:
+        router.threshold = args.threshold
+
+    rows = load_fixture(args.fixture)
+    latencies = []
+    decided = correct = 0
+    by_source = Counter()
+    errors = []
+    confusion = Counter()
+
+    for row in rows:
+        previous_context = None
+        if row.get("user_preferences"):
+            previous_context = {"user_preferences": row["user_preferences"]}
+
+        started = time.perf_counter()
+        decision = router.route(row["query"], previous_context)
+        latencies.append(time.perf_counter() - started)
+
+        by_source[decision.source] += 1
+        if not decision.decided:
+            if args.verbose:
+                print(f"  [defer] {row['query']} ({decision.reason})")
+            continue
+
+        decided += 1
+        confusion[(row["label"], decision.next_step)] += 1
+        if decision.next_step == row["label"]:
+            correct += 1
+        else:
+            errors.append((row, decision))
+
+    total = len(rows)
+    ordered = sorted(latencies)
+    p95 = ordered[min(total - 1, int(0.95 * (total - 1)))]
+
+    print("=" * 60)
+    print("Local intent router evaluation")
+    print("=" * 60)
+    print(f"Queries:              {total}")
+    print(f"Decided locally:      {decided} ({decided / total:.1%})")
+    print(f"  - by rule:          {by_source['rule']}")
+    print(f"  - by classifier:    {by_source['classifier']}")
+    print(f"Fallback to LLM:      {total - decided} ({(total - decided) / total:.1%})")
+    print(f"Accuracy (decided):   {correct / decided if decided else 0:.1%}")
+    print(f"Latency p50 / p95:    {statistics.median(latencies) * 1000:.3f}ms / {p95 * 1000:.3f}ms")
+    print("-" * 60)
+    print("Confusion (label -> routed):")
+    for (label, routed), count in sorted(confusion.items()):
+        print(f"  {label:<16} -> {routed:<16} {count}")
+    if errors:
+        print("-" * 60)
+        print("Misrouted:")
+        for row, decision in errors:
+            print(f"  {row['query']!r}: {row['label']} -> {decision.next_step} ({decision.reason})")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+LLM 카세트 재생 벤치마크 (OpenAI 호출 없이 stream_generator 전체 실행)
+
+LLM_CASSETTE_MODE=record로 실제 세션을 녹화해 둔 카세트(들)를 재생 모드로 불러와,
+카세트에 기록된 사용자 턴을 세션(파일)별로 순서대로 stream_generator에 다시 보냅니다.
+채팅/임베딩 응답은 카세트에서 녹화 당시 타이밍(--latency-scale 배율)으로 재생됩니다.
+DB(체크포인트 복원, 검색, 로그 저장)는 평소 설정의 Postgres를 그대로 사용합니다.
+
+턴마다 첫 답변 토큰 시간(TTFT)과 전체 시간을, 그래프 노드별로 실행 시간을 집계합니다.
+
+녹화:
+    LLM_CASSETTE_MODE=record LLM_CASSETTE_PATH=cassettes/reco_01.jsonl uvicorn main:app
+Usage:
+    python benchmarks/replay_cassettes.py cassettes/
+    python benchmarks/replay_cassettes.py cassettes/reco_01.jsonl --latency-scale 0 --json out.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+
+class TimedGraph:
+    """app_graph.astream_events를 그대로 흘려보내면서 노드 시작/종료 시각을 기록하는 프록시"""
+
+    def __init__(self, graph: Any) -> None:
+        self._graph = graph
+        self.node_seconds: Dict[str, List[float]] = defaultdict(list)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._graph, name)
+
+    async def astream_events(self, *args, **kwargs):
+        started: Dict[str, float] = {}
+        async for event in self._graph.astream_events(*args, **kwargs):
+            node = event.get("metadata", {}).get("langgraph_node")
+            if node and event.get("name") == node:
+                if event["event"] == "on_chain_start":
+                    started[event["run_id"]] = time.perf_counter()
+                elif event["event"] == "on_chain_end" and event["run_id"] in started:
+                    self.node_seconds[node].append(
+                        time.perf_counter() - started.pop(event["run_id"])
+                    )
+            yield event
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(q * (len(ordered) - 1) + 0.5))]
+
+
+async def replay(args) -> Dict[str, Any]:
+    import main
+    from agent.llm_cassette import get_cassette
+
+    cassette = get_cassette()
+    timed = TimedGraph(main.app_graph)
+    main.app_graph = timed
+
+    sessions: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for turn in cassette.turns:
+        sessions[f"{turn['cassette']}:{turn['thread_id']}"].append(turn)
+
+    turns: List[Dict[str, Any]] = []
+    for session, session_turns in sessions.items():
+        # 녹화 세션마다 새 thread_id (체크포인트/DB 히스토리가 녹화 시작 시점과 같도록)
+        thread_id = f"replay-{uuid.uuid4().hex[:12]}"
+        for index, turn in enumerate(session_turns, start=1):
+            started = time.perf_counter()
+            first_answer = None
+            answer_chars = 0
+            async for event in main.stream_generator(
+                turn["user_query"],
+                thread_id,
+                turn.get("member_id", 0),
+                turn.get("user_mode", "BEGINNER"),
+                turn.get("recommended_count", 3),
+            ):
+                payload = event.payload
+                if payload.get("type") == "answer":
+                    if first_answer is None:
+                        first_answer = time.perf_counter() - started
+                    answer_chars += len(payload.get("content", ""))
+            total = time.perf_counter() - started
+            turns.append(
+                {
+                    "session": session,
+                    "turn": index,
+                    "query": turn["user_query"],
+                    "ttft": first_answer,
+                    "total": total,
+                    "answer_chars": answer_chars,
+                }
+            )
+            ttft = f"{first_answer * 1000:8.0f}ms" if first_answer is not None else "       -  "
+            print(f"{session[:40]:<40} #{index:<2} TTFT {ttft}  total {total * 1000:8.0f}ms")
+
+    ttfts = [t["ttft"] for t in turns if t["ttft"] is not None]
+    totals = [t["total"] for t in turns]
+    return {
+        "latency_scale": cassette.latency_scale,
+        "cassette": cassette.stats(),
+        "turns": turns,
+        "summary": {
+            "turns": len(turns),
+            "ttft_p50": _percentile(ttfts, 0.5),
+            "ttft_p95": _percentile(ttfts, 0.95),
+            "total_p50": _percentile(totals, 0.5),
+            "total_p95": _percentile(totals, 0.95),
+        },
+        "nodes": {
+            node: {
+                "calls": len(values),
+                "mean": statistics.fmean(values),
+                "p95": _percentile(values, 0.95),
+                "total": sum(values),
+            }
+            for node, values in sorted(timed.node_seconds.items())
+        },
+    }
+
+
+def report(result: Dict[str, Any]) -> None:
+    summary = result["summary"]
+    print(
+        f"\nturns {summary['turns']}  "
+        f"TTFT p50 {summary['ttft_p50'] * 1000:.0f}ms p95 {summary['ttft_p95'] * 1000:.0f}ms  "
+        f"total p50 {summary['total_p50'] * 1000:.0f}ms p95 {summary['total_p95'] * 1000:.0f}ms"
+    )
+    print(f"\n{'node':<32} {'calls':>6} {'mean':>10} {'p95':>10} {'total':>10}")
+    for node, stats in sorted(result["nodes"].items(), key=lambda item: -item[1]["total"]):
+        print(
+            f"{node:<32} {stats['calls']:>6} {stats['mean'] * 1000:>8.0f}ms "
+            f"{stats['p95'] * 1000:>8.0f}ms {stats['total'] * 1000:>8.0f}ms"
+        )
+    cassette = result["cassette"]
+    print(f"\nreplayed {cassette['replayed']} responses, {cassette['misses']} cassette miss(es)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded LLM cassettes through stream_generator")
+    parser.add_argument("cassettes", help="카세트 파일 또는 *.jsonl 디렉터리")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="녹화 지연 배율 (0=즉시)")
+    parser.add_argument("--strict", action="store_true", help="요청 본문이 정확히 같은 응답만 재생")
+    parser.add_argument("--json", help="결과를 JSON으로 저장할 경로")
+    args = parser.parse_args()
+
+    # 모델/클라이언트가 만들어지기 전에(= main 임포트 전에) 재생 모드로 설정
+    os.environ["LLM_CASSETTE_MODE"] = "replay"
+    os.environ["LLM_CASSETTE_PATH"] = args.cassettes
+    os.environ["LLM_CASSETTE_LATENCY_SCALE"] = str(args.latency_scale)
+    os.environ["LLM_CASSETTE_STRICT"] = "true" if args.strict else "false"
+    os.environ.setdefault("OPENAI_API_KEY", "sk-cassette-replay")
+
+    result = asyncio.run(replay(args))
+    report(result)
+    if args.json:
+        Path(args.json).write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
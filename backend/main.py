@@ -1,8 +1,9 @@
-import json
+import asyncio
+import hmac
 import re
 import time
-from typing import Generator, List
-from fastapi import FastAPI
+from typing import AsyncIterator, List, Optional
+from fastapi import FastAPI, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
 from fastapi.staticfiles import StaticFiles
@@ -12,13 +13,32 @@ from langchain_core.messages import HumanMessage, AIMessage
 
 # auth 라우터 등록 + chat 검증방식 변경 ====ksu====
 from fastapi import Depends
-from agent.auth import get_identity, require_member_match
+from agent.auth import get_identity, require_admin, require_member_match
 from routers import auth
 
 
 # 모듈 임포트
 from agent.schemas import ChatRequest
-from agent.graph import app_graph
+from agent.graph import app_graph, RECO_STREAM_EVENT
+from agent.metrics import metrics
+from agent.model_health import MODEL_DEGRADATION
+from agent.circuit_breaker import CIRCUIT_BREAKERS
+from agent.stream_cancel import stream_until_disconnect
+from agent.sse import SSEEvent, coalesce_sse
+from agent.deadline import new_request_deadline
+from agent.llm_cassette import record_turn
+from agent.loop_monitor import get_loop_monitor, is_loop_monitor_enabled
+from agent.schema_migrations import is_migrate_on_startup_enabled, migrate
+from agent.password_hasher import get_password_hasher
+from agent.image_utils import shutdown_image_pool
+from agent.storage_s3 import shutdown_storage_executor
+from agent.admission import (
+    AdmissionRejected,
+    AdmittedStreamingResponse,
+    admission_tier,
+    get_admission_controller,
+    is_admission_enabled,
+)
 from agent.utils import parse_recommended_count, normalize_recommended_count
 from agent.database import (
     save_chat_message,
@@ -87,9 +107,17 @@ async def stream_generator(
     member_id: int = 0,
     user_mode: str = "BEGINNER",
     recommended_count: int = 3,
-) -> Generator[str, None, None]:
+) -> AsyncIterator[SSEEvent]:
 
     save_chat_message(thread_id, member_id, "user", user_query)
+    # LLM_CASSETTE_MODE=record일 때 재생 CLI 입력으로 쓸 사용자 턴 기록
+    record_turn(
+        thread_id=thread_id,
+        user_query=user_query,
+        member_id=member_id,
+        user_mode=user_mode,
+        recommended_count=recommended_count,
+    )
     config = {"configurable": {"thread_id": thread_id}}
 
     # [★ 수정] 히스토리 중복 방지 로직
@@ -135,6 +163,9 @@ async def stream_generator(
 
     normalized_mode = normalize_user_mode(user_mode)
 
+    # [★추가] 턴 전체 시간 예산: 이후 노드/도구가 남은 시간에 맞춰 타임아웃을 줄임
+    deadline = new_request_deadline()
+
     # [★추가] 추천 개수와 명시성 여부 계산
     resolved_count, is_explicit = resolve_recommended_count_with_flag(
         user_query, recommended_count if recommended_count != 3 else None
@@ -149,6 +180,8 @@ async def stream_generator(
         "is_count_explicit": is_explicit,  # [★추가] 명시성 플래그
         "thread_id": thread_id,  # [★추가] DB 백업을 위한 thread_id
         "recommended_history": db_recommended_history,  # [★추가] DB에서 복원한 히스토리
+        # [★추가] 턴 전체 마감 시각 (CHAT_DEADLINE_SECONDS, 0이면 없음)
+        "deadline_at": deadline.at if deadline else None,
     }
 
     full_ai_response = ""
@@ -168,12 +201,10 @@ async def stream_generator(
                 output = event["data"].get("output")
                 if output and isinstance(output, dict) and "status" in output:
                     status_msg = output["status"]
-                    data = json.dumps(
-                        {"type": "log", "content": status_msg}, ensure_ascii=False
-                    )
-                    yield f"data: {data}\n\n"
+                    yield SSEEvent({"type": "log", "content": status_msg})
 
             # [A] Writer & Info Agents: 실시간 답변 스트리밍
+            content = None
             if kind == "on_chat_model_stream":
 
                 # [★추가] 내부용 헬퍼(번역기 등)의 출력은 화면에 보내지 않고 무시(Skip)
@@ -181,9 +212,11 @@ async def stream_generator(
                 if "internal_helper" in tags:
                     continue
 
+                # 추천 섹션은 동시에 작성되므로 원시 토큰 대신 순서 보장 이벤트([A-2])를 사용
+                if node_name.startswith("parallel_reco"):
+                    continue
+
                 target_nodes = [
-                    # Recommendation graph
-                    "parallel_reco",
                     # Legacy / other graphs
                     "writer",
                     "perfume_describer",
@@ -192,36 +225,31 @@ async def stream_generator(
                     # [Wave 2] Info graph status-specific nodes (only streaming ones)
                     "info_writer",
                 ]
-                # NOTE: LangGraph's node name comes from workflow.add_node("<name>", ...).
-                # We include a prefix fallback in case the runtime metadata differs.
-                if node_name in target_nodes or node_name.startswith("parallel_reco"):
+                if node_name in target_nodes:
                     content = event["data"]["chunk"].content
-                    if content:
-                        if node_name == "parallel_reco" or node_name.startswith(
-                            "parallel_reco"
-                        ):
-                            if pending_parallel_reco_separator and content.lstrip().startswith(
-                                "##"
-                            ):
-                                content = f"\n\n{content.lstrip()}"
-                                pending_parallel_reco_separator = False
-                            content = content.replace("---##", "---\n\n##").replace(
-                                "--- ##", "---\n\n##"
-                            )
-                        if node_name == "parallel_reco" or node_name.startswith(
-                            "parallel_reco"
-                        ):
-                            did_stream_parallel_reco = True
-                            if content.strip().endswith("---"):
-                                pending_parallel_reco_separator = True
-                        full_ai_response += content
-                        data = json.dumps(
-                            {"type": "answer", "content": content}, ensure_ascii=False
-                        )
-                        yield f"data: {data}\n\n"
+
+            # [A-2] 추천 섹션: OrderedStreamMultiplexer가 순서대로 내보낸 청크
+            elif kind == "on_custom_event" and event.get("name") == RECO_STREAM_EVENT:
+                content = event["data"].get("content")
+                if content:
+                    if pending_parallel_reco_separator and content.lstrip().startswith(
+                        "##"
+                    ):
+                        content = f"\n\n{content.lstrip()}"
+                        pending_parallel_reco_separator = False
+                    content = content.replace("---##", "---\n\n##").replace(
+                        "--- ##", "---\n\n##"
+                    )
+                    did_stream_parallel_reco = True
+                    if content.strip().endswith("---"):
+                        pending_parallel_reco_separator = True
+
+            if content:
+                full_ai_response += content
+                yield SSEEvent({"type": "answer", "content": content}, node_name)
 
             # [B] Interviewer & Fixed Message Nodes: 결과 전송 (non-streaming)
-            elif kind == "on_chain_end" and node_name in [
+            if kind == "on_chain_end" and node_name in [
                 "interviewer",
                 # Info graph fixed message nodes
                 "fallback_handler",
@@ -241,11 +269,9 @@ async def stream_generator(
                         last_msg = messages[-1]
                         if hasattr(last_msg, "content") and last_msg.content:
                             full_ai_response += last_msg.content
-                            data = json.dumps(
-                                {"type": "answer", "content": last_msg.content},
-                                ensure_ascii=False,
+                            yield SSEEvent(
+                                {"type": "answer", "content": last_msg.content}, node_name
                             )
-                            yield f"data: {data}\n\n"
 
             # [B-2] parallel_reco: 완성된 결과 전송 (non-streaming)
             elif kind == "on_chain_end" and node_name == "parallel_reco":
@@ -276,37 +302,28 @@ async def stream_generator(
                                 
                                 if additional_content:
                                     full_ai_response += additional_content
-                                    data = json.dumps(
+                                    yield SSEEvent(
                                         {"type": "answer", "content": additional_content},
-                                        ensure_ascii=False,
+                                        node_name,
                                     )
-                                    yield f"data: {data}\n\n"
                                 continue
                             full_ai_response += last_msg.content
-                            data = json.dumps(
-                                {"type": "answer", "content": last_msg.content},
-                                ensure_ascii=False,
+                            yield SSEEvent(
+                                {"type": "answer", "content": last_msg.content}, node_name
                             )
-                            yield f"data: {data}\n\n"
 
             # [C] ★Researcher 내부 단계 전환 (전략 수립 완료 -> 검색 시작)★
             elif kind == "on_chat_model_end" and node_name == "researcher":
                 # 리서처 노드 내에서 전략 수립 LLM이 끝나면 즉시 검색 문구로 교체합니다.
                 log_msg = "전략에 맞는 향수를 검색중 입니다..."
-                data = json.dumps(
-                    {"type": "log", "content": log_msg}, ensure_ascii=False
-                )
-                yield f"data: {data}\n\n"
+                yield SSEEvent({"type": "log", "content": log_msg})
 
             # [D] Tools (로그): 데이터 조회 완료
             elif kind == "on_chain_end" and node_name == "tools":
                 log_msg = (
                     "✅ 검색된 정보를 분석하여 최적의 추천 리스트를 만드는 중입니다..."
                 )
-                data = json.dumps(
-                    {"type": "log", "content": log_msg}, ensure_ascii=False
-                )
-                yield f"data: {data}\n\n"
+                yield SSEEvent({"type": "log", "content": log_msg})
 
         if full_ai_response:
             save_chat_message(thread_id, member_id, "assistant", full_ai_response)
@@ -314,8 +331,7 @@ async def stream_generator(
     except GeneratorExit:
         return
     except Exception as e:
-        error_msg = json.dumps({"type": "error", "content": str(e)}, ensure_ascii=False)
-        yield f"data: {error_msg}\n\n"
+        yield SSEEvent({"type": "error", "content": str(e)})
 
 # 기존 코드 주석처리 /chat 변경 (request.user_mode 신뢰하지 않음)
 # @app.post("/chat")
@@ -339,17 +355,43 @@ async def stream_generator(
 
 # 수정 코드
 @app.post("/chat")
-async def chat_stream(request: ChatRequest, identity = Depends(get_identity)):
+async def chat_stream(
+    request: ChatRequest, http_request: Request, identity = Depends(get_identity)
+):
     member_id = identity.user_id or 0
     user_mode = identity.user_mode or "BEGINNER"
     recommended_count = request.recommended_count or 3
-    return StreamingResponse(
-        stream_generator(
-            request.user_query,
-            request.thread_id,
-            member_id,
-            user_mode,
-            recommended_count,
+    thread_id = request.thread_id
+
+    # 동시 실행 수 제한: 자리가 없으면 잠시 대기, 그래도 없으면 503 + Retry-After
+    ticket = None
+    if is_admission_enabled():
+        try:
+            ticket = await get_admission_controller().acquire(
+                admission_tier(identity.user_id, user_mode)
+            )
+        except AdmissionRejected as e:
+            raise e.to_http()
+
+    def on_finish(outcome: str) -> None:
+        if outcome != "completed":
+            print(f"   🛑 [Stream] thread_id={thread_id} outcome={outcome}", flush=True)
+
+    # 브라우저가 연결을 끊으면 그래프 실행(하위 LLM 호출 포함)을 취소
+    return AdmittedStreamingResponse(
+        stream_until_disconnect(
+            # 연속 토큰은 짧은 시간창(SSE_COALESCE_WINDOW_MS) 단위로 한 프레임에 묶어 전송
+            coalesce_sse(
+                stream_generator(
+                    request.user_query,
+                    request.thread_id,
+                    member_id,
+                    user_mode,
+                    recommended_count,
+                )
+            ),
+            http_request.is_disconnected,
+            on_finish=on_finish,
         ),
         media_type="text/event-stream",
         # NOTE: 이 변경은 SSE 응답 헤더 복구용이며 에이전트 로직/성능에는 영향 없음
@@ -359,12 +401,83 @@ async def chat_stream(request: ChatRequest, identity = Depends(get_identity)):
             "Connection": "keep-alive",
             "X-Accel-Buffering": "no",
         },
+        ticket=ticket,
     )
 
 
 @app.get("/health")
 def health():
-    return {"status": "ok"}
+    # 모델 강등 상태 포함 (writer/router가 FAST_LLM으로 우회 중인지)
+    # + OpenAI 호출 서킷 브레이커 상태 (열려 있으면 로컬 폴백 사용 중)
+    return {
+        "status": "ok",
+        "models": MODEL_DEGRADATION.snapshot(),
+        "circuits": CIRCUIT_BREAKERS.snapshot(),
+    }
+
+
+@app.get("/metrics")
+def get_metrics(
+    x_metrics_token: Optional[str] = Header(None),
+    identity = Depends(get_identity),
+):
+    """인프로세스 메트릭 스냅샷 (추측 실행 등 성능 지표) - 관리자 또는 스크레이프 토큰(METRICS_SCRAPE_TOKEN)"""
+    scrape_token = os.getenv("METRICS_SCRAPE_TOKEN")
+    if not (scrape_token and x_metrics_token and hmac.compare_digest(x_metrics_token, scrape_token)):
+        require_admin(identity)
+    return metrics.snapshot()
+
+
+# ==========================================
+# 스키마 마이그레이션 (요청 처리 중 DDL 대신 시작 시 1회)
+# ==========================================
+@app.on_event("startup")
+async def apply_schema_migrations():
+    if not is_migrate_on_startup_enabled():
+        return
+    try:
+        await asyncio.to_thread(migrate)
+    except Exception as e:
+        print(f"⚠️ [Migration] 스키마 마이그레이션 실패: {e}", flush=True)
+
+
+# ==========================================
+# 이벤트 루프 블로킹 감지
+# ==========================================
+@app.on_event("startup")
+async def start_loop_monitor():
+    if is_loop_monitor_enabled():
+        get_loop_monitor().start()
+
+
+@app.on_event("shutdown")
+async def stop_loop_monitor():
+    await get_loop_monitor().stop()
+
+
+@app.on_event("shutdown")
+async def stop_password_hasher():
+    # 비밀번호 해시 워커 프로세스 정리
+    await asyncio.to_thread(get_password_hasher().shutdown)
+
+
+@app.on_event("shutdown")
+async def stop_image_pool():
+    # 프로필 이미지 변환 워커 프로세스 정리
+    await asyncio.to_thread(shutdown_image_pool)
+
+
+@app.on_event("shutdown")
+async def stop_storage_executor():
+    # 오브젝트 스토리지 I/O 스레드 정리
+    await asyncio.to_thread(shutdown_storage_executor)
+
+
+@app.get("/debug/event-loop")
+def get_event_loop_report(identity = Depends(get_identity)):
+    """루프 지연 분포와 최근 블로킹 보고(원인 프레임 + 스택) - 관리자 전용"""
+    require_admin(identity)
+    return get_loop_monitor().snapshot()
 
 # 기존 코드 주석처리
 # @app.get("/chat/rooms/{member_id}")
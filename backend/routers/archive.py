@@ -1,7 +1,16 @@
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
-from agent.archive_db import get_my_perfumes, add_my_perfume_logic, delete_my_perfume_logic, update_my_perfume_logic
+from agent.archive_db import (
+    get_my_perfumes,
+    add_my_perfume_logic,
+    delete_my_perfume_logic,
+    update_my_perfume_logic,
+    ARCHIVE_BULK_MAX_ITEMS,
+    bulk_add_my_perfumes,
+    bulk_delete_my_perfumes,
+    bulk_update_my_perfumes,
+)
 # ======== ksu ======== 새로운 member_id 검증 로직 추가
 from fastapi import Depends
 from agent.auth import get_identity, require_member_match
@@ -19,6 +28,19 @@ class UpdatePerfumeStatusRequest(BaseModel):
     register_status: str
     preference: Optional[str] = None
 
+# 일괄 요청 (최대 ARCHIVE_BULK_MAX_ITEMS건, 한 트랜잭션)
+class BulkAddRequest(BaseModel):
+    items: List[MyPerfumeRequest] = Field(..., min_length=1, max_length=ARCHIVE_BULK_MAX_ITEMS)
+
+class BulkUpdateItem(UpdatePerfumeStatusRequest):
+    perfume_id: int
+
+class BulkUpdateRequest(BaseModel):
+    items: List[BulkUpdateItem] = Field(..., min_length=1, max_length=ARCHIVE_BULK_MAX_ITEMS)
+
+class BulkDeleteRequest(BaseModel):
+    perfume_ids: List[int] = Field(..., min_length=1, max_length=ARCHIVE_BULK_MAX_ITEMS)
+
 # [수정] 모든 API에 추가 적용 (GET/POST/PATCH/DELETE)
 # identity = Depends(get_identity)
 # require_member_match(member_id, identity)
@@ -33,6 +55,40 @@ def list_archive(member_id: int, identity = Depends(get_identity)):
     require_member_match(member_id, identity)
     return get_my_perfumes(member_id)
 
+# 일괄 API: 인증/트랜잭션 1번으로 N건 처리, 항목별 결과 반환
+# (PATCH /{member_id}/perfumes/{perfume_id}보다 먼저 등록해야 "bulk"가 perfume_id로 잡히지 않음)
+def _bulk_result(result: dict) -> dict:
+    if result["status"] == "error":
+        raise HTTPException(status_code=400, detail={"message": result["message"], "results": result["results"]})
+    return {"status": "ok", "results": result["results"], "summary": result["summary"]}
+
+@router.post("/{member_id}/perfumes/bulk")
+def register_archive_bulk(member_id: int, req: BulkAddRequest, identity = Depends(get_identity)):
+    """
+    POST /users/{member_id}/perfumes/bulk  {"items": [MyPerfumeRequest, ...]}
+    항목별 결과: created | updated | duplicate | invalid
+    """
+    require_member_match(member_id, identity)
+    return _bulk_result(bulk_add_my_perfumes(member_id, [item.model_dump() for item in req.items]))
+
+@router.patch("/{member_id}/perfumes/bulk")
+def update_archive_bulk(member_id: int, req: BulkUpdateRequest, identity = Depends(get_identity)):
+    """
+    PATCH /users/{member_id}/perfumes/bulk  {"items": [{"perfume_id", "register_status", "preference"}, ...]}
+    항목별 결과: updated | not_found | duplicate | invalid
+    """
+    require_member_match(member_id, identity)
+    return _bulk_result(bulk_update_my_perfumes(member_id, [item.model_dump() for item in req.items]))
+
+@router.post("/{member_id}/perfumes/bulk-delete")
+def delete_archive_bulk(member_id: int, req: BulkDeleteRequest, identity = Depends(get_identity)):
+    """
+    POST /users/{member_id}/perfumes/bulk-delete  {"perfume_ids": [...]}
+    항목별 결과: deleted | not_found | duplicate
+    """
+    require_member_match(member_id, identity)
+    return _bulk_result(bulk_delete_my_perfumes(member_id, req.perfume_ids))
+
 @router.post("/{member_id}/perfumes")
 def register_archive(member_id: int, req: MyPerfumeRequest, identity = Depends(get_identity)):
     """
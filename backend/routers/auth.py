@@ -4,16 +4,15 @@
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from passlib.context import CryptContext
 import httpx
 from jose import jwt
 import os
 from datetime import datetime, timedelta
 
 from agent.database import get_member_db_connection, release_member_db_connection
+from agent.password_hasher import verify_password
 
 router = APIRouter(prefix="/auth", tags=["auth"])
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
 
 class LocalTokenRequest(BaseModel):
     email: str
@@ -54,8 +53,17 @@ def issue_token_local(req: LocalTokenRequest):
             raise HTTPException(status_code=401, detail="Invalid credentials")
 
         member_id, pwd_hash, role_type, user_mode = row
-        if not pwd_hash or not pwd_context.verify(req.password, pwd_hash):
+        if not pwd_hash:
             raise HTTPException(status_code=401, detail="Invalid credentials")
+        verified, new_hash = verify_password(req.password, pwd_hash)
+        if not verified:
+            raise HTTPException(status_code=401, detail="Invalid credentials")
+        if new_hash:
+            cur.execute(
+                "UPDATE tb_member_basic_m SET pwd_hash=%s WHERE member_id=%s",
+                (new_hash, member_id),
+            )
+            conn.commit()
 
         role = (role_type or "USER").upper()
         mode = (user_mode or "BEGINNER").upper()
@@ -7,24 +7,34 @@ import psycopg2.errors
 import psycopg2.errors
 # [수정] database.py의 커넥션 풀 사용 (user.py 제거)
 from agent.database import get_member_db_connection, release_member_db_connection, add_my_perfume
-from passlib.context import CryptContext
 import os
 import uuid
 import shutil
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 # [중복 제거] add_my_perfume은 위에서 이미 임포트됨
 
 # ======== ksu ========= 
 # 관리자/프로필/내향수 저장 등 모든 사용자 연관 API에 검증 적용
-from fastapi import Depends
+from fastapi import Depends, Query
+from fastapi.responses import StreamingResponse
 from agent.auth import get_identity, require_admin, require_member_match, require_authenticated
 # ======================
+from agent.password_hasher import hash_password, verify_password
+from agent.member_listing import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    MEMBER_ROLES,
+    MEMBER_STATUSES,
+    MemberFilters,
+    count_members,
+    decode_cursor,
+    fetch_page,
+    stream_page_json,
+)
 
 # 이 라우터는 '/users'로 시작하는 모든 요청을 처리합니다.
 router = APIRouter(prefix="/users", tags=["users"])
 
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
-
 # [요청 모델] 프론트엔드(NextAuth)에서 보내주는 데이터 형식 정의
 class KakaoLoginRequest(BaseModel):
     kakao_id: str  # 카카오 고유 ID (필수)
@@ -107,7 +117,6 @@ def login_with_kakao(req: KakaoLoginRequest):
     cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
 
     try:
-        _ensure_profile_columns(cur)
         nickname = req.nickname or "향수초보"
         profile_image_url = req.profile_image or None
 
@@ -414,10 +423,13 @@ def link_account(req: LinkAccountRequest):
             raise HTTPException(status_code=404, detail="해당 이메일로 가입된 계정을 찾을 수 없습니다.")
 
         # [STEP 2] 비밀번호 검증
-        if not pwd_context.verify(req.password, local_user["pwd_hash"]):
+        verified, new_hash = verify_password(req.password, local_user["pwd_hash"])
+        if not verified:
             raise HTTPException(status_code=401, detail="비밀번호가 일치하지 않습니다.")
 
         member_id = local_user["member_id"]
+        if new_hash:
+            _store_rehash(cur, member_id, new_hash)
 
         # [STEP 3] 이미 카카오 연결되어 있는지 확인
         cur.execute(
@@ -477,12 +489,11 @@ def link_account(req: LinkAccountRequest):
             release_member_db_connection(conn)
 
 
-def _ensure_profile_columns(cur):
-    cur.execute(
-        "ALTER TABLE tb_member_profile_t ADD COLUMN IF NOT EXISTS sub_email VARCHAR(100)"
-    )
+def _store_rehash(cur, member_id: int, new_hash: str):
+    # 작업 계수(PASSWORD_HASH_ROUNDS)가 바뀐 해시는 로그인 성공 시 새 해시로 교체
     cur.execute(
-        "ALTER TABLE tb_member_profile_t ADD COLUMN IF NOT EXISTS profile_image_url VARCHAR(255)"
+        "UPDATE tb_member_basic_m SET pwd_hash=%s WHERE member_id=%s",
+        (new_hash, member_id),
     )
 
 
@@ -605,8 +616,12 @@ def login_local_user(req: LocalLoginRequest):
         if not row.get("pwd_hash"):
             raise HTTPException(status_code=401, detail="Invalid credentials")
 
-        if not pwd_context.verify(req.password, row["pwd_hash"]):
+        verified, new_hash = verify_password(req.password, row["pwd_hash"])
+        if not verified:
             raise HTTPException(status_code=401, detail="Invalid credentials")
+        if new_hash:
+            _store_rehash(cur, row["member_id"], new_hash)
+            conn.commit()
 
         status_check = _check_withdraw_status(cur, row["member_id"])
         if status_check["status"] == "WITHDRAW_REQ":
@@ -730,7 +745,7 @@ def register_local_user(req: LocalRegisterRequest):
         if cur.fetchone():
             raise HTTPException(status_code=409, detail="Login ID already exists")
 
-        pwd_hash = pwd_context.hash(password)
+        pwd_hash = hash_password(password)
 
         sql_basic = """
             INSERT INTO tb_member_basic_m
@@ -785,7 +800,6 @@ def get_profile(member_id: int, identity = Depends(get_identity)):
     cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
 
     try:
-        _ensure_profile_columns(cur)
         cur.execute(
             """
             SELECT
@@ -838,7 +852,6 @@ def check_nickname(nickname: str, member_id: Optional[int] = None):
     cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
 
     try:
-        _ensure_profile_columns(cur)
         if member_id:
             cur.execute(
                 "SELECT member_id FROM tb_member_profile_t WHERE nickname=%s AND member_id<>%s",
@@ -868,8 +881,6 @@ def update_profile(member_id: int, req: UpdateProfileRequest, identity = Depends
     cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
 
     try:
-        _ensure_profile_columns(cur)
-
         cur.execute(
             "SELECT member_id FROM tb_member_basic_m WHERE member_id=%s",
             (member_id,),
@@ -1043,10 +1054,11 @@ def update_password(member_id: int, req: UpdatePasswordRequest, identity = Depen
         if row.get("join_channel") != "LOCAL":
             raise HTTPException(status_code=400, detail="Password login not enabled")
 
-        if not pwd_context.verify(req.current_password, row["pwd_hash"]):
+        verified, _ = verify_password(req.current_password, row["pwd_hash"])
+        if not verified:
             raise HTTPException(status_code=401, detail="Invalid credentials")
 
-        new_hash = pwd_context.hash(req.new_password)
+        new_hash = hash_password(req.new_password)
         cur.execute(
             """
             UPDATE tb_member_basic_m
@@ -1176,20 +1188,26 @@ async def upload_profile_image(member_id: int, file: UploadFile = File(...), ide
 
     Process:
     1. Validate file type and size (max 5MB)
-    2. Convert to 256x256 WebP
-    3. Upload to S3 (profile_images/{uuid}.webp)
-    4. Save CDN URL to tb_member_profile_t
-    5. Delete old S3 object if it exists
+    2. Convert to WebP variants (64/128/256) in the image worker pool
+    3. Upload to S3 (profile_images/{uuid}.webp, {uuid}_64.webp, {uuid}_128.webp)
+    4. Save CDN URL (256 variant) to tb_member_profile_t
+    5. Delete old S3 objects if they exist
     """
-    from agent.image_utils import process_profile_image_upload
-    from agent.storage_s3 import upload_profile_webp, parse_key_from_cdn_url, delete_key
+    from agent.image_utils import (
+        PROFILE_IMAGE_SIZE,
+        PROFILE_IMAGE_VARIANT_SIZES,
+        process_profile_image_variants,
+    )
+    from agent.storage_s3 import aupload_profile_variants, parse_key_from_cdn_url, adelete_profile_image
+
+    extra_sizes = [size for size in PROFILE_IMAGE_VARIANT_SIZES if size != PROFILE_IMAGE_SIZE]
 
     # Step 1: Validate and convert image
-    webp_data = await process_profile_image_upload(file)
+    variants = await process_profile_image_variants(file)
 
     # Step 2: Upload to S3 and get CDN URL
     try:
-        s3_key, cdn_url = upload_profile_webp(webp_data)
+        s3_key, cdn_url = await aupload_profile_variants(variants, PROFILE_IMAGE_SIZE)
     except Exception as e:
         import logging
         logging.error(f"S3 upload failed: {e}")
@@ -1200,8 +1218,6 @@ async def upload_profile_image(member_id: int, file: UploadFile = File(...), ide
     cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
 
     try:
-        _ensure_profile_columns(cur)
-
         # Verify member exists
         cur.execute(
             "SELECT member_id FROM tb_member_basic_m WHERE member_id=%s",
@@ -1209,10 +1225,7 @@ async def upload_profile_image(member_id: int, file: UploadFile = File(...), ide
         )
         if not cur.fetchone():
             # Clean up uploaded S3 object
-            try:
-                delete_key(s3_key)
-            except:
-                pass
+            await adelete_profile_image(s3_key, extra_sizes)
             raise HTTPException(status_code=404, detail="Member not found")
 
         # Get existing profile image URL
@@ -1253,29 +1266,19 @@ async def upload_profile_image(member_id: int, file: UploadFile = File(...), ide
             old_key = parse_key_from_cdn_url(old_cdn_url)
             if old_key:
                 # Only delete if it's our profile image (starts with profile_images/)
-                try:
-                    delete_key(old_key)
-                except Exception as e:
-                    import logging
-                    logging.warning(f"Failed to delete old S3 object {old_key}: {e}")
+                await adelete_profile_image(old_key, extra_sizes)
 
         return {"profile_image_url": cdn_url}
 
     except HTTPException:
         conn.rollback()
         # Clean up uploaded S3 object on error
-        try:
-            delete_key(s3_key)
-        except:
-            pass
+        await adelete_profile_image(s3_key, extra_sizes)
         raise
     except Exception as e:
         conn.rollback()
         # Clean up uploaded S3 object on error
-        try:
-            delete_key(s3_key)
-        except:
-            pass
+        await adelete_profile_image(s3_key, extra_sizes)
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
@@ -1299,35 +1302,52 @@ from typing import Optional
 
 # ======== ksu ========= 관리자 회원 조회 API 변경
 @router.get("/admin/members")
-def admin_list_members(identity = Depends(get_identity)):
+def admin_list_members(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    status: Optional[str] = None,
+    role: Optional[str] = None,
+    joined_from: Optional[date] = None,
+    joined_to: Optional[date] = None,
+    count: str = Query("estimate", pattern="^(estimate|exact|none)$"),
+    identity = Depends(get_identity),
+):
     require_admin(identity)
     # admin_member_id 제거: 세션/헤더 기반 권한 검증만 사용
 # ======================
+    # 키셋 페이지네이션 + 서버 측 필터, 전체 건수는 기본 추정치 (agent/member_listing.py)
+    if status is not None and status.upper() not in MEMBER_STATUSES:
+        raise HTTPException(status_code=400, detail="Invalid status")
+    if role is not None and role.upper() not in MEMBER_ROLES:
+        raise HTTPException(status_code=400, detail="Invalid role")
+    try:
+        after_id = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    filters = MemberFilters(
+        status=status.upper() if status else None,
+        role=role.upper() if role else None,
+        joined_from=joined_from,
+        joined_to=joined_to,
+    )
+
     conn = get_member_db_connection()
     cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
 
     try:
-        cur.execute(
-            """
-            SELECT
-                b.member_id,
-                p.email,
-                p.nickname,
-                b.join_dt,
-                s.member_status,
-                b.join_channel
-            FROM tb_member_basic_m b
-            LEFT JOIN tb_member_profile_t p ON b.member_id = p.member_id
-            LEFT JOIN tb_member_status_t s ON b.member_id = s.member_id
-            ORDER BY b.member_id DESC
-            """
-        )
-        return {"members": cur.fetchall()}
+        total = count_members(cur, filters, count)
+        rows, next_cursor = fetch_page(cur, filters, after_id, limit)
     finally:
         cur.close()
         if conn:
             release_member_db_connection(conn)
 
+    # 커넥션은 이미 반납했으므로 느린 클라이언트가 풀을 잡고 있지 않음
+    return StreamingResponse(
+        stream_page_json(rows, next_cursor, total, limit),
+        media_type="application/json",
+    )
+
 
 # @router.patch("/admin/members/{member_id}/status")
 # def admin_update_member_status(member_id: int, admin_member_id: int, status: str):
@@ -1337,7 +1357,7 @@ def admin_update_member_status(member_id: int, status: str, identity = Depends(g
     require_admin(identity)
     # admin_member_id 제거: 세션/헤더 기반 권한 검증만 사용
 # ======================
-    if status not in ("NORMAL", "LOCK", "DORMANT", "WITHDRAW_REQ", "WITHDRAW"):
+    if status not in MEMBER_STATUSES:
         raise HTTPException(status_code=400, detail="Invalid status")
 
     conn = get_member_db_connection()
@@ -4,11 +4,17 @@ Migrate profile images from local /uploads to S3.
 
 This script:
 1. Finds all profile_image_url values starting with '/uploads/' in tb_member_profile_t
-2. For each, converts the image to 256x256 WebP
-3. Uploads to S3 and updates DB with CDN URL
-4. Idempotent: skips rows already migrated to CDN
+2. Converts each image to WebP variants (64/128/256) in a worker pool
+3. Uploads to storage (rate-limited) and updates DB with CDN URLs in batches
+4. Idempotent and resumable: skips rows already on CDN and member ids in the checkpoint file
+
+Usage:
+    python scripts/migrate_profile_images_to_s3.py
+    python scripts/migrate_profile_images_to_s3.py --workers 16 --rate 50 --batch-size 200
+    python scripts/migrate_profile_images_to_s3.py --dry-run
 """
 
+import argparse
 import os
 import sys
 from pathlib import Path
@@ -19,136 +25,96 @@ if str(BACKEND_DIR) not in sys.path:
     sys.path.insert(0, str(BACKEND_DIR))
 
 from agent.database import get_member_db_connection, release_member_db_connection
-from agent.image_utils import convert_to_profile_webp
-from agent.storage_s3 import upload_profile_webp
-
-
-def main():
+from agent.profile_image_migration import (
+    SELECT_LOCAL_IMAGES_SQL,
+    Checkpoint,
+    MigrationRow,
+    ProfileImageMigrator,
+    update_profile_urls,
+)
+
+DEFAULT_CHECKPOINT = BACKEND_DIR / "uploads" / ".profile_image_migration.checkpoint"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Migrate profile images from /uploads to S3")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent read/convert/upload workers")
+    parser.add_argument("--rate", type=float, default=0, help="Max uploads per second (0 = unlimited)")
+    parser.add_argument("--batch-size", type=int, default=100, help="Rows per DB update batch")
+    parser.add_argument("--checkpoint", type=Path, default=DEFAULT_CHECKPOINT, help="Completed member id file")
+    parser.add_argument("--uploads-dir", type=Path, default=BACKEND_DIR / "uploads")
+    parser.add_argument("--report-interval", type=float, default=5.0, help="Seconds between progress lines")
+    parser.add_argument("--dry-run", action="store_true", help="Read and convert only; no upload/DB/checkpoint")
+    return parser.parse_args(argv)
+
+
+def main(args):
     """Main migration function."""
     conn = get_member_db_connection()
-    cur = conn.cursor()
 
     try:
-        # Statistics
-        stats = {
-            'total': 0,
-            'skipped_already_cdn': 0,
-            'file_not_found': 0,
-            'conversion_failed': 0,
-            's3_failed': 0,
-            'db_failed': 0,
-            'success': 0,
-        }
-
         # Get all rows with local /uploads/ paths
-        cur.execute(
-            """
-            SELECT member_id, profile_image_url
-            FROM tb_member_profile_t
-            WHERE profile_image_url LIKE '/uploads/%'
-            ORDER BY member_id
-            """
-        )
-        rows = cur.fetchall()
-
-        stats['total'] = len(rows)
-        print(f"Found {stats['total']} rows with local /uploads/ paths")
+        cur = conn.cursor()
+        try:
+            cur.execute(SELECT_LOCAL_IMAGES_SQL)
+            rows = [MigrationRow(member_id, url) for member_id, url in cur.fetchall()]
+        finally:
+            cur.close()
+        conn.rollback()
+
+        print(f"Found {len(rows)} rows with local /uploads/ paths")
         print("=" * 60)
 
-        if stats['total'] == 0:
+        if not rows:
             print("No migration needed. All profile images are already on CDN.")
             return
 
-        uploads_dir = os.path.join(BACKEND_DIR, "uploads")
-
-        for member_id, old_url in rows:
-            print(f"\n[{member_id}] Processing: {old_url}")
-
-            # Extract filename
-            filename = os.path.basename(old_url)
-            local_path = os.path.join(uploads_dir, filename)
-
-            # Check if file exists
-            if not os.path.exists(local_path):
-                print(f"  ⚠️  File not found: {local_path}")
-                stats['file_not_found'] += 1
-                continue
-
-            try:
-                # Read and convert image
-                with open(local_path, 'rb') as f:
-                    image_data = f.read()
-
-                print(f"  📖 Read {len(image_data)} bytes from local file")
-
-                webp_data = convert_to_profile_webp(image_data)
-                print(f"  🖼️  Converted to WebP: {len(webp_data)} bytes")
-
-            except Exception as e:
-                print(f"  ❌ Conversion failed: {e}")
-                stats['conversion_failed'] += 1
-                continue
-
-            try:
-                # Upload to S3
-                s3_key, cdn_url = upload_profile_webp(webp_data)
-                print(f"  ☁️  Uploaded to S3: {cdn_url}")
-
-            except Exception as e:
-                print(f"  ❌ S3 upload failed: {e}")
-                stats['s3_failed'] += 1
-                continue
-
-            try:
-                # Update DB
-                cur.execute(
-                    """
-                    UPDATE tb_member_profile_t
-                    SET profile_image_url = %s
-                    WHERE member_id = %s
-                    """,
-                    (cdn_url, member_id)
-                )
-                conn.commit()
-                print(f"  ✅ DB updated successfully")
-                stats['success'] += 1
-
-            except Exception as e:
-                conn.rollback()
-                print(f"  ❌ DB update failed: {e}")
-                stats['db_failed'] += 1
-
-                # Try to clean up S3 object (best-effort)
-                try:
-                    from agent.storage_s3 import delete_key
-                    delete_key(s3_key)
-                    print(f"  🗑️  Cleaned up S3 object after DB failure")
-                except:
-                    pass
+        migrator = ProfileImageMigrator(
+            args.uploads_dir,
+            update_urls=lambda images: update_profile_urls(conn, images),
+            checkpoint=None if args.dry_run else Checkpoint(args.checkpoint),
+            workers=args.workers,
+            rate=args.rate,
+            batch_size=args.batch_size,
+            dry_run=args.dry_run,
+            report_interval=args.report_interval,
+        )
+        stats = migrator.run(rows)
 
         # Final report
         print("\n" + "=" * 60)
-        print("MIGRATION COMPLETE")
+        print("DRY RUN COMPLETE" if args.dry_run else "MIGRATION COMPLETE")
         print("=" * 60)
-        print(f"Total rows processed:     {stats['total']}")
-        print(f"✅ Successfully migrated:  {stats['success']}")
+        print(f"Total rows found:         {stats['total']}")
+        print(f"⏭️  Skipped (checkpoint):   {stats['skipped_checkpoint']}")
+        print(f"✅ {'Convertible' if args.dry_run else 'Successfully migrated'}:  {stats['success']}")
         print(f"⚠️  File not found:         {stats['file_not_found']}")
+        print(f"⚠️  Read failed:            {stats['read_failed']}")
         print(f"❌ Conversion failed:      {stats['conversion_failed']}")
         print(f"❌ S3 upload failed:       {stats['s3_failed']}")
         print(f"❌ DB update failed:       {stats['db_failed']}")
+        print(f"↩️  Changed during run:     {stats['url_changed']}")
+
+        if args.dry_run:
+            return
 
         # Check if any /uploads/ paths remain
-        cur.execute(
-            "SELECT COUNT(*) FROM tb_member_profile_t WHERE profile_image_url LIKE '/uploads/%'"
-        )
-        remaining = cur.fetchone()[0]
+        cur = conn.cursor()
+        try:
+            cur.execute(
+                "SELECT COUNT(*) FROM tb_member_profile_t WHERE profile_image_url LIKE '/uploads/%'"
+            )
+            remaining = cur.fetchone()[0]
+        finally:
+            cur.close()
+        conn.rollback()
 
         print("\n" + "=" * 60)
         if remaining == 0:
             print("✅ SUCCESS: No /uploads/ paths remaining in database!")
         else:
             print(f"⚠️  WARNING: {remaining} /uploads/ paths still remain")
-            print("   (These may be files that could not be migrated)")
+            print("   (These may be files that could not be migrated; re-run to retry)")
 
     except Exception as e:
         print(f"\n❌ Migration script failed: {e}")
@@ -157,14 +123,18 @@ def main():
         sys.exit(1)
 
     finally:
-        cur.close()
         if conn:
             release_member_db_connection(conn)
 
 
 if __name__ == '__main__':
+    args = parse_args()
+
     # Verify environment variables
-    required_env = ['AWS_BUCKET_NAME', 'AWS_ACCESS_KEY_ID', 'AWS_SECRET_ACCESS_KEY', 'CLOUDFRONT_DOMAIN']
+    if os.environ.get('STORAGE_BACKEND', 's3').strip().lower() == 's3' and not args.dry_run:
+        required_env = ['AWS_BUCKET_NAME', 'AWS_ACCESS_KEY_ID', 'AWS_SECRET_ACCESS_KEY', 'CLOUDFRONT_DOMAIN']
+    else:
+        required_env = ['CLOUDFRONT_DOMAIN'] if not args.dry_run else []
     missing = [k for k in required_env if not os.environ.get(k)]
 
     if missing:
@@ -174,9 +144,10 @@ if __name__ == '__main__':
             print(f"  {k}=...")
         sys.exit(1)
 
-    print("Starting migration from /uploads to S3...")
+    print("Starting migration from /uploads to S3..." if not args.dry_run else "Dry run: checking /uploads images...")
     print(f"S3 Bucket: {os.environ.get('AWS_BUCKET_NAME')}")
     print(f"CDN Domain: {os.environ.get('CLOUDFRONT_DOMAIN')}")
+    print(f"Workers: {args.workers}, rate: {args.rate or 'unlimited'}/s, batch: {args.batch_size}")
     print()
 
-    main()
+    main(args)
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Apply versioned schema migrations (agent/migrations/<db>/NNNN_name.sql).
+
+This script:
+1. Creates schema_migrations in each target DB if missing
+2. Applies pending migrations in version order inside one transaction
+3. Records each applied version (safe to re-run; already-applied versions are skipped)
+
+The API server also runs this at startup unless SCHEMA_MIGRATE_ON_STARTUP=false.
+
+Usage:
+    python scripts/migrate_schema.py
+    python scripts/migrate_schema.py --db member --dry-run
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add backend directory to Python path
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.schema_migrations import DATABASES, migrate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply versioned schema migrations")
+    parser.add_argument("--db", action="append", choices=sorted(DATABASES), help="대상 DB (기본: 전체)")
+    parser.add_argument("--dry-run", action="store_true", help="적용하지 않고 대기 중인 버전만 출력")
+    args = parser.parse_args()
+
+    applied = migrate(args.db, dry_run=args.dry_run)
+    for name, versions in applied.items():
+        label = "pending" if args.dry_run else "applied"
+        print(f"{name}: {len(versions)} {label} {versions}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Train the local intent router classifier (offline, CPU only).
+
+This script:
+1. Reads labeled queries from agent/data/intent_seed.jsonl
+2. Masks brand/perfume/note/accord names with the lexicon gazetteer
+3. Trains a char n-gram softmax regression in pure Python
+4. Writes weights to agent/data/intent_model.json (or --output)
+
+The DB gazetteer is NOT used here so training is reproducible offline;
+at runtime DB names are masked the same way as lexicon names.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add backend directory to Python path
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.intent_router import (
+    DATA_DIR,
+    SEED_PATH,
+    build_gazetteer,
+    extract_features,
+    load_seed_examples,
+    train_linear_classifier,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the local intent router")
+    parser.add_argument("--seed-file", type=Path, default=SEED_PATH)
+    parser.add_argument("--output", type=Path, default=DATA_DIR / "intent_model.json")
+    parser.add_argument("--epochs", type=int, default=40)
+    parser.add_argument("--learning-rate", type=float, default=0.5)
+    parser.add_argument("--l2", type=float, default=1e-4)
+    args = parser.parse_args()
+
+    gazetteer = build_gazetteer(include_db=False)
+    examples = load_seed_examples(args.seed_file)
+    samples = [
+        (extract_features(query, gazetteer.find(query)), label)
+        for query, label in examples
+    ]
+
+    classifier = train_linear_classifier(
+        samples, epochs=args.epochs, learning_rate=args.learning_rate, l2=args.l2
+    )
+
+    correct = 0
+    for features, label in samples:
+        probs = classifier.predict_proba(features)
+        correct += max(probs, key=probs.get) == label
+
+    classifier.save(args.output)
+
+    print("=" * 60)
+    print("Intent router training report")
+    print("=" * 60)
+    print(f"Examples:         {len(samples)}")
+    print(f"Labels:           {', '.join(classifier.labels)}")
+    print(f"Features:         {len(classifier.to_dict()['weights'])}")
+    print(f"Train accuracy:   {correct / len(samples):.3f}")
+    print(f"Saved model:      {args.output}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+/chat 입장 제어 테스트
+
+- 등급별/전체 동시 실행 수 제한과 FIFO 대기열
+- 대기열 초과·대기 시간 초과 시 즉시 거절 (503 + Retry-After)
+- 등급 간 예산 격리, 대기 중 취소 정리
+- 5배 과부하에서도 입장한 요청의 지연이 (작업 시간 + 최대 대기)로 제한되는지 (가짜 그래프)
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.admission import (  # noqa: E402
+    AdmissionController,
+    AdmissionRejected,
+    AdmittedStreamingResponse,
+    TierBudget,
+    admission_tier,
+    parse_budgets,
+)
+from agent.metrics import metrics  # noqa: E402
+
+
+def _controller(global_limit=10, max_wait=0.2, **budgets):
+    budgets = budgets or {"member": (2, 2)}
+    return AdmissionController(
+        {tier: TierBudget(*limits) for tier, limits in budgets.items()},
+        global_limit=global_limit,
+        max_wait=max_wait,
+        retry_after=3,
+    )
+
+
+def test_parse_budgets_and_tiers():
+    assert parse_budgets("member:8:16, guest:3:6") == {
+        "member": TierBudget(8, 16),
+        "guest": TierBudget(3, 6),
+    }
+    assert admission_tier(None, "EXPERT") == "guest"
+    assert admission_tier(7, "BEGINNER") == "member"
+    assert admission_tier(7, "expert") == "expert"
+
+
+@pytest.mark.asyncio
+async def test_waiters_are_admitted_in_fifo_order_on_release():
+    controller = _controller(max_wait=1.0, member=(1, 3))
+    first = await controller.acquire("member")
+    order = []
+
+    async def wait(name):
+        ticket = await controller.acquire("member")
+        order.append(name)
+        return ticket
+
+    waiters = [asyncio.create_task(wait(name)) for name in "abc"]
+    await asyncio.sleep(0)
+    assert controller.queued("member") == 3
+
+    first.release()
+    first.release()  # 두 번 반납해도 한 자리만 돌려줌
+    ticket = await waiters[0]
+    assert controller.running("member") == 1
+    ticket.release()
+    (await waiters[1]).release()
+    (await waiters[2]).release()
+    assert order == ["a", "b", "c"]
+    assert controller.running_total == 0
+
+
+@pytest.mark.asyncio
+async def test_queue_full_and_timeout_rejections():
+    metrics.reset()
+    controller = _controller(max_wait=0.05, member=(1, 1))
+    held = await controller.acquire("member")
+
+    waiter = asyncio.create_task(controller.acquire("member"))
+    await asyncio.sleep(0)
+    with pytest.raises(AdmissionRejected) as full:
+        await controller.acquire("member")
+    assert full.value.reason == "queue_full"
+
+    with pytest.raises(AdmissionRejected) as timed_out:
+        await waiter
+    assert timed_out.value.reason == "timeout"
+    assert controller.queued("member") == 0
+
+    error = full.value.to_http()
+    assert error.status_code == 503
+    assert error.headers["Retry-After"] == "3"
+    counters = metrics.snapshot()["counters"]
+    assert counters["chat_admission_rejected_total{reason=queue_full,tier=member}"] == 1
+    assert counters["chat_admission_rejected_total{reason=timeout,tier=member}"] == 1
+    held.release()
+
+
+@pytest.mark.asyncio
+async def test_tiers_do_not_share_budgets_but_share_global_limit():
+    controller = _controller(global_limit=3, max_wait=0.05, guest=(1, 0), member=(3, 2))
+    await controller.acquire("guest")
+    with pytest.raises(AdmissionRejected):
+        await controller.acquire("guest")
+
+    # 게스트가 막혀도 회원은 입장 가능 (단, 전체 한도 3 안에서)
+    await controller.acquire("member")
+    await controller.acquire("member")
+    with pytest.raises(AdmissionRejected) as rejected:
+        await controller.acquire("member")
+    assert rejected.value.reason == "timeout"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_queue():
+    controller = _controller(max_wait=5, member=(1, 2))
+    held = await controller.acquire("member")
+    waiter = asyncio.create_task(controller.acquire("member"))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert controller.queued("member") == 0
+    held.release()
+    assert controller.running_total == 0
+
+
+@pytest.mark.asyncio
+async def test_http_rejection_and_ticket_release_after_stream():
+    controller = _controller(max_wait=0.01, member=(1, 0))
+    app = FastAPI()
+
+    @app.post("/chat")
+    async def chat():
+        try:
+            ticket = await controller.acquire("member")
+        except AdmissionRejected as e:
+            raise e.to_http()
+
+        async def body():
+            yield "data: {}\n\n"
+
+        return AdmittedStreamingResponse(body(), media_type="text/event-stream", ticket=ticket)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        held = await controller.acquire("member")
+        rejected = await client.post("/chat")
+        assert rejected.status_code == 503
+        assert rejected.headers["retry-after"] == "3"
+        held.release()
+
+        ok = await client.post("/chat")
+        assert ok.status_code == 200
+    assert controller.running_total == 0
+
+
+class FakeGraph:
+    """DB 풀(capacity)을 잡고 service_time 동안 실행되는 가짜 그래프"""
+
+    def __init__(self, capacity, service_time):
+        self.pool = asyncio.Semaphore(capacity)
+        self.service_time = service_time
+        self.in_use = self.peak = 0
+
+    async def run(self):
+        async with self.pool:
+            self.in_use += 1
+            self.peak = max(self.peak, self.in_use)
+            await asyncio.sleep(self.service_time)
+            self.in_use -= 1
+
+
+async def _offer_load(graph, controller, clients, requests_per_client):
+    admitted, rejected = [], []
+
+    async def client():
+        for _ in range(requests_per_client):
+            started = time.perf_counter()
+            if controller is None:
+                await graph.run()
+                admitted.append(time.perf_counter() - started)
+                continue
+            try:
+                ticket = await controller.acquire("member")
+            except AdmissionRejected:
+                rejected.append(time.perf_counter() - started)
+                await asyncio.sleep(0.01)
+                continue
+            try:
+                await graph.run()
+            finally:
+                ticket.release()
+            admitted.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(client() for _ in range(clients)))
+    return admitted, rejected
+
+
+@pytest.mark.asyncio
+async def test_latency_stays_bounded_under_5x_overload():
+    capacity, service_time, max_wait = 4, 0.05, 0.1
+    clients = capacity * 5
+
+    unbounded, _ = await _offer_load(FakeGraph(capacity, service_time), None, clients, 3)
+
+    graph = FakeGraph(capacity, service_time)
+    controller = _controller(global_limit=capacity, max_wait=max_wait, member=(capacity, capacity))
+    admitted, rejected = await _offer_load(graph, controller, clients, 3)
+
+    bound = service_time + max_wait + 0.1
+    assert rejected, "overload should shed some requests"
+    assert max(admitted) <= bound
+    assert max(rejected) <= max_wait + 0.1
+    # 제어가 없으면 대기 시간이 과부하 배수만큼 늘어남
+    assert max(unbounded) > bound
+    assert graph.peak <= capacity
@@ -0,0 +1,202 @@
+"""
+내 향수 일괄 등록/수정/삭제 API 테스트
+
+- N건을 한 트랜잭션(쿼리 1번, 커밋 1번)으로 처리하고 항목별 결과를 돌려주는지
+- unnest 기반 upsert: 새 항목은 created, 기존 항목은 updated, 요청 안 중복은 뒤 항목이 반영
+- 잘못된 항목은 invalid로 건너뛰고 나머지는 반영, DB 오류 시 전부 롤백
+- 최대 건수 초과/다른 회원 경로는 거절
+"""
+import importlib
+import sys
+import types
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.auth import RequestIdentity  # noqa: E402
+
+MEMBER_ID = 7
+
+
+class FakeArchiveDB:
+    """tb_member_my_perfume_t만 흉내 (일괄 SQL 3종을 파라미터 배열로 해석)"""
+
+    def __init__(self):
+        self.rows = {}
+        self.executes = 0
+        self.commits = 0
+        self.rollbacks = 0
+        self.fail = False
+        self.released = 0
+
+    def cursor(self, cursor_factory=None):
+        return FakeArchiveCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class FakeArchiveCursor:
+    def __init__(self, db):
+        self.db = db
+        self.result = []
+
+    def execute(self, sql, params):
+        db = self.db
+        db.executes += 1
+        if db.fail:
+            raise RuntimeError("deadlock detected")
+        member_id = params["member_id"]
+        if "unnest" in sql and sql.lstrip().startswith("INSERT"):
+            self.result = []
+            for pid, name, status, pref in zip(params["ids"], params["names"], params["statuses"], params["preferences"]):
+                inserted = (member_id, pid) not in db.rows
+                db.rows[(member_id, pid)] = {"perfume_name": name, "register_status": status, "preference": pref}
+                self.result.append({"perfume_id": pid, "inserted": inserted})
+        elif "unnest" in sql and sql.lstrip().startswith("UPDATE"):
+            self.result = []
+            for pid, status, pref in zip(params["ids"], params["statuses"], params["preferences"]):
+                row = db.rows.get((member_id, pid))
+                if row is not None:
+                    row["register_status"] = status
+                    row["preference"] = pref or row["preference"]
+                    self.result.append({"perfume_id": pid})
+        elif sql.lstrip().startswith("DELETE") and "ANY" in sql:
+            self.result = [
+                {"perfume_id": pid} for pid in params["ids"] if db.rows.pop((member_id, pid), None) is not None
+            ]
+        else:
+            raise AssertionError(f"unexpected SQL: {sql}")
+
+    def fetchall(self):
+        return self.result
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def client(monkeypatch):
+    db = FakeArchiveDB()
+    invalidated = []
+    fake_db = types.ModuleType("agent.database")
+    fake_db.get_recom_db_connection = lambda: db
+    fake_db.get_db_connection = lambda: db
+
+    def release(conn):
+        db.released += 1
+
+    fake_db.release_recom_db_connection = release
+    fake_db.release_db_connection = release
+    monkeypatch.setitem(sys.modules, "agent.database", fake_db)
+    for name in ("agent.archive_db", "routers.archive"):
+        sys.modules.pop(name, None)
+    archive = importlib.import_module("routers.archive")
+    archive_db = importlib.import_module("agent.archive_db")
+    monkeypatch.setattr(archive_db, "invalidate_personalization", invalidated.append)
+
+    app = FastAPI()
+    app.include_router(archive.router)
+    app.dependency_overrides[archive.get_identity] = lambda: RequestIdentity(
+        user_id=MEMBER_ID, role="USER", user_mode="BEGINNER"
+    )
+    yield TestClient(app), db, invalidated, archive_db
+    for name in ("agent.archive_db", "routers.archive"):
+        sys.modules.pop(name, None)
+
+
+def item(pid, status="HAVE", preference="GOOD"):
+    return {"perfume_id": pid, "perfume_name": f"Perfume {pid}", "register_status": status, "preference": preference}
+
+
+def test_bulk_add_upserts_in_one_transaction(client):
+    http, db, invalidated, _ = client
+    db.rows[(MEMBER_ID, 2)] = {"perfume_name": "Perfume 2", "register_status": "HAD", "preference": "BAD"}
+
+    items = [item(i) for i in range(1, 501)]
+    response = http.post(f"/users/{MEMBER_ID}/perfumes/bulk", json={"items": items})
+    assert response.status_code == 200, response.text
+    body = response.json()
+
+    assert db.executes == 1 and db.commits == 1 and db.released == 1
+    assert body["summary"] == {"created": 499, "updated": 1}
+    assert body["results"][1] == {"perfume_id": 2, "result": "updated"}
+    assert db.rows[(MEMBER_ID, 2)]["register_status"] == "HAVE"
+    assert len(db.rows) == 500
+    assert invalidated == [MEMBER_ID]
+
+
+def test_invalid_and_duplicate_items_are_reported_per_item(client):
+    http, db, _, _ = client
+    items = [
+        item(1, status="HAVE"),
+        item(2, status="OWNED"),
+        item(1, status="HAD", preference="neutral"),
+        item(3, preference="LOVE"),
+        item(4, status="recommended", preference=None),
+    ]
+    body = http.post(f"/users/{MEMBER_ID}/perfumes/bulk", json={"items": items}).json()
+
+    assert [r["result"] for r in body["results"]] == ["duplicate", "invalid", "created", "invalid", "created"]
+    assert "OWNED" in body["results"][1]["message"]
+    assert db.rows[(MEMBER_ID, 1)] == {"perfume_name": "Perfume 1", "register_status": "HAD", "preference": "NEUTRAL"}
+    assert db.rows[(MEMBER_ID, 4)]["preference"] == "NEUTRAL"
+    assert db.executes == 1
+
+
+def test_bulk_update_and_delete_report_missing_rows(client):
+    http, db, invalidated, _ = client
+    http.post(f"/users/{MEMBER_ID}/perfumes/bulk", json={"items": [item(i) for i in (1, 2, 3)]})
+    db.executes = db.commits = 0
+
+    body = http.patch(
+        f"/users/{MEMBER_ID}/perfumes/bulk",
+        json={"items": [
+            {"perfume_id": 1, "register_status": "HAD"},
+            {"perfume_id": 9, "register_status": "HAD"},
+            {"perfume_id": 2, "register_status": "HAVE", "preference": "BAD"},
+        ]},
+    ).json()
+    assert [r["result"] for r in body["results"]] == ["updated", "not_found", "updated"]
+    assert db.rows[(MEMBER_ID, 1)] == {"perfume_name": "Perfume 1", "register_status": "HAD", "preference": "GOOD"}
+    assert db.rows[(MEMBER_ID, 2)]["preference"] == "BAD"
+
+    body = http.post(f"/users/{MEMBER_ID}/perfumes/bulk-delete", json={"perfume_ids": [3, 8, 3, 1]}).json()
+    assert [r["result"] for r in body["results"]] == ["deleted", "not_found", "duplicate", "deleted"]
+    assert body["summary"] == {"deleted": 2, "not_found": 1, "duplicate": 1}
+    assert list(db.rows) == [(MEMBER_ID, 2)]
+    assert db.executes == 2 and db.commits == 2
+    assert invalidated == [MEMBER_ID] * 3
+
+
+def test_database_error_rolls_back_everything(client):
+    http, db, invalidated, _ = client
+    db.fail = True
+    response = http.post(f"/users/{MEMBER_ID}/perfumes/bulk", json={"items": [item(1), item(2, status="X")]})
+
+    assert response.status_code == 400
+    detail = response.json()["detail"]
+    assert "deadlock" in detail["message"]
+    assert [r["result"] for r in detail["results"]] == ["error", "invalid"]
+    assert db.rollbacks == 1 and db.commits == 0 and db.released == 1
+    assert db.rows == {} and invalidated == []
+
+
+def test_limits_and_member_match(client):
+    http, db, _, archive_db = client
+    too_many = [item(i) for i in range(archive_db.ARCHIVE_BULK_MAX_ITEMS + 1)]
+    assert http.post(f"/users/{MEMBER_ID}/perfumes/bulk", json={"items": too_many}).status_code == 422
+    assert http.post(f"/users/{MEMBER_ID}/perfumes/bulk", json={"items": []}).status_code == 422
+    assert http.post(f"/users/{MEMBER_ID + 1}/perfumes/bulk", json={"items": [item(1)]}).status_code == 403
+    # 단건 PATCH 경로와 충돌하지 않음
+    assert http.patch(f"/users/{MEMBER_ID}/perfumes/bulk", json={"items": [item(1)]}).status_code == 200
+    assert db.executes == 1
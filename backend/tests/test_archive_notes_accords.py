@@ -0,0 +1,56 @@
+"""
+get_perfume_notes_and_accords 집합 기반 조회 테스트
+
+- 노트/어코드를 한 번의 쿼리(array_agg DISTINCT)로 가져오는지
+- 순서를 유지하며 중복/빈 값을 제거하고, 행이 없는 향수도 빈 목록으로 채우는지
+"""
+from unittest.mock import MagicMock, patch
+
+from backend.agent import archive_db
+
+
+def _connection(rows):
+    cursor = MagicMock()
+    cursor.fetchall.return_value = rows
+    conn = MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cursor
+    return conn, cursor
+
+
+def test_single_grouped_query_for_notes_and_accords():
+    rows = [
+        {"perfume_id": 1, "notes": ["Rose", "Musk", "Rose", None, ""], "accords": ["Floral", "Floral"]},
+        {"perfume_id": 2, "notes": None, "accords": ["Woody"]},
+        {"perfume_id": 99, "notes": ["Iris"], "accords": []},  # 요청하지 않은 ID는 무시
+    ]
+    conn, cursor = _connection(rows)
+    with patch.object(archive_db, "get_db_connection", return_value=conn), \
+         patch.object(archive_db, "release_db_connection") as release:
+        result = archive_db.get_perfume_notes_and_accords([1, 2, 3])
+
+    assert cursor.execute.call_count == 1
+    sql, params = cursor.execute.call_args.args
+    assert "array_agg(DISTINCT a.accord)" in sql and "array_agg(DISTINCT n.note)" in sql
+    assert params == {"ids": [1, 2, 3]}
+    release.assert_called_once_with(conn)
+
+    assert result == {
+        1: {"notes": ["Rose", "Musk"], "accords": ["Floral"]},
+        2: {"notes": [], "accords": ["Woody"]},
+        3: {"notes": [], "accords": []},
+    }
+
+
+def test_query_error_returns_empty_and_releases_connection():
+    conn, cursor = _connection([])
+    cursor.execute.side_effect = RuntimeError("connection reset")
+    with patch.object(archive_db, "get_db_connection", return_value=conn), \
+         patch.object(archive_db, "release_db_connection") as release:
+        assert archive_db.get_perfume_notes_and_accords([1]) == {}
+    release.assert_called_once_with(conn)
+
+
+def test_empty_ids_skip_database():
+    with patch.object(archive_db, "get_db_connection") as get_conn:
+        assert archive_db.get_perfume_notes_and_accords([]) == {}
+    get_conn.assert_not_called()
@@ -110,3 +110,26 @@ def test_get_rooms_member_zero(monkeypatch):
     data = response.json()
     assert "rooms" in data
     assert data["rooms"] == []
+
+
+def test_metrics_requires_admin_or_scrape_token(monkeypatch):
+    """Test: GET /metrics is closed to guests, open to admins and the scrape token."""
+    from agent.auth import RequestIdentity, get_identity
+
+    client = make_client(monkeypatch)
+    monkeypatch.setenv("METRICS_SCRAPE_TOKEN", "scrape-secret")
+
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"X-Metrics-Token": "wrong"}).status_code == 401
+    assert client.get("/metrics", headers={"X-Metrics-Token": "scrape-secret"}).status_code == 200
+
+    app = client.app
+    app.dependency_overrides[get_identity] = lambda: RequestIdentity(user_id=3, role="USER", user_mode="BEGINNER")
+    try:
+        assert client.get("/metrics").status_code == 403
+        app.dependency_overrides[get_identity] = lambda: RequestIdentity(user_id=1, role="ADMIN", user_mode="BEGINNER")
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert isinstance(response.json(), dict)
+    finally:
+        app.dependency_overrides.pop(get_identity, None)
@@ -0,0 +1,62 @@
+"""
+/chat 부하 생성기 스모크 테스트
+
+가짜 LLM/DB로 앱 전체를 띄우는 벤치마크가 네트워크 없이 끝까지 돌고,
+시나리오별 TTFT/프레임 간격/완료 시간과 루프 지연을 JSON으로 남기는지 확인합니다.
+(agent.database를 교체하므로 별도 프로세스에서 실행)
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from benchmarks.chat_load.scenarios import parse_mix, schedule  # noqa: E402
+
+
+def test_mix_is_normalized_and_schedule_is_seeded():
+    mix = parse_mix("reco=2,info=1,followup=1")
+    assert mix == {"reco": 0.5, "info": 0.25, "followup": 0.25}
+    assert schedule(mix, 20, seed=3) == schedule(mix, 20, seed=3)
+    with pytest.raises(ValueError):
+        parse_mix("checkout=1")
+
+
+def test_load_generator_runs_offline_and_writes_json(tmp_path):
+    out = tmp_path / "load.json"
+    env = {**os.environ, "OPENAI_API_KEY": "sk-bench", "OPENAI_BASE_URL": "http://127.0.0.1:9/v1"}
+    completed = subprocess.run(
+        [
+            sys.executable, "-W", "ignore", "-m", "benchmarks.chat_load",
+            "--concurrency", "3",
+            "--sessions", "6",
+            "--mix", "reco=1,info=1,followup=1",
+            "--latency-scale", "0.02",
+            "--json", str(out),
+        ],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=300,
+    )
+    assert completed.returncode == 0, completed.stderr[-2000:]
+
+    result = json.loads(out.read_text(encoding="utf-8"))
+    overall = result["overall"]
+    assert overall["turns"] == 6
+    assert overall["error_turns"] == 0 and overall["no_answer_turns"] == 0
+    assert overall["status"] == {"200": 6}
+    for metric in ("ttft", "inter_token_gap", "completion"):
+        assert overall[metric]["p50"] is not None
+        assert overall[metric]["p50"] <= overall[metric]["p95"] <= overall[metric]["p99"]
+    assert overall["ttft"]["p50"] <= overall["completion"]["p50"]
+    assert result["loop_lag"]["count"] > 0
+    assert result["fake_openai"]["calls"]["writer"] > 0
+    assert set(result["scenarios"]) <= {"reco", "info", "followup"}
@@ -0,0 +1,274 @@
+"""
+OpenAI 호출 서킷 브레이커 테스트 (가짜 시계로 결정적으로 진행)
+
+- 업스트림 오류가 연속 임계치만큼 나면 OPEN, 이후 호출은 바로 거절되는지
+- open_seconds 후 HALF_OPEN에서 probe 1개만 허용하고 결과에 따라 CLOSED/OPEN으로 가는지
+- 파싱 오류 등 업스트림 장애가 아닌 오류는 세지 않는지, 취소된 probe가 자리를 돌려주는지
+- 브레이커가 열리면 라벨/정보 노드가 LLM을 부르지 않고 기존 로컬 폴백을 바로 쓰는지
+"""
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.circuit_breaker import (  # noqa: E402
+    BreakerPolicy,
+    CircuitBreakerRegistry,
+    CircuitOpenError,
+    CircuitState,
+)
+from agent.denylist import UserFriendlyStrategyLabels  # noqa: E402
+from agent.metrics import metrics  # noqa: E402
+
+
+class VirtualClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _registry(clock, **overrides):
+    policy = BreakerPolicy(**{"failure_threshold": 3, "open_seconds": 30.0, **overrides})
+    return CircuitBreakerRegistry(policy, clock=clock)
+
+
+class FlakyUpstream:
+    """호출마다 가상 시계를 진행시키고, healthy가 아니면 타임아웃으로 실패하는 가짜 API"""
+
+    def __init__(self, clock, timeout=10.0):
+        self.clock = clock
+        self.timeout = timeout
+        self.healthy = True
+        self.calls = 0
+
+    async def call(self):
+        self.calls += 1
+        if self.healthy:
+            self.clock.now += 0.2
+            return "ok"
+        self.clock.now += self.timeout
+        raise asyncio.TimeoutError()
+
+
+async def _call(breaker, upstream):
+    try:
+        with breaker.guard():
+            return await upstream.call()
+    except CircuitOpenError:
+        return "fallback"
+    except asyncio.TimeoutError:
+        return "timeout"
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_and_callers_fall_back_immediately():
+    metrics.reset()
+    clock = VirtualClock()
+    breaker = _registry(clock).get("gpt-4o-mini", "brand_match")
+    upstream = FlakyUpstream(clock)
+
+    upstream.healthy = False
+    results = [await _call(breaker, upstream) for _ in range(10)]
+
+    assert results == ["timeout"] * 3 + ["fallback"] * 7
+    assert upstream.calls == 3
+    # 장애 중 10번 호출에 든 시간 = 타임아웃 3번뿐
+    assert clock.now == 30.0
+    assert breaker.state is CircuitState.OPEN
+    counters = metrics.snapshot()["counters"]
+    assert counters["circuit_breaker_rejected_total{breaker=gpt-4o-mini:brand_match}"] == 7
+    assert counters["circuit_breaker_transitions_total{breaker=gpt-4o-mini:brand_match,to=open}"] == 1
+
+
+@pytest.mark.asyncio
+async def test_half_open_probe_closes_or_reopens():
+    clock = VirtualClock()
+    breaker = _registry(clock).get("text-embedding-3-small", "embedding")
+    upstream = FlakyUpstream(clock)
+    upstream.healthy = False
+    for _ in range(3):
+        await _call(breaker, upstream)
+    opened_at = clock.now
+
+    clock.now = opened_at + 29.9
+    assert breaker.is_open()
+    clock.now = opened_at + 30.0
+    assert breaker.state is CircuitState.HALF_OPEN
+
+    # 실패한 probe → 다시 OPEN (타이머 새로 시작)
+    assert await _call(breaker, upstream) == "timeout"
+    assert breaker.state is CircuitState.OPEN
+    clock.now += 29.0
+    assert await _call(breaker, upstream) == "fallback"
+
+    # 회복 후 probe 성공 → CLOSED
+    clock.now += 1.0
+    upstream.healthy = True
+    assert await _call(breaker, upstream) == "ok"
+    assert breaker.state is CircuitState.CLOSED
+    assert [await _call(breaker, upstream) for _ in range(3)] == ["ok"] * 3
+
+
+@pytest.mark.asyncio
+async def test_half_open_allows_single_probe_and_cancel_releases_it():
+    clock = VirtualClock()
+    breaker = _registry(clock, failure_threshold=1).get("gpt-4.1", "info_writer")
+    breaker.record_failure()
+    clock.now += 30.0
+
+    gate = asyncio.Event()
+
+    async def slow_probe():
+        with breaker.guard():
+            await gate.wait()
+
+    probe = asyncio.create_task(slow_probe())
+    await asyncio.sleep(0)
+    assert breaker.is_open()
+    with pytest.raises(CircuitOpenError):
+        with breaker.guard():
+            pass
+
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+    assert breaker.state is CircuitState.HALF_OPEN
+    assert not breaker.is_open()
+
+
+def test_non_upstream_errors_do_not_count_and_reset_streak():
+    clock = VirtualClock()
+    breaker = _registry(clock).get("gpt-4.1", "strategy_label")
+
+    for _ in range(2):
+        breaker.record_failure()
+    with pytest.raises(ValueError):
+        with breaker.guard():
+            raise ValueError("bad json")
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state is CircuitState.CLOSED
+    breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN
+
+
+def test_registry_keys_and_disabled_mode():
+    clock = VirtualClock()
+    registry = _registry(clock, failure_threshold=1)
+    assert registry.get("gpt-4.1", "info_writer") is registry.get("gpt-4.1", "info_writer")
+    registry.get("gpt-4.1", "info_writer").record_failure()
+    assert not registry.get("gpt-4.1", "info_router").is_open()
+    assert registry.snapshot()["gpt-4.1:info_writer"]["state"] == "open"
+
+    disabled = CircuitBreakerRegistry(BreakerPolicy(failure_threshold=1), clock=clock, enabled=False)
+    breaker = disabled.get("gpt-4.1", "info_writer")
+    breaker.record_failure()
+    assert not breaker.is_open() and breaker.allow()
+
+
+
+class YieldingClock(VirtualClock):
+    """읽을 때마다 GIL을 놓아 상태 확인과 전이 사이에 다른 스레드가 끼어들게 하는 시계"""
+
+    def __call__(self):
+        time.sleep(0.0005)
+        return self.now
+
+
+def _run_threads(target, count=16):
+    barrier = threading.Barrier(count)
+    results = []
+
+    def worker():
+        barrier.wait()
+        results.append(target())
+
+    threads = [threading.Thread(target=worker) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_threads_share_state_safely():
+    clock = YieldingClock()
+    registry = _registry(clock, failure_threshold=5)
+
+    # get-or-create: 동시에 처음 요청해도 브레이커는 하나
+    breakers = _run_threads(lambda: registry.get("text-embedding-3-small", "embedding"))
+    assert len({id(b) for b in breakers}) == 1
+    breaker = breakers[0]
+
+    # 실패 카운트가 유실되지 않고 정확히 한 번만 OPEN으로 전이
+    metrics.reset()
+    _run_threads(breaker.record_failure, count=5)
+    assert breaker.state is CircuitState.OPEN
+    assert metrics.counter(
+        "circuit_breaker_transitions_total", breaker=breaker.name, to="open"
+    ) == 1
+
+    # HALF_OPEN에서는 동시에 들어와도 probe는 half_open_max_calls개만
+    clock.now += 30.0
+    allowed = _run_threads(breaker.allow)
+    assert allowed.count(True) == 1
+    assert metrics.counter(
+        "circuit_breaker_transitions_total", breaker=breaker.name, to="half_open"
+    ) == 1
+
+
+def _open_registry(model, operation):
+    registry = _registry(VirtualClock(), failure_threshold=1)
+    registry.get(model, operation).record_failure()
+    return registry
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_makes_labeler_use_safe_labels_without_llm_call():
+    from agent import strategy_labeler
+    from agent.strategy_labeler import BatchStrategyLabeler
+
+    llm = MagicMock()
+    llm.with_structured_output.return_value.ainvoke = AsyncMock()
+    with patch.object(strategy_labeler, "CIRCUIT_BREAKERS", _open_registry("default", "strategy_label")):
+        labeler = BatchStrategyLabeler(llm, {}, expected=2)
+        labels = await labeler.generate_labels({1: "a", 2: "b"})
+
+    assert set(labels.values()) <= set(UserFriendlyStrategyLabels.SAFE_LABELS)
+    assert labeler.llm_calls == 0
+    llm.with_structured_output.return_value.ainvoke.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_short_circuits_graph_label_and_info_writer():
+    from backend.agent import graph, graph_info
+
+    smart = MagicMock()
+    smart.ainvoke = AsyncMock()
+    searcher = graph.RecoSearcher.__new__(graph.RecoSearcher)
+    searcher.user_prefs = {}
+    with patch.object(graph, "SMART_LLM", smart), \
+         patch.object(graph, "CIRCUIT_BREAKERS", _open_registry("default", "strategy_label")):
+        label = await searcher.generate_user_label("reason")
+    assert label in UserFriendlyStrategyLabels.SAFE_LABELS
+    smart.ainvoke.assert_not_awaited()
+
+    info_llm = MagicMock()
+    info_llm.ainvoke = AsyncMock()
+    with patch.object(graph_info, "INFO_LLM", info_llm), \
+         patch.object(graph_info, "CIRCUIT_BREAKERS", _open_registry("default", "info_writer")):
+        result = await graph_info.perfume_describer_node(
+            {"target_name": "Chanel No.5", "info_payload": '{"name": "No.5"}'}
+        )
+    assert result == {"info_status": "ERROR"}
+    info_llm.ainvoke.assert_not_awaited()
@@ -36,7 +36,7 @@ async def test_parallel_reco_contiguous_numbering():
     with patch("backend.agent.graph.SMART_LLM") as mock_smart, \
          patch("backend.agent.graph.SUPER_SMART_LLM") as mock_super, \
          patch("backend.agent.graph.advanced_perfume_search_tool") as mock_search, \
-         patch("backend.agent.graph.get_personalization_summary", return_value={}), \
+         patch("backend.agent.graph.aget_personalization_summary", new_callable=AsyncMock, return_value={}), \
          patch("backend.agent.graph.save_recommendation_log"):
              
         # 1. Mock SMART_LLM (Planner & Labeler)
@@ -130,7 +130,7 @@ async def test_parallel_reco_contiguous_numbering():
     with patch("backend.agent.graph.SMART_LLM") as mock_smart, \
          patch("backend.agent.graph.SUPER_SMART_LLM") as mock_super, \
          patch("backend.agent.graph.smart_search_with_retry_async", side_effect=side_effect_search) as mock_search, \
-         patch("backend.agent.graph.get_personalization_summary", return_value={}), \
+         patch("backend.agent.graph.aget_personalization_summary", new_callable=AsyncMock, return_value={}), \
          patch("backend.agent.graph.save_recommendation_log"):
              
         # Setup mocks
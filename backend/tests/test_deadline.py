@@ -0,0 +1,216 @@
+"""
+요청 마감 시간(deadline) 전파 테스트
+
+- 남은 예산만큼 타임아웃이 줄어들고, 마감 때문에 끊긴 호출만 DeadlineExceeded로 구분되는지
+- 시간이 부족하면 선택 단계(완화 검색, 리랭크 번역)를 건너뛰는지
+- state의 deadline_at이 노드 실행 동안 ContextVar로 전달되는지
+- 가짜 느린 검색/작성 모델로 parallel_reco_node가 예산 안에 응답을 끝내는지
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.deadline import (  # noqa: E402
+    Deadline,
+    DeadlineExceeded,
+    allow_optional_stage,
+    current_deadline,
+    deadline_scope,
+    new_request_deadline,
+    remaining_timeout,
+    with_state_deadline,
+    within_deadline,
+)
+from agent.metrics import metrics  # noqa: E402
+
+
+class VirtualClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_deadline_budget_arithmetic():
+    clock = VirtualClock()
+    deadline = Deadline.after(10, clock)
+    clock.now += 4
+    assert deadline.remaining() == 6
+    assert deadline.timeout(30) == 6
+    assert deadline.timeout(2) == 2
+    assert deadline.has_time_for(6) and not deadline.has_time_for(7)
+    assert deadline.reserve(5).remaining() == 1
+    clock.now += 7
+    assert deadline.expired() and deadline.remaining() == 0
+    assert new_request_deadline(0) is None
+
+
+def test_optional_stages_are_skipped_when_time_is_short():
+    metrics.reset()
+    clock = VirtualClock()
+    assert remaining_timeout(10) == 10  # 마감 없음: 기존 동작
+
+    with deadline_scope(Deadline.after(5, clock)):
+        assert remaining_timeout(10) == 5
+        assert allow_optional_stage("relaxation", 3)
+        assert not allow_optional_stage("rerank_translation", 8)
+    assert current_deadline() is None
+
+    counters = metrics.snapshot()["counters"]
+    assert counters["chat_deadline_skipped_total{stage=rerank_translation}"] == 1
+    assert "chat_deadline_skipped_total{stage=relaxation}" not in counters
+
+
+@pytest.mark.asyncio
+async def test_within_deadline_distinguishes_deadline_from_own_timeout():
+    with deadline_scope(Deadline.after(0.05)):
+        started = time.perf_counter()
+        with pytest.raises(DeadlineExceeded) as exceeded:
+            async with within_deadline("writer", default_timeout=10):
+                await asyncio.sleep(5)
+        assert exceeded.value.stage == "writer"
+        assert time.perf_counter() - started < 0.5
+
+        # 이미 지난 마감이면 시작하지도 않음
+        await asyncio.sleep(0.06)
+        with pytest.raises(DeadlineExceeded):
+            async with within_deadline("search"):
+                raise AssertionError("should not run")
+
+    with deadline_scope(Deadline.after(10)):
+        # 단계 자체 타임아웃이 더 짧으면 일반 TimeoutError
+        with pytest.raises(TimeoutError):
+            async with within_deadline("router", default_timeout=0.01):
+                await asyncio.sleep(5)
+        # 블록 안에서 난 업스트림 TimeoutError는 그대로 전달
+        with pytest.raises(asyncio.TimeoutError):
+            async with within_deadline("router"):
+                raise asyncio.TimeoutError()
+
+
+@pytest.mark.asyncio
+async def test_state_deadline_is_visible_to_tools_inside_node():
+    seen = []
+
+    async def tool():
+        seen.append(current_deadline())
+
+    @with_state_deadline
+    async def node(state):
+        await asyncio.gather(asyncio.create_task(tool()), tool())
+        return {}
+
+    at = time.time() + 30
+    await node({"deadline_at": at})
+    await node({})
+
+    assert [d.at for d in seen[:2]] == [at, at]
+    assert seen[2:] == [None, None]
+
+
+def _plan_llm():
+    from backend.agent.schemas import HardFilters, SearchStrategyPlan, StrategyFilters
+
+    class FakeStructured:
+        def __init__(self, schema):
+            self.schema = schema
+
+        async def ainvoke(self, messages, config=None):
+            if self.schema.__name__ == "StrategyLabelBatch":
+                return self.schema(labels=[])
+            priority = int(messages[-1].content.split("우선순위: ")[1].split("\n")[0])
+            return SearchStrategyPlan(
+                priority=priority,
+                strategy_name=f"S{priority}",
+                reason=f"reason {priority}",
+                hard_filters=HardFilters(gender="Unisex"),
+                strategy_filters=StrategyFilters(),
+                strategy_keyword=["k"],
+            )
+
+    smart = MagicMock()
+    smart.with_structured_output.side_effect = FakeStructured
+    return smart
+
+
+class SlowWriter:
+    """첫 토큰은 빨리 주지만 본문을 끝없이 느리게 생성하는 작성 모델"""
+
+    def __init__(self, fallback_delay=30.0):
+        self.fallback_delay = fallback_delay
+
+    async def astream(self, messages):
+        section = messages[-1].content.split("[섹션 번호]: ")[1].split("\n")[0]
+        yield MagicMock(content=f"## {section}. 향수\n")
+        while True:
+            await asyncio.sleep(0.05)
+            yield MagicMock(content="느린 본문 ")
+
+    async def ainvoke(self, messages):
+        await asyncio.sleep(self.fallback_delay)
+        return MagicMock(content="대안 안내")
+
+
+def _candidate(priority):
+    return {"id": 100 + priority, "name": f"P{priority}", "brand": f"B{priority}"}
+
+
+async def _run_node(graph, state, budget):
+    state = {"member_id": 0, "user_preferences": {"gender": "Unisex"}, "messages": [],
+             "recommended_count": 3, **state, "deadline_at": time.time() + budget}
+    started = time.perf_counter()
+    result = await graph.parallel_reco_node(state)
+    return result, time.perf_counter() - started
+
+
+@pytest.mark.asyncio
+async def test_parallel_reco_finishes_within_budget_when_search_hangs():
+    from backend.agent import graph
+
+    async def hanging_search(h, s, exclude_ids=None, query_text="", rank_mode="DEFAULT"):
+        await asyncio.sleep(30)
+
+    budget = 0.6
+    with patch.object(graph, "SMART_LLM", _plan_llm()), \
+         patch.object(graph, "SUPER_SMART_LLM", SlowWriter()), \
+         patch.object(graph, "WRITER_RESERVE_SECONDS", 0.2), \
+         patch.object(graph, "smart_search_with_retry_async", hanging_search), \
+         patch.object(graph, "save_recommendation_log"):
+        result, elapsed = await _run_node(graph, {}, budget)
+
+    assert elapsed < budget + 0.3
+    # 대안 안내 LLM도 느리므로 고정 문구로 마무리
+    assert result["messages"][-1].content == graph.DEADLINE_FALLBACK_MESSAGE
+    assert result["chat_outcome_status"] == "ERROR"
+
+
+@pytest.mark.asyncio
+async def test_parallel_reco_cuts_slow_writers_at_deadline():
+    from backend.agent import graph
+
+    async def fast_search(h, s, exclude_ids=None, query_text="", rank_mode="DEFAULT"):
+        priority = int(query_text.split()[-1])
+        return [_candidate(priority)], "Perfect Match"
+
+    budget = 0.8
+    with patch.object(graph, "SMART_LLM", _plan_llm()), \
+         patch.object(graph, "SUPER_SMART_LLM", SlowWriter()), \
+         patch.object(graph, "WRITER_RESERVE_SECONDS", 0.5), \
+         patch.object(graph, "smart_search_with_retry_async", fast_search), \
+         patch.object(graph, "save_recommendation_log"):
+        result, elapsed = await _run_node(graph, {}, budget)
+
+    assert elapsed < budget + 0.3
+    text = result["messages"][-1].content
+    # 마감까지 스트리밍된 섹션은 결과에 그대로 남음
+    assert "## 1. 향수" in text and "느린 본문" in text
+    assert result["chat_outcome_status"] == "OK"
@@ -0,0 +1,156 @@
+"""
+get_identity JWT 클레임 캐시 테스트
+
+- 같은 토큰은 서명 검증을 한 번만 하고, exp가 지나면 다시 검증(→ 401)
+- SECRET_KEY를 교체하면 이전 키로 서명된 토큰은 캐시에 있어도 통과하지 못함
+- 변조/만료/형식 오류 토큰은 캐시하지 않음
+"""
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from jose import jwt
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent import auth  # noqa: E402
+from agent.auth import IdentityCache, get_identity  # noqa: E402
+from agent.metrics import metrics  # noqa: E402
+
+
+def issue(secret, member_id=5, exp_in=600, **extra):
+    payload = {"sub": str(member_id), "role": "user", "user_mode": "expert", **extra}
+    if exp_in is not None:
+        payload["exp"] = int(time.time()) + exp_in
+    return jwt.encode(payload, secret, algorithm="HS256")
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("SECRET_KEY", "secret-v1")
+    monkeypatch.delenv("ALGORITHM", raising=False)
+    monkeypatch.delenv("AUTH_IDENTITY_CACHE_ENABLED", raising=False)
+    now = [time.time()]
+    cache = IdentityCache(max_entries=3, clock=lambda: now[0])
+    monkeypatch.setattr(auth, "IDENTITY_CACHE", cache)
+
+    decodes = []
+    real_decode = jwt.decode
+
+    def counting_decode(token, *args, **kwargs):
+        decodes.append(token)
+        return real_decode(token, *args, **kwargs)
+
+    monkeypatch.setattr(auth.jwt, "decode", counting_decode)
+    metrics.reset()
+
+    app = FastAPI()
+
+    @app.get("/whoami")
+    def whoami(identity=Depends(get_identity)):
+        return {"user_id": identity.user_id, "role": identity.role, "user_mode": identity.user_mode}
+
+    yield TestClient(app), cache, decodes, now
+
+
+def call(http, token):
+    return http.get("/whoami", headers={"Authorization": f"Bearer {token}"})
+
+
+def test_verified_claims_are_reused_until_exp(client):
+    http, cache, decodes, now = client
+    token = issue("secret-v1", exp_in=60)
+
+    for _ in range(5):
+        response = call(http, token)
+        assert response.json() == {"user_id": 5, "role": "USER", "user_mode": "EXPERT"}
+    assert len(decodes) == 1 and len(cache) == 1
+    assert metrics.counter("auth_identity_cache_total", result="hit") == 4
+
+    # 캐시 시계로 exp가 지나면 항목을 버리고 다시 검증 (jose는 실제 시계라 여기선 통과)
+    now[0] += 61
+    assert call(http, token).status_code == 200
+    assert len(decodes) == 2
+    assert metrics.counter("auth_identity_cache_total", result="expired") == 1
+    # 다시 검증했어도 이미 exp가 지난 클레임은 저장하지 않음
+    assert len(cache) == 0
+
+
+def test_secret_rotation_invalidates_cached_tokens(client, monkeypatch):
+    http, cache, decodes, _ = client
+    old_token = issue("secret-v1")
+    assert call(http, old_token).status_code == 200
+
+    monkeypatch.setenv("SECRET_KEY", "secret-v2")
+    assert call(http, old_token).status_code == 401
+    assert len(decodes) == 2
+
+    new_token = issue("secret-v2", member_id=9)
+    assert call(http, new_token).json()["user_id"] == 9
+    assert call(http, new_token).json()["user_id"] == 9
+    assert len(decodes) == 3
+    # 이전 버전 항목은 새 버전이 처음 저장될 때 비워짐
+    assert len(cache) == 1
+
+    # 알고리즘 변경도 다른 버전
+    monkeypatch.setenv("ALGORITHM", "HS512")
+    assert call(http, new_token).status_code == 401
+
+
+def test_tampered_and_invalid_tokens_are_never_cached(client):
+    http, cache, decodes, _ = client
+    token = issue("secret-v1")
+    header, payload, signature = token.split(".")
+    tampered_sig = f"{header}.{payload}.{signature[:-2]}{'AA' if signature[-2:] != 'AA' else 'BB'}"
+    forged = issue("not-the-secret")
+    expired = issue("secret-v1", exp_in=-5)
+
+    for bad in (tampered_sig, forged, expired, "not.a.jwt"):
+        for _ in range(2):
+            assert call(http, bad).status_code == 401
+    assert len(decodes) == 8 and len(cache) == 0
+
+    # 정상 토큰을 캐시한 뒤에도 페이로드를 바꾼 토큰은 별도 키라 다시 검증
+    assert call(http, token).status_code == 200
+    other_payload = issue("secret-v1", member_id=1).split(".")[1]
+    assert call(http, f"{header}.{other_payload}.{signature}").status_code == 401
+    assert len(cache) == 1
+
+
+def test_tokens_without_exp_are_verified_every_time(client):
+    http, cache, decodes, _ = client
+    token = issue("secret-v1", exp_in=None)
+    assert call(http, token).status_code == 200
+    assert call(http, token).status_code == 200
+    assert len(decodes) == 2 and len(cache) == 0
+
+
+def test_lru_bound_and_disable_flag(client, monkeypatch):
+    http, cache, decodes, _ = client
+    tokens = [issue("secret-v1", member_id=i) for i in range(1, 5)]
+    for token in tokens:
+        call(http, token)
+    assert len(cache) == 3
+    call(http, tokens[0])  # 가장 오래된 항목은 밀려남
+    assert len(decodes) == 5
+
+    monkeypatch.setenv("AUTH_IDENTITY_CACHE_ENABLED", "false")
+    call(http, tokens[3])
+    call(http, tokens[3])
+    assert len(decodes) == 7
+
+
+def test_cached_claims_are_copies():
+    cache = IdentityCache(clock=lambda: 100.0)
+    claims = {"sub": "1", "exp": 200}
+    assert cache.put("v1", "tok", claims)
+    cache.get("v1", "tok")["sub"] = "2"
+    claims["sub"] = "3"
+    assert cache.get("v1", "tok")["sub"] == "1"
+    assert cache.get("v2", "tok") is None
+    assert not cache.put("v1", "old", {"sub": "1", "exp": 100})
@@ -0,0 +1,144 @@
+"""
+Tests for the profile image worker pipeline (multi-size variants, decode limits, worker pool).
+"""
+
+import asyncio
+import io
+import sys
+from pathlib import Path
+
+import pytest
+from botocore.exceptions import ClientError
+from fastapi import HTTPException
+from PIL import Image
+
+# Add backend directory to Python path
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent import image_utils, storage_s3  # noqa: E402
+from agent.image_utils import (  # noqa: E402
+    ImageRejected,
+    _open_checked,
+    render_profile_variants,
+    render_profile_variants_async,
+)
+from agent.metrics import metrics  # noqa: E402
+
+
+def create_test_image_bytes(width: int, height: int, format: str = 'PNG') -> bytes:
+    """Helper: Create a test image as bytes."""
+    img = Image.new('RGB', (width, height), color=(0, 128, 255))
+    buf = io.BytesIO()
+    img.save(buf, format=format)
+    return buf.getvalue()
+
+
+@pytest.fixture
+def thread_pool(monkeypatch):
+    """Run the worker pool on threads so tests do not spawn processes."""
+    image_utils.shutdown_image_pool()
+    monkeypatch.setattr(image_utils, 'IMAGE_POOL_ENABLED', False)
+    yield
+    image_utils.shutdown_image_pool()
+
+
+def test_single_decode_produces_all_variant_sizes():
+    variants = render_profile_variants(create_test_image_bytes(640, 480, 'JPEG'), (64, 128, 256))
+
+    assert sorted(variants) == [64, 128, 256]
+    for size, data in variants.items():
+        img = Image.open(io.BytesIO(data))
+        assert img.format == 'WEBP'
+        assert img.size == (size, size)
+
+
+def test_pixel_limit_rejects_before_decode(monkeypatch):
+    data = create_test_image_bytes(1200, 1000)
+    monkeypatch.setattr(image_utils, 'PROFILE_IMAGE_MAX_PIXELS', 1000 * 1000)
+    monkeypatch.setattr(Image.Image, 'load', lambda self: pytest.fail('decoded a rejected image'))
+
+    with pytest.raises(ImageRejected) as excinfo:
+        _open_checked(data, 256)
+    assert excinfo.value.status_code == 413
+
+
+def test_jpeg_uses_reduced_scale_decode():
+    jpeg = _open_checked(create_test_image_bytes(2048, 1536, 'JPEG'), 256)
+    # DCT scaling to 1/4: the short side stays >= the largest variant
+    assert jpeg.size == (512, 384)
+
+    png = _open_checked(create_test_image_bytes(2048, 1536, 'PNG'), 256)
+    assert png.size == (2048, 1536)
+
+
+def test_pool_returns_variants_and_maps_errors(thread_pool):
+    metrics.reset()
+    variants = asyncio.run(render_profile_variants_async(create_test_image_bytes(300, 300), (64, 256)))
+    assert sorted(variants) == [64, 256]
+    assert metrics.histogram('image_pool_seconds')['count'] == 1
+
+    with pytest.raises(HTTPException) as excinfo:
+        asyncio.run(render_profile_variants_async(b'not an image', (64, 256)))
+    assert excinfo.value.status_code == 400
+    assert metrics.gauge('image_pool_pending') == 0
+
+
+def test_full_pool_fails_fast_with_503(thread_pool, monkeypatch):
+    metrics.reset()
+    monkeypatch.setattr(image_utils, '_SLOTS', image_utils.threading.BoundedSemaphore(1))
+    image_utils._SLOTS.acquire()
+
+    with pytest.raises(HTTPException) as excinfo:
+        asyncio.run(render_profile_variants_async(create_test_image_bytes(64, 64)))
+    assert excinfo.value.status_code == 503
+    assert excinfo.value.headers['Retry-After'] == '1'
+    assert metrics.counter('image_pool_rejected_total') == 1
+
+
+def test_upload_profile_variants_keys_and_cleanup(monkeypatch):
+    monkeypatch.setenv('S3_PREFIX_PROFILE_IMAGES', 'profile_images')
+    monkeypatch.setenv('CLOUDFRONT_DOMAIN', 'https://cdn.example.com/')
+    uploaded, deleted = [], []
+    monkeypatch.setattr(storage_s3, 'upload_bytes', lambda *, key, data, content_type: uploaded.append(key))
+    monkeypatch.setattr(storage_s3, 'delete_key', deleted.append)
+
+    key, url = storage_s3.upload_profile_variants({64: b'a', 128: b'b', 256: b'c'}, 256)
+    assert url == f'https://cdn.example.com/{key}'
+    assert uploaded == [
+        storage_s3.profile_variant_key(key, 64),
+        storage_s3.profile_variant_key(key, 128),
+        key,
+    ]
+    assert uploaded[0].endswith('_64.webp')
+
+    storage_s3.delete_profile_image(key, (64, 128))
+    assert deleted == [key] + uploaded[:2]
+
+    # A failed upload removes the variants that were already stored
+    deleted.clear()
+
+    def failing_upload(*, key, data, content_type):
+        if key.endswith('_128.webp'):
+            raise ClientError({'Error': {'Code': '500'}}, 'PutObject')
+        uploaded.append(key)
+
+    monkeypatch.setattr(storage_s3, 'upload_bytes', failing_upload)
+    uploaded.clear()
+    with pytest.raises(ClientError):
+        storage_s3.upload_profile_variants({64: b'a', 128: b'b', 256: b'c'}, 256)
+    assert deleted == uploaded and len(deleted) == 1
+
+    # Unexpected errors (bad credentials config, encoding bugs, ...) roll back too
+    def broken_upload(*, key, data, content_type):
+        if key.endswith('_128.webp'):
+            raise ValueError('unexpected')
+        uploaded.append(key)
+
+    monkeypatch.setattr(storage_s3, 'upload_bytes', broken_upload)
+    uploaded.clear()
+    deleted.clear()
+    with pytest.raises(ValueError):
+        storage_s3.upload_profile_variants({64: b'a', 128: b'b', 256: b'c'}, 256)
+    assert deleted == uploaded and len(deleted) == 1
@@ -0,0 +1,177 @@
+"""
+로컬 Fast-Path 의도 라우터 테스트
+
+- 명확한 추천/정보/유사 요청은 LLM 없이 결정되는지
+- 애매한 요청/범위 밖 요청은 LLM으로 위임(defer)되는지
+- 학습된 모델 직렬화/로드가 동일한 결과를 내는지
+- Supervisor가 로컬 결정 시 RoutingDecision 호출을 건너뛰는지
+"""
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.intent_router import (  # noqa: E402
+    IntentRouter,
+    LinearIntentClassifier,
+    build_gazetteer,
+    extract_features,
+    load_classifier,
+    load_seed_examples,
+    mask_entities,
+    train_linear_classifier,
+)
+
+
+@pytest.fixture(scope="module")
+def gazetteer():
+    return build_gazetteer(include_db=False)
+
+
+@pytest.fixture(scope="module")
+def router(gazetteer):
+    classifier = load_classifier()
+    assert classifier is not None, "agent/data/intent_model.json 이 필요합니다"
+    return IntentRouter(gazetteer, classifier)
+
+
+class TestGazetteer:
+    def test_longest_match_wins(self, gazetteer):
+        hits = gazetteer.find("화이트 머스크 향수 알려줘")
+        assert [(h.category, h.canonical) for h in hits] == [("note", "White musk")]
+
+    def test_perfume_and_brand_detected(self, gazetteer):
+        hits = gazetteer.find("조말론 우드세이지랑 비슷한 거")
+        categories = {h.category: h.canonical for h in hits}
+        assert categories["brand"] == "Jo Malone"
+        assert categories["perfume"] == "Wood Sage & Sea Salt"
+
+    def test_ascii_terms_require_word_boundary(self, gazetteer):
+        gazetteer.add("perfume", "Rose", "Rose")
+        assert gazetteer.find("primroses smell") == []
+        assert [h.surface for h in gazetteer.find("rose 설명해줘")] == ["rose"]
+
+    def test_masking_replaces_entities(self, gazetteer):
+        query = "자도르랑 비슷한 향수"
+        assert mask_entities(query, gazetteer.find(query)) == "§p 랑 비슷한 향수"
+
+
+class TestRules:
+    @pytest.mark.parametrize(
+        "query",
+        ["상큼한 향수 추천해줘", "여자친구 선물 뭐 사지?", "샤넬 향수 추천해줘", "머스크 향 좋아하는데 추천해줘"],
+    )
+    def test_recommendation_routes_to_interviewer(self, router, query):
+        decision = router.route(query)
+        assert decision.next_step == "interviewer"
+
+    @pytest.mark.parametrize(
+        "query",
+        [
+            "디올 쁘아종이랑 비슷한 향수 추천해줘",
+            "라임바질 같은 상큼한 향수",
+            "샤넬 넘버5 노트 알려줘",
+            "베티버가 뭐야?",
+            "방금 추천한 거 어떤 향이야",
+        ],
+    )
+    def test_item_and_knowledge_routes_to_info(self, router, query):
+        decision = router.route(query)
+        assert decision.next_step == "info_retrieval"
+        assert decision.source == "rule"
+
+    def test_followup_uses_previous_context(self, router):
+        context = {"user_preferences": {"gender": "Women", "season": "Summer"}}
+        decision = router.route("다른 거 더 보여줘", context)
+        assert decision.next_step == "interviewer"
+
+    @pytest.mark.parametrize("query", ["", "안녕하세요", "자바스크립트 질문 있어", "뭐 없을까"])
+    def test_ambiguous_or_out_of_scope_defers(self, router, query):
+        decision = router.route(query)
+        assert decision.next_step is None
+        assert decision.source == "defer"
+
+    def test_never_decides_writer_locally(self, router):
+        for query in ["오늘 날씨 어때?", "코딩 도와줘", "점심 메뉴 추천해줘"]:
+            assert router.route(query).next_step in (None, "interviewer", "info_retrieval")
+
+
+class TestClassifier:
+    def test_round_trip_serialization(self, gazetteer, tmp_path):
+        samples = [
+            (extract_features(q, gazetteer.find(q)), label)
+            for q, label in load_seed_examples()[::3]
+        ]
+        classifier = train_linear_classifier(samples, epochs=5)
+        path = tmp_path / "model.json"
+        classifier.save(path)
+        restored = LinearIntentClassifier.load(path)
+
+        features = extract_features("여름 향수 추천", gazetteer.find("여름 향수 추천"))
+        original = classifier.predict_proba(features)
+        loaded = restored.predict_proba(features)
+        for label in original:
+            assert loaded[label] == pytest.approx(original[label], abs=1e-3)
+
+    def test_shipped_model_generalizes_to_unseen_phrasing(self, router, gazetteer):
+        features = extract_features("탐다오 노트 구성 궁금해요", gazetteer.find("탐다오 노트 구성 궁금해요"))
+        probs = router.classifier.predict_proba(features)
+        assert max(probs, key=probs.get) == "info_retrieval"
+
+
+# ------------------------------------------------------------------
+# Supervisor 연동
+# ------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_supervisor_skips_llm_when_route_is_local(monkeypatch):
+    from backend.agent import graph, intent_router
+
+    monkeypatch.setenv("SPECULATIVE_ROUTING_ENABLED", "false")
+    monkeypatch.setattr(
+        intent_router,
+        "_ROUTER",
+        IntentRouter(build_gazetteer(include_db=False), load_classifier()),
+    )
+    llm = MagicMock()
+
+    with patch.object(graph, "SMART_LLM", llm):
+        routed = await graph.supervisor_node(
+            {"messages": [HumanMessage(content="베티버가 뭐야?")]}
+        )
+
+    assert routed["next_step"] == "info_retrieval"
+    llm.with_structured_output.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_supervisor_falls_back_to_llm_when_deferred(monkeypatch):
+    from backend.agent import graph, intent_router
+
+    monkeypatch.setattr(
+        intent_router,
+        "_ROUTER",
+        IntentRouter(build_gazetteer(include_db=False), load_classifier()),
+    )
+    decision = MagicMock(next_step="writer")
+    llm = MagicMock()
+
+    async def ainvoke(_messages):
+        return decision
+
+    llm.with_structured_output.return_value.ainvoke = ainvoke
+
+    with patch.object(graph, "SMART_LLM", llm):
+        routed = await graph.supervisor_node(
+            {"messages": [HumanMessage(content="안녕하세요")]}
+        )
+
+    assert routed["next_step"] == "writer"
+    llm.with_structured_output.assert_called_once()
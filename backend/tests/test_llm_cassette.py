@@ -0,0 +1,207 @@
+"""
+LLM 카세트 녹화/재생 테스트
+
+가짜 OpenAI 서버(httpx 전송 계층)로 실제 ChatOpenAI/AsyncOpenAI 호출을 녹화한 뒤
+- 재생 시 네트워크 없이 같은 응답(스트리밍 청크 포함)을 돌려주는지
+- 청크 도착 시각이 배율대로 재현되는지 (1배: 녹화 TTFT 유지, 0배: 즉시)
+- 동시 요청 순서가 달라도 요청 본문으로 올바른 응답을 찾는지
+- strict 모드에서 없는 요청은 재시도 없이 404(NotFoundError)로 드러나는지
+- 동기 invoke 경로와 사용자 턴 기록
+을 확인합니다.
+"""
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import openai
+import pytest
+from langchain_openai import ChatOpenAI
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.llm_cassette import Cassette  # noqa: E402
+
+TTFT = 0.15
+TOKEN_GAP = 0.02
+
+
+def _completion_chunk(model, content):
+    return {
+        "id": "chatcmpl-1",
+        "object": "chat.completion.chunk",
+        "created": 0,
+        "model": model,
+        "choices": [{"index": 0, "delta": {"content": content}, "finish_reason": None}],
+    }
+
+
+def _reply(body):
+    """마지막 사용자 메시지를 대문자로 돌려주는 결정적 가짜 모델"""
+    return f"echo {body['messages'][-1]['content'].upper()}"
+
+
+class FakeOpenAIStream(httpx.AsyncByteStream, httpx.SyncByteStream):
+    def __init__(self, frames, delays):
+        self.frames = frames
+        self.delays = delays
+
+    async def __aiter__(self):
+        for frame, delay in zip(self.frames, self.delays):
+            await asyncio.sleep(delay)
+            yield frame
+
+    def __iter__(self):
+        for frame, delay in zip(self.frames, self.delays):
+            time.sleep(delay)
+            yield frame
+
+
+class FakeOpenAI(httpx.AsyncBaseTransport, httpx.BaseTransport):
+    def __init__(self):
+        self.calls = 0
+
+    def _respond(self, request):
+        self.calls += 1
+        body = json.loads(request.read())
+        headers = {"content-type": "application/json"}
+        if request.url.path.endswith("/embeddings"):
+            payload = {
+                "object": "list",
+                "data": [{"object": "embedding", "index": 0, "embedding": [0.1, 0.2, float(len(body["input"]))]}],
+                "model": body["model"],
+                "usage": {"prompt_tokens": 1, "total_tokens": 1},
+            }
+            return 200, headers, [json.dumps(payload).encode()], [TTFT]
+        text = _reply(body)
+        if body.get("stream"):
+            words = text.split(" ")
+            frames = [
+                f"data: {json.dumps(_completion_chunk(body['model'], word + ' '))}\n\n".encode()
+                for word in words
+            ] + [b"data: [DONE]\n\n"]
+            delays = [TTFT] + [TOKEN_GAP] * (len(frames) - 1)
+            return 200, {"content-type": "text/event-stream"}, frames, delays
+        payload = {
+            "id": "chatcmpl-1",
+            "object": "chat.completion",
+            "created": 0,
+            "model": body["model"],
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+        }
+        return 200, headers, [json.dumps(payload).encode()], [TTFT]
+
+    async def handle_async_request(self, request):
+        status, headers, frames, delays = self._respond(request)
+        return httpx.Response(status, headers=headers, stream=FakeOpenAIStream(frames, delays))
+
+    def handle_request(self, request):
+        status, headers, frames, delays = self._respond(request)
+        return httpx.Response(status, headers=headers, stream=FakeOpenAIStream(frames, delays))
+
+
+def _models(cassette):
+    chat = ChatOpenAI(
+        model="gpt-4.1",
+        api_key="sk-test",
+        streaming=True,
+        max_retries=0,
+        http_client=cassette.sync_client(),
+        http_async_client=cassette.async_client(),
+    )
+    embeddings = openai.AsyncOpenAI(api_key="sk-test", http_client=cassette.async_client(), max_retries=0)
+    return chat, embeddings
+
+
+async def _stream(chat, text):
+    started = time.perf_counter()
+    first, chunks = None, []
+    async for chunk in chat.astream(text):
+        if chunk.content:
+            first = first if first is not None else time.perf_counter() - started
+            chunks.append(chunk.content)
+    return "".join(chunks), first, len(chunks)
+
+
+async def _session(chat, embeddings):
+    streamed = await asyncio.gather(_stream(chat, "rose"), _stream(chat, "vetiver"))
+    embedding = await embeddings.embeddings.create(input="citrus", model="text-embedding-3-small")
+    return streamed, embedding.data[0].embedding
+
+
+@pytest.fixture
+def recorded(tmp_path):
+    path = tmp_path / "session.jsonl"
+    upstream = FakeOpenAI()
+    cassette = Cassette(str(path), "record", upstream_sync=upstream, upstream_async=upstream)
+    chat, embeddings = _models(cassette)
+    cassette.record_turn(thread_id="t1", user_query="장미 향수 추천", member_id=0)
+    result = asyncio.run(_session(chat, embeddings))
+    sync_reply = chat.invoke("musk").content
+    assert upstream.calls == 4
+    return path, result, sync_reply
+
+
+@pytest.mark.asyncio
+async def test_replay_serves_recorded_responses_offline_with_timing(recorded):
+    path, (recorded_streams, recorded_embedding), _ = recorded
+    entries = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [e["type"] for e in entries].count("http") == 4
+    assert entries[0] == {**entries[0], "type": "turn", "user_query": "장미 향수 추천"}
+
+    cassette = Cassette(str(path), "replay", latency_scale=1.0)
+    chat, embeddings = _models(cassette)
+    # 녹화와 반대 순서로 요청해도 본문 해시로 맞는 응답을 찾음
+    vetiver = await _stream(chat, "vetiver")
+    rose = await _stream(chat, "rose")
+    embedding = await embeddings.embeddings.create(input="citrus", model="text-embedding-3-small")
+
+    assert rose[0] == recorded_streams[0][0] == "echo ROSE "
+    assert vetiver[0] == recorded_streams[1][0]
+    assert rose[2] == recorded_streams[0][2]  # 스트리밍 청크 수 유지
+    assert embedding.data[0].embedding == recorded_embedding
+    # 녹화된 첫 토큰 시간이 재현됨
+    assert TTFT * 0.8 <= rose[1] <= TTFT * 3
+    assert cassette.stats() == {"mode": "replay", "recorded": 0, "replayed": 3, "misses": 0}
+    assert cassette.turns[0]["cassette"] == "session.jsonl"
+
+
+@pytest.mark.asyncio
+async def test_latency_scale_zero_replays_immediately(recorded):
+    path, _, _ = recorded
+    cassette = Cassette(str(path), "replay", latency_scale=0.0)
+    chat, _ = _models(cassette)
+
+    started = time.perf_counter()
+    text, first, _ = await _stream(chat, "rose")
+    assert text == "echo ROSE "
+    assert time.perf_counter() - started < TTFT
+
+
+@pytest.mark.asyncio
+async def test_strict_miss_fails_fast_without_retry(recorded):
+    path, _, _ = recorded
+    cassette = Cassette(str(path), "replay", latency_scale=0.0, strict=True)
+    chat, _ = _models(cassette)
+
+    with pytest.raises(openai.NotFoundError, match="cassette miss"):
+        await _stream(chat, "oud")
+    assert cassette.stats()["misses"] == 1
+
+    # strict가 아니면 같은 엔드포인트/모델의 남은 녹화분으로 대체
+    lenient = Cassette(str(path), "replay", latency_scale=0.0)
+    chat, _ = _models(lenient)
+    text, _, _ = await _stream(chat, "oud")
+    assert text.startswith("echo ")
+
+
+def test_sync_invoke_is_replayed(recorded):
+    path, _, sync_reply = recorded
+    cassette = Cassette(str(path), "replay", latency_scale=0.0)
+    chat, _ = _models(cassette)
+    assert chat.invoke("musk").content == sync_reply == "echo MUSK "
@@ -0,0 +1,77 @@
+"""
+이벤트 루프 블로킹 감지 테스트
+
+- 코루틴 안의 동기 호출(time.sleep)이 루프를 막으면 그 함수 프레임이 원인으로 보고되는지
+- 블로킹 시간/카운터/지연 히스토그램이 메트릭에 남는지
+- await로 양보하는 긴 대기는 블로킹으로 보고되지 않는지
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.loop_monitor import LoopMonitor  # noqa: E402
+from agent.metrics import metrics  # noqa: E402
+
+
+def blocking_db_call():
+    # psycopg2 동기 쿼리 흉내
+    time.sleep(0.3)
+
+
+async def handler_with_sync_db():
+    await asyncio.sleep(0)
+    blocking_db_call()
+    await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_blocking_call_is_reported_with_offending_frame():
+    metrics.reset()
+    monitor = LoopMonitor(interval=0.01, block_threshold=0.05)
+    monitor.start()
+    try:
+        await asyncio.sleep(0.05)
+        await handler_with_sync_db()
+        await asyncio.sleep(0.05)
+    finally:
+        await monitor.stop()
+
+    reports = monitor.reports()
+    assert len(reports) == 1
+    report = reports[0]
+    assert report["frame"]["function"] == "blocking_db_call"
+    assert report["frame"]["file"].endswith("test_loop_monitor.py")
+    assert report["blocked_seconds"] >= 0.2
+    functions = [frame["function"] for frame in report["stack"]]
+    assert functions.index("handler_with_sync_db") < functions.index("blocking_db_call")
+
+    label = f"{report['frame']['file']}:blocking_db_call"
+    assert metrics.counter("event_loop_blocked_total", frame=label) == 1
+    assert metrics.histogram("event_loop_blocked_seconds")["count"] == 1
+    assert metrics.histogram("event_loop_lag_seconds")["max"] >= 0.2
+
+    snapshot = monitor.snapshot()
+    assert snapshot["blocked_total"] == 1
+    assert snapshot["recent_blocks"][0]["frame"]["function"] == "blocking_db_call"
+
+
+@pytest.mark.asyncio
+async def test_awaited_wait_is_not_reported():
+    metrics.reset()
+    monitor = LoopMonitor(interval=0.01, block_threshold=0.05)
+    monitor.start()
+    try:
+        await asyncio.sleep(0.3)
+    finally:
+        await monitor.stop()
+
+    assert monitor.reports() == []
+    assert metrics.histogram("event_loop_lag_seconds")["count"] > 5
+    assert not monitor.running
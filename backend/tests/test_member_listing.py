@@ -0,0 +1,246 @@
+"""
+관리자 회원 목록 페이지네이션 테스트
+
+- 키셋 커서로 페이지를 넘기면 모든 회원이 member_id DESC 순서로 정확히 한 번씩 나오는지
+- 상태/권한/가입일 필터가 서버에서 적용되는지
+- 전체 건수: 필터 없으면 reltuples, 필터 있으면 EXPLAIN 추정, count=exact일 때만 COUNT(*)
+- 응답이 스트리밍 JSON이고 잘못된 커서/필터는 400인지
+"""
+import importlib
+import json
+import sys
+import types
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.auth import RequestIdentity  # noqa: E402
+from agent.member_listing import (  # noqa: E402
+    ESTIMATE_TABLE_SQL,
+    MemberFilters,
+    build_page_query,
+    decode_cursor,
+    encode_cursor,
+    stream_page_json,
+)
+
+MEMBERS = 237
+STATUSES = ["NORMAL", "LOCK", None, "DORMANT", None, "WITHDRAW_REQ"]
+
+
+def make_members():
+    start = datetime(2025, 1, 1, 9, 0)
+    return [
+        {
+            "member_id": i,
+            "email": f"user{i}@example.com",
+            "nickname": f"회원{i}",
+            "join_dt": start + timedelta(days=i // 3),
+            "member_status": STATUSES[i % len(STATUSES)],
+            "join_channel": "LOCAL",
+            "role_type": "ADMIN" if i % 50 == 0 else (None if i % 2 else "USER"),
+        }
+        for i in range(1, MEMBERS + 1)
+    ]
+
+
+class FakeMemberDB:
+    """회원 목록 쿼리만 흉내 내는 DB (파라미터와 조건 문자열로 필터 적용)"""
+
+    def __init__(self, members, reltuples=MEMBERS):
+        self.members = members
+        self.reltuples = reltuples
+        self.statements = []
+
+    def matches(self, m, sql, params):
+        status = m["member_status"]
+        role = m["role_type"]
+        if "s.member_status = 'NORMAL' OR s.member_status IS NULL" in sql and status not in ("NORMAL", None):
+            return False
+        if "status" in params and status != params["status"]:
+            return False
+        if "b.role_type = 'USER' OR b.role_type IS NULL" in sql and role not in ("USER", None):
+            return False
+        if "role" in params and role != params["role"]:
+            return False
+        if "joined_from" in params and m["join_dt"].date() < params["joined_from"]:
+            return False
+        if "joined_before" in params and m["join_dt"].date() >= params["joined_before"]:
+            return False
+        if "after_id" in params and m["member_id"] >= params["after_id"]:
+            return False
+        return True
+
+    def cursor(self, cursor_factory=None):
+        return FakeMemberCursor(self)
+
+
+class FakeMemberCursor:
+    def __init__(self, db):
+        self.db = db
+        self.rows = []
+
+    def execute(self, sql, params=None):
+        params = params or {}
+        self.db.statements.append(sql)
+        if sql == ESTIMATE_TABLE_SQL:
+            self.rows = [{"estimate": self.db.reltuples}]
+            return
+        matched = [m for m in self.db.members if self.db.matches(m, sql, params)]
+        if sql.startswith("EXPLAIN"):
+            self.rows = [{"QUERY PLAN": [{"Plan": {"Plan Rows": len(matched) + 3}}]}]
+        elif "COUNT(*)" in sql:
+            self.rows = [{"total": len(matched)}]
+        else:
+            ordered = sorted(matched, key=lambda m: m["member_id"], reverse=True)[: params["limit"]]
+            columns = ("member_id", "email", "nickname", "join_dt", "member_status", "join_channel")
+            self.rows = [{c: m[c] for c in columns} for m in ordered]
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def client(monkeypatch):
+    db = FakeMemberDB(make_members())
+    released = []
+    fake_db = types.ModuleType("agent.database")
+    fake_db.get_member_db_connection = lambda: db
+    fake_db.release_member_db_connection = released.append
+    fake_db.add_my_perfume = lambda *args: None
+    monkeypatch.setitem(sys.modules, "agent.database", fake_db)
+    sys.modules.pop("routers.users", None)
+    users = importlib.import_module("routers.users")
+
+    app = FastAPI()
+    app.include_router(users.router)
+    app.dependency_overrides[users.get_identity] = lambda: RequestIdentity(
+        user_id=1, role="ADMIN", user_mode="BEGINNER"
+    )
+    yield TestClient(app), db, released
+    sys.modules.pop("routers.users", None)
+
+
+def walk(client, **params):
+    seen, pages, cursor = [], 0, None
+    while True:
+        query = dict(params, **({"cursor": cursor} if cursor else {}))
+        response = client.get("/users/admin/members", params=query)
+        assert response.status_code == 200, response.text
+        body = response.json()
+        pages += 1
+        seen.extend(m["member_id"] for m in body["members"])
+        cursor = body["next_cursor"]
+        assert body["has_more"] == (cursor is not None)
+        if not cursor:
+            return seen, pages, body
+
+
+def test_keyset_pages_cover_every_member_once(client):
+    http, db, released = client
+    seen, pages, last = walk(http, limit=50, count="none")
+    assert seen == list(range(MEMBERS, 0, -1))
+    assert pages == 5 and len(last["members"]) == MEMBERS - 200
+    assert len(released) == pages
+    # OFFSET 없이 앞 페이지 이후만 읽음
+    page_sql = [s for s in db.statements if "ORDER BY b.member_id DESC" in s]
+    assert all("OFFSET" not in s for s in page_sql)
+    assert sum("b.member_id < %(after_id)s" in s for s in page_sql) == pages - 1
+
+
+def test_server_side_filters(client):
+    http, db, _ = client
+    members = db.members
+    seen, _, _ = walk(http, limit=20, status="lock", count="none")
+    assert seen == sorted((m["member_id"] for m in members if m["member_status"] == "LOCK"), reverse=True)
+
+    seen, _, _ = walk(http, limit=20, status="NORMAL", role="USER", count="none")
+    expected = [
+        m["member_id"] for m in members
+        if m["member_status"] in ("NORMAL", None) and m["role_type"] in ("USER", None)
+    ]
+    assert seen == sorted(expected, reverse=True)
+
+    seen, _, _ = walk(http, limit=7, joined_from="2025-01-10", joined_to="2025-01-20", count="none")
+    expected = [
+        m["member_id"] for m in members
+        if date(2025, 1, 10) <= m["join_dt"].date() <= date(2025, 1, 20)
+    ]
+    assert seen == sorted(expected, reverse=True)
+
+    seen, _, _ = walk(http, role="admin", count="none")
+    assert seen == [200, 150, 100, 50]
+
+
+def test_total_is_estimated_unless_exact_requested(client):
+    http, db, _ = client
+    db.reltuples = 240
+    body = http.get("/users/admin/members", params={"limit": 10}).json()
+    assert body["total"] == {"count": 240, "exact": False}
+    assert not any("COUNT(*)" in s for s in db.statements)
+
+    body = http.get("/users/admin/members", params={"limit": 10, "status": "LOCK"}).json()
+    locked = sum(m["member_status"] == "LOCK" for m in db.members)
+    assert body["total"] == {"count": locked + 3, "exact": False}
+
+    body = http.get("/users/admin/members", params={"limit": 10, "status": "LOCK", "count": "exact"}).json()
+    assert body["total"] == {"count": locked, "exact": True}
+
+    # 통계가 아직 없으면(-1) 정확한 건수로 대체
+    db.reltuples = -1
+    body = http.get("/users/admin/members", params={"limit": 10}).json()
+    assert body["total"] == {"count": MEMBERS, "exact": True}
+
+
+def test_streamed_json_and_validation(client):
+    http, _, _ = client
+    response = http.get("/users/admin/members", params={"limit": 3, "count": "none"})
+    assert response.headers["content-type"] == "application/json"
+    assert "content-length" not in response.headers
+    body = response.json()
+    assert body["members"][0]["join_dt"].startswith("2025-")
+    assert body["total"] is None and body["limit"] == 3
+
+    assert http.get("/users/admin/members", params={"cursor": "bm90LWEtY3Vyc29y"}).status_code == 400
+    assert http.get("/users/admin/members", params={"status": "BANNED"}).status_code == 400
+    assert http.get("/users/admin/members", params={"limit": 0}).status_code == 422
+    assert http.get("/users/admin/members", params={"count": "maybe"}).status_code == 422
+
+
+def test_cursor_roundtrip_and_query_shape():
+    assert decode_cursor(encode_cursor(123456)) == 123456
+    for bad in ("", "!!!", encode_cursor(1)[:-1] + "A"):
+        with pytest.raises(ValueError):
+            decode_cursor(bad)
+
+    sql, params = build_page_query(MemberFilters(status="LOCK", joined_to=date(2025, 3, 1)), 900, 25)
+    assert "s.member_status = %(status)s" in sql and "b.member_id < %(after_id)s" in sql
+    assert params == {
+        "status": "LOCK",
+        "joined_before": date(2025, 3, 2),
+        "after_id": 900,
+        "limit": 26,
+    }
+
+    chunks = list(stream_page_json([{"member_id": 2}, {"member_id": 1}], "abc", None, 2, encode=lambda v: v))
+    assert len(chunks) == 4
+    assert json.loads(b"".join(chunks)) == {
+        "members": [{"member_id": 2}, {"member_id": 1}],
+        "next_cursor": "abc",
+        "has_more": True,
+        "limit": 2,
+        "total": None,
+    }
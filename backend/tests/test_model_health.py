@@ -0,0 +1,203 @@
+"""
+모델 자동 강등 컨트롤러 시뮬레이션 테스트
+
+가상 시계를 쓰는 가짜 모델(지연 분포/오류율 주입)로 호출을 흘려 보내며
+- 지연 급증·업스트림 오류 시 FAST_LLM으로 강등되는지
+- 임계치 근처에서 흔들려도 상태가 반복 전환(flapping)되지 않는지 (히스테리시스)
+- 업스트림이 회복되면 probe 표본으로 원래 모델에 복귀하는지
+- graph의 router/writer 호출이 강등 상태를 따르는지
+를 확인합니다.
+"""
+import asyncio
+import random
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.model_health import DegradationController, DegradationPolicy  # noqa: E402
+
+
+class VirtualClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeModel:
+    """호출할 때마다 latency_fn()만큼 가상 시계를 진행시키는 가짜 모델"""
+
+    def __init__(self, name, clock, latency_fn, error_rate=0.0, rng=None):
+        self.name = name
+        self.clock = clock
+        self.latency_fn = latency_fn
+        self.error_rate = error_rate
+        self.rng = rng or random.Random(0)
+        self.calls = 0
+
+    async def ainvoke(self, _messages):
+        self.calls += 1
+        self.clock.now += self.latency_fn()
+        if self.rng.random() < self.error_rate:
+            raise asyncio.TimeoutError()
+        return self.name
+
+
+def _controller(clock, **overrides):
+    settings = dict(
+        p95_threshold=4.0,
+        error_threshold=0.25,
+        window_seconds=60,
+        min_samples=10,
+        min_probe_samples=5,
+        min_hold_seconds=30,
+        probe_ratio=0.2,
+    )
+    settings.update(overrides)
+    policy = DegradationPolicy(**settings)
+    return DegradationController({"router": policy}, clock=clock, rng=random.Random(1))
+
+
+async def _simulate(controller, primary, fast, calls, gap=1.0):
+    """calls번 호출하며 어떤 모델이 응답했는지 기록 (호출 사이 gap초 경과)"""
+    served = []
+    for _ in range(calls):
+        model, is_primary = controller.choose("router", primary, fast)
+        try:
+            async with controller.track("router", is_primary):
+                served.append(await model.ainvoke([]))
+        except asyncio.TimeoutError:
+            served.append("error")
+        controller._clock.now += gap
+    return served
+
+
+def _lognormal(rng, median, sigma=0.3):
+    return lambda: median * rng.lognormvariate(0, sigma)
+
+
+@pytest.mark.asyncio
+async def test_latency_spike_degrades_then_recovers_with_probes():
+    clock, rng = VirtualClock(), random.Random(42)
+    controller = _controller(clock)
+    primary = FakeModel("primary", clock, _lognormal(rng, 1.0), rng=rng)
+    fast = FakeModel("fast", clock, _lognormal(rng, 0.4), rng=rng)
+
+    healthy = await _simulate(controller, primary, fast, 30)
+    assert set(healthy) == {"primary"}
+    assert not controller.is_degraded("router")
+
+    # 업스트림 지연 급증 (중앙값 8초)
+    primary.latency_fn = _lognormal(rng, 8.0)
+    spike = await _simulate(controller, primary, fast, 60)
+    assert controller.is_degraded("router")
+    # 강등 이후 대부분의 호출은 fast로, 일부만 probe로 primary에 감
+    after = spike[spike.index("fast"):]
+    assert after.count("fast") > after.count("primary") * 2
+
+    # 업스트림 회복 → hold 시간 이후 probe 표본으로 복귀
+    primary.latency_fn = _lognormal(rng, 1.0)
+    recovered = await _simulate(controller, primary, fast, 200)
+    assert not controller.is_degraded("router")
+    assert recovered[-20:] == ["primary"] * 20
+    assert controller.snapshot()["router"]["transitions"] == 2
+
+
+@pytest.mark.asyncio
+async def test_upstream_error_rate_triggers_degradation():
+    clock, rng = VirtualClock(), random.Random(7)
+    controller = _controller(clock)
+    primary = FakeModel("primary", clock, _lognormal(rng, 1.0), error_rate=0.5, rng=rng)
+    fast = FakeModel("fast", clock, _lognormal(rng, 0.4), rng=rng)
+
+    await _simulate(controller, primary, fast, 20)
+
+    assert controller.is_degraded("router")
+    assert controller.snapshot()["router"]["state"] == "degraded"
+
+
+@pytest.mark.asyncio
+async def test_non_upstream_errors_are_not_counted():
+    clock = VirtualClock()
+    controller = _controller(clock)
+    for _ in range(30):
+        with pytest.raises(ValueError):
+            async with controller.track("router"):
+                raise ValueError("parse error")
+    assert controller.snapshot()["router"]["samples"] == 0
+    assert not controller.is_degraded("router")
+
+
+@pytest.mark.asyncio
+async def test_hysteresis_prevents_flapping_near_threshold():
+    clock, rng = VirtualClock(), random.Random(3)
+    # 느린 호출(≈9초 간격)로도 min_samples가 모이도록 창을 넉넉히
+    controller = _controller(clock, window_seconds=600)
+    primary = FakeModel("primary", clock, _lognormal(rng, 8.0), rng=rng)
+    fast = FakeModel("fast", clock, _lognormal(rng, 0.4), rng=rng)
+    await _simulate(controller, primary, fast, 30)
+    assert controller.is_degraded("router")
+
+    # 임계치(4s) 바로 아래(3.0~3.9s)에서 흔들림: 복귀 기준(4 × 0.7 = 2.8s)에 못 미치므로 유지
+    primary.latency_fn = lambda: rng.uniform(3.0, 3.9)
+    await _simulate(controller, primary, fast, 300)
+    assert controller.is_degraded("router")
+    assert controller.snapshot()["router"]["transitions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_writer_ttft_is_measured_at_first_token():
+    clock = VirtualClock()
+    controller = DegradationController(
+        {"writer": DegradationPolicy(p95_threshold=2.0, min_samples=1)}, clock=clock
+    )
+
+    async with controller.track("writer") as mark_first_token:
+        clock.now += 1.0
+        mark_first_token()
+        clock.now += 30.0  # 긴 본문 생성 시간은 지연 판단에 포함하지 않음
+
+    assert controller.snapshot()["writer"]["p95_seconds"] == 1.0
+    assert not controller.is_degraded("writer")
+
+
+@pytest.mark.asyncio
+async def test_graph_router_uses_fast_llm_while_degraded():
+    from backend.agent import graph
+    from backend.agent.schemas import RoutingDecision
+
+    clock = VirtualClock()
+    controller = DegradationController(
+        {"router": DegradationPolicy(p95_threshold=1.0, min_samples=1, probe_ratio=0.0)},
+        clock=clock,
+    )
+    controller.record("router", 10.0)
+    assert controller.is_degraded("router")
+
+    smart, fast = MagicMock(), MagicMock()
+    smart.with_structured_output.return_value.ainvoke = AsyncMock(
+        return_value=RoutingDecision(next_step="writer")
+    )
+    fast.with_structured_output.return_value.ainvoke = AsyncMock(
+        return_value=RoutingDecision(next_step="info_retrieval")
+    )
+
+    undecided = AsyncMock(return_value=MagicMock(decided=False))
+    with patch.object(graph, "MODEL_DEGRADATION", controller), \
+         patch.object(graph, "route_locally", undecided), \
+         patch.object(graph, "SMART_LLM", smart), \
+         patch.object(graph, "FAST_LLM", fast):
+        result = await graph._route_request(
+            {"messages": [graph.HumanMessage(content="샤넬 넘버5 어떤 향이야?")]}
+        )
+
+    assert result == {"next_step": "info_retrieval"}
+    fast.with_structured_output.return_value.ainvoke.assert_awaited_once()
+    smart.with_structured_output.return_value.ainvoke.assert_not_awaited()
@@ -0,0 +1,279 @@
+"""
+순서 보장 스트림 멀티플렉서 / 동시 섹션 작성 테스트
+
+- 늦게 시작했지만 먼저 끝난 섹션도 앞 섹션 뒤에 순서대로 흘러가는지
+- 선두 섹션 토큰은 버퍼링 없이 즉시 전달되는지
+- 동시 실행 수(K) 제한을 지키는지
+- 앞 섹션 작성이 실패하면 스트림으로 나가는 헤더 번호/도입부가 선두 시점 기준으로 정해지는지
+- aclose()가 producer 취소만 정리하고 현재 태스크에 온 취소는 전달하는지
+- parallel_reco_node가 섹션을 동시에 작성하면서 is_last/번호 규칙을 유지하는지
+"""
+import asyncio
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.ordered_stream import OrderedStreamMultiplexer  # noqa: E402
+from agent.section_stream import SectionHeaderRewriter  # noqa: E402
+
+
+def _producer(name, delays, log=None):
+    async def run(emit):
+        for index, delay in enumerate(delays):
+            await asyncio.sleep(delay)
+            if log is not None:
+                log.append(f"{name}{index}")
+            await emit(f"{name}{index} ")
+        return name
+
+    return run
+
+
+@pytest.mark.asyncio
+async def test_output_follows_submit_order():
+    received = []
+
+    async def sink(order, chunk):
+        received.append((order, chunk))
+
+    mux = OrderedStreamMultiplexer(sink, max_concurrency=3)
+    mux.submit(_producer("a", [0.03, 0.03]))
+    mux.submit(_producer("b", [0.0, 0.0]))
+    mux.submit(_producer("c", [0.01, 0.01]))
+
+    assert await mux.drain() == ["a", "b", "c"]
+    assert [chunk for _, chunk in received] == ["a0 ", "a1 ", "b0 ", "b1 ", "c0 ", "c1 "]
+    assert [order for order, _ in received] == [0, 0, 1, 1, 2, 2]
+
+
+@pytest.mark.asyncio
+async def test_head_streams_live_while_others_buffer():
+    produced, received = [], []
+
+    async def sink(order, chunk):
+        received.append(chunk.strip())
+        # 선두 청크는 생성 직후 바로 전달되어야 함
+        if order == 0:
+            assert produced[-1] == chunk.strip()
+
+    mux = OrderedStreamMultiplexer(sink, max_concurrency=2)
+    mux.submit(_producer("a", [0.01, 0.01, 0.01], produced))
+    mux.submit(_producer("b", [0.0, 0.0, 0.0], produced))
+    await mux.drain()
+
+    # b는 a보다 먼저 모두 생성됐지만 a 이후에 나와야 함
+    assert produced[:3] == ["b0", "b1", "b2"]
+    assert received == ["a0", "a1", "a2", "b0", "b1", "b2"]
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit():
+    active = peak = 0
+
+    def tracked():
+        async def run(emit):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            await emit("x")
+            active -= 1
+
+        return run
+
+    async def sink(order, chunk):
+        pass
+
+    mux = OrderedStreamMultiplexer(sink, max_concurrency=2)
+    for _ in range(5):
+        mux.submit(tracked())
+    await mux.drain()
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_section_does_not_block_followers():
+    received = []
+
+    async def sink(order, chunk):
+        received.append(chunk)
+
+    async def broken(emit):
+        await emit("partial ")
+        raise RuntimeError("writer down")
+
+    mux = OrderedStreamMultiplexer(sink, max_concurrency=3)
+    mux.submit(broken)
+    mux.submit(_producer("b", [0.0]))
+
+    assert await mux.drain() == [None, "b"]
+    assert received == ["partial ", "b0 "]
+
+
+@pytest.mark.asyncio
+async def test_streamed_headers_are_numbered_when_section_becomes_head():
+    received = []
+
+    async def sink(order, chunk):
+        received.append((order, chunk))
+
+    def section(number, delay):
+        async def run(emit):
+            await asyncio.sleep(delay)
+            await emit(f"도입부 {number}\n")
+            await emit(f"## {number}. 향수 {number}\n본문 {number}")
+            return "ok"
+
+        return run
+
+    async def broken(emit):
+        await asyncio.sleep(0.02)
+        raise RuntimeError("writer down")
+
+    mux = OrderedStreamMultiplexer(sink, max_concurrency=3, formatter=SectionHeaderRewriter)
+    mux.submit(broken)
+    mux.submit(section(2, 0.0))
+    mux.submit(section(3, 0.0))
+    outputs = await mux.drain()
+
+    streamed = "".join(chunk for _, chunk in received)
+    # 1번 작성이 실패했으므로 2번이 첫 섹션: 도입부 유지 + '## 1.', 3번은 도입부 제거 + '## 2.'
+    assert streamed == "도입부 2\n## 1. 향수 2\n본문 2\n---## 2. 향수 3\n본문 3\n---"
+    assert [order for order, _ in received][0] == 1
+    assert outputs == [None, "도입부 2\n## 1. 향수 2\n본문 2\n---", "## 2. 향수 3\n본문 3\n---"]
+    assert mux.has_output
+
+
+@pytest.mark.asyncio
+async def test_aclose_propagates_cancellation_of_current_task():
+    started = asyncio.Event()
+
+    async def stubborn(emit):
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            # 정리에 시간이 걸리는 producer
+            await asyncio.sleep(0.05)
+            raise
+
+    async def sink(order, chunk):
+        pass
+
+    mux = OrderedStreamMultiplexer(sink)
+    mux.submit(stubborn)
+    await started.wait()
+
+    # producer 취소만 있으면 조용히 정리
+    await mux.aclose()
+
+    mux = OrderedStreamMultiplexer(sink)
+    mux.submit(stubborn)
+    await started.wait()
+    closer = asyncio.create_task(mux.aclose())
+    await asyncio.sleep(0.01)
+    closer.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await closer
+
+
+async def _run_parallel_reco(generate_section, dispatched=None):
+    from backend.agent import graph
+    from backend.agent.schemas import HardFilters, SearchStrategyPlan, StrategyFilters
+
+    class FakeStructured:
+        def __init__(self, schema):
+            self.schema = schema
+
+        async def ainvoke(self, messages, config=None):
+            if self.schema.__name__ == "StrategyLabelBatch":
+                raise RuntimeError("labels not under test")
+            priority = int(messages[-1].content.split("우선순위: ")[1].split("\n")[0])
+            return SearchStrategyPlan(
+                priority=priority,
+                strategy_name=f"S{priority}",
+                reason=f"reason {priority}",
+                hard_filters=HardFilters(gender="Unisex"),
+                strategy_filters=StrategyFilters(),
+                strategy_keyword=["k"],
+            )
+
+    smart = MagicMock()
+    smart.with_structured_output.side_effect = FakeStructured
+
+    async def fake_search(h, s, exclude_ids=None, query_text="", rank_mode="DEFAULT"):
+        perfume_id = int(query_text.split()[-1])
+        return [{"id": perfume_id, "name": f"P{perfume_id}", "brand": f"B{perfume_id}"}], "Match"
+
+    async def dispatch(order, content):
+        if dispatched is not None:
+            dispatched.append(content)
+
+    with patch.object(graph, "SMART_LLM", smart), \
+         patch.object(graph, "smart_search_with_retry_async", fake_search), \
+         patch.object(graph, "save_recommendation_log"), \
+         patch.object(graph, "_dispatch_reco_chunk", dispatch), \
+         patch.object(graph.RecoWriter, "generate_section", generate_section):
+        return await graph.parallel_reco_node(
+            {"member_id": 0, "user_preferences": {"gender": "Unisex"}, "messages": [],
+             "recommended_count": 3}
+        )
+
+
+@pytest.mark.asyncio
+async def test_parallel_reco_writes_sections_concurrently():
+    active = peak = 0
+    calls = []
+
+    async def slow_section(_writer, prepared, number, *, is_first, is_last, on_chunk=None, format_output=True):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        calls.append((number, is_first, is_last))
+        await asyncio.sleep(0.05)
+        # 두 번째 섹션 작성 실패 → 최종 번호는 1, 2로 다시 매겨져야 함
+        active -= 1
+        if number == 2:
+            return None
+        return f"## {number}. P"
+
+    result = await _run_parallel_reco(slow_section)
+
+    assert peak >= 2
+    assert [c[0] for c in calls] == [1, 2, 3]
+    assert [c[2] for c in calls] == [False, False, True]
+    message = result["messages"][0].content
+    assert "## 1. P" in message and "## 2. P" in message
+    assert "## 3." not in message
+
+
+@pytest.mark.asyncio
+async def test_parallel_reco_streams_renumbered_sections_when_first_writer_fails():
+    dispatched = []
+    calls = []
+
+    async def section(_writer, prepared, number, *, is_first, is_last, on_chunk=None, format_output=True):
+        calls.append((number, is_first, format_output))
+        if number == 1:
+            await asyncio.sleep(0.03)
+            raise RuntimeError("writer down")
+        if is_first:
+            await on_chunk(f"도입부 {number}\n")
+        await on_chunk(f"## {number}. P{number}\n본문")
+        return "raw"
+
+    result = await _run_parallel_reco(section, dispatched)
+
+    # 앞 섹션이 아직 아무것도 내보내지 않았으므로 모든 섹션이 도입부 후보를 작성
+    assert calls == [(1, True, False), (2, True, False), (3, True, False)]
+    streamed = "".join(dispatched)
+    assert streamed == "도입부 2\n## 1. P2\n본문\n---## 2. P3\n본문\n---"
+    message = result["messages"][0].content
+    assert message.startswith("도입부 2\n## 1. P2\n본문\n---")
+    assert "## 2. P3" in message and "## 3." not in message
@@ -0,0 +1,129 @@
+"""
+비밀번호 해시 전용 실행기 테스트
+
+- 프로세스 풀에서 hash/verify가 동작하고 작업별 시간이 메트릭에 남는지
+- 작업 계수(rounds)가 올라가면 검증 성공 시 새 해시를 돌려주는지 (투명한 재해시)
+- 대기열이 가득 차면 기다리지 않고 429(Retry-After)로 거절하는지
+- 워커가 포화돼 timeout 안에 결과가 없으면 500이 아니라 503(Retry-After)인지
+"""
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.metrics import metrics  # noqa: E402
+from agent.password_hasher import (  # noqa: E402
+    PasswordHasher,
+    PasswordHasherBusy,
+    PasswordHasherTimeout,
+    build_context,
+    get_password_hasher,
+    verify_password,
+)
+from agent import password_hasher  # noqa: E402
+
+
+def test_process_pool_hash_and_verify_record_timings():
+    metrics.reset()
+    hasher = PasswordHasher(workers=1, max_pending=2, rounds=1000)
+    try:
+        pwd_hash = hasher.hash("Secret!23")
+        assert pwd_hash.startswith("$pbkdf2-sha256$1000$")
+        assert hasher.verify("Secret!23", pwd_hash) == (True, None)
+        assert hasher.verify("wrong", pwd_hash) == (False, None)
+    finally:
+        hasher.shutdown()
+
+    assert metrics.histogram("password_hash_seconds", op="hash")["count"] == 1
+    assert metrics.histogram("password_hash_seconds", op="verify")["count"] == 2
+    assert metrics.gauge("password_hash_pending") == 0
+
+
+def test_verify_rehashes_when_work_factor_increases():
+    metrics.reset()
+    old_hash = build_context(1000).hash("Secret!23")
+    hasher = PasswordHasher(workers=1, rounds=2000, use_processes=False)
+    try:
+        ok, new_hash = hasher.verify("Secret!23", old_hash)
+        assert ok and new_hash.startswith("$pbkdf2-sha256$2000$")
+        assert build_context(2000).verify("Secret!23", new_hash)
+        # 이미 새 계수인 해시, 틀린 비밀번호는 재해시하지 않음
+        assert hasher.verify("Secret!23", new_hash) == (True, None)
+        assert hasher.verify("wrong", old_hash) == (False, None)
+    finally:
+        hasher.shutdown()
+    assert metrics.counter("password_rehash_total") == 1
+
+
+def test_full_queue_fails_fast_with_429():
+    metrics.reset()
+    hasher = PasswordHasher(workers=1, max_pending=1, rounds=1000, use_processes=False)
+    started, release = threading.Event(), threading.Event()
+
+    def slow_verify():
+        started.set()
+        release.wait(5)
+        return True, None
+
+    worker = threading.Thread(target=hasher._run, args=("verify", slow_verify))
+    worker.start()
+    try:
+        assert started.wait(5)
+        with pytest.raises(PasswordHasherBusy) as excinfo:
+            hasher.hash("Secret!23")
+        http = excinfo.value.to_http()
+        assert http.status_code == 429
+        assert int(http.headers["Retry-After"]) >= 1
+        assert metrics.counter("password_hash_rejected_total", op="hash") == 1
+    finally:
+        release.set()
+        worker.join(5)
+
+    # 슬롯이 반납되면 다시 받음
+    assert hasher.hash("Secret!23").startswith("$pbkdf2-sha256$1000$")
+    hasher.shutdown()
+
+
+def test_saturated_pool_times_out_with_503(monkeypatch):
+    metrics.reset()
+    hasher = PasswordHasher(workers=1, max_pending=4, rounds=1000, timeout=0.05, use_processes=False)
+    monkeypatch.setattr(password_hasher, "_HASHER", hasher)
+    assert get_password_hasher() is hasher
+    release = threading.Event()
+
+    def slow_verify():
+        release.wait(5)
+        return True, None
+
+    timeouts = []
+
+    def occupy():
+        try:
+            hasher._run("verify", slow_verify)
+        except PasswordHasherTimeout as error:
+            timeouts.append(error)
+
+    worker = threading.Thread(target=occupy)
+    worker.start()
+    try:
+        # 앞 작업이 워커를 잡고 있어 이 검증은 대기열에서 timeout
+        with pytest.raises(HTTPException) as excinfo:
+            verify_password("Secret!23", build_context(1000).hash("Secret!23"))
+        assert excinfo.value.status_code == 503
+        assert int(excinfo.value.headers["Retry-After"]) >= 1
+    finally:
+        release.set()
+        worker.join(5)
+    assert len(timeouts) == 1
+    assert metrics.counter("password_hash_timeouts_total", op="verify") == 2
+
+    # 시간 초과된 작업도 끝나면 슬롯을 반납
+    assert hasher.verify("Secret!23", build_context(1000).hash("Secret!23")) == (True, None)
+    assert metrics.gauge("password_hash_pending") == 0
+    hasher.shutdown()
@@ -0,0 +1,305 @@
+"""
+개인화 프로필 캐시 테스트
+
+- 같은 회원의 반복 추천 턴은 DB 쿼리 0회로 요약을 돌려주는지 (동기/비동기 접근자 모두)
+- 아카이브 변경(add/update/delete) 후 해당 회원만 다시 계산되는지
+- 재계산 시 이미 본 향수의 노트/어코드는 다시 조회하지 않는지
+- 계산 도중 무효화되면 오래된 결과를 저장하지 않는지
+- 노트/어코드 조회가 실패한(빈 결과) 프로필은 캐시하지 않는지
+- 새 향수의 노트/어코드만 빠진 부분 실패, 아카이브 조회 실패도 캐시하지 않는지
+"""
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from backend.agent import archive_db, personalization
+from backend.agent.profile_cache import (
+    PERFUME_FEATURE_CACHE,
+    PROFILE_CACHE,
+    PerfumeFeatureCache,
+    PersonalizationProfile,
+    ProfileCache,
+)
+
+
+class FakeDB:
+    """archive_db가 쓰는 SQL만 흉내 내는 인메모리 DB (실행된 쿼리 기록)"""
+
+    def __init__(self):
+        self.archive = {
+            1: [
+                {"perfume_id": 10, "perfume_name": "Santal 33", "register_status": "HAVE", "preference": "GOOD"},
+                {"perfume_id": 11, "perfume_name": "Another 13", "register_status": "HAVE", "preference": "GOOD"},
+            ],
+            2: [
+                {"perfume_id": 20, "perfume_name": "Philosykos", "register_status": "HAD", "preference": "GOOD"},
+            ],
+        }
+        self.brands = {10: "Le Labo", 11: "Le Labo", 20: "Diptyque", 30: "Byredo"}
+        self.accords = {10: ["Woody"], 11: ["Musky"], 20: ["Green"], 30: ["Powdery"]}
+        self.notes = {10: ["Sandalwood"], 11: ["Ambrette"], 20: ["Fig"], 30: ["Iris"]}
+        self.queries = []
+        self.feature_requests = []
+        self.threads = set()
+
+    def connect(self):
+        return FakeConnection(self)
+
+    def count(self, fragment):
+        return sum(1 for sql in self.queries if fragment in sql)
+
+
+class FakeConnection:
+    def __init__(self, db):
+        self.db = db
+
+    def cursor(self, cursor_factory=None):
+        return FakeCursor(self.db)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self.rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        pass
+
+    def execute(self, sql, params=()):
+        db = self.db
+        sql = " ".join(sql.split())
+        db.queries.append(sql)
+        db.threads.add(threading.get_ident())
+        if sql.startswith("SELECT p.member_id"):
+            member_id = params[0]
+            self.rows = [{**row, "member_id": member_id, "register_dt": None} for row in db.archive.get(member_id, [])]
+        elif "tb_perfume_basic_m" in sql:
+            self.rows = [
+                {"perfume_id": pid, "perfume_brand": db.brands[pid], "img_link": None, "name_kr": None, "brand_kr": None}
+                for pid in params
+            ]
+        elif "TB_PERFUME_ACCORD_R" in sql:
+            db.feature_requests.append(list(params["ids"]))
+            self.rows = [
+                {"perfume_id": pid, "accords": db.accords[pid], "notes": db.notes[pid]}
+                for pid in params["ids"]
+            ]
+        elif sql.startswith("INSERT INTO tb_member_my_perfume_t"):
+            member_id, perfume_id, name, status, preference = params
+            db.archive.setdefault(member_id, []).insert(
+                0, {"perfume_id": perfume_id, "perfume_name": name, "register_status": status, "preference": preference}
+            )
+        elif sql.startswith("UPDATE tb_member_my_perfume_t"):
+            status, preference, member_id, perfume_id = params
+            for row in db.archive.get(member_id, []):
+                if row["perfume_id"] == perfume_id:
+                    row["register_status"] = status
+                    row["preference"] = preference or row["preference"]
+        elif sql.startswith("DELETE FROM tb_member_my_perfume_t"):
+            member_id, perfume_id = params
+            db.archive[member_id] = [r for r in db.archive.get(member_id, []) if r["perfume_id"] != perfume_id]
+
+    def fetchall(self):
+        return self.rows
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setenv("PERSONALIZATION_CACHE_ENABLED", "true")
+    PROFILE_CACHE.clear()
+    PERFUME_FEATURE_CACHE.clear()
+    fake = FakeDB()
+    with patch.object(archive_db, "get_recom_db_connection", side_effect=fake.connect), \
+         patch.object(archive_db, "get_db_connection", side_effect=fake.connect), \
+         patch.object(archive_db, "release_recom_db_connection"), \
+         patch.object(archive_db, "release_db_connection"):
+        yield fake
+    PROFILE_CACHE.clear()
+    PERFUME_FEATURE_CACHE.clear()
+
+
+def test_repeat_turns_make_no_db_calls(db):
+    first = personalization.get_personalization_summary(1)
+    assert first["liked_brands"] == {"Le Labo": pytest.approx(4.8)}
+    assert len(db.queries) == 3  # 아카이브, 상세, 노트/어코드
+
+    for _ in range(3):
+        assert personalization.get_personalization_summary(1) == first
+    assert len(db.queries) == 3
+
+    # 호출자가 결과를 바꿔도 캐시는 오염되지 않음
+    first["liked_brands"].clear()
+    assert personalization.get_personalization_summary(1)["liked_brands"]
+
+
+@pytest.mark.asyncio
+async def test_async_accessor_loads_off_loop_then_serves_from_cache(db):
+    loop_thread = threading.get_ident()
+
+    summary = await personalization.aget_personalization_summary(1)
+    assert "Le Labo" in summary["summary_text"]
+    assert db.threads and loop_thread not in db.threads
+
+    queries = len(db.queries)
+    assert await personalization.aget_personalization_summary(1) == summary
+    assert len(db.queries) == queries
+
+
+def test_update_invalidates_only_that_member(db):
+    personalization.get_personalization_summary(1)
+    personalization.get_personalization_summary(2)
+    feature_queries = db.count("TB_PERFUME_ACCORD_R")
+
+    assert archive_db.update_my_perfume_logic(1, 10, "HAVE", "BAD") == {"status": "success"}
+
+    queries = len(db.queries)
+    member2 = personalization.get_personalization_summary(2)
+    assert len(db.queries) == queries
+    assert member2["liked_brands"] == {"Diptyque": pytest.approx(1.2)}
+
+    member1 = personalization.get_personalization_summary(1)
+    assert member1["disliked_perfumes"][0]["perfume_id"] == 10
+    # 노트/어코드는 향수별 캐시에서 재사용
+    assert db.count("TB_PERFUME_ACCORD_R") == feature_queries
+
+
+def test_add_and_delete_invalidate_and_fetch_only_new_features(db):
+    assert personalization.get_personalization_summary(1)["total_count"] == 2
+
+    archive_db.add_my_perfume_logic(1, 30, "Gypsy Water", "HAVE", "GOOD")
+    summary = personalization.get_personalization_summary(1)
+    assert summary["total_count"] == 3
+    assert "Byredo" in summary["liked_brands"]
+    assert db.feature_requests == [[10, 11], [30]]  # 새 향수(30)만 조회
+
+    archive_db.delete_my_perfume_logic(1, 30)
+    summary = personalization.get_personalization_summary(1)
+    assert summary["total_count"] == 2
+    assert "Byredo" not in summary["liked_brands"]
+
+
+def test_failed_mutation_keeps_cache(db):
+    personalization.get_personalization_summary(1)
+    with patch.object(FakeCursor, "execute", side_effect=RuntimeError("deadlock")):
+        result = archive_db.delete_my_perfume_logic(1, 10)
+    assert result["status"] == "error"
+    assert PROFILE_CACHE.get(1) is not None
+
+
+def test_profile_without_notes_is_not_cached(db):
+    # get_perfume_notes_and_accords는 DB 오류를 삼키고 {}를 돌려줌
+    execute = FakeCursor.execute
+
+    def failing_features(cursor, sql, params=()):
+        if "TB_PERFUME_ACCORD_R" in sql:
+            raise RuntimeError("statement timeout")
+        return execute(cursor, sql, params)
+
+    with patch.object(FakeCursor, "execute", failing_features):
+        degraded = personalization.get_personalization_summary(1)
+    assert degraded["total_count"] == 2 and degraded["liked_notes"] == []
+    assert PROFILE_CACHE.get(1) is None
+
+    # 다음 턴에는 다시 계산해 노트까지 채운 프로필을 캐시
+    recovered = personalization.get_personalization_summary(1)
+    assert recovered["liked_brands"] == {"Le Labo": pytest.approx(4.8)}
+    assert PROFILE_CACHE.get(1) is not None
+    assert db.feature_requests == [[10, 11]]
+
+
+def test_partially_loaded_features_are_not_cached(db):
+    personalization.get_personalization_summary(1)
+    archive_db.add_my_perfume_logic(1, 30, "Gypsy Water", "HAVE", "GOOD")
+
+    # 10, 11은 향수별 캐시에 있고 새 향수(30) 조회만 실패 → 합친 결과는 비어 있지 않음
+    execute = FakeCursor.execute
+
+    def failing_features(cursor, sql, params=()):
+        if "TB_PERFUME_ACCORD_R" in sql:
+            raise RuntimeError("statement timeout")
+        return execute(cursor, sql, params)
+
+    with patch.object(FakeCursor, "execute", failing_features):
+        partial = personalization.get_personalization_summary(1)
+    assert partial["total_count"] == 3 and "Iris" not in partial["liked_notes"]
+    assert PROFILE_CACHE.get(1) is None
+
+    recovered = personalization.get_personalization_summary(1)
+    assert "Iris" in recovered["liked_notes"]
+    assert PROFILE_CACHE.get(1) is not None
+
+
+def test_archive_fetch_error_is_not_cached_as_empty_profile(db):
+    with patch.object(archive_db, "get_recom_db_connection", return_value=None):
+        assert personalization.get_personalization_summary(1)["total_count"] == 0
+    assert PROFILE_CACHE.get(1) is None
+
+    execute = FakeCursor.execute
+
+    def failing_archive(cursor, sql, params=()):
+        if "tb_member_my_perfume_t" in sql:
+            raise RuntimeError("connection reset")
+        return execute(cursor, sql, params)
+
+    with patch.object(FakeCursor, "execute", failing_archive):
+        assert personalization.get_personalization_summary(1)["total_count"] == 0
+    assert PROFILE_CACHE.get(1) is None
+
+    # 라우터용 기본 호출은 기존처럼 빈 목록
+    with patch.object(FakeCursor, "execute", failing_archive):
+        assert archive_db.get_my_perfumes(1) == []
+
+    assert personalization.get_personalization_summary(1)["total_count"] == 2
+    assert PROFILE_CACHE.get(1) is not None
+
+
+def test_feature_cache_reports_ids_the_loader_did_not_return():
+    cache = PerfumeFeatureCache()
+    features, missing = cache.get_many([1, 2], lambda ids: {1: {"notes": ["A"], "accords": []}})
+    assert set(features) == {1} and missing == [2]
+
+    # 빠진 ID는 저장되지 않으므로 다음 호출에서 다시 조회
+    requested = []
+
+    def loader(ids):
+        requested.append(ids)
+        return {pid: {"notes": [], "accords": []} for pid in ids}
+
+    features, missing = cache.get_many([1, 2], loader)
+    assert requested == [[2]] and missing == [] and set(features) == {1, 2}
+
+
+def test_invalidation_during_build_discards_stale_profile():
+    cache = ProfileCache()
+    generation = cache.generation(7)
+    cache.invalidate(7)  # 계산 중 아카이브 변경
+    assert cache.put(7, PersonalizationProfile(summary={"total_count": 1}), generation) is False
+    assert cache.get(7) is None
+
+    generation = cache.generation(7)
+    assert cache.put(7, PersonalizationProfile(summary={"total_count": 2}), generation) is True
+    assert cache.get(7).summary["total_count"] == 2
+
+
+def test_ttl_and_lru_bounds():
+    now = [0.0]
+    cache = ProfileCache(ttl_seconds=10, max_members=2, clock=lambda: now[0])
+    for member_id in (1, 2, 3):
+        cache.put(member_id, PersonalizationProfile(summary={}), cache.generation(member_id))
+    assert cache.get(1) is None and len(cache) == 2
+
+    now[0] = 11
+    assert cache.get(2) is None
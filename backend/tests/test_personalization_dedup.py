@@ -40,7 +40,7 @@ async def test_recommendation_deduplication():
     }
 
     # 2. Mock Dependencies
-    with patch("backend.agent.graph.get_personalization_summary", return_value={}), \
+    with patch("backend.agent.graph.aget_personalization_summary", new_callable=AsyncMock, return_value={}), \
          patch("backend.agent.graph.SMART_LLM") as mock_smart_llm, \
          patch("backend.agent.graph.smart_search_with_retry_async") as mock_search, \
          patch("backend.agent.graph.save_recommendation_log"):
@@ -104,7 +104,7 @@ async def test_personalization_injection():
         "disliked_perfumes": [disliked_item]
     }
 
-    with patch("backend.agent.graph.get_personalization_summary", return_value=mock_personalization_data) as mock_get_pers, \
+    with patch("backend.agent.graph.aget_personalization_summary", new_callable=AsyncMock, return_value=mock_personalization_data) as mock_get_pers, \
          patch("backend.agent.graph.SMART_LLM") as mock_smart_llm, \
          patch("backend.agent.graph.smart_search_with_retry_async") as mock_search, \
          patch("backend.agent.graph.SUPER_SMART_LLM") as mock_super_llm, \
@@ -131,8 +131,8 @@ async def test_personalization_injection():
         # Run Node
         await parallel_reco_node(state)
 
-        # 3. Verify get_personalization_summary called
-        mock_get_pers.assert_called_with(999)
+        # 3. Verify aget_personalization_summary awaited
+        mock_get_pers.assert_awaited_with(999)
 
         # 4. Verify Disliked ID in exclude_ids
         call_args = mock_search.call_args
@@ -142,9 +142,14 @@ async def test_personalization_injection():
         assert 500 in exclude_ids, f"Disliked perfume 500 not in exclude_ids: {exclude_ids}"
 
         # 5. Verify Summary Text in Prompt
-        plan_call_args = mock_smart_llm.with_structured_output.return_value.ainvoke.call_args
-        assert plan_call_args is not None
-        messages, _ = plan_call_args
+        # (같은 mock을 쓰는 배치 라벨 호출은 제외하고 전략 수립 호출만 확인)
+        plan_calls = [
+            call
+            for call in mock_smart_llm.with_structured_output.return_value.ainvoke.call_args_list
+            if "전략 이름" in call.args[0][-1].content
+        ]
+        assert plan_calls
+        messages, _ = plan_calls[-1]
         system_msg = messages[0][0] 
         assert isinstance(system_msg, SystemMessage)
         assert summary_text in system_msg.content, "Personalization summary not found in Researcher prompt"
@@ -0,0 +1,246 @@
+"""
+프로필 이미지 일괄 이전 엔진 테스트
+
+- 수천 장의 가짜 이미지를 로컬 파일 스토리지로 옮기고 DB URL을 배치로 갱신하는지
+- 중간에 죽어도 체크포인트로 이어서 처리하고, 완료된 행은 다시 올리지 않는지
+- 이전 중 URL이 바뀐 행은 덮어쓰지 않고 올린 객체를 지우는지
+- 중단 시 커밋 전 배치/실행 중 작업이 올린 객체를 지우는지, 읽기 오류는 행 단위 실패인지
+- dry-run, 속도 제한(토큰 버킷), 진행률/ETA 출력
+"""
+import io
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent import storage_s3  # noqa: E402
+from agent.image_utils import render_profile_variants  # noqa: E402
+from agent.profile_image_migration import (  # noqa: E402
+    Checkpoint,
+    MigrationRow,
+    ProfileImageMigrator,
+    ProgressReporter,
+    RateLimiter,
+)
+from agent.storage_s3 import LocalFSBackend  # noqa: E402
+
+IMAGES = 2000
+SIZES = (16, 32)
+PRIMARY = 32
+
+
+class Crash(BaseException):
+    """프로세스가 죽은 상황 (except Exception으로 잡히지 않음)"""
+
+
+class FakeProfileTable:
+    """tb_member_profile_t.profile_image_url만 흉내 (조건부 배치 UPDATE)"""
+
+    def __init__(self, rows, crash_on_batch=None):
+        self.urls = {r.member_id: r.old_url for r in rows}
+        self.batches = []
+        self.crash_on_batch = crash_on_batch
+        self._lock = threading.Lock()
+
+    def update_urls(self, images):
+        with self._lock:
+            if self.crash_on_batch is not None and len(self.batches) + 1 == self.crash_on_batch:
+                raise Crash()
+            self.batches.append(len(images))
+            updated = set()
+            for img in images:
+                if self.urls.get(img.member_id) == img.old_url:
+                    self.urls[img.member_id] = img.cdn_url
+                    updated.add(img.member_id)
+            return updated
+
+
+def tiny_png(seed: int) -> bytes:
+    img = Image.new('RGB', (24, 20), color=(seed % 256, (seed * 7) % 256, 90))
+    buf = io.BytesIO()
+    img.save(buf, format='PNG')
+    return buf.getvalue()
+
+
+@pytest.fixture
+def env(tmp_path, monkeypatch):
+    monkeypatch.setenv('S3_PREFIX_PROFILE_IMAGES', 'profile_images')
+    monkeypatch.setenv('CLOUDFRONT_DOMAIN', 'https://cdn.example.com')
+    uploads = tmp_path / 'uploads'
+    uploads.mkdir()
+    storage_root = tmp_path / 'storage'
+    storage_s3.set_storage_backend(LocalFSBackend(storage_root))
+
+    rows = []
+    for member_id in range(1, IMAGES + 1):
+        name = f'{member_id}.png'
+        rows.append(MigrationRow(member_id, f'/uploads/{name}'))
+        if member_id % 500 == 0:
+            continue  # 파일 없음
+        (uploads / name).write_bytes(b'not an image' if member_id % 700 == 0 else tiny_png(member_id))
+    yield uploads, storage_root, rows, tmp_path / 'migration.checkpoint'
+    storage_s3.set_storage_backend(None)
+
+
+def make_migrator(uploads, table, checkpoint=None, uploaded=None, **kwargs):
+    def upload(variants):
+        result = storage_s3.upload_profile_variants(variants, PRIMARY)
+        if uploaded is not None:
+            uploaded.append(result[0])
+        return result
+
+    def delete(key):
+        storage_s3.delete_profile_image(key, [s for s in SIZES if s != PRIMARY])
+
+    kwargs.setdefault('workers', 8)
+    kwargs.setdefault('batch_size', 100)
+    return ProfileImageMigrator(
+        uploads,
+        update_urls=table.update_urls,
+        checkpoint=checkpoint,
+        convert=lambda data: render_profile_variants(data, SIZES),
+        upload=upload,
+        delete=delete,
+        emit=lambda line: None,
+        **kwargs,
+    )
+
+
+def stored_keys(storage_root):
+    return {p.relative_to(storage_root).as_posix() for p in storage_root.rglob('*.webp')}
+
+
+def test_migrates_thousands_of_images_in_batches(env):
+    uploads, storage_root, rows, checkpoint_path = env
+    table = FakeProfileTable(rows)
+    stats = make_migrator(uploads, table, Checkpoint(checkpoint_path)).run(rows)
+
+    missing, corrupt = IMAGES // 500, 2  # 700, 1400
+    assert stats['file_not_found'] == missing
+    assert stats['conversion_failed'] == corrupt
+    assert stats['success'] == IMAGES - missing - corrupt
+    assert max(table.batches) == 100 and sum(table.batches) == stats['success']
+
+    migrated = {m: url for m, url in table.urls.items() if url.startswith('https://cdn.example.com/')}
+    assert len(migrated) == stats['success']
+    keys = stored_keys(storage_root)
+    assert len(keys) == stats['success'] * len(SIZES)
+    for url in migrated.values():
+        key = url[len('https://cdn.example.com/'):]
+        assert key in keys and storage_s3.profile_variant_key(key, 16) in keys
+        assert Image.open(storage_root / key).size == (PRIMARY, PRIMARY)
+
+    assert Checkpoint(checkpoint_path).completed == set(migrated)
+
+
+def test_resumes_from_checkpoint_after_crash(env):
+    uploads, storage_root, rows, checkpoint_path = env
+    table = FakeProfileTable(rows, crash_on_batch=5)
+    first_uploads = []
+    with pytest.raises(Crash):
+        make_migrator(uploads, table, Checkpoint(checkpoint_path), first_uploads).run(rows)
+
+    checkpoint = Checkpoint(checkpoint_path)
+    assert len(checkpoint.completed) == 400
+    done_before = set(checkpoint.completed)
+    # 커밋되지 않은 배치와 실행 중이던 작업이 올린 객체는 남지 않음
+    committed = {table.urls[m][len('https://cdn.example.com/'):] for m in done_before}
+    assert len(first_uploads) > len(committed)
+    assert stored_keys(storage_root) == committed | {storage_s3.profile_variant_key(k, 16) for k in committed}
+
+    table.crash_on_batch = None
+    second_uploads = []
+    stats = make_migrator(uploads, table, checkpoint, second_uploads).run(rows)
+
+    assert stats['skipped_checkpoint'] == 400
+    assert len(second_uploads) == IMAGES - 400 - stats['file_not_found'] - stats['conversion_failed']
+    # 완료된 행은 다시 올리지 않고, 최종적으로 모든 가능한 행이 이전됨
+    on_cdn = {m for m, url in table.urls.items() if url.startswith('https://')}
+    assert done_before <= on_cdn
+    assert len(on_cdn) == IMAGES - stats['file_not_found'] - stats['conversion_failed']
+    second_keys = {u for u in second_uploads}
+    assert not any(table.urls[m][len('https://cdn.example.com/'):] in second_keys for m in done_before)
+
+
+def test_unreadable_file_fails_only_that_row(env):
+    uploads, storage_root, rows, _ = env
+    rows = rows[:10]
+    (uploads / '3.png').unlink()
+    (uploads / '3.png').mkdir()  # 읽으면 IsADirectoryError
+    table = FakeProfileTable(rows)
+    stats = make_migrator(uploads, table).run(rows)
+
+    assert stats['read_failed'] == 1
+    assert stats['success'] == 9
+    assert table.urls[3] == '/uploads/3.png'
+
+
+def test_rows_changed_during_migration_are_not_overwritten(env):
+    uploads, storage_root, rows, _ = env
+    rows = rows[:50]
+    table = FakeProfileTable(rows)
+    table.urls[7] = 'https://cdn.example.com/profile_images/user-uploaded.webp'
+
+    stats = make_migrator(uploads, table, batch_size=10).run(rows)
+
+    assert stats['url_changed'] == 1 and stats['success'] == 49
+    assert table.urls[7].endswith('user-uploaded.webp')
+    # 고아 객체는 지워져 DB가 가리키는 객체만 남음
+    referenced = {url[len('https://cdn.example.com/'):] for m, url in table.urls.items() if m != 7}
+    assert {k for k in stored_keys(storage_root) if not k.endswith('_16.webp')} == referenced
+
+
+def test_dry_run_touches_nothing(env):
+    uploads, storage_root, rows, checkpoint_path = env
+    rows = rows[:600]
+    table = FakeProfileTable(rows)
+    stats = make_migrator(uploads, table, dry_run=True).run(rows)
+
+    assert stats['success'] == 600 - 1  # member 500 파일 없음
+    assert stats['file_not_found'] == 1
+    assert table.batches == []
+    assert all(url.startswith('/uploads/') for url in table.urls.values())
+    assert not storage_root.exists() or stored_keys(storage_root) == set()
+    assert not checkpoint_path.exists()
+
+
+def test_rate_limiter_spaces_acquires():
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    limiter = RateLimiter(5, burst=1, clock=lambda: now[0], sleep=sleep)
+    for _ in range(10):
+        limiter.acquire()
+    assert now[0] == pytest.approx(9 / 5)
+    assert RateLimiter(0).acquire() == 0.0
+
+
+def test_progress_reports_throughput_and_eta():
+    now = [0.0]
+    lines = []
+    reporter = ProgressReporter(1000, interval=5, clock=lambda: now[0], emit=lines.append)
+    now[0] = 2
+    assert reporter.maybe_report(100, {'success': 100}) is None
+    now[0] = 10
+    line = reporter.maybe_report(250, {'success': 240})
+    assert '250/1000 (25%)' in line and '25.0 img/s' in line and 'ETA 30s' in line
+    assert 'failed=10' in line and lines == [line]
+
+
+def test_checkpoint_ignores_torn_last_line(tmp_path):
+    path = tmp_path / 'cp'
+    path.write_text('1\n2\n3')
+    checkpoint = Checkpoint(path)
+    assert checkpoint.completed == {1, 2}
+    checkpoint.add_many([4, 2])
+    assert Checkpoint(path).completed == {1, 2, 4}
@@ -0,0 +1,268 @@
+"""
+스키마 마이그레이션 러너 테스트
+
+- NNNN_name.sql을 번호 순으로 적용하고 schema_migrations에 기록, 재실행 시 건너뛰는지
+- dry-run/실패 시 롤백되는지, 잘못된 파일명/중복 버전을 거부하는지
+- 프로필 API가 더 이상 DDL을 실행하지 않아, 동시 조회가 ACCESS EXCLUSIVE 락에
+  줄 서지 않는지 (테이블 락을 흉내 낸 가짜 DB로 확인)
+"""
+import importlib
+import sys
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.auth import RequestIdentity  # noqa: E402
+from agent.schema_migrations import (  # noqa: E402
+    MIGRATIONS_DIR,
+    discover_migrations,
+    run_migrations,
+)
+
+
+# ==========================================
+# 러너
+# ==========================================
+class RecordingConnection:
+    """schema_migrations 테이블만 흉내 내는 커넥션"""
+
+    def __init__(self, applied=(), fail_on=None):
+        self.applied = set(applied)
+        self.fail_on = fail_on
+        self.statements = []
+        self.commits = 0
+        self.rollbacks = 0
+        self._staged = set()
+
+    def cursor(self):
+        return RecordingCursor(self)
+
+    def commit(self):
+        self.commits += 1
+        self.applied |= self._staged
+        self._staged = set()
+
+    def rollback(self):
+        self.rollbacks += 1
+        self._staged = set()
+
+
+class RecordingCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.rows = []
+
+    def execute(self, sql, params=None):
+        conn = self.conn
+        conn.statements.append(" ".join(sql.split()))
+        if conn.fail_on and conn.fail_on in sql:
+            raise RuntimeError("syntax error")
+        if sql.startswith("SELECT version FROM schema_migrations"):
+            self.rows = [(v,) for v in sorted(conn.applied)]
+        elif sql.startswith("INSERT INTO schema_migrations"):
+            conn._staged.add(params[0])
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def migrations_dir(tmp_path):
+    (tmp_path / "0002_add_index.sql").write_text("CREATE INDEX IF NOT EXISTS ix ON t (c);")
+    (tmp_path / "0001_add_column.sql").write_text("ALTER TABLE t ADD COLUMN IF NOT EXISTS c INT;")
+    (tmp_path / "0010_backfill.sql").write_text("UPDATE t SET c = 0 WHERE c IS NULL;")
+    return tmp_path
+
+
+def test_applies_pending_in_order_and_skips_applied(migrations_dir):
+    conn = RecordingConnection()
+    applied = run_migrations(conn, migrations_dir)
+    assert [m.version for m in applied] == [1, 2, 10]
+    assert conn.statements[0] == "SELECT pg_advisory_xact_lock(%s)"
+    ddl = [s for s in conn.statements if s.startswith(("ALTER", "CREATE INDEX", "UPDATE t"))]
+    assert [s.split()[0] for s in ddl] == ["ALTER", "CREATE", "UPDATE"]
+    assert conn.applied == {1, 2, 10} and conn.commits == 1
+
+    conn.statements.clear()
+    assert run_migrations(conn, migrations_dir) == []
+    assert not any(s.startswith("ALTER") for s in conn.statements)
+
+
+def test_dry_run_and_failure_roll_back(migrations_dir):
+    conn = RecordingConnection(applied={1})
+    pending = run_migrations(conn, migrations_dir, dry_run=True)
+    assert [m.version for m in pending] == [2, 10]
+    assert conn.applied == {1} and conn.rollbacks == 1
+    assert not any(s.startswith("CREATE INDEX") for s in conn.statements)
+
+    conn = RecordingConnection(fail_on="UPDATE t")
+    with pytest.raises(RuntimeError):
+        run_migrations(conn, migrations_dir)
+    assert conn.applied == set() and conn.commits == 0 and conn.rollbacks == 1
+
+
+def test_rejects_bad_filenames_and_duplicate_versions(tmp_path):
+    (tmp_path / "add_column.sql").write_text("SELECT 1;")
+    with pytest.raises(ValueError):
+        discover_migrations(tmp_path)
+
+    (tmp_path / "add_column.sql").unlink()
+    (tmp_path / "0001_a.sql").write_text("SELECT 1;")
+    (tmp_path / "001_b.sql").write_text("SELECT 1;")
+    with pytest.raises(ValueError):
+        discover_migrations(tmp_path)
+
+
+def test_shipped_member_migrations_cover_profile_columns():
+    migrations = discover_migrations(MIGRATIONS_DIR / "member")
+    assert migrations[0].version == 1
+    sql = " ".join(m.sql for m in migrations)
+    assert "sub_email" in sql and "profile_image_url" in sql
+
+
+# ==========================================
+# 프로필 조회 동시성 (테이블 락 모델)
+# ==========================================
+QUERY_SECONDS = 0.05
+
+
+class TableLocks:
+    """
+    PostgreSQL 테이블 락 모델
+    ALTER TABLE → ACCESS EXCLUSIVE, SELECT → ACCESS SHARE, 둘 다 트랜잭션 끝까지 유지
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self.readers = 0
+        self.writer = False
+        self.max_readers = 0
+        self.ddl = []
+
+    def acquire(self, exclusive):
+        with self._cond:
+            if exclusive:
+                self._cond.wait_for(lambda: not self.writer and self.readers == 0)
+                self.writer = True
+            else:
+                self._cond.wait_for(lambda: not self.writer)
+                self.readers += 1
+                self.max_readers = max(self.max_readers, self.readers)
+
+    def release(self, exclusive, count):
+        with self._cond:
+            if exclusive:
+                self.writer = False
+            self.readers -= count
+            self._cond.notify_all()
+
+
+class LockingConnection:
+    def __init__(self, locks):
+        self.locks = locks
+        self.exclusive = False
+        self.shared = 0
+
+    def cursor(self, cursor_factory=None):
+        return LockingCursor(self)
+
+    def end_transaction(self):
+        if self.exclusive or self.shared:
+            self.locks.release(self.exclusive, self.shared)
+        self.exclusive, self.shared = False, 0
+
+    commit = rollback = end_transaction
+
+
+class LockingCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, sql, params=None):
+        conn = self.conn
+        if sql.lstrip().upper().startswith("ALTER"):
+            conn.locks.ddl.append(sql)
+            if not conn.exclusive:
+                # 이미 잡은 공유 락이 없다는 가정 (핸들러는 DDL을 먼저 실행했음)
+                conn.locks.acquire(exclusive=True)
+                conn.exclusive = True
+        elif not conn.exclusive:
+            conn.locks.acquire(exclusive=False)
+            conn.shared += 1
+        time.sleep(QUERY_SECONDS)
+
+    def fetchone(self):
+        return {"member_id": 1, "nickname": "향수초보", "sub_email": None, "profile_image_url": None}
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def users_router(monkeypatch):
+    """DB 풀을 만들지 않는 agent.database로 routers.users 임포트"""
+    locks = TableLocks()
+    fake_db = types.ModuleType("agent.database")
+    fake_db.get_member_db_connection = lambda: LockingConnection(locks)
+    # 풀 반납 시 psycopg2 풀처럼 열린 트랜잭션을 롤백
+    fake_db.release_member_db_connection = lambda conn: conn.rollback()
+    fake_db.add_my_perfume = lambda *args: None
+    monkeypatch.setitem(sys.modules, "agent.database", fake_db)
+    sys.modules.pop("routers.users", None)
+    users = importlib.import_module("routers.users")
+    yield users, locks
+    sys.modules.pop("routers.users", None)
+
+
+def _concurrent(fn, count):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=count) as pool:
+        results = list(pool.map(lambda i: fn(i), range(count)))
+    return results, time.perf_counter() - started
+
+
+def test_profile_reads_do_not_serialize_on_ddl_lock(users_router):
+    users, locks = users_router
+    readers = 8
+
+    def read(i):
+        identity = RequestIdentity(user_id=i + 1, role="USER", user_mode="BEGINNER")
+        return users.get_profile(i + 1, identity=identity)
+
+    results, elapsed = _concurrent(read, readers)
+    assert all(row["member_id"] == 1 for row in results)
+    assert locks.ddl == []
+    assert locks.max_readers > 1
+    assert elapsed < readers * QUERY_SECONDS * 0.6
+
+    nickname_checks, _ = _concurrent(lambda i: users.check_nickname(f"닉네임{i}"), readers)
+    assert all("available" in r for r in nickname_checks)
+    assert locks.ddl == []
+
+
+def test_lock_model_serializes_when_requests_run_ddl(users_router):
+    # 대조군: 예전처럼 요청마다 ALTER TABLE을 실행하면 조회가 한 줄로 선다
+    _, locks = users_router
+    readers = 8
+
+    def legacy_read(i):
+        conn = LockingConnection(locks)
+        cur = conn.cursor()
+        cur.execute("ALTER TABLE tb_member_profile_t ADD COLUMN IF NOT EXISTS sub_email VARCHAR(100)")
+        cur.execute("SELECT 1 FROM tb_member_profile_t WHERE member_id = %s", (i,))
+        conn.rollback()
+
+    _, elapsed = _concurrent(legacy_read, readers)
+    assert len(locks.ddl) == readers
+    assert elapsed >= readers * 2 * QUERY_SECONDS * 0.9
@@ -0,0 +1,136 @@
+"""
+섹션 헤더 스트리밍 정리기 테스트
+
+- 무작위 텍스트 × 무작위 청크 분할에서 기존 후처리(format_section_text)와 글자 단위로 같은지 (속성 기반)
+- 헤더 줄이 끝나는 즉시 고친 헤더를 내보내고, 본문 토큰은 버퍼링하지 않는지
+- generate_section이 정리된 청크를 on_chunk로 바로 넘기고 같은 텍스트를 반환하는지
+"""
+import random
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from langchain_core.messages import AIMessage
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.section_stream import (  # noqa: E402
+    SectionHeaderRewriter,
+    format_section_text,
+    renumber_section_header,
+)
+
+# 경계 조건이 자주 나오도록 고른 조각들 (줄바꿈 변형, '#', '-', 숫자 헤더, 공백)
+FRAGMENTS = [
+    "##", "#", "## ", "## 3. ", "## 1.", "12.", " ", "  ", "\t",
+    "\n", "\n\n", "\r\n", "\r", "\u2028", "\x0c",
+    "---", "--", "-", "\n---", "--- ", "---\n",
+    "도입부 문장입니다. ", "제목", "향수 설명", "[[SAVE:1]]", "x",
+]
+
+
+def _random_text(rng: random.Random) -> str:
+    return "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 14)))
+
+
+def _random_chunks(rng: random.Random, text: str):
+    chunks, index = [], 0
+    while index < len(text):
+        size = rng.randint(1, 5)
+        chunks.append(text[index:index + size])
+        index += size
+    # 빈 청크도 섞어 넣음 (모델이 빈 delta를 보내는 경우)
+    if chunks and rng.random() < 0.3:
+        chunks.insert(rng.randrange(len(chunks) + 1), "")
+    return chunks
+
+
+def _stream(chunks, display_priority):
+    rewriter = SectionHeaderRewriter(display_priority)
+    outputs = [rewriter.feed(chunk) for chunk in chunks]
+    outputs.append(rewriter.finish())
+    return outputs
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_buffered_post_processing_for_random_chunkings(seed):
+    rng = random.Random(seed)
+    for _ in range(300):
+        text = _random_text(rng)
+        display_priority = rng.randint(1, 3)
+        expected = format_section_text(text, display_priority)
+        for _ in range(3):
+            chunks = _random_chunks(rng, text)
+            assert "".join(_stream(chunks, display_priority)) == expected, (text, chunks)
+
+
+@pytest.mark.parametrize(
+    "text, display_priority",
+    [
+        ("", 2),
+        ("   \n", 1),
+        ("도입부\n## 3. 제목\n본문", 2),
+        ("도입부\n## 3. 제목\n본문", 1),
+        ("## 3. 제목\r\n본문\r\n---\r\n", 1),
+        ("## 3.", 2),
+        ("헤더 없는 본문", 2),
+        ("본문\n---  \n", 3),
+    ],
+)
+def test_edge_cases_match_post_processing(text, display_priority):
+    expected = format_section_text(text, display_priority)
+    assert "".join(_stream(list(text), display_priority)) == expected
+    assert "".join(_stream([text], display_priority)) == expected
+
+
+def test_renumber_section_header_only_touches_first_header_line():
+    assert renumber_section_header("## 3. 우디\n## 4. 본문", 1) == "## 1. 우디\n## 4. 본문"
+    assert renumber_section_header("도입부\n## 3. 우디", 1) == "도입부\n## 3. 우디"
+    assert renumber_section_header("", 2) == ""
+
+
+def test_header_is_rewritten_as_soon_as_line_completes():
+    rewriter = SectionHeaderRewriter(2)
+
+    assert rewriter.feed("오늘의 추천입니다.\n") == ""
+    assert rewriter.feed("## 5") == ""
+    assert rewriter.feed(". 우디 향수") == ""
+    assert rewriter.feed("\n첫 문장") == "## 2. 우디 향수\n첫 문장"
+    # 헤더 이후 토큰은 바로 전달 (끝 공백만 보류)
+    assert rewriter.feed(" 둘째") == " 둘째"
+    assert rewriter.feed(" \n") == ""
+    assert rewriter.feed("셋째") == " \n셋째"
+    assert rewriter.finish() == "\n---"
+
+
+@pytest.mark.asyncio
+async def test_generate_section_forwards_rewritten_chunks_while_streaming():
+    from backend.agent import graph
+
+    chunks = ["도입부 ", "## ", "3. 향수", "\n본문 ", "이어짐"]
+    seen_before_end = []
+    forwarded = []
+
+    class FakeModel:
+        async def astream(self, messages):
+            for index, chunk in enumerate(chunks):
+                yield AIMessage(content=chunk)
+                seen_before_end.append((index, "".join(forwarded)))
+
+    async def on_chunk(text):
+        forwarded.append(text)
+
+    writer = graph.RecoWriter({"messages": []})
+    prepared = {"section_data": {"perfume": {}}}
+    with patch.object(graph, "SUPER_SMART_LLM", FakeModel()):
+        result = await writer.generate_section(
+            prepared, 2, is_first=False, is_last=False, on_chunk=on_chunk
+        )
+
+    assert result == format_section_text("".join(chunks), 2)
+    assert result == "".join(forwarded)
+    # 헤더 줄이 끝난 청크(3번째) 직후 이미 고친 헤더가 전달됨 (스트림 종료 전)
+    assert seen_before_end[3][1] == "## 2. 향수\n본문"
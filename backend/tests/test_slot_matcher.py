@@ -0,0 +1,194 @@
+"""
+인터뷰 슬롯 사전 추출 테스트
+
+- Aho-Corasick 오토마톤이 겹치는 패턴을 모두 찾는지
+- 성별/관계/계절/스타일 등 슬롯이 사전 단어로 채워지는지
+- 부정 표현/충돌/특정 향수 언급 시 LLM을 건너뛰지 않는지
+- Interviewer가 충분한 턴에서 InterviewResult 호출을 생략하는지
+- Interviewer LLM 호출이 요청 마감 시간으로 제한되는지
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.aho_corasick import AhoCorasick, Match, select_longest  # noqa: E402
+from agent.slot_matcher import build_slot_matcher  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return build_slot_matcher(include_db=False)
+
+
+class TestAhoCorasick:
+    def test_finds_overlapping_patterns(self):
+        automaton = AhoCorasick()
+        for pattern in ["he", "she", "his", "hers"]:
+            automaton.add(pattern, pattern)
+        found = {(m.start, m.end, m.value) for m in automaton.find_all("ushers")}
+        assert found == {(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")}
+
+    def test_matches_naive_scan(self):
+        patterns = ["머스크", "화이트 머스크", "우디", "우드", "세이지", "우드세이지"]
+        automaton = AhoCorasick()
+        for pattern in patterns:
+            automaton.add(pattern, pattern)
+        text = "화이트 머스크랑 우드세이지, 우디한 향"
+        expected = {
+            (i, i + len(p), p)
+            for p in patterns
+            for i in range(len(text))
+            if text.startswith(p, i)
+        }
+        assert {(m.start, m.end, m.value) for m in automaton.find_all(text)} == expected
+
+    def test_select_longest_drops_contained_matches(self):
+        matches = [Match(0, 7, "화이트 머스크"), Match(4, 7, "머스크"), Match(9, 11, "우디")]
+        assert [m.value for m in select_longest(matches)] == ["화이트 머스크", "우디"]
+
+
+class TestExtraction:
+    def test_relation_sets_gender_target_and_gift(self, matcher):
+        slots = matcher.extract("남친 선물로 우디한 거 추천").slots
+        assert slots["gender"] == "Men"
+        assert slots["target"] == "남친"
+        assert slots["use_case"] == "GIFT"
+        assert slots["accord"] == "Woody"
+
+    def test_age_and_gender_build_target(self, matcher):
+        slots = matcher.extract("30대 남자 출근용 향수 2개").slots
+        assert slots["target"] == "30대 남성"
+        assert slots["situation"] == "Office"
+        assert slots["recommended_count"] == 2
+
+    def test_longest_match_prefers_relation_over_gender(self, matcher):
+        slots = matcher.extract("여자친구 향수").slots
+        assert slots["target"] == "여자친구"
+
+    def test_brand_with_similarity_becomes_reference(self, matcher):
+        slots = matcher.extract("샤넬 같은 느낌 여성 향수").slots
+        assert slots["reference_brand"] == "Chanel"
+        assert "brand" not in slots
+
+    def test_english_terms_respect_word_boundary(self, matcher):
+        slots = matcher.extract("summer perfume for women").slots
+        assert slots["season"] == "Summer"
+        assert slots["gender"] == "Women"
+        assert "gender" not in matcher.extract("womenswear store").slots
+
+
+class TestSkipDecision:
+    @pytest.mark.parametrize(
+        "query",
+        ["여름에 쓸 여자 향수 추천해줘", "엄마 생일 선물 우아한 향수", "가을에 쓸 유니섹스 향수"],
+    )
+    def test_sufficient_turns_skip(self, matcher, query):
+        assert matcher.extract(query).can_skip_llm()
+
+    def test_target_without_concept_needs_llm(self, matcher):
+        assert not matcher.extract("20대 여성 향수 추천해줘").can_skip_llm()
+
+    def test_negated_slot_is_dropped(self, matcher):
+        extraction = matcher.extract("장미 말고 머스크 향 여자 향수")
+        assert extraction.has_negation
+        assert extraction.slots["note"] == "Musk"
+        assert not extraction.can_skip_llm()
+
+    def test_conflicting_values_are_not_prefilled(self, matcher):
+        extraction = matcher.extract("남자 여자 둘 다 쓸 수 있는 향수 여름용")
+        assert "gender" in extraction.conflicts
+        assert "gender" not in extraction.slots
+        assert not extraction.can_skip_llm()
+
+    def test_specific_perfume_needs_llm(self, matcher):
+        extraction = matcher.extract("디올 쁘아종이랑 비슷한 여자 향수")
+        assert extraction.mentions_perfume
+        assert not extraction.can_skip_llm()
+
+    def test_carried_slots_complete_the_turn(self, matcher):
+        extraction = matcher.extract("여름이요")
+        assert not extraction.can_skip_llm()
+        assert extraction.can_skip_llm({"gender": "Men", "target": "남성"})
+
+
+# ------------------------------------------------------------------
+# Interviewer 연동
+# ------------------------------------------------------------------
+
+
+@pytest.fixture
+def offline_matcher(monkeypatch):
+    from backend.agent import slot_matcher
+
+    monkeypatch.setenv("SLOT_PREFILL_ENABLED", "true")
+    monkeypatch.setattr(slot_matcher, "_MATCHER", slot_matcher.build_slot_matcher(include_db=False))
+
+
+@pytest.mark.asyncio
+async def test_interviewer_skips_llm_when_slots_are_sufficient(offline_matcher):
+    from backend.agent import graph
+
+    llm = MagicMock()
+    with patch.object(graph, "SMART_LLM", llm):
+        result = await graph.interviewer_node(
+            {"messages": [HumanMessage(content="여름에 쓸 여자 향수 추천해줘")]}
+        )
+
+    llm.with_structured_output.assert_not_called()
+    assert result["next_step"] == "researcher"
+    assert result["user_preferences"]["gender"] == "Women"
+    assert result["user_preferences"]["season"] == "Summer"
+
+
+@pytest.mark.asyncio
+async def test_interviewer_passes_prefilled_slots_to_llm(offline_matcher):
+    from backend.agent import graph
+
+    interview_result = graph.InterviewResult(
+        user_preferences=graph.UserPreferences(target="20대 여성", gender="Women"),
+        is_sufficient=False,
+        response_message="어떤 분위기를 선호하시나요?",
+        is_off_topic=False,
+    )
+    llm = MagicMock()
+    llm.with_structured_output.return_value.ainvoke = AsyncMock(return_value=interview_result)
+
+    with patch.object(graph, "SMART_LLM", llm):
+        result = await graph.interviewer_node(
+            {"messages": [HumanMessage(content="20대 여성 향수 추천해줘")]}
+        )
+
+    messages = llm.with_structured_output.return_value.ainvoke.call_args[0][0]
+    assert '"gender": "Women"' in messages[0].content
+    assert result["active_mode"] == "interviewer"
+    assert result["messages"][0].content == "어떤 분위기를 선호하시나요?"
+
+
+@pytest.mark.asyncio
+async def test_interviewer_llm_is_bounded_by_request_deadline(offline_matcher):
+    from backend.agent import graph
+
+    async def hang(messages):
+        await asyncio.sleep(5)
+
+    llm = MagicMock()
+    llm.with_structured_output.return_value.ainvoke = hang
+
+    started = time.perf_counter()
+    with patch.object(graph, "SMART_LLM", llm):
+        result = await graph.interviewer_node(
+            {"messages": [HumanMessage(content="20대 여성 향수 추천해줘")],
+             "deadline_at": time.time() + 0.1}
+        )
+
+    assert time.perf_counter() - started < 1.0
+    assert result["next_step"] == "writer"
@@ -0,0 +1,224 @@
+"""
+Pre-Validator / Supervisor 추측 병렬 실행 테스트
+
+- 검증 통과 시 라우팅 결과를 재사용하는지
+- 검증 거부 시 진행 중인 라우팅 호출을 즉시 취소하는지
+- 이미 끝난 라우팅 호출을 낭비(wasted)로 집계하는지
+"""
+import asyncio
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.metrics import metrics  # noqa: E402
+from agent.speculative import run_speculative  # noqa: E402
+from agent.schemas import RoutingDecision, ValidationResult  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics(monkeypatch):
+    # 로컬 Fast-Path 라우터가 LLM 라우팅을 대신하지 않도록 비활성화
+    monkeypatch.setenv("LOCAL_INTENT_ROUTER_ENABLED", "false")
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+async def _delayed(value, delay):
+    await asyncio.sleep(delay)
+    return value
+
+
+@pytest.mark.asyncio
+async def test_accepted_primary_returns_speculative_result():
+    primary, routed = await run_speculative(
+        _delayed({"ok": True}, 0.05),
+        _delayed("interviewer", 0.05),
+        accept=lambda r: r["ok"],
+        stage="t",
+    )
+
+    assert primary == {"ok": True}
+    assert routed == "interviewer"
+    assert metrics.counter("speculative_used_total", stage="t") == 1
+    assert metrics.histogram("speculative_saved_seconds", stage="t")["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_overlap_is_concurrent_not_sequential():
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await run_speculative(
+        _delayed({"ok": True}, 0.2),
+        _delayed("info_retrieval", 0.2),
+        accept=lambda r: r["ok"],
+        stage="t",
+    )
+    assert loop.time() - started < 0.35
+
+
+@pytest.mark.asyncio
+async def test_rejected_primary_cancels_pending_speculation():
+    cancelled = asyncio.Event()
+
+    async def slow_routing():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    primary, routed = await run_speculative(
+        _delayed({"ok": False}, 0.01),
+        slow_routing(),
+        accept=lambda r: r["ok"],
+        stage="t",
+    )
+
+    assert routed is None
+    assert cancelled.is_set()
+    assert loop.time() - started < 1.0
+    assert metrics.counter("speculative_cancelled_total", stage="t") == 1
+    assert metrics.counter("speculative_wasted_total", stage="t") == 0
+
+
+@pytest.mark.asyncio
+async def test_rejected_after_speculation_finished_counts_as_wasted():
+    primary, routed = await run_speculative(
+        _delayed({"ok": False}, 0.05),
+        _delayed("writer", 0.0),
+        accept=lambda r: r["ok"],
+        stage="t",
+    )
+
+    assert routed is None
+    assert metrics.counter("speculative_wasted_total", stage="t") == 1
+    assert metrics.counter("speculative_cancelled_total", stage="t") == 0
+
+
+@pytest.mark.asyncio
+async def test_primary_exception_cancels_speculation():
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        await run_speculative(
+            failing(), _delayed("writer", 5), accept=lambda r: True, stage="t"
+        )
+    assert metrics.counter("speculative_cancelled_total", stage="t") == 1
+
+
+# ------------------------------------------------------------------
+# Graph 노드 연동
+# ------------------------------------------------------------------
+
+
+def _fake_smart_llm(validation: ValidationResult, next_step: str, calls: list):
+    def with_structured_output(schema):
+        runnable = MagicMock()
+
+        async def ainvoke(_messages):
+            calls.append(schema.__name__)
+            if schema.__name__ == "ValidationResult":
+                return validation
+            return RoutingDecision(next_step=next_step)
+
+        runnable.ainvoke = ainvoke
+        return runnable
+
+    llm = MagicMock()
+    llm.with_structured_output.side_effect = with_structured_output
+    return llm
+
+
+@pytest.mark.asyncio
+async def test_pre_validator_precomputes_route_and_supervisor_reuses_it():
+    from backend.agent import graph
+
+    calls = []
+    llm = _fake_smart_llm(
+        ValidationResult(is_unsupported=False, reason="ok"), "interviewer", calls
+    )
+    state = {"messages": [HumanMessage(content="향수 추천해줘")]}
+
+    with patch.object(graph, "SMART_LLM", llm):
+        validated = await graph.pre_validator_node(state)
+        assert validated["validation_result"] == "supported"
+        assert validated["speculative_next_step"] == "interviewer"
+
+        routed = await graph.supervisor_node({**state, **validated})
+
+    assert routed["next_step"] == "interviewer"
+    assert sorted(calls) == ["RoutingDecision", "ValidationResult"]
+
+
+@pytest.mark.asyncio
+async def test_unsupported_request_discards_route():
+    from backend.agent import graph
+
+    calls = []
+    llm = _fake_smart_llm(
+        ValidationResult(
+            is_unsupported=True, unsupported_category="가격", reason="가격 정보 없음"
+        ),
+        "interviewer",
+        calls,
+    )
+    state = {"messages": [HumanMessage(content="제일 싼 향수 알려줘")]}
+
+    with patch.object(graph, "SMART_LLM", llm):
+        validated = await graph.pre_validator_node(state)
+
+    assert validated["validation_result"] == "unsupported"
+    assert validated["speculative_next_step"] is None
+
+
+@pytest.mark.asyncio
+async def test_interviewer_mode_skips_speculation():
+    from backend.agent import graph
+
+    calls = []
+    llm = _fake_smart_llm(
+        ValidationResult(is_unsupported=False, reason="ok"), "info_retrieval", calls
+    )
+    state = {
+        "messages": [HumanMessage(content="20대 여성이요")],
+        "active_mode": "interviewer",
+    }
+
+    with patch.object(graph, "SMART_LLM", llm):
+        validated = await graph.pre_validator_node(state)
+        routed = await graph.supervisor_node({**state, **validated})
+
+    assert calls == ["ValidationResult"]
+    assert routed["next_step"] == "interviewer"
+
+
+@pytest.mark.asyncio
+async def test_speculation_can_be_disabled(monkeypatch):
+    from backend.agent import graph
+
+    monkeypatch.setenv("SPECULATIVE_ROUTING_ENABLED", "false")
+    calls = []
+    llm = _fake_smart_llm(
+        ValidationResult(is_unsupported=False, reason="ok"), "info_retrieval", calls
+    )
+    state = {"messages": [HumanMessage(content="샤넬 No.5 정보 알려줘")]}
+
+    with patch.object(graph, "SMART_LLM", llm):
+        validated = await graph.pre_validator_node(state)
+        assert validated["speculative_next_step"] is None
+        routed = await graph.supervisor_node({**state, **validated})
+
+    assert routed["next_step"] == "info_retrieval"
+    assert calls == ["ValidationResult", "RoutingDecision"]
@@ -0,0 +1,116 @@
+"""
+SSE 프레임 병합 테스트
+
+- 같은 노드의 연속 answer 청크가 한 프레임으로 합쳐지고 내용/순서가 보존되는지
+- 이벤트 종류/노드가 바뀌거나 바이트 임계치·시간창을 넘으면 버퍼를 비우는지
+- 소스가 멈춰 있어도 시간창이 지나면 버퍼가 전송되는지
+"""
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.sse import SSECoalescer, SSEEvent, coalesce_sse, encode_sse  # noqa: E402
+
+
+def _decode(frames):
+    payloads = []
+    for frame in frames:
+        assert frame.startswith("data: ") and frame.endswith("\n\n")
+        payloads.append(json.loads(frame[len("data: "):]))
+    return payloads
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_encode_sse_keeps_korean_readable():
+    frame = encode_sse({"type": "answer", "content": "향수 \"추천\"\n"})
+    assert "향수" in frame
+    assert _decode([frame]) == [{"type": "answer", "content": "향수 \"추천\"\n"}]
+
+
+def test_consecutive_answer_chunks_merge_until_event_type_changes():
+    coalescer = SSECoalescer(window=10, max_bytes=10_000)
+    frames = []
+    for token in ["## 1. ", "우디", " 향수"]:
+        frames += coalescer.push(SSEEvent({"type": "answer", "content": token}, "writer"))
+    assert frames == []
+
+    frames += coalescer.push(SSEEvent({"type": "log", "content": "검색중"}))
+    frames += coalescer.push(SSEEvent({"type": "answer", "content": "다음"}, "writer"))
+    frames += coalescer.flush()
+
+    assert _decode(frames) == [
+        {"type": "answer", "content": "## 1. 우디 향수"},
+        {"type": "log", "content": "검색중"},
+        {"type": "answer", "content": "다음"},
+    ]
+    assert (coalescer.events_in, coalescer.frames_out) == (5, 3)
+
+
+def test_node_change_flushes_buffer():
+    coalescer = SSECoalescer(window=10, max_bytes=10_000)
+    frames = coalescer.push(SSEEvent({"type": "answer", "content": "a"}, "writer"))
+    frames += coalescer.push(SSEEvent({"type": "answer", "content": "b"}, "info_writer"))
+    frames += coalescer.flush()
+    assert [p["content"] for p in _decode(frames)] == ["a", "b"]
+
+
+def test_byte_threshold_and_time_window():
+    clock = FakeClock()
+    coalescer = SSECoalescer(window=0.03, max_bytes=6, clock=clock)
+
+    # "향수" = 6 bytes → 임계치 도달 즉시 전송
+    assert _decode(coalescer.push(SSEEvent({"type": "answer", "content": "향수"}, "w")))[0][
+        "content"
+    ] == "향수"
+
+    assert coalescer.push(SSEEvent({"type": "answer", "content": "a"}, "w")) == []
+    assert coalescer.timeout() == pytest.approx(0.03)
+    clock.now += 0.031
+    assert coalescer.timeout() == 0
+    frames = coalescer.push(SSEEvent({"type": "answer", "content": "b"}, "w"))
+    assert [p["content"] for p in _decode(frames)] == ["ab"]
+    assert coalescer.timeout() is None
+
+
+@pytest.mark.asyncio
+async def test_stalled_source_is_flushed_after_window():
+    arrivals = []
+
+    async def source():
+        yield SSEEvent({"type": "answer", "content": "a"}, "w")
+        yield SSEEvent({"type": "answer", "content": "b"}, "w")
+        await asyncio.sleep(0.3)
+        yield SSEEvent({"type": "answer", "content": "c"}, "w")
+
+    started = time.perf_counter()
+    async for frame in coalesce_sse(source(), SSECoalescer(window=0.02), enabled=True):
+        arrivals.append((time.perf_counter() - started, _decode([frame])[0]["content"]))
+
+    assert [content for _, content in arrivals] == ["ab", "c"]
+    # "ab"는 "c"를 기다리지 않고 시간창이 지나자마자 전송
+    assert arrivals[0][0] < 0.2
+
+
+@pytest.mark.asyncio
+async def test_disabled_mode_sends_one_frame_per_event():
+    async def source():
+        for token in ["a", "b", "c"]:
+            yield SSEEvent({"type": "answer", "content": token}, "w")
+
+    frames = [frame async for frame in coalesce_sse(source(), enabled=False)]
+    assert [p["content"] for p in _decode(frames)] == ["a", "b", "c"]
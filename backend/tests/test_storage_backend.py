@@ -0,0 +1,114 @@
+"""
+Tests for storage backends (cached S3 client, local filesystem backend, async facade).
+"""
+
+import asyncio
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+# Add backend directory to Python path
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent import storage_s3  # noqa: E402
+from agent.metrics import metrics  # noqa: E402
+from agent.storage_s3 import LocalFSBackend, S3Backend, StorageBackend  # noqa: E402
+
+
+@pytest.fixture
+def local_storage(tmp_path, monkeypatch):
+    monkeypatch.setenv('S3_PREFIX_PROFILE_IMAGES', 'profile_images')
+    monkeypatch.setenv('CLOUDFRONT_DOMAIN', 'https://cdn.example.com')
+    backend = LocalFSBackend(tmp_path)
+    storage_s3.set_storage_backend(backend)
+    yield backend
+    storage_s3.set_storage_backend(None)
+    storage_s3.shutdown_storage_executor()
+
+
+def test_local_backend_put_delete_and_root_guard(local_storage, tmp_path):
+    metrics.reset()
+    storage_s3.upload_bytes(key='profile_images/a.webp', data=b'webp', content_type='image/webp')
+    assert (tmp_path / 'profile_images' / 'a.webp').read_bytes() == b'webp'
+    assert [p.name for p in (tmp_path / 'profile_images').iterdir()] == ['a.webp']
+
+    storage_s3.delete_key('profile_images/a.webp')
+    storage_s3.delete_key('profile_images/missing.webp')
+    assert not (tmp_path / 'profile_images' / 'a.webp').exists()
+    assert metrics.histogram('storage_op_seconds', op='put', backend='local')['count'] == 1
+    assert metrics.histogram('storage_op_seconds', op='delete', backend='local')['count'] == 2
+
+    with pytest.raises(ValueError):
+        local_storage.put('../outside.webp', b'x', 'image/webp')
+
+
+def test_s3_client_is_created_once_across_threads():
+    created = []
+
+    class FakeClient:
+        def __init__(self):
+            self.puts = []
+
+        def put_object(self, **kwargs):
+            self.puts.append(kwargs['Key'])
+
+    def factory():
+        created.append(threading.current_thread().name)
+        return FakeClient()
+
+    backend = S3Backend(bucket='bucket', client_factory=factory)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda i: backend.put(f'k{i}', b'x', 'image/webp'), range(64)))
+
+    assert len(created) == 1
+    assert sorted(backend.client.puts) == sorted(f'k{i}' for i in range(64))
+
+
+def test_s3_client_config_pool_matches_executor():
+    config = storage_s3._s3_client_config()
+    assert config.max_pool_connections == storage_s3.S3_MAX_POOL_CONNECTIONS
+    assert config.retries['mode'] == 'standard'
+
+
+def test_async_facade_runs_off_the_event_loop(local_storage, tmp_path):
+    threads = []
+
+    class RecordingBackend(StorageBackend):
+        name = 'recording'
+
+        def put(self, key, data, content_type):
+            threads.append(threading.current_thread().name)
+            local_storage.put(key, data, content_type)
+
+        def delete(self, key):
+            threads.append(threading.current_thread().name)
+            local_storage.delete(key)
+
+    storage_s3.set_storage_backend(RecordingBackend())
+
+    async def upload_and_replace():
+        key, url = await storage_s3.aupload_profile_variants({64: b'small', 256: b'large'}, 256)
+        await storage_s3.adelete_profile_image(key, (64,))
+        return key, url
+
+    key, url = asyncio.run(upload_and_replace())
+    assert url == f'https://cdn.example.com/{key}'
+    assert len(threads) == 4
+    assert all(name.startswith('storage-io') for name in threads)
+    assert list((tmp_path / 'profile_images').iterdir()) == []
+
+
+def test_backend_must_implement_put_and_delete():
+    class PutOnly(StorageBackend):
+        def put(self, key, data, content_type):
+            pass
+
+    with pytest.raises(TypeError):
+        PutOnly()
+    with pytest.raises(TypeError):
+        StorageBackend()
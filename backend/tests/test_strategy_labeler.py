@@ -0,0 +1,182 @@
+"""
+전략명 배치 생성 테스트
+
+- N개 전략의 라벨을 구조화 출력 1회로 만드는지 (정상 경로)
+- 금지어가 포함된 라벨만 다시 요청하는지
+- 재요청 후에도 실패하면 SAFE_LABELS로 대체하는지
+- 계획 실패(withdraw)한 전략을 기다리지 않는지
+"""
+import asyncio
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.denylist import UserFriendlyStrategyLabels, has_forbidden_words  # noqa: E402
+from agent.schemas import StrategyLabel, StrategyLabelBatch  # noqa: E402
+from agent.strategy_labeler import BatchStrategyLabeler  # noqa: E402
+
+
+class FakeLabelModel:
+    """요청에 들어온 priority마다 scripted 라벨을 순서대로 돌려주는 가짜 구조화 출력 모델"""
+
+    def __init__(self, scripted):
+        self.scripted = {priority: list(labels) for priority, labels in scripted.items()}
+        self.requests = []
+
+    def with_structured_output(self, schema):
+        assert schema.__name__ == "StrategyLabelBatch"
+        return self
+
+    async def ainvoke(self, messages, config=None):
+        assert config == {"tags": ["internal_helper"]}
+        prompt = messages[-1].content
+        priorities = [p for p in self.scripted if f"priority {p}:" in prompt]
+        self.requests.append(priorities)
+        return StrategyLabelBatch(
+            labels=[StrategyLabel(priority=p, label=self.scripted[p].pop(0)) for p in priorities]
+        )
+
+
+async def _label_all(labeler, reasons):
+    futures = [labeler.request(priority, reason) for priority, reason in reasons.items()]
+    labels = await asyncio.gather(*futures)
+    await labeler.aclose()
+    return labels
+
+
+@pytest.mark.asyncio
+async def test_one_call_for_all_strategies():
+    model = FakeLabelModel({1: ["우아한 첫인상"], 2: ["산뜻한 하루"], 3: ["포근한 저녁"]})
+    labeler = BatchStrategyLabeler(model, {"gender": "Women"}, expected=3)
+
+    labels = await _label_all(labeler, {1: "A", 2: "B", 3: "C"})
+
+    assert labels == ["우아한 첫인상", "산뜻한 하루", "포근한 저녁"]
+    assert labeler.llm_calls == 1
+    assert model.requests == [[1, 2, 3]]
+
+
+@pytest.mark.asyncio
+async def test_only_offending_labels_are_re_requested():
+    model = FakeLabelModel(
+        {1: ["우아한 첫인상"], 2: ["이미지 강조 전략", "산뜻한 하루"], 3: ["포근한 저녁"]}
+    )
+    labeler = BatchStrategyLabeler(model, {}, expected=3)
+
+    labels = await _label_all(labeler, {1: "A", 2: "B", 3: "C"})
+
+    assert labels[1] == "산뜻한 하루"
+    assert model.requests == [[1, 2, 3], [2]]
+    assert labeler.llm_calls == 2
+
+
+@pytest.mark.asyncio
+async def test_persistent_violation_falls_back_to_safe_label():
+    model = FakeLabelModel({1: ["전략적 선택", "이미지 반전"]})
+    labeler = BatchStrategyLabeler(model, {}, expected=1)
+
+    labels = await _label_all(labeler, {1: "A"})
+
+    assert labels[0] in UserFriendlyStrategyLabels.SAFE_LABELS
+    assert not has_forbidden_words(labels[0])
+    assert labeler.llm_calls == 2
+
+
+@pytest.mark.asyncio
+async def test_model_error_falls_back_without_raising():
+    model = MagicMock()
+    model.with_structured_output.return_value.ainvoke = AsyncMock(side_effect=RuntimeError("boom"))
+    labeler = BatchStrategyLabeler(model, {}, expected=2)
+
+    labels = await _label_all(labeler, {1: "A", 2: "B"})
+
+    assert all(label in UserFriendlyStrategyLabels.SAFE_LABELS for label in labels)
+    assert len(set(labels)) == 2
+
+
+@pytest.mark.asyncio
+async def test_withdrawn_strategy_does_not_delay_batch():
+    model = FakeLabelModel({1: ["우아한 첫인상"], 3: ["포근한 저녁"]})
+    labeler = BatchStrategyLabeler(model, {}, expected=3, max_wait=10)
+
+    first = labeler.request(1, "A")
+    labeler.withdraw(2)
+    third = labeler.request(3, "C")
+
+    labels = await asyncio.wait_for(asyncio.gather(first, third), timeout=1)
+    await labeler.aclose()
+    assert labels == ["우아한 첫인상", "포근한 저녁"]
+    assert model.requests == [[1, 3]]
+
+
+@pytest.mark.asyncio
+async def test_late_strategy_is_labeled_after_max_wait():
+    model = FakeLabelModel({1: ["우아한 첫인상"], 2: ["산뜻한 하루"]})
+    labeler = BatchStrategyLabeler(model, {}, expected=2, max_wait=0.01)
+
+    first = await asyncio.wait_for(labeler.request(1, "A"), timeout=1)
+    second = await asyncio.wait_for(labeler.request(2, "B"), timeout=1)
+    await labeler.aclose()
+
+    assert (first, second) == ("우아한 첫인상", "산뜻한 하루")
+    assert model.requests == [[1], [2]]
+
+
+@pytest.mark.asyncio
+async def test_parallel_reco_makes_one_label_call_for_three_strategies():
+    from backend.agent import graph
+    from backend.agent.schemas import HardFilters, SearchStrategyPlan, StrategyFilters
+
+    label_calls = []
+
+    class FakeStructured:
+        def __init__(self, schema):
+            self.schema = schema
+
+        async def ainvoke(self, messages, config=None):
+            if self.schema.__name__ == "StrategyLabelBatch":
+                label_calls.append(messages)
+                return StrategyLabelBatch(
+                    labels=[StrategyLabel(priority=p, label=f"무드 {p}") for p in (1, 2, 3)]
+                )
+            priority = int(messages[-1].content.split("우선순위: ")[1].split("\n")[0])
+            return SearchStrategyPlan(
+                priority=priority,
+                strategy_name=f"S{priority}",
+                reason=f"reason {priority}",
+                hard_filters=HardFilters(gender="Unisex"),
+                strategy_filters=StrategyFilters(),
+                strategy_keyword=["k"],
+            )
+
+    smart = MagicMock()
+    smart.with_structured_output.side_effect = FakeStructured
+    smart.ainvoke = AsyncMock(side_effect=AssertionError("per-strategy label call"))
+
+    async def fake_search(h, s, exclude_ids=None, query_text="", rank_mode="DEFAULT"):
+        perfume_id = int(query_text.split()[-1])
+        return [{"id": perfume_id, "name": f"P{perfume_id}", "brand": f"B{perfume_id}"}], "Match"
+
+    sections = []
+
+    async def fake_generate_section(_writer, prepared, number, **_kwargs):
+        sections.append(prepared["section_data"]["strategy"]["user_label"])
+        return f"## {number}. section"
+
+    with patch.object(graph, "SMART_LLM", smart), \
+         patch.object(graph, "smart_search_with_retry_async", fake_search), \
+         patch.object(graph, "save_recommendation_log"), \
+         patch.object(graph.RecoWriter, "generate_section", fake_generate_section):
+        await graph.parallel_reco_node(
+            {"member_id": 0, "user_preferences": {"gender": "Unisex"}, "messages": [],
+             "recommended_count": 3}
+        )
+
+    assert len(label_calls) == 1
+    assert sorted(sections) == ["무드 1", "무드 2", "무드 3"]
@@ -0,0 +1,185 @@
+"""
+클라이언트 이탈 시 스트림 취소 테스트
+
+- 연결이 끊기면 가짜 그래프의 하위 Task(병렬 준비/작성)가 제한 시간 안에 모두 취소되는지
+- 정상 종료/오류 시 outcome이 completed/error로 집계되는지
+- parallel_reco_node가 취소되면 진행 중인 전략 준비 Task까지 정리하는지
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.metrics import metrics  # noqa: E402
+from agent.stream_cancel import StreamOutcome, stream_until_disconnect  # noqa: E402
+
+
+class FakeGraph:
+    """노드 안에서 하위 Task를 여러 개 띄우고 오래 걸리는 가짜 그래프 실행"""
+
+    def __init__(self, children: int = 4):
+        self.children = children
+        self.tasks = []
+        self.cleaned_up = False
+
+    async def _child(self):
+        await asyncio.sleep(30)
+
+    async def astream(self):
+        try:
+            yield "data: start\n\n"
+            self.tasks = [asyncio.create_task(self._child()) for _ in range(self.children)]
+            try:
+                await asyncio.gather(*self.tasks)
+            finally:
+                for task in self.tasks:
+                    task.cancel()
+            yield "data: never\n\n"
+        finally:
+            self.cleaned_up = True
+
+
+def _disconnect_after(seconds: float):
+    started = time.perf_counter()
+
+    async def is_disconnected():
+        return time.perf_counter() - started >= seconds
+
+    return is_disconnected
+
+
+@pytest.mark.asyncio
+async def test_disconnect_cancels_all_child_tasks_within_bound():
+    metrics.reset()
+    graph = FakeGraph()
+    outcomes = []
+    received = []
+
+    started = time.perf_counter()
+    async for chunk in stream_until_disconnect(
+        graph.astream(),
+        _disconnect_after(0.05),
+        poll_interval=0.01,
+        cancel_timeout=1.0,
+        on_finish=outcomes.append,
+    ):
+        received.append(chunk)
+    elapsed = time.perf_counter() - started
+
+    assert received == ["data: start\n\n"]
+    assert elapsed < 1.0
+    assert graph.tasks and all(task.cancelled() for task in graph.tasks)
+    assert graph.cleaned_up
+    assert outcomes == [StreamOutcome.CANCELLED]
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"]["chat_stream_outcome_total{outcome=cancelled}"] == 1
+
+
+@pytest.mark.asyncio
+async def test_consumer_close_also_cancels_graph_run():
+    graph = FakeGraph()
+    outcomes = []
+
+    stream = stream_until_disconnect(
+        graph.astream(),
+        _disconnect_after(60),
+        poll_interval=0.01,
+        on_finish=outcomes.append,
+    )
+    assert await stream.__anext__() == "data: start\n\n"
+    await asyncio.sleep(0.02)
+    # 서버 쪽에서 응답을 닫음 (전송 실패 등)
+    await stream.aclose()
+
+    assert all(task.cancelled() for task in graph.tasks)
+    assert outcomes == [StreamOutcome.CANCELLED]
+
+
+@pytest.mark.asyncio
+async def test_completed_and_error_outcomes():
+    async def finite():
+        yield "a"
+        yield "b"
+
+    async def broken():
+        yield "a"
+        raise ValueError("boom")
+
+    outcomes = []
+    chunks = [
+        c
+        async for c in stream_until_disconnect(
+            finite(), _disconnect_after(60), on_finish=outcomes.append
+        )
+    ]
+    assert chunks == ["a", "b"]
+
+    with pytest.raises(ValueError):
+        async for _ in stream_until_disconnect(
+            broken(), _disconnect_after(60), on_finish=outcomes.append
+        ):
+            pass
+
+    assert outcomes == [StreamOutcome.COMPLETED, StreamOutcome.ERROR]
+
+
+@pytest.mark.asyncio
+async def test_parallel_reco_cancellation_stops_strategy_tasks():
+    from backend.agent import graph
+    from backend.agent.schemas import HardFilters, SearchStrategyPlan, StrategyFilters
+
+    class FakeStructured:
+        def __init__(self, schema):
+            self.schema = schema
+
+        async def ainvoke(self, messages, config=None):
+            if self.schema.__name__ == "StrategyLabelBatch":
+                await asyncio.sleep(30)
+            priority = int(messages[-1].content.split("우선순위: ")[1].split("\n")[0])
+            return SearchStrategyPlan(
+                priority=priority,
+                strategy_name=f"S{priority}",
+                reason=f"reason {priority}",
+                hard_filters=HardFilters(gender="Unisex"),
+                strategy_filters=StrategyFilters(),
+                strategy_keyword=["k"],
+            )
+
+    smart = MagicMock()
+    smart.with_structured_output.side_effect = FakeStructured
+
+    searches_started = 0
+    searches_cancelled = 0
+
+    async def slow_search(h, s, exclude_ids=None, query_text="", rank_mode="DEFAULT"):
+        nonlocal searches_started, searches_cancelled
+        searches_started += 1
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            searches_cancelled += 1
+            raise
+
+    with patch.object(graph, "SMART_LLM", smart), \
+         patch.object(graph, "smart_search_with_retry_async", slow_search), \
+         patch.object(graph, "save_recommendation_log"):
+        node = asyncio.create_task(
+            graph.parallel_reco_node(
+                {"member_id": 0, "user_preferences": {"gender": "Unisex"}, "messages": [],
+                 "recommended_count": 3}
+            )
+        )
+        while searches_started < 3:
+            await asyncio.sleep(0.01)
+        node.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(node, timeout=1.0)
+
+    assert searches_cancelled == 3
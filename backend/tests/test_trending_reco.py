@@ -91,3 +91,46 @@ async def test_rerank_perfumes_default_fallback():
         assert len(result) == 1
         # It should have used semantic scoring (0.9)
         assert result[0]["review_score"] == 0.9
+
+@pytest.mark.asyncio
+async def test_rerank_does_not_hold_connection_across_llm_awaits():
+    """
+    Test that no pooled connection is checked out while the translation
+    and embedding calls are awaited (a fresh one is taken for the query).
+    """
+    checked_out = []
+    held_during_awaits = []
+
+    mock_cur = MagicMock()
+    mock_cur.fetchall.return_value = [{"perfume_id": 1, "similarity_score": 0.7, "best_review": "Nice"}]
+
+    def get_conn():
+        conn = MagicMock()
+        conn.cursor.return_value = mock_cur
+        checked_out.append(conn)
+        return conn
+
+    def release_conn(conn):
+        checked_out.remove(conn)
+
+    async def translate(**kwargs):
+        held_during_awaits.append(len(checked_out))
+        completion = MagicMock()
+        completion.choices[0].message.content = "translated query"
+        return completion
+
+    async def embed(text):
+        held_during_awaits.append(len(checked_out))
+        return [0.1, 0.2]
+
+    with patch("backend.agent.database.async_client") as mock_client, \
+         patch("backend.agent.database.get_embedding_async", side_effect=embed), \
+         patch("backend.agent.database.get_db_connection", side_effect=get_conn) as mock_get, \
+         patch("backend.agent.database.release_db_connection", side_effect=release_conn):
+        mock_client.chat.completions.create = AsyncMock(side_effect=translate)
+
+        result = await rerank_perfumes_async([{"id": 1, "name": "A"}], query_text="q", rank_mode="DEFAULT")
+
+    assert result[0]["review_score"] == 0.7
+    assert held_during_awaits == [0, 0]
+    assert mock_get.call_count == 1 and checked_out == []
@@ -16,6 +16,18 @@ interface MemberRow {
   member_status: string | null;
 }
 
+interface MemberTotal {
+  count: number;
+  exact: boolean;
+}
+
+interface MemberPage {
+  members: MemberRow[];
+  next_cursor: string | null;
+  has_more: boolean;
+  total: MemberTotal | null;
+}
+
 const statusOptions = ["NORMAL", "LOCK", "DORMANT", "WITHDRAW_REQ", "WITHDRAW"] as const;
 
 export default function AdminPage() {
@@ -25,6 +37,8 @@ export default function AdminPage() {
   const [verifiedRoleType, setVerifiedRoleType] = useState<string | null>(null);
   const [isVerifying, setIsVerifying] = useState(true);
   const [members, setMembers] = useState<MemberRow[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [memberTotal, setMemberTotal] = useState<MemberTotal | null>(null);
   const [message, setMessage] = useState<string | null>(null);
   const [isLoading, setIsLoading] = useState(false);
   const apiBaseUrl = "/api";
@@ -88,6 +102,26 @@ export default function AdminPage() {
     return () => controller.abort();
   }, [apiBaseUrl, memberId]);
 
+  // 회원 목록은 페이지 단위(next_cursor)로 받음: 첫 페이지만 전체 건수(추정치)를 함께 요청
+  const fetchMemberPage = async (cursor: string | null, signal?: AbortSignal): Promise<MemberPage | null> => {
+    const params = new URLSearchParams();
+    if (cursor) {
+      params.set("cursor", cursor);
+      params.set("count", "none");
+    }
+    const query = params.toString();
+    const response = await fetch(
+      `${apiBaseUrl}/users/admin/members${query ? `?${query}` : ""}`,
+      { signal }
+    );
+    if (!response.ok) {
+      const data = await response.json().catch(() => null);
+      setMessage(data?.detail || "관리자 목록 조회에 실패했습니다.");
+      return null;
+    }
+    return response.json();
+  };
+
   useEffect(() => {
     if (!memberId || !isAdmin) return;
     const controller = new AbortController();
@@ -96,19 +130,15 @@ export default function AdminPage() {
       setIsLoading(true);
       setMessage(null);
       try {
-        const response = await fetch(
-          `${apiBaseUrl}/users/admin/members`,
-          { signal: controller.signal }
-        );
-        if (!response.ok) {
-          const data = await response.json().catch(() => null);
-          setMessage(data?.detail || "관리자 목록 조회에 실패했습니다.");
-          return;
-        }
-        const data = await response.json();
+        const data = await fetchMemberPage(null, controller.signal);
+        if (!data) return;
         setMembers(data.members ?? []);
+        setNextCursor(data.next_cursor ?? null);
+        setMemberTotal(data.total ?? null);
       } catch (error) {
-        setMessage("관리자 목록 조회에 실패했습니다.");
+        if ((error as Error).name !== 'AbortError') {
+          setMessage("관리자 목록 조회에 실패했습니다.");
+        }
       } finally {
         setIsLoading(false);
       }
@@ -119,6 +149,22 @@ export default function AdminPage() {
     return () => controller.abort();
   }, [apiBaseUrl, isAdmin, memberId]);
 
+  const loadMoreMembers = async () => {
+    if (!nextCursor || isLoading) return;
+    setIsLoading(true);
+    setMessage(null);
+    try {
+      const data = await fetchMemberPage(nextCursor);
+      if (!data) return;
+      setMembers((prev) => [...prev, ...(data.members ?? [])]);
+      setNextCursor(data.next_cursor ?? null);
+    } catch (error) {
+      setMessage("관리자 목록 조회에 실패했습니다.");
+    } finally {
+      setIsLoading(false);
+    }
+  };
+
   const updateStatus = async (targetId: string, status: string) => {
     if (!memberId) return;
     try {
@@ -168,6 +214,10 @@ export default function AdminPage() {
                 <div>
                   <h3 className="text-2xl font-black tracking-tight">회원 관리 시스템</h3>
                   <p className="text-xs text-gray-500 mt-1 uppercase tracking-widest font-bold">Member Management Studio</p>
+                  <p className="text-[11px] text-gray-400 mt-1 font-bold">
+                    {members.length.toLocaleString()}명 표시
+                    {memberTotal && ` / 전체 ${memberTotal.exact ? "" : "약 "}${memberTotal.count.toLocaleString()}명`}
+                  </p>
                 </div>
                 {isLoading && (
                   <div className="flex items-center gap-2">
@@ -228,6 +278,19 @@ export default function AdminPage() {
                   </tbody>
                 </table>
               </div>
+
+              {nextCursor && (
+                <div className="flex justify-center">
+                  <button
+                    type="button"
+                    onClick={loadMoreMembers}
+                    disabled={isLoading}
+                    className="px-6 py-2 rounded-full bg-black text-white text-xs font-bold tracking-widest uppercase shadow-md hover:shadow-lg transition-all disabled:opacity-40"
+                  >
+                    {isLoading ? "Loading..." : "더 보기"}
+                  </button>
+                </div>
+              )}
             </section>
           )}
         </main>